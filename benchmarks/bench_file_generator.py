@@ -0,0 +1,87 @@
+#!/usr/bin/env python3
+"""
+Zapis plików przez FileGenerator: sekwencyjnie vs pula wątków
+
+Generuje syntetyczny projekt (tysiące plików w docs/ i examples/, część
+strumieniowych) i mierzy generate_with_report() dla różnych liczb wątków.
+Domyślnie na dysku lokalnym (katalog repo) i na tmpfs (/dev/shm, jeśli
+istnieje) - różnica między nimi pokazuje, ile kosztują opóźnienia systemu
+plików, a ile samo renderowanie.
+
+Użycie:
+    python benchmarks/bench_file_generator.py [--files 5000] [--size 2000] \\
+        [--workers 1,4,8,16] [--dir /mnt/nfs/tmp]
+"""
+
+import argparse
+import shutil
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+
+from src.generators.file_generator import FileGenerator
+from src.transformers.base_transformer import TransformedData
+
+
+def build_project(files: int, size: int) -> TransformedData:
+    """Syntetyczny wynik transformacji: co trzeci plik strumieniowy, 50 katalogów docs/"""
+    data = TransformedData()
+    data.destination = 'bench'
+    line = 'Lorem ipsum dolor sit amet, consectetur adipiscing elit.\n'
+    body = line * max(size // len(line), 1)
+    for i in range(files):
+        if i % 3 == 0:
+            data.add_stream(f'docs/{i % 50:02d}/page_{i}.md', lambda i=i: (f'# Strona {i}\n', body))
+        else:
+            data.add_file(f'examples/example_{i}.txt', body)
+    return data
+
+
+def measure(target: Path, data: TransformedData, workers: int, runs: int) -> float:
+    """Najlepszy czas zapisu (s) w świeżym katalogu w `target`"""
+    best = None
+    for _ in range(runs):
+        output = Path(tempfile.mkdtemp(prefix='drdoc-bench-', dir=target))
+        try:
+            generator = FileGenerator(str(output), max_workers=workers)
+            start = time.perf_counter()
+            report = generator.generate_with_report(data, 'project', incremental=False)
+            elapsed = time.perf_counter() - start
+            if report.failed:
+                raise RuntimeError(f"Błędy zapisu: {list(report.failed.items())[:3]}")
+        finally:
+            shutil.rmtree(output, ignore_errors=True)
+        best = elapsed if best is None else min(best, elapsed)
+    return best
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark zapisu plików FileGenerator')
+    parser.add_argument('--files', type=int, default=5000, help='Liczba plików projektu')
+    parser.add_argument('--size', type=int, default=2000, help='Przybliżony rozmiar pliku (bajty)')
+    parser.add_argument('--workers', default='1,4,8,16', help='Liczby wątków (po przecinku)')
+    parser.add_argument('--dir', action='append', help='Katalog docelowy (domyślnie: repo i /dev/shm)')
+    parser.add_argument('--runs', type=int, default=3, help='Liczba przebiegów (liczy się najlepszy)')
+    args = parser.parse_args()
+
+    targets = [Path(d) for d in args.dir] if args.dir else [ROOT] + [p for p in [Path('/dev/shm')] if p.is_dir()]
+    workers = [int(w) for w in args.workers.split(',')]
+    data = build_project(args.files, args.size)
+
+    print(f"{args.files} plików po ~{args.size} B")
+    for target in targets:
+        baseline = None
+        for count in workers:
+            elapsed = measure(target, data, count, args.runs)
+            baseline = baseline or elapsed
+            print(f"  {str(target):<30} wątki={count:<3} {elapsed * 1000:9.1f} ms  "
+                  f"({len(data.files) / elapsed:8.0f} plików/s, x{baseline / elapsed:.2f})")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -4,6 +4,7 @@ Dr.Doc - Data Transformation Tool
 Główna aplikacja CLI
 """
 
+import os
 import sys
 import argparse
 from pathlib import Path
@@ -12,9 +13,57 @@ from typing import Optional
 # Dodaj src do path
 sys.path.insert(0, str(Path(__file__).parent))
 
-from src.parsers import parse_content, detect_format
-from src.transformers import transform_data
-from src.generators.file_generator import FileGenerator
+from src.parsers import parse_content, parse_file, detect_format
+from src.transformers import transform_many
+from src.transformers.base_transformer import source_hash
+from src.transformers.templates import template_dir_fingerprint
+from src.generators.file_generator import FileGenerator, InputFile
+from src.version import __version__
+
+
+# Rozszerzenia plików rozpoznawane jako podpowiedź formatu {rozszerzenie: format}
+KNOWN_EXTENSIONS = {
+    'txt': 'txt',
+    'md': 'md',
+    'json': 'json',
+    'php': 'php',
+    'csv': 'csv',
+    'tsv': 'tsv',
+    'docx': 'doc',
+    'html': 'html',
+    'htm': 'html',
+    'xml': 'xml'
+}
+
+# Dostępne destinacje (-d przyjmuje jedną lub kilka, rozdzielonych przecinkami)
+DESTINATIONS = ['github', 'chatgpt', 'rag', 'project_brief']
+
+# Formaty parsowane prosto z pliku (strumieniowo lub binarnie, bez load_input)
+STREAMED_FORMATS = ['csv', 'tsv', 'doc', 'html', 'xml']
+
+
+def format_from_path(input_path: str) -> Optional[str]:
+    """Zwraca podpowiedź formatu na podstawie rozszerzenia pliku"""
+    ext = Path(input_path).suffix.lstrip('.').lower()
+    return KNOWN_EXTENSIONS.get(ext)
+
+
+def parse_destinations(value: str) -> list[str]:
+    """Parsuje listę destinacji z argumentu -d (np. 'github,chatgpt')"""
+    names = list(dict.fromkeys(name.strip() for name in value.split(',') if name.strip()))
+    unknown = [name for name in names if name not in DESTINATIONS]
+    if not names or unknown:
+        raise argparse.ArgumentTypeError(
+            f"nieznana destinacja: {', '.join(unknown) or value!r} (dostępne: {', '.join(DESTINATIONS)})"
+        )
+    return names
+
+
+def output_name(destination: str, project_name: Optional[str], multiple: bool) -> str:
+    """Nazwa katalogu wyjściowego destinacji"""
+    if not multiple:
+        return project_name or f"{destination}_output"
+    return f"{project_name}_{destination}" if project_name else f"{destination}_output"
 
 
 def load_input(input_path: str = None, stdin: bool = False) -> tuple[str, str]:
@@ -40,9 +89,7 @@ def load_input(input_path: str = None, stdin: bool = False) -> tuple[str, str]:
             content = f.read()
         
         # Podpowiedź formatu z rozszerzenia
-        ext = path.suffix.lstrip('.').lower()
-        if ext in ['txt', 'md', 'json', 'php']:
-            format_hint = ext
+        format_hint = format_from_path(input_path)
     else:
         raise ValueError("Musisz podać ścieżkę do pliku lub użyć --stdin")
     
@@ -62,9 +109,21 @@ Przykłady użycia:
   # Auto-detekcja formatu
   %(prog)s -i document.md -d chatgpt
   
+  # Kilka destinacji z jednego parsowania (równolegle)
+  %(prog)s -i document.md -d github,chatgpt --project-name demo
+  
   # Ze stdin
   cat data.json | %(prog)s --stdin -d github
   
+  # Archiwum zamiast katalogu (.zip, .tar.gz/.tgz, .tar)
+  %(prog)s -i document.md -d github --archive demo.zip
+  
+  # Archiwum tar na stdout (komunikaty na stderr)
+  %(prog)s -i document.md -d github --archive - | tar x -C /tmp
+  
+  # Regeneracja mimo aktualnego manifestu
+  %(prog)s -i document.md -d github --force
+  
   # Tylko podgląd (bez generowania plików)
   %(prog)s -i data.txt -d github --preview
   
@@ -74,7 +133,8 @@ Przykłady użycia:
 Dostępne destinacje:
   - github         : Struktura repozytorium GitHub
   - chatgpt        : Kontekst dla AI (ChatGPT/Claude)
-  - project_brief  : Brief projektowy (TODO)
+  - rag            : Chunki JSONL dla wyszukiwania (RAG)
+  - project_brief  : Brief projektowy (PROJECT_BRIEF_[Nazwa].md)
         """
     )
     
@@ -88,15 +148,18 @@ Dostępne destinacje:
     # Output
     parser.add_argument('-o', '--output', default='data/output',
                        help='Katalog wyjściowy (domyślnie: data/output)')
+    parser.add_argument('--archive', metavar='PLIK',
+                       help='Zapisz wynik jako archiwum (.zip, .tar.gz, .tgz, .tar) zamiast katalogu; '
+                            '"-" = tar na stdout')
     
     # Destinacja
-    parser.add_argument('-d', '--destination', 
-                       choices=['github', 'chatgpt', 'project_brief'],
-                       help='Typ destinacji')
+    parser.add_argument('-d', '--destination', type=parse_destinations,
+                       metavar='{' + ','.join(DESTINATIONS) + '}[,...]',
+                       help='Typ destinacji (kilka rozdzielonych przecinkami)')
     
     # Format
     parser.add_argument('-f', '--format',
-                       choices=['txt', 'md', 'json', 'doc', 'php', 'clipboard'],
+                       choices=['txt', 'md', 'json', 'csv', 'tsv', 'doc', 'php', 'html', 'xml', 'clipboard'],
                        help='Format wejściowy (opcjonalnie, auto-detect)')
     
     # Opcje
@@ -104,8 +167,13 @@ Dostępne destinacje:
                        help='Tylko wykryj format i zakończ')
     parser.add_argument('--preview', action='store_true',
                        help='Tylko podgląd, nie generuj plików')
+    parser.add_argument('--tree-limit', type=int, default=200, metavar='N',
+                       help='Maks. liczba wpisów katalogu w drzewie i plików w podglądzie '
+                            '(domyślnie: 200, 0 = bez limitu)')
     parser.add_argument('--project-name',
                        help='Nazwa projektu (dla katalogu wyjściowego)')
+    parser.add_argument('--force', action='store_true',
+                       help='Generuj od nowa, nawet gdy manifest projektu jest aktualny')
     
     # Metadata
     parser.add_argument('--author', help='Autor projektu')
@@ -115,39 +183,115 @@ Dostępne destinacje:
     # Debugging
     parser.add_argument('-v', '--verbose', action='store_true',
                        help='Tryb verbose')
+    parser.add_argument('--version', action='version', version=f'%(prog)s {__version__}')
     
     args = parser.parse_args()
     
+    # --archive -: stdout zajmuje archiwum, wszystkie komunikaty idą na stderr
+    stdout = sys.stdout
+    archive_stdout = None
+    if args.archive == '-':
+        if sys.stdout.isatty():
+            print("❌ Błąd: Archiwum nie zostanie zapisane do terminala (przekieruj stdout)", file=sys.stderr)
+            return 1
+        archive_stdout = sys.stdout.buffer
+        sys.stdout = sys.stderr
+    
     try:
-        # 1. LOAD INPUT
-        if args.verbose:
-            print("📥 Ładowanie danych wejściowych...")
-        
-        content, format_hint = load_input(args.input, args.stdin)
+        if args.archive and archive_stdout is None:
+            # Moduł archiwów (tarfile, zipfile) importowany tylko z --archive
+            from src.generators.archive import archive_format_for
+            archive_format_for(args.archive)
         
-        # Override format hint jeśli podano
-        if args.format:
-            format_hint = args.format
+        file_input = args.input if args.input and args.input != '-' else None
+        destinations = args.destination or []
+        multiple = len(destinations) > 1
         
-        if args.verbose:
-            print(f"   Rozmiar: {len(content)} znaków")
-        
-        # 2. DETECT FORMAT
-        detected_format, confidence = detect_format(content)
+        # Metadata dla transformera
+        metadata = {
+            'project_name': args.project_name or 'my-project',
+            'author': args.author or 'Unknown',
+            'description': args.description or 'Project description',
+            'license': args.license
+        }
         
-        if args.detect:
-            print(f"Wykryty format: {detected_format}")
-            print(f"Pewność: {confidence:.2%}")
-            return 0
+        # 0. MANIFEST - aktualne projekty pomijane bez wczytywania wejścia
+        generator = FileGenerator(args.output)
+        source = None
+        config_hashes = {}
+        if file_input and destinations and not (args.detect or args.preview or args.archive):
+            if not Path(file_input).exists():
+                raise FileNotFoundError(f"Plik nie istnieje: {file_input}")
+            source = InputFile(file_input)
+            # Wersja programu i szablony destinacji też decydują o wyniku
+            config_hashes = {
+                dest: source_hash(__version__, dest, args.format, metadata, template_dir_fingerprint(dest))
+                for dest in destinations
+            }
+            if not args.force:
+                current = [
+                    dest for dest in destinations
+                    if generator.is_up_to_date(output_name(dest, args.project_name, multiple), config_hashes[dest], source)
+                ]
+                for dest in current:
+                    print(f"✅ Bez zmian: {Path(args.output) / output_name(dest, args.project_name, multiple)}")
+                destinations = [dest for dest in destinations if dest not in current]
+                if not destinations:
+                    return 0
+            # Hash wejścia przed wczytaniem - zmiana pliku w trakcie przebiegu wymusi kolejny
+            source.hash
         
+        # 1. LOAD INPUT
         if args.verbose:
-            print(f"🔍 Wykryty format: {detected_format} (pewność: {confidence:.2%})")
+            print("📥 Ładowanie danych wejściowych...")
         
-        # 3. PARSE
-        if args.verbose:
-            print("📖 Parsowanie danych...")
+        stream_format = args.format or (format_from_path(file_input) if file_input else None)
         
-        parsed = parse_content(content, format_hint or detected_format)
+        if file_input and stream_format in STREAMED_FORMATS:
+            # Duże pliki tabelaryczne, DOCX i HTML/XML parsujemy prosto z pliku - bez load_input()
+            if not Path(file_input).exists():
+                raise FileNotFoundError(f"Plik nie istnieje: {file_input}")
+            
+            if args.verbose:
+                print(f"   Rozmiar: {Path(file_input).stat().st_size} bajtów")
+            
+            detected_format, confidence = stream_format, 1.0
+            
+            if args.detect:
+                print(f"Wykryty format: {detected_format}")
+                print(f"Pewność: {confidence:.2%}")
+                return 0
+            
+            if args.verbose:
+                print("📖 Parsowanie danych (strumieniowo)...")
+            
+            parsed = parse_file(file_input, stream_format)
+        else:
+            content, format_hint = load_input(args.input, args.stdin)
+            
+            # Override format hint jeśli podano
+            if args.format:
+                format_hint = args.format
+            
+            if args.verbose:
+                print(f"   Rozmiar: {len(content)} znaków")
+            
+            # 2. DETECT FORMAT
+            detected_format, confidence = detect_format(content)
+            
+            if args.detect:
+                print(f"Wykryty format: {detected_format}")
+                print(f"Pewność: {confidence:.2%}")
+                return 0
+            
+            if args.verbose:
+                print(f"🔍 Wykryty format: {detected_format} (pewność: {confidence:.2%})")
+            
+            # 3. PARSE
+            if args.verbose:
+                print("📖 Parsowanie danych...")
+            
+            parsed = parse_content(content, format_hint or detected_format)
         
         if parsed.errors:
             print("⚠️  Ostrzeżenia podczas parsowania:")
@@ -160,64 +304,102 @@ Dostępne destinacje:
             print(f"   Bloki kodu: {len(parsed.code_blocks) if parsed.code_blocks else 0}")
         
         # Sprawdź czy podano destinację
-        if not args.destination:
+        if not destinations:
             print("❌ Błąd: Musisz podać destinację (-d/--destination)")
-            print("   Dostępne: github, chatgpt, project_brief")
+            print(f"   Dostępne: {', '.join(DESTINATIONS)}")
             return 1
         
         # 4. TRANSFORM
         if args.verbose:
-            print(f"🔄 Transformacja do: {args.destination}")
+            print(f"🔄 Transformacja do: {', '.join(destinations)}")
         
-        # Metadata dla transformera
-        metadata = {
-            'project_name': args.project_name or 'my-project',
-            'author': args.author or 'Unknown',
-            'description': args.description or 'Project description',
-            'license': args.license
-        }
-        
-        transformed = transform_data(args.destination, parsed, metadata=metadata)
+        # Jedno parsowanie, transformery uruchamiane równolegle
+        results = transform_many(destinations, parsed, metadata=metadata)
         
-        if transformed.errors:
-            print("❌ Błędy podczas transformacji:")
-            for error in transformed.errors:
+        failed = [dest for dest, transformed in results.items() if transformed.errors]
+        for dest in failed:
+            print(f"❌ Błędy podczas transformacji ({dest}):" if multiple else "❌ Błędy podczas transformacji:")
+            for error in results[dest].errors:
                 print(f"   - {error}")
+        if len(failed) == len(results):
             return 1
         
-        if args.verbose:
-            print(f"   Pliki do wygenerowania: {len(transformed.files)}")
-        
         # 5. GENERATE lub PREVIEW
-        generator = FileGenerator(args.output)
+        tree_limit = args.tree_limit if args.tree_limit > 0 else None
+        archive_projects = {}
         
-        if args.preview:
-            # Tylko podgląd
-            print("\n" + "=" * 70)
-            print(generator.preview(transformed))
-            print("=" * 70)
-            print("\n📁 Struktura plików:")
-            print(generator.get_file_tree(transformed))
-        else:
-            # Generuj pliki
-            if args.verbose:
-                print(f"💾 Generowanie plików w: {args.output}")
-            
-            project_name = args.project_name or f"{args.destination}_output"
-            generated = generator.generate(transformed, project_name)
+        for dest, transformed in results.items():
+            if transformed.errors:
+                continue
             
-            print(f"\n✅ Wygenerowano {len(generated)} plików:")
-            for rel_path, abs_path in generated.items():
-                print(f"   ✓ {rel_path}")
-            
-            print(f"\n📂 Lokalizacja: {Path(args.output).absolute() / project_name}")
+            if args.verbose:
+                print(f"   Pliki do wygenerowania ({dest}): {len(transformed.files)}")
             
+            if args.preview:
+                # Tylko podgląd
+                print("\n" + "=" * 70)
+                print(generator.preview(transformed, max_files=tree_limit))
+                print("=" * 70)
+                print("\n📁 Struktura plików:")
+                print(generator.get_file_tree(transformed, max_entries=tree_limit, collapse=True))
+            elif args.archive:
+                # Do archiwum - katalog projektu jako katalog w archiwum
+                archive_projects[output_name(dest, args.project_name, multiple)] = transformed
+            else:
+                # Generuj pliki
+                project_name = output_name(dest, args.project_name, multiple)
+                if args.verbose:
+                    print(f"💾 Generowanie plików w: {Path(args.output) / project_name}")
+                
+                run = {'config_hash': config_hashes[dest], 'input': source.record()} if source else None
+                report = generator.generate_with_report(transformed, project_name,
+                                                        incremental=not args.force, run=run)
+                
+                skipped = f" (pominięte bez zmian: {len(report.skipped)})" if report.skipped else ""
+                print(f"\n✅ Zapisano {len(report.written)} plików{skipped}:")
+                for rel_path in report.written:
+                    print(f"   ✓ {rel_path}")
+                for rel_path in report.removed:
+                    print(f"   ✗ {rel_path} (nieaktualny, usunięty)")
+                if report.failed:
+                    print(f"\n❌ Nie zapisano {len(report.failed)} plików:")
+                    for rel_path, error in report.failed.items():
+                        print(f"   - {rel_path}: {error}")
+                    failed.append(dest)
+                
+                print(f"\n📂 Lokalizacja: {Path(args.output).absolute() / project_name}")
+                
+                if args.verbose:
+                    print("\n📁 Struktura:")
+                    print(generator.get_file_tree(transformed, max_entries=tree_limit, collapse=True))
+        
+        if archive_projects:
             if args.verbose:
-                print("\n📁 Struktura:")
-                print(generator.get_file_tree(transformed))
+                print(f"📦 Zapisywanie archiwum: {args.archive}")
+            if archive_stdout is not None:
+                try:
+                    count = generator.write_archive(archive_projects, archive_stdout, 'tar')
+                    archive_stdout.flush()
+                except BrokenPipeError:
+                    # Odbiorca potoku (np. head) zamknął stdout przed końcem archiwum
+                    os.dup2(os.open(os.devnull, os.O_WRONLY), stdout.fileno())
+                    print("❌ Błąd: Potok zamknięty przed końcem archiwum", file=sys.stderr)
+                    return 1
+                print(f"\n✅ Zapisano archiwum tar na stdout ({count} plików)")
+            else:
+                count = generator.save_archive(archive_projects, args.archive)
+                print(f"\n✅ Zapisano archiwum ({count} plików): {Path(args.archive).absolute()}")
+        
+        if failed:
+            return 1
         
         return 0
         
+    except BrokenPipeError:
+        # Odbiorca potoku (np. --detect | head -1) zamknął stdout - bez komunikatu,
+        # a stdout przekierowany, żeby zamknięcie interpretera nie zgłosiło błędu
+        os.dup2(os.open(os.devnull, os.O_WRONLY), stdout.fileno())
+        return 1
     except FileNotFoundError as e:
         print(f"❌ Błąd: {e}")
         return 1
@@ -230,6 +412,8 @@ Dostępne destinacje:
             import traceback
             traceback.print_exc()
         return 1
+    finally:
+        sys.stdout = stdout
 
 
 if __name__ == '__main__':
@@ -0,0 +1,347 @@
+#!/usr/bin/env python3
+"""
+Budowa modelu klasyfikatora języków (src/transformers/resources/language_weights.json)
+
+Trenuje naiwny klasyfikator Bayesa na lokalnym korpusie kodu. Cechy plików
+liczone są tą samą funkcją co w LanguageClassifier (extract_features). Dla każdego języka
+zachowywane są jego najczęstsze cechy; model zapisuje dla nich logarytmy
+prawdopodobieństw (wygładzanie Laplace'a) jako przyrost ponad próg języka,
+tylko tam gdzie przyrost jest istotny - wiersze są rzadkie.
+
+Źródła --fenced dostarczają bloki kodu z etykietą języka z plików Markdown
+(README pakietów) - najbliższe temu, co klasyfikator dostaje na wejściu.
+Języki bez lokalnego korpusu (sql, php, java) uczone są dodatkowo na
+próbkach wbudowanych w skrypt (SEED_CORPUS).
+
+Użycie (model w repo zbudowano na źródłach dostępnych lokalnie):
+    python scripts/build_language_model.py \\
+        --source python=/usr/lib/python3.11 --source javascript=<node_modules>/npm \\
+        --source typescript=<node_modules> --source go=/usr/local/go/src \\
+        --source c=/usr/include --source cpp=/usr/include/boost/geometry \\
+        --source php=config/inputs/PHP.md --source text=/usr/share/doc --source text=config \\
+        --fenced <node_modules> --fenced ~/.cargo/registry/src --fenced /usr/share/doc
+"""
+
+import argparse
+import json
+import math
+import re
+import sys
+from collections import Counter
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from src.transformers.language import WEIGHTS_PATH, extract_features, normalize_language
+
+
+# Blok kodu Markdown: etykieta języka i treść
+FENCE_RE = re.compile(r'^```[ \t]*([\w+#.-]*)[^\n]*\n(.*?)^```[ \t]*$', re.MULTILINE | re.DOTALL)
+
+# Rozszerzenia plików uznawane za dany język (None - pliki bez rozszerzenia)
+LANGUAGE_SUFFIXES = {
+    'python': {'.py'},
+    'javascript': {'.js', '.mjs', '.cjs'},
+    'typescript': {'.ts'},
+    'bash': {'.sh', '.bash'},
+    'json': {'.json'},
+    'html': {'.html', '.htm'},
+    'css': {'.css'},
+    'xml': {'.xml', '.xsd', '.xsl'},
+    'yaml': {'.yml', '.yaml'},
+    'toml': {'.toml'},
+    'ini': {'.ini', '.cfg', '.conf'},
+    'c': {'.c', '.h'},
+    'cpp': {'.cc', '.cpp', '.hpp', '.cxx'},
+    'go': {'.go'},
+    'rust': {'.rs'},
+    'ruby': {'.rb'},
+    'perl': {'.pl', '.pm'},
+    'java': {'.java'},
+    'php': {'.php', '.md'},
+    'sql': {'.sql'},
+    'text': {None, '.txt', '.md'}
+}
+
+SEED_CORPUS = {
+    'sql': '''
+CREATE TABLE users (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    email VARCHAR(255) NOT NULL UNIQUE,
+    name TEXT,
+    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+);
+
+CREATE INDEX idx_users_email ON users (email);
+
+INSERT INTO users (email, name) VALUES ('jan@example.com', 'Jan');
+INSERT INTO orders (user_id, total) VALUES (1, 99.90), (2, 15.00);
+
+SELECT u.id, u.name, COUNT(o.id) AS order_count
+FROM users u
+LEFT JOIN orders o ON o.user_id = u.id
+WHERE u.created_at >= '2024-01-01'
+GROUP BY u.id, u.name
+HAVING COUNT(o.id) > 3
+ORDER BY order_count DESC
+LIMIT 10;
+
+UPDATE users SET name = 'Anna' WHERE id = 2;
+DELETE FROM sessions WHERE expires_at < NOW();
+
+ALTER TABLE orders ADD COLUMN status VARCHAR(20) DEFAULT 'new';
+DROP TABLE IF EXISTS tmp_import;
+
+select name, price from products where price between 10 and 20 order by price;
+select * from logs where level = 'error' and created_at > now() - interval '1 day';
+
+CREATE VIEW active_users AS
+SELECT id, email FROM users WHERE deleted_at IS NULL;
+
+BEGIN TRANSACTION;
+UPDATE accounts SET balance = balance - 100 WHERE id = 1;
+UPDATE accounts SET balance = balance + 100 WHERE id = 2;
+COMMIT;
+
+CREATE TABLE order_items (
+    order_id INT NOT NULL REFERENCES orders(id) ON DELETE CASCADE,
+    product_id INT NOT NULL,
+    quantity INT NOT NULL CHECK (quantity > 0),
+    PRIMARY KEY (order_id, product_id)
+);
+
+SELECT DISTINCT category FROM products WHERE id IN (SELECT product_id FROM order_items);
+WITH recent AS (SELECT * FROM orders WHERE created_at > '2024-06-01')
+SELECT user_id, SUM(total) FROM recent GROUP BY user_id;
+''',
+    'php': '''
+<?php
+
+namespace App\\Http\\Controllers;
+
+use App\\Models\\User;
+use Illuminate\\Http\\Request;
+
+class UserController extends Controller
+{
+    private $repository;
+
+    public function __construct(UserRepository $repository)
+    {
+        $this->repository = $repository;
+    }
+
+    public function index(Request $request)
+    {
+        $users = $this->repository->paginate($request->input('per_page', 15));
+        return view('users.index', ['users' => $users]);
+    }
+
+    public function store(Request $request): JsonResponse
+    {
+        $data = $request->validate([
+            'email' => 'required|email',
+            'name' => 'required|string|max:255',
+        ]);
+        $user = User::create($data);
+        return response()->json($user, 201);
+    }
+}
+
+function connect(array $config): PDO
+{
+    $dsn = "mysql:host={$config['host']};dbname={$config['name']}";
+    return new PDO($dsn, $config['user'], $config['password']);
+}
+
+$items = array_map(fn($item) => $item['price'] * 2, $items);
+foreach ($items as $key => $value) {
+    echo "$key: $value\\n";
+}
+
+if (isset($_GET['id']) && !empty($_POST['name'])) {
+    $id = (int) $_GET['id'];
+    $stmt = $pdo->prepare('SELECT * FROM users WHERE id = ?');
+    $stmt->execute([$id]);
+    $row = $stmt->fetch(PDO::FETCH_ASSOC);
+}
+?>
+''',
+    'java': '''
+package com.example.app;
+
+import java.util.ArrayList;
+import java.util.List;
+import java.util.Map;
+
+public class UserService {
+    private final UserRepository repository;
+    private static final int MAX_USERS = 100;
+
+    public UserService(UserRepository repository) {
+        this.repository = repository;
+    }
+
+    public List<User> findActive() {
+        List<User> result = new ArrayList<>();
+        for (User user : repository.findAll()) {
+            if (user.isActive()) {
+                result.add(user);
+            }
+        }
+        return result;
+    }
+
+    @Override
+    public String toString() {
+        return "UserService{" + repository + "}";
+    }
+
+    public static void main(String[] args) {
+        System.out.println("Hello, World!");
+        Map<String, Integer> counts = new HashMap<>();
+        counts.put("a", 1);
+        try {
+            Thread.sleep(1000);
+        } catch (InterruptedException e) {
+            throw new RuntimeException(e);
+        }
+    }
+}
+
+public interface Repository<T> {
+    Optional<T> findById(long id);
+    void save(T entity);
+}
+
+@RestController
+@RequestMapping("/api/users")
+public class UserController {
+    @Autowired
+    private UserService service;
+
+    @GetMapping("/{id}")
+    public ResponseEntity<User> get(@PathVariable Long id) {
+        return service.find(id).map(ResponseEntity::ok).orElse(ResponseEntity.notFound().build());
+    }
+}
+'''
+}
+
+
+def sample_files(root: Path, suffixes: set, max_files: int) -> list:
+    """Pliki źródła o danych rozszerzeniach, rozłożone równomiernie po drzewie"""
+    if root.is_file():
+        return [root]
+    files = []
+    for path in sorted(root.rglob('*')):
+        suffix = path.suffix or None
+        if suffix not in suffixes or path.name.endswith('.d.ts') or '.min.' in path.name:
+            continue
+        if path.is_file() and not path.is_symlink():
+            files.append(path)
+    if len(files) > max_files:
+        step = len(files) / max_files
+        files = [files[int(i * step)] for i in range(max_files)]
+    return files
+
+
+def read_text(path: Path, max_chars: int) -> str:
+    """Początek pliku bez zminifikowanych (bardzo długich) linii"""
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            text = f.read(max_chars)
+    except (UnicodeDecodeError, OSError):
+        return ''
+    return '\n'.join(line for line in text.splitlines() if len(line) < 400)
+
+
+def fenced_blocks(text: str):
+    """Bloki kodu z etykietą języka z tekstu Markdown: (język kanoniczny, kod)"""
+    for match in FENCE_RE.finditer(text):
+        yield normalize_language(match.group(1)), match.group(2)
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Buduje model LanguageClassifier')
+    parser.add_argument('--source', action='append', default=[], help='język=plik lub katalog korpusu')
+    parser.add_argument('--fenced', action='append', default=[],
+                        help='Katalog z plikami Markdown - bloki kodu z etykietą języka')
+    parser.add_argument('--max-files', type=int, default=400, help='Limit plików na źródło')
+    parser.add_argument('--max-chars', type=int, default=20000, help='Limit znaków na plik')
+    parser.add_argument('--features-per-language', type=int, default=600, help='Cechy zachowane dla języka')
+    parser.add_argument('--min-delta', type=float, default=0.5, help='Pomiń przyrosty log p mniejsze niż to')
+    parser.add_argument('--seed-weight', type=int, default=20, help='Krotność próbek SEED_CORPUS')
+    parser.add_argument('--fenced-weight', type=int, default=3, help='Krotność bloków z plików Markdown')
+    parser.add_argument('--out', default=str(WEIGHTS_PATH), help='Plik wyjściowy')
+    args = parser.parse_args()
+
+    counts = {language: Counter() for language in LANGUAGE_SUFFIXES}
+
+    def add(language: str, text: str, weight: int = 1):
+        for feature, count in extract_features(text).items():
+            counts[language][feature] += count * weight
+
+    for language, text in SEED_CORPUS.items():
+        add(language, text, args.seed_weight)
+
+    for source in args.source:
+        language, _, location = source.partition('=')
+        if language not in LANGUAGE_SUFFIXES:
+            parser.error(f"nieznany język: {language}")
+        files = sample_files(Path(location), LANGUAGE_SUFFIXES[language], args.max_files)
+        for path in files:
+            text = read_text(path, args.max_chars)
+            if path.suffix == '.md':
+                # Z Markdown: dla języka 'text' - tekst poza blokami kodu, dla pozostałych - bloki kodu
+                parts = FENCE_RE.split(text)
+                text = '\n'.join(parts[0::3] if language == 'text' else parts[2::3])
+            add(language, text)
+        print(f"{language:<12} {location}: {len(files)} plików")
+
+    # Bloki kodu z dokumentacji - najbliższe temu, co klasyfikator dostaje na wejściu
+    for location in args.fenced:
+        blocks = Counter()
+        for path in sample_files(Path(location), {'.md'}, args.max_files * 10):
+            for language, code in fenced_blocks(read_text(path, args.max_chars)):
+                if language in counts and language != 'text':
+                    add(language, code, args.fenced_weight)
+                    blocks[language] += 1
+        print(f"{'(fenced)':<12} {location}: {dict(blocks.most_common())}")
+
+    languages = [language for language in LANGUAGE_SUFFIXES if counts[language]]
+
+    # Słownik: najczęstsze cechy każdego języka
+    vocabulary = set()
+    for language in languages:
+        vocabulary.update(feature for feature, _ in counts[language].most_common(args.features_per_language))
+    vocabulary = sorted(vocabulary)
+    size = len(vocabulary)
+
+    floors = []
+    weights = {feature: [] for feature in vocabulary}
+    for index, language in enumerate(languages):
+        language_counts = counts[language]
+        total = sum(language_counts[feature] for feature in vocabulary)
+        floor = math.log(1 / (total + size))
+        floors.append(round(floor, 3))
+        for feature in vocabulary:
+            delta = math.log((language_counts[feature] + 1) / (total + size)) - floor
+            if delta >= args.min_delta:
+                weights[feature].append([index, round(delta, 2)])
+
+    model = {
+        'languages': languages,
+        'priors': [0.0] * len(languages),
+        'floors': floors,
+        'weights': {feature: row for feature, row in weights.items() if row}
+    }
+    out = Path(args.out)
+    out.parent.mkdir(parents=True, exist_ok=True)
+    with open(out, 'w', encoding='utf-8') as f:
+        json.dump(model, f, ensure_ascii=False, separators=(',', ':'), sort_keys=True)
+    print(f"Zapisano {len(languages)} języków, {len(model['weights'])} cech do {out}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,154 @@
+#!/usr/bin/env python3
+"""
+Budowa słownika BPE dla licznika tokenów (src/transformers/resources/token_vocab.bpe)
+
+Trenuje bajtowy BPE na lokalnym korpusie: kod i dokumentacja (angielski),
+teksty polskie (Markdown, pliki .mo z tłumaczeniami). Korpus jest dzielony
+tym samym pre-tokenizerem co TokenCounter, więc scalenia nigdy nie
+przekraczają granic pre-tokenów.
+
+Użycie:
+    python scripts/build_token_vocab.py --merges 30000 \\
+        --source /usr/lib/python3.11/pydoc_data --source /usr/lib/python3.11 \\
+        --source /usr/share/common-licenses --source README.md --source config \\
+        --source /usr/share/locale/pl/LC_MESSAGES --weight-pl 4
+"""
+
+import argparse
+import base64
+import gettext
+import heapq
+import sys
+from collections import Counter
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from src.transformers.tokenizer import PRETOKEN_RE, VOCAB_PATH
+
+
+TEXT_SUFFIXES = {'', '.py', '.md', '.txt', '.rst', '.json', '.html', '.js', '.css', '.php'}
+
+
+def iter_texts(source: Path, max_bytes: int):
+    """Zwraca (tekst, czy_ważony) dla plików źródła - łącznie do max_bytes"""
+    files = [source] if source.is_file() else sorted(p for p in source.rglob('*') if p.is_file())
+    used = 0
+    for path in files:
+        if used >= max_bytes:
+            break
+        if path.suffix == '.mo':
+            try:
+                with open(path, 'rb') as f:
+                    catalog = gettext.GNUTranslations(f)._catalog
+            except Exception:
+                continue
+            # Klucze to oryginały angielskie, wartości - tłumaczenia polskie
+            text = '\n'.join(
+                part for item in catalog.items() for part in item if isinstance(part, str)
+            )
+            used += len(text)
+            yield text, True
+        elif path.suffix in TEXT_SUFFIXES and 'test' not in path.parts:
+            try:
+                text = path.read_text(encoding='utf-8')
+            except (UnicodeDecodeError, OSError):
+                continue
+            used += len(text)
+            yield text, path.suffix == '.md'
+
+
+def train(words: Counter, merges: int):
+    """Trenuje BPE na słowniku {pre-token (bytes): częstość}; zwraca listę tokenów wg rang"""
+    vocab = [bytes([i]) for i in range(256)]
+    seqs = [list(word) for word in words]
+    freqs = list(words.values())
+
+    pair_counts = Counter()
+    where = {}
+    for idx, seq in enumerate(seqs):
+        for pair in zip(seq, seq[1:]):
+            pair_counts[pair] += freqs[idx]
+            where.setdefault(pair, set()).add(idx)
+
+    heap = [(-count, pair) for pair, count in pair_counts.items()]
+    heapq.heapify(heap)
+
+    while len(vocab) < 256 + merges and heap:
+        neg_count, pair = heapq.heappop(heap)
+        actual = pair_counts.get(pair, 0)
+        if actual <= 0:
+            continue
+        if -neg_count != actual:
+            heapq.heappush(heap, (-actual, pair))
+            continue
+        if actual < 2:
+            break
+
+        new_id = len(vocab)
+        vocab.append(vocab[pair[0]] + vocab[pair[1]])
+        a, b = pair
+        touched = Counter()
+
+        for idx in where.pop(pair, ()):
+            seq = seqs[idx]
+            freq = freqs[idx]
+            for old in zip(seq, seq[1:]):
+                pair_counts[old] -= freq
+            merged = []
+            i = 0
+            while i < len(seq):
+                if i < len(seq) - 1 and seq[i] == a and seq[i + 1] == b:
+                    merged.append(new_id)
+                    i += 2
+                else:
+                    merged.append(seq[i])
+                    i += 1
+            seqs[idx] = merged
+            for new in zip(merged, merged[1:]):
+                pair_counts[new] += freq
+                where.setdefault(new, set()).add(idx)
+                if new_id in new:
+                    touched[new] = pair_counts[new]
+
+        pair_counts.pop(pair, None)
+        for new, count in touched.items():
+            heapq.heappush(heap, (-pair_counts[new], new))
+
+    return vocab
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Buduje słownik BPE dla TokenCounter')
+    parser.add_argument('--source', action='append', required=True, help='Plik lub katalog korpusu')
+    parser.add_argument('--merges', type=int, default=30000, help='Liczba scaleń BPE')
+    parser.add_argument('--max-bytes', type=int, default=12 * 1024 * 1024, help='Limit korpusu na źródło')
+    parser.add_argument('--weight-pl', type=int, default=4, help='Waga tekstów z plików .mo/.md')
+    parser.add_argument('--min-count', type=int, default=2, help='Pomiń pre-tokeny rzadsze niż to')
+    parser.add_argument('--out', default=str(VOCAB_PATH), help='Plik wyjściowy')
+    args = parser.parse_args()
+
+    words = Counter()
+    for source in args.source:
+        for text, weighted in iter_texts(Path(source), args.max_bytes):
+            weight = args.weight_pl if weighted else 1
+            for piece in PRETOKEN_RE.findall(text):
+                words[piece] += weight
+
+    encoded = Counter()
+    for piece, count in words.items():
+        if count >= args.min_count:
+            encoded[piece.encode('utf-8', 'surrogatepass')] += count
+    print(f"Pre-tokeny: {len(words)} unikalnych, {len(encoded)} po odcięciu rzadkich")
+
+    vocab = train(encoded, args.merges)
+    out = Path(args.out)
+    out.parent.mkdir(parents=True, exist_ok=True)
+    with open(out, 'w', encoding='ascii') as f:
+        for rank, token in enumerate(vocab):
+            f.write(f"{base64.b64encode(token).decode('ascii')} {rank}\n")
+    print(f"Zapisano {len(vocab)} tokenów do {out}")
+
+
+if __name__ == '__main__':
+    main()
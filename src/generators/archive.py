@@ -0,0 +1,136 @@
+"""
+Archive Sink - Zapis wyniku transformacji prosto do archiwum (zip, tar, tar.gz)
+
+Pliki z TransformedData trafiają do archiwum jeden po drugim, bez tworzenia
+drzewa katalogów na dysku. Archiwum może być zapisywane do dowolnego
+strumienia binarnego - pliku, sys.stdout.buffer (tar do potoku) albo bufora
+ChunkBuffer, z którego odpowiedź HTTP oddaje kolejne fragmenty.
+
+Pliki strumieniowe (StreamedFile) w zip są kompresowane fragment po
+fragmencie; tar wymaga rozmiaru w nagłówku, więc plik strumieniowy jest
+najpierw składany w SpooledTemporaryFile (w pamięci, a dopiero powyżej
+limitu - w pliku tymczasowym).
+"""
+
+import io
+import tarfile
+import tempfile
+import time
+import zipfile
+from typing import BinaryIO, Iterator, List
+
+from ..transformers.base_transformer import FileContent
+
+
+ARCHIVE_FORMATS = ('zip', 'tar.gz', 'tar')
+
+# Rozszerzenie pliku -> format archiwum
+ARCHIVE_SUFFIXES = {'.zip': 'zip', '.tar.gz': 'tar.gz', '.tgz': 'tar.gz', '.tar': 'tar'}
+
+MIME_TYPES = {'zip': 'application/zip', 'tar.gz': 'application/gzip', 'tar': 'application/x-tar'}
+
+SPOOL_SIZE = 8 * 1024 * 1024    # Plik strumieniowy dla tar - do tej wielkości składany w pamięci
+FILE_MODE = 0o644
+
+
+def archive_format_for(path: str) -> str:
+    """Format archiwum z rozszerzenia pliku (.zip, .tar.gz/.tgz, .tar)"""
+    name = str(path).lower()
+    for suffix, archive_format in ARCHIVE_SUFFIXES.items():
+        if name.endswith(suffix):
+            return archive_format
+    raise ValueError(f"Nieznany format archiwum: {path} (obsługiwane: .zip, .tar.gz, .tgz, .tar)")
+
+
+def _encoded(content: FileContent) -> Iterator[bytes]:
+    if isinstance(content, str):
+        yield content.encode('utf-8')
+    else:
+        for chunk in content:
+            yield chunk.encode('utf-8')
+
+
+class ChunkBuffer(io.RawIOBase):
+    """Strumień tylko do zapisu, z którego zapisane bajty odbiera się porcjami (drain)"""
+
+    def __init__(self):
+        super().__init__()
+        self._chunks: List[bytes] = []
+
+    def writable(self) -> bool:
+        return True
+
+    def write(self, data) -> int:
+        if data:
+            self._chunks.append(bytes(data))
+        return len(data)
+
+    def drain(self) -> bytes:
+        """Zwraca i usuwa bajty zapisane od ostatniego wywołania"""
+        data = b''.join(self._chunks)
+        self._chunks.clear()
+        return data
+
+
+class ArchiveWriter:
+    """
+    Zapisuje pliki do archiwum w strumieniu `target` (zip, tar lub tar.gz).
+
+    Strumień nie musi obsługiwać seek() - zip używa wtedy deskryptorów danych,
+    a tar trybu strumieniowego ('w|', 'w|gz').
+    """
+
+    def __init__(self, target: BinaryIO, archive_format: str = 'zip', compresslevel: int = 6):
+        """compresslevel dotyczy zip (deflate)"""
+        if archive_format not in ARCHIVE_FORMATS:
+            raise ValueError(f"Nieznany format archiwum: {archive_format} (dostępne: {', '.join(ARCHIVE_FORMATS)})")
+        self.archive_format = archive_format
+        self.files = 0
+        self._mtime = time.time()
+        if archive_format == 'zip':
+            self._zip = zipfile.ZipFile(target, 'w', compression=zipfile.ZIP_DEFLATED, compresslevel=compresslevel)
+            self._tar = None
+        else:
+            mode = 'w|gz' if archive_format == 'tar.gz' else 'w|'
+            # Tryb strumieniowy 'w|gz' nie przyjmuje compresslevel (gzip zawsze z poziomem 9)
+            self._tar = tarfile.open(fileobj=target, mode=mode, format=tarfile.PAX_FORMAT)
+            self._zip = None
+
+    def add(self, path: str, content: FileContent):
+        """Dodaje plik (treść lub StreamedFile) pod ścieżką `path` w archiwum"""
+        if self._zip is not None:
+            info = zipfile.ZipInfo(path, date_time=time.localtime(self._mtime)[:6])
+            info.compress_type = zipfile.ZIP_DEFLATED
+            info.external_attr = FILE_MODE << 16
+            with self._zip.open(info, 'w') as f:
+                for data in _encoded(content):
+                    f.write(data)
+        else:
+            info = tarfile.TarInfo(path)
+            info.mtime = int(self._mtime)
+            info.mode = FILE_MODE
+            if isinstance(content, str):
+                data = content.encode('utf-8')
+                info.size = len(data)
+                self._tar.addfile(info, io.BytesIO(data))
+            else:
+                with tempfile.SpooledTemporaryFile(max_size=SPOOL_SIZE) as spool:
+                    for data in _encoded(content):
+                        spool.write(data)
+                    info.size = spool.tell()
+                    spool.seek(0)
+                    self._tar.addfile(info, spool)
+        self.files += 1
+
+    def close(self):
+        """Zamyka archiwum (zapisuje katalog zip / końcowe bloki tar); strumień docelowy pozostaje otwarty"""
+        if self._zip is not None:
+            self._zip.close()
+        else:
+            self._tar.close()
+
+    def __enter__(self) -> 'ArchiveWriter':
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
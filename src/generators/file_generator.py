@@ -1,23 +1,151 @@
 """
 File Generator
 Generuje pliki fizyczne z przetransformowanych danych
+
+Regeneracja przyrostowa: w katalogu projektu zapisywany jest manifest
+(.drdoc_manifest.json) z hashami źródeł każdego pliku (TransformedData.sources).
+Przy kolejnym przebiegu plik o niezmienionym hashu, który nadal istnieje na
+dysku, nie jest renderowany ani zapisywany, a pliki z poprzedniego przebiegu,
+których nie ma w wyniku (np. po zmianie nagłówka), są usuwane.
+
+Zapis: wszystkie katalogi tworzone są raz, przed zapisem plików, a same pliki
+zapisywane równolegle przez ograniczoną pulę wątków (przy tysiącach plików
+i systemach plików sieciowych czas zapisu zależy głównie od opóźnień).
+Błąd zapisu jednego pliku trafia do raportu i nie przerywa pozostałych.
+
+Plik identyczny z istniejącym (najpierw porównanie rozmiaru, hash dopiero
+przy zgodnym rozmiarze) nie jest nadpisywany - czas modyfikacji się nie
+zmienia. Zmienione pliki zapisywane są do pliku tymczasowego w tym samym
+katalogu i podmieniane przez os.replace(), więc przerwany zapis nigdy nie
+zostawia uciętego pliku.
+
+Manifest zapamiętuje też cały przebieg: wersję narzędzia, hash konfiguracji,
+plik wejściowy (rozmiar, czas modyfikacji, hash treści) oraz hash, rozmiar
+i czas modyfikacji każdego pliku wyjściowego. is_up_to_date() sprawdza go
+najpierw samym stat() - hash wejścia liczony jest tylko, gdy zmienił się czas
+modyfikacji - więc niezmienione wejście nie jest nawet wczytywane.
+
+Zamiast drzewa katalogów wynik można zapisać jako archiwum (zip, tar,
+tar.gz) - do pliku, na stdout albo jako strumień fragmentów dla odpowiedzi
+HTTP (write_archive / save_archive / iter_archive).
+
+Podgląd i drzewo plików (preview, get_file_tree, file_tree) mają limity
+wpisów i głębokości - przy dziesiątkach tysięcy plików wynik pozostaje
+czytelny i tani w budowie.
 """
 
+import hashlib
+import json
 import os
+import time
 from pathlib import Path
-from typing import Dict, List
-from ..transformers.base_transformer import TransformedData
+from typing import Any, BinaryIO, Callable, Dict, Iterator, List, Optional, Tuple
+from ..transformers.base_transformer import FileContent, TransformedData
+from ..version import __version__
+from .file_tree import FileTree
+
+
+MANIFEST_NAME = '.drdoc_manifest.json'
+MANIFEST_FORMAT = 1
+WRITE_CHUNK = 16        # Minimalna paczka plików zapisywana przez jeden wątek
+READ_BLOCK = 1 << 20    # Blok odczytu przy hashowaniu istniejących plików
+RACY_WINDOW_NS = 2 * 10**9  # Plik zmieniony tuż przed odczytem - czas modyfikacji nie jest zapamiętywany
+
+# Wynik zapisu pojedynczego pliku
+WRITTEN, IDENTICAL, FAILED = 'written', 'identical', 'failed'
+
+
+def file_digest(path: Path) -> bytes:
+    """Hash treści pliku na dysku (czytany blokami)"""
+    digest = hashlib.blake2b(digest_size=16)
+    with open(path, 'rb') as f:
+        for block in iter(lambda: f.read(READ_BLOCK), b''):
+            digest.update(block)
+    return digest.digest()
+
+
+def same_content(path: Path, size: int, digest: Callable[[], bytes]) -> bool:
+    """Czy plik ma daną treść: najpierw rozmiar (stat), hash tylko przy zgodnym rozmiarze"""
+    try:
+        if path.stat().st_size != size:
+            return False
+        return file_digest(path) == digest()
+    except OSError:
+        return False
+
+
+class InputFile:
+    """
+    Plik wejściowy przebiegu: stat() przy utworzeniu, hash treści
+    dopiero gdy jest potrzebny (liczony raz).
+    """
+    
+    def __init__(self, path: str):
+        self.path = Path(path)
+        stat = self.path.stat()
+        self.size = stat.st_size
+        self.mtime_ns = stat.st_mtime_ns
+        self._hash: Optional[str] = None
+    
+    @property
+    def hash(self) -> str:
+        if self._hash is None:
+            self._hash = file_digest(self.path).hex()
+        return self._hash
+    
+    def matches(self, recorded: Optional[Dict[str, Any]]) -> bool:
+        """Czy plik ma treść zapisaną w manifeście: rozmiar, czas modyfikacji, a dopiero potem hash"""
+        if not recorded or recorded.get('size') != self.size:
+            return False
+        if recorded.get('mtime_ns') == self.mtime_ns:
+            return True
+        return recorded.get('hash') == self.hash
+    
+    def record(self) -> Dict[str, Any]:
+        """Wpis do manifestu (bez czasu modyfikacji, gdy plik zmienił się przed chwilą -
+        kolejna zmiana w tej samej jednostce czasu systemu plików byłaby niewidoczna)"""
+        racy = time.time_ns() - self.mtime_ns < RACY_WINDOW_NS
+        return {'hash': self.hash, 'size': self.size, 'mtime_ns': None if racy else self.mtime_ns}
+
+
+class GenerationReport:
+    """Wynik zapisu plików projektu"""
+    
+    def __init__(self, project_dir: Path):
+        self.project_dir = project_dir
+        self.files: Dict[str, str] = {}      # Pliki projektu na dysku {ścieżka_względna: ścieżka_absolutna}
+        self.written: List[str] = []         # Pliki zapisane (nowe lub zmienione)
+        self.unchanged: List[str] = []       # Pliki o niezmienionych źródłach (bez renderowania)
+        self.identical: List[str] = []       # Pliki wyrenderowane, ale identyczne z istniejącymi
+        self.removed: List[str] = []         # Nieaktualne pliki poprzedniego przebiegu (usunięte)
+        self.failed: Dict[str, str] = {}     # Pliki, których nie udało się zapisać {ścieżka: błąd}
+    
+    @property
+    def skipped(self) -> List[str]:
+        """Pliki pominięte - bez zmian na dysku"""
+        return self.unchanged + self.identical
+    
+    def counts(self) -> Dict[str, int]:
+        return {
+            'written': len(self.written),
+            'skipped': len(self.unchanged) + len(self.identical),
+            'failed': len(self.failed),
+            'removed': len(self.removed)
+        }
 
 
 class FileGenerator:
     """Klasa generująca pliki wyjściowe"""
     
-    def __init__(self, output_dir: str = "data/output"):
+    def __init__(self, output_dir: str = "data/output", max_workers: Optional[int] = None):
         """
         Args:
             output_dir: Katalog wyjściowy dla plików
+            max_workers: Liczba wątków zapisu (1 - zapis sekwencyjny,
+                         None - jak dla zadań I/O: liczba CPU + 4, maks. 8)
         """
         self.output_dir = Path(output_dir)
+        self.max_workers = max_workers or min(8, (os.cpu_count() or 1) + 4)
     
     def generate(self, transformed_data: TransformedData, 
                  project_name: str = None) -> Dict[str, str]:
@@ -29,7 +157,27 @@ class FileGenerator:
             project_name: Nazwa projektu (używana jako subdirectory)
             
         Returns:
-            Dict: Mapowanie {ścieżka_względna: ścieżka_absolutna} wygenerowanych plików
+            Dict: Mapowanie {ścieżka_względna: ścieżka_absolutna} plików projektu
+                  (bez plików, których nie udało się zapisać - patrz generate_with_report)
+        """
+        return self.generate_with_report(transformed_data, project_name).files
+    
+    def generate_with_report(self, transformed_data: TransformedData, project_name: str = None,
+                             incremental: bool = True, run: Optional[Dict[str, Any]] = None) -> GenerationReport:
+        """
+        Generuje pliki i zwraca raport (zapisane / bez zmian / usunięte / błędy).
+        
+        Args:
+            transformed_data: Dane po transformacji
+            project_name: Nazwa projektu (używana jako subdirectory)
+            incremental: Pomijaj pliki o niezmienionych źródłach (wg manifestu); przy False
+                         wszystkie pliki są renderowane, ale nieaktualne pliki z manifestu
+                         nadal są usuwane
+            run: Opis przebiegu do manifestu ({'config_hash', 'input': InputFile.record()}),
+                 sprawdzany później przez is_up_to_date(); zapisywany tylko przy zapisie bez błędów
+            
+        Returns:
+            GenerationReport: Raport zapisu
         """
         if not project_name:
             project_name = f"project_{transformed_data.destination}"
@@ -38,22 +186,244 @@ class FileGenerator:
         project_dir = self.output_dir / project_name
         project_dir.mkdir(parents=True, exist_ok=True)
         
-        generated_files = {}
+        report = GenerationReport(project_dir)
+        # Poprzedni manifest zawsze - do usuwania nieaktualnych plików; hashe źródeł tylko przy incremental
+        previous = self.load_manifest(project_dir).get('files', {})
+        entries: Dict[str, Dict[str, Any]] = {}
+        pending: List[Tuple[str, Path, FileContent]] = []
         
-        # Generuj każdy plik
         for rel_path, content in transformed_data.files.items():
             file_path = project_dir / rel_path
+            sources = transformed_data.sources.get(rel_path)
+            entries[rel_path] = {'sources': sources} if sources else {}
+            report.files[rel_path] = str(file_path.absolute())
             
-            # Utwórz katalogi jeśli potrzebne
-            file_path.parent.mkdir(parents=True, exist_ok=True)
+            # Źródła bez zmian i plik na miejscu - bez renderowania
+            if (incremental and sources and previous.get(rel_path, {}).get('sources') == sources
+                    and file_path.is_file()):
+                report.unchanged.append(rel_path)
+                if previous[rel_path].get('hash'):
+                    entries[rel_path]['hash'] = previous[rel_path]['hash']
+                continue
             
-            # Zapisz plik
-            with open(file_path, 'w', encoding='utf-8') as f:
-                f.write(content)
+            pending.append((rel_path, file_path, content))
+        
+        # Katalogi tworzone raz, przed zapisem (każdy unikalny katalog jeden raz)
+        directories = {file_path.parent for _, file_path, _ in pending}
+        for directory in sorted(directories, key=lambda d: len(d.parts)):
+            try:
+                directory.mkdir(parents=True, exist_ok=True)
+            except OSError:
+                pass    # Błąd wyjdzie przy zapisie plików tego katalogu
+        
+        # Zapis plików (pula wątków); błędy zbierane per plik
+        for rel_path, status, error, digest in self._write_all(pending):
+            if status == WRITTEN:
+                report.written.append(rel_path)
+            elif status == IDENTICAL:
+                report.identical.append(rel_path)
+            else:
+                report.failed[rel_path] = error
+                del report.files[rel_path]
+                entries[rel_path] = {}      # Bez hasha źródeł - plik zostanie zapisany ponownie
+                continue
+            entries[rel_path]['hash'] = digest
+        
+        # Rozmiar i czas modyfikacji plików - do sprawdzenia przebiegu samym stat()
+        for rel_path, file_path in report.files.items():
+            try:
+                stat = os.stat(file_path)
+            except OSError:
+                continue
+            entries[rel_path].update(size=stat.st_size, mtime_ns=stat.st_mtime_ns)
+        
+        # Pliki poprzedniego przebiegu, których nie ma w wyniku
+        root = project_dir.resolve()
+        for rel_path in previous:
+            if rel_path in entries:
+                continue
+            stale = (project_dir / rel_path).resolve()
+            if stale.is_relative_to(root) and stale.is_file():
+                stale.unlink()
+                report.removed.append(rel_path)
+        
+        manifest = {
+            'format': MANIFEST_FORMAT,
+            'destination': transformed_data.destination,
+            'files': entries
+        }
+        if run and not report.failed:
+            manifest['run'] = dict(run, version=__version__)
+        self.save_manifest(project_dir, manifest)
+        return report
+    
+    def is_up_to_date(self, project_name: str, config_hash: str, source: InputFile) -> bool:
+        """
+        Czy projekt jest aktualny: ta sama wersja narzędzia i konfiguracja,
+        niezmienione wejście i wszystkie pliki wyjściowe na miejscu.
+        
+        Sprawdzane od najtańszych warunków: manifest, stat() wejścia (hash
+        treści tylko przy zmienionym czasie modyfikacji), stat() plików
+        wyjściowych. Wejście dotknięte bez zmiany treści jest odnotowywane
+        w manifeście, żeby kolejny przebieg znów obył się bez hashowania.
+        """
+        project_dir = self.output_dir / project_name
+        manifest = self.load_manifest(project_dir)
+        run = manifest.get('run')
+        if not run or run.get('version') != __version__ or run.get('config_hash') != config_hash:
+            return False
+        if not source.matches(run.get('input')):
+            return False
+        
+        for rel_path, entry in manifest.get('files', {}).items():
+            try:
+                stat = os.stat(project_dir / rel_path)
+            except OSError:
+                return False
+            if entry.get('size') != stat.st_size or entry.get('mtime_ns') != stat.st_mtime_ns:
+                return False
+        
+        if run['input'].get('mtime_ns') != source.mtime_ns:
+            run['input'] = source.record()
+            try:
+                self.save_manifest(project_dir, manifest)
+            except OSError:
+                pass    # Następny przebieg policzy hash ponownie
+        return True
+    
+    def _write_all(self, pending: List[Tuple[str, Path, FileContent]]) -> List[Tuple[str, str, Optional[str], Optional[str]]]:
+        """Zapisuje pliki (równolegle dla większych partii); zwraca [(ścieżka, status, błąd, hash)] w kolejności wejścia"""
+        # Wątki dostają paczki plików, nie pojedyncze pliki - mniej narzutu puli przy tysiącach małych plików
+        chunk = max(WRITE_CHUNK, -(-len(pending) // (self.max_workers * 4)))
+        batches = [pending[i:i + chunk] for i in range(0, len(pending), chunk)]
+        if self.max_workers <= 1 or len(batches) <= 1:
+            return [self._write_one(item) for item in pending]
+        
+        # Import przy użyciu - --detect i małe projekty nie płacą za concurrent.futures
+        from concurrent.futures import ThreadPoolExecutor
+        
+        def write_batch(batch):
+            return [self._write_one(item) for item in batch]
+        
+        with ThreadPoolExecutor(max_workers=min(self.max_workers, len(batches)),
+                                thread_name_prefix='drdoc-write') as pool:
+            return [result for results in pool.map(write_batch, batches) for result in results]
+    
+    @staticmethod
+    def _write_one(item: Tuple[str, Path, FileContent]) -> Tuple[str, str, Optional[str], Optional[str]]:
+        """
+        Zapisuje plik atomowo (plik tymczasowy + os.replace), pomijając identyczną treść.
+        Zwraca (ścieżka, status, błąd, hash treści).
+        """
+        rel_path, file_path, content = item
+        temp_path = file_path.with_name(f".{file_path.name}.{os.urandom(4).hex()}.tmp")
+        try:
+            if isinstance(content, str):
+                data = content.encode('utf-8')
+                digest = hashlib.blake2b(data, digest_size=16)
+                # Treść w pamięci - porównanie przed jakimkolwiek zapisem
+                if same_content(file_path, len(data), digest.digest):
+                    return rel_path, IDENTICAL, None, digest.hexdigest()
+                with open(temp_path, 'xb') as f:
+                    f.write(data)
+            else:
+                # Plik strumieniowy - fragment po fragmencie, rozmiar i hash liczone w locie
+                digest = hashlib.blake2b(digest_size=16)
+                size = 0
+                with open(temp_path, 'xb') as f:
+                    for chunk in content:
+                        data = chunk.encode('utf-8')
+                        digest.update(data)
+                        size += len(data)
+                        f.write(data)
+                if same_content(file_path, size, digest.digest):
+                    temp_path.unlink()
+                    return rel_path, IDENTICAL, None, digest.hexdigest()
+            os.replace(temp_path, file_path)
+        except Exception as e:
+            # Błąd zapisu lub renderowania pliku strumieniowego - nie przerywa pozostałych,
+            # a istniejący plik pozostaje nienaruszony
+            try:
+                temp_path.unlink(missing_ok=True)
+            except OSError:
+                pass
+            return rel_path, FAILED, f"{type(e).__name__}: {e}", None
+        return rel_path, WRITTEN, None, digest.hexdigest()
+    
+    def load_manifest(self, project_dir: Path) -> Dict[str, Any]:
+        """Wczytuje manifest projektu (pusty słownik gdy brak lub nieczytelny)"""
+        try:
+            with open(Path(project_dir) / MANIFEST_NAME, 'r', encoding='utf-8') as f:
+                manifest = json.load(f)
+        except (OSError, ValueError):
+            return {}
+        if not isinstance(manifest, dict) or manifest.get('format') != MANIFEST_FORMAT:
+            return {}
+        return manifest
+    
+    def save_manifest(self, project_dir: Path, manifest: Dict[str, Any]):
+        """Zapisuje manifest projektu (atomowo, bez zapisu gdy się nie zmienił)"""
+        text = json.dumps(manifest, ensure_ascii=False, indent=1, sort_keys=True)
+        _, status, error, _ = self._write_one((MANIFEST_NAME, Path(project_dir) / MANIFEST_NAME, text))
+        if status == FAILED:
+            raise OSError(f"Nie można zapisać manifestu: {error}")
+    
+    def write_archive(self, projects: Dict[str, TransformedData], target: BinaryIO,
+                      archive_format: str = 'zip') -> int:
+        """
+        Zapisuje pliki projektów do archiwum w strumieniu (bez plików na dysku).
+        
+        Args:
+            projects: {katalog w archiwum: dane po transformacji}
+            target: Strumień binarny (plik, sys.stdout.buffer, ...)
+            archive_format: 'zip', 'tar.gz' lub 'tar'
             
-            generated_files[rel_path] = str(file_path.absolute())
+        Returns:
+            int: Liczba plików w archiwum
+        """
+        from .archive import ArchiveWriter
+        
+        with ArchiveWriter(target, archive_format) as archive:
+            for root, transformed_data in projects.items():
+                for rel_path, content in transformed_data.files.items():
+                    archive.add(f"{root}/{rel_path}", content)
+        return archive.files
+    
+    def iter_archive(self, projects: Dict[str, TransformedData], archive_format: str = 'zip') -> Iterator[bytes]:
+        """Archiwum jako kolejne fragmenty bajtów (po każdym pliku) - np. do odpowiedzi HTTP"""
+        from .archive import ArchiveWriter, ChunkBuffer
+        
+        buffer = ChunkBuffer()
+        with ArchiveWriter(buffer, archive_format) as archive:
+            for root, transformed_data in projects.items():
+                for rel_path, content in transformed_data.files.items():
+                    archive.add(f"{root}/{rel_path}", content)
+                    data = buffer.drain()
+                    if data:
+                        yield data
+        data = buffer.drain()
+        if data:
+            yield data
+    
+    def save_archive(self, projects: Dict[str, TransformedData], path: str,
+                     archive_format: Optional[str] = None) -> int:
+        """
+        Zapisuje archiwum do pliku `path` (format z rozszerzenia, gdy nie podano).
+        Archiwum powstaje w pliku tymczasowym i jest podmieniane atomowo.
+        """
+        from .archive import archive_format_for
         
-        return generated_files
+        path = Path(path)
+        archive_format = archive_format or archive_format_for(path.name)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        temp_path = path.with_name(f".{path.name}.{os.urandom(4).hex()}.tmp")
+        try:
+            with open(temp_path, 'xb') as f:
+                count = self.write_archive(projects, f, archive_format)
+            os.replace(temp_path, path)
+        finally:
+            temp_path.unlink(missing_ok=True)
+        return count
     
     def generate_structure_only(self, transformed_data: TransformedData,
                                 project_name: str = None) -> List[str]:
@@ -85,91 +455,76 @@ class FileGenerator:
         
         return created_dirs
     
-    def preview(self, transformed_data: TransformedData) -> str:
+    def preview(self, transformed_data: TransformedData, max_files: Optional[int] = None) -> str:
         """
         Generuje podgląd struktury plików jako tekst.
         
         Args:
             transformed_data: Dane po transformacji
+            max_files: Maks. liczba opisanych plików (None - wszystkie); pliki
+                       strumieniowe ponad limit nie są renderowane
             
         Returns:
             str: Podgląd struktury plików
         """
-        preview = f"Preview for destination: {transformed_data.destination}\n"
-        preview += "=" * 60 + "\n\n"
+        return "".join(self.iter_preview(transformed_data, max_files))
+    
+    def iter_preview(self, transformed_data: TransformedData, max_files: Optional[int] = None) -> Iterator[str]:
+        """Podgląd (jak preview()) fragment po fragmencie"""
+        yield f"Preview for destination: {transformed_data.destination}\n"
+        yield "=" * 60 + "\n\n"
         
         if transformed_data.errors:
-            preview += "⚠️  ERRORS:\n"
+            yield "⚠️  ERRORS:\n"
             for error in transformed_data.errors:
-                preview += f"  - {error}\n"
-            preview += "\n"
+                yield f"  - {error}\n"
+            yield "\n"
         
-        preview += "📁 File Structure:\n"
-        preview += "-" * 60 + "\n"
+        yield "📁 File Structure:\n"
+        yield "-" * 60 + "\n"
         
-        # Sortuj pliki
-        sorted_files = sorted(transformed_data.files.keys())
-        
-        for file_path in sorted_files:
-            content = transformed_data.files[file_path]
-            size = len(content)
-            lines = content.count('\n') + 1
+        files = transformed_data.files
+        for file_path in sorted(files)[:max_files]:
+            content = files[file_path]
+            if isinstance(content, str):
+                size = len(content)
+                lines = content.count('\n') + 1
+            else:
+                # Plik strumieniowy - statystyki liczone w locie, bez materializacji
+                size = 0
+                lines = 1
+                for chunk in content:
+                    size += len(chunk)
+                    lines += chunk.count('\n')
             
-            preview += f"  {file_path}\n"
-            preview += f"    Size: {size} bytes, Lines: {lines}\n"
+            yield f"  {file_path}\n    Size: {size} bytes, Lines: {lines}\n"
         
-        preview += "\n"
-        preview += f"📊 Metadata:\n"
-        preview += "-" * 60 + "\n"
-        for key, value in transformed_data.metadata.items():
-            preview += f"  {key}: {value}\n"
+        if max_files is not None and len(files) > max_files:
+            yield f"  … (+{len(files) - max_files} więcej)\n"
         
-        return preview
+        yield "\n"
+        yield "📊 Metadata:\n"
+        yield "-" * 60 + "\n"
+        for key, value in transformed_data.metadata.items():
+            yield f"  {key}: {value}\n"
+    
+    def file_tree(self, transformed_data: TransformedData) -> FileTree:
+        """Drzewo plików (FileTree) - do stronicowania i rozwijania poddrzew"""
+        return FileTree(transformed_data.files)
     
-    def get_file_tree(self, transformed_data: TransformedData) -> str:
+    def get_file_tree(self, transformed_data: TransformedData, max_depth: Optional[int] = None,
+                      max_entries: Optional[int] = None, collapse: bool = False) -> str:
         """
         Generuje drzewiastą reprezentację struktury plików.
         
         Args:
             transformed_data: Dane po transformacji
+            max_depth: Liczba rozwijanych poziomów (głębsze katalogi zwinięte z liczbą plików)
+            max_entries: Maks. liczba wpisów na katalog (reszta jako "… (+N więcej)")
+            collapse: Łącz katalogi z jednym podkatalogiem w jedną linię (a/b/c/)
             
         Returns:
             str: ASCII tree struktura
         """
-        files = sorted(transformed_data.files.keys())
-        
-        # Buduj drzewo
-        tree = {}
-        for file_path in files:
-            parts = file_path.split('/')
-            current = tree
-            
-            for part in parts[:-1]:  # Katalogi
-                if part not in current:
-                    current[part] = {}
-                current = current[part]
-            
-            # Plik (liść)
-            current[parts[-1]] = None
-        
-        # Konwertuj na string
-        def render_tree(node: dict, prefix: str = "", is_last: bool = True) -> str:
-            result = ""
-            items = sorted(node.items())
-            
-            for i, (name, children) in enumerate(items):
-                is_last_item = (i == len(items) - 1)
-                connector = "└── " if is_last_item else "├── "
-                
-                result += prefix + connector + name
-                
-                if children is not None:  # Katalog
-                    result += "/\n"
-                    extension = "    " if is_last_item else "│   "
-                    result += render_tree(children, prefix + extension, is_last_item)
-                else:  # Plik
-                    result += "\n"
-            
-            return result
-        
-        return ".\n" + render_tree(tree)
+        return self.file_tree(transformed_data).render(max_depth=max_depth, max_entries=max_entries,
+                                                       collapse=collapse)
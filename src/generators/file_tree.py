@@ -0,0 +1,179 @@
+"""
+File Tree - Drzewo plików wyniku transformacji
+
+Drzewo budowane jest w jednym przebiegu po ścieżkach plików, bez
+wcześniejszego sortowania. Katalog pliku wyszukiwany jest po pełnej ścieżce,
+więc kolejne pliki tego samego katalogu kosztują jedno wyszukiwanie; dzieci
+katalogu sortowane są raz - przy pierwszym renderowaniu tego katalogu.
+Renderowanie to generator linii sterowany jawnym stosem, więc koszt jest
+liniowy względem liczby wyświetlonych wpisów, a wynik można stronicować
+(offset/limit) bez budowania całego tekstu.
+
+Ograniczenia dla bardzo dużych wyników:
+- max_depth: katalogi głębiej są zwinięte do jednej linii z liczbą plików
+- max_entries: katalog pokazuje najwyżej tyle wpisów, reszta jako "… (+N więcej)"
+- collapse: łańcuchy katalogów z jednym podkatalogiem łączone w jedną linię (a/b/c/)
+
+entries() zwraca wpisy jednego katalogu - do leniwego rozwijania poddrzew
+(np. w interfejsie web).
+"""
+
+from itertools import islice
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple
+
+
+class TreeNode:
+    """Katalog drzewa: dzieci {nazwa: TreeNode (katalog) lub None (plik)}"""
+
+    __slots__ = ('children', '_files', '_sorted')
+
+    def __init__(self):
+        self.children: Dict[str, Optional['TreeNode']] = {}
+        self._files: Optional[int] = None
+        self._sorted: Optional[List[Tuple[str, Optional['TreeNode']]]] = None
+
+    @property
+    def files(self) -> int:
+        """Liczba plików poddrzewa (liczona raz, przy pierwszym użyciu)"""
+        if self._files is None:
+            self._files = sum(1 if child is None else child.files for child in self.children.values())
+        return self._files
+
+    def entries(self) -> List[Tuple[str, Optional['TreeNode']]]:
+        """Dzieci posortowane po nazwie (sortowanie raz, przy pierwszym użyciu)"""
+        if self._sorted is None:
+            self._sorted = sorted(self.children.items())
+        return self._sorted
+
+    def collapsed(self, name: str) -> Tuple[str, 'TreeNode']:
+        """Łączy łańcuch katalogów z jednym podkatalogiem: ('a', a) -> ('a/b/c', c)"""
+        node = self
+        while len(node.children) == 1:
+            (child_name, child), = node.children.items()
+            if child is None:
+                break
+            name, node = f"{name}/{child_name}", child
+        return name, node
+
+
+class FileTree:
+    """Drzewo ścieżek plików (np. TransformedData.files)"""
+
+    def __init__(self, paths: Iterable[str]):
+        self.root = TreeNode()
+        self._directories: Dict[str, TreeNode] = {'': self.root}
+        for path in paths:
+            directory, _, name = path.rpartition('/')
+            node = self._directories.get(directory) or self._directory(directory)
+            node.children.setdefault(name, None)
+
+    def _directory(self, path: str) -> TreeNode:
+        """Tworzy katalog (i brakujących przodków) pod pełną ścieżką"""
+        parent_path, _, name = path.rpartition('/')
+        parent = self._directories.get(parent_path) or self._directory(parent_path)
+        node = parent.children[name] = TreeNode()
+        self._directories[path] = node
+        return node
+
+    @property
+    def files(self) -> int:
+        return self.root.files
+
+    def node(self, path: str = '') -> Optional[TreeNode]:
+        """Katalog pod ścieżką ('' - korzeń); None gdy nie istnieje lub jest plikiem"""
+        return self._directories.get(path.strip('/'))
+
+    def lines(self, path: str = '', max_depth: Optional[int] = None,
+              max_entries: Optional[int] = None, collapse: bool = False) -> Iterator[str]:
+        """
+        Linie drzewa ASCII katalogu `path` (bez linii korzenia ".").
+
+        Args:
+            path: Katalog, od którego renderować ('' - całe drzewo)
+            max_depth: Liczba rozwijanych poziomów (None - bez limitu)
+            max_entries: Maks. liczba wpisów na katalog (None - bez limitu)
+            collapse: Łącz katalogi z jednym podkatalogiem w jedną linię
+        """
+        node = self.node(path)
+        if node is None:
+            return
+
+        def frame(directory: TreeNode, prefix: str, depth: int) -> list:
+            entries = directory.entries()
+            shown = entries if max_entries is None else entries[:max_entries]
+            return [shown, 0, prefix, depth, len(entries) - len(shown)]
+
+        stack = [frame(node, '', 0)]
+        while stack:
+            current = stack[-1]
+            entries, index, prefix, depth, hidden = current
+            if index == len(entries):
+                stack.pop()
+                if hidden:
+                    yield f"{prefix}└── … (+{hidden} więcej)"
+                continue
+            current[1] = index + 1
+
+            name, child = entries[index]
+            last = index == len(entries) - 1 and not hidden
+            connector = "└── " if last else "├── "
+            if child is None:
+                yield prefix + connector + name
+                continue
+
+            if collapse:
+                name, child = child.collapsed(name)
+            if max_depth is not None and depth + 1 >= max_depth:
+                yield f"{prefix}{connector}{name}/ ({child.files} plików)"
+                continue
+            yield prefix + connector + name + "/"
+            stack.append(frame(child, prefix + ("    " if last else "│   "), depth + 1))
+
+    def render(self, path: str = '', **options) -> str:
+        """Drzewo ASCII jako tekst (z linią korzenia "."); opcje jak w lines()"""
+        return "".join(line + "\n" for line in [".", *self.lines(path, **options)])
+
+    def page(self, path: str = '', offset: int = 0, limit: int = 200, **options) -> Dict[str, Any]:
+        """
+        Strona linii drzewa: {'lines', 'offset', 'next_offset'} (next_offset None na
+        ostatniej stronie). Renderowane są tylko linie do końca strony.
+        """
+        lines = list(islice(self.lines(path, **options), offset, offset + limit + 1))
+        more = len(lines) > limit
+        return {
+            'lines': lines[:limit],
+            'offset': offset,
+            'next_offset': offset + limit if more else None
+        }
+
+    def entries(self, path: str = '', offset: int = 0, limit: int = 200,
+                collapse: bool = True) -> Optional[Dict[str, Any]]:
+        """
+        Wpisy jednego katalogu (do leniwego rozwijania): {'path', 'total', 'entries',
+        'next_offset'}; wpis: {'name', 'path', 'type': 'dir'|'file', 'files'}.
+        None gdy katalog nie istnieje.
+        """
+        node = self.node(path)
+        if node is None:
+            return None
+        base = path.strip('/')
+        entries = node.entries()
+        result = []
+        for name, child in entries[offset:offset + limit]:
+            if child is None:
+                result.append({'name': name, 'path': f"{base}/{name}" if base else name, 'type': 'file'})
+                continue
+            if collapse:
+                name, child = child.collapsed(name)
+            result.append({
+                'name': name,
+                'path': f"{base}/{name}" if base else name,
+                'type': 'dir',
+                'files': child.files
+            })
+        return {
+            'path': base,
+            'total': len(entries),
+            'entries': result,
+            'next_offset': offset + limit if offset + limit < len(entries) else None
+        }
@@ -3,27 +3,135 @@ Parser Manager & Auto-detector
 Inicjalizuje wszystkie parsery i zapewnia auto-detekcję formatu.
 """
 
-from .base_parser import parser_registry, ParsedData
-from .txt_parser import TxtParser
-from .md_parser import MarkdownParser
-from .json_parser import JsonParser
+import re
+
+from .base_parser import parser_registry, ParsedData, import_object
+
+
+# Klasy parserów eksportowane leniwie {nazwa: moduł}
+_LAZY_EXPORTS = {
+    'TxtParser': 'txt_parser',
+    'MarkdownParser': 'md_parser',
+    'JsonParser': 'json_parser',
+    'CsvParser': 'csv_parser',
+    'DocxParser': 'docx_parser',
+    'PhpParser': 'php_parser',
+    'HtmlParser': 'html_parser',
+    'XmlParser': 'html_parser',
+    'ClipboardParser': 'clipboard_parser'
+}
+
+
+_MD_LINK_RE = re.compile(r'\[[^\]]*\]\(')
+_MD_LINE_RE = re.compile(r'^(?:#{1,6}\s|>\s?|[-*+]\s+\S|\d+\.\s+\S)')   # Jak w clipboard_parser
+_QUOTED_RE = re.compile(r'"[^"]*"')
+
+
+def _head(content, size: int = 4096) -> str:
+    return content[:size] if isinstance(content, str) else ''
+
+
+# Tanie testy wstępne - zwracają False tylko gdy can_parse() parsera na pewno da 0
+
+def _sniff_binary(content) -> bool:
+    return isinstance(content, (bytes, bytearray))
+
+
+def _sniff_markup(content) -> bool:
+    return '<' in _head(content)
+
+
+def _sniff_php(content) -> bool:
+    return '<?' in _head(content)
+
+
+def _table_lines(content) -> list:
+    """Niepuste, pełne linie z początku tekstu - ta sama próbka co w CsvParser.can_parse()"""
+    head = _head(content, 8192)
+    lines = head.split('\n')
+    if len(content) > len(head):
+        lines = lines[:-1]  # Ostatnia linia może być ucięta
+    return [line.rstrip('\r') for line in lines if line.strip()][:20]
+
+
+def _same_count(lines: list, delimiters: str) -> bool:
+    """
+    Czy wszystkie linie mają tę samą, niezerową liczbę któregoś separatora.
+    Separatory w cudzysłowach się nie liczą; pole cytowane przez kilka linii
+    (nieparzysta liczba cudzysłowów) zostawia decyzję parserowi.
+    """
+    unquoted = []
+    for line in lines:
+        if '"' in line:
+            if line.count('"') % 2:
+                return True
+            line = _QUOTED_RE.sub('', line)
+        unquoted.append(line)
+    return any(unquoted[0].count(d) and all(line.count(d) == unquoted[0].count(d) for line in unquoted[1:])
+               for d in delimiters)
+
+
+def _sniff_table(delimiters: str):
+    def sniff(content) -> bool:
+        lines = _table_lines(content)
+        return len(lines) >= 3 and lines[0].lstrip()[:1] not in ('{', '[', '#', '<') \
+            and _same_count(lines, delimiters)
+    return sniff
+
+
+def _sniff_mixed(content) -> bool:
+    """Wklejka mieszana potrzebuje regionu z parserem innym niż tekst: JSON, PHP albo tabeli"""
+    if not isinstance(content, str) or '\n' not in content.strip():
+        return False
+    head = _head(content, 64 * 1024)
+    if '<?' in head:
+        return True
+    run = []
+    fenced = False
+    for line in head.split('\n'):
+        stripped = line.strip()
+        # Bloki ``` należą do regionu Markdown
+        if stripped.startswith('```'):
+            fenced, run = not fenced, []
+            continue
+        if fenced:
+            continue
+        if stripped[:1] in ('{', '[') and not _MD_LINK_RE.match(stripped):
+            return True
+        # Tabela: co najmniej 3 kolejne niepuste linie tekstu o stałej liczbie separatora
+        prose = stripped and not stripped.startswith('|') and not _MD_LINE_RE.match(stripped)
+        run = (run + [stripped])[-3:] if prose else []
+        if len(run) == 3 and _same_count(run, ',;\t'):
+            return True
+    return False
+
+
+def _target(class_name: str) -> str:
+    return f"{__name__}.{_LAZY_EXPORTS[class_name]}:{class_name}"
 
 
 def init_parsers():
-    """Inicjalizuje i rejestruje wszystkie parsery"""
-    parser_registry.register('txt', TxtParser())
-    parser_registry.register('md', MarkdownParser())
-    parser_registry.register('json', JsonParser())
-    # DOC, PHP, CLIPBOARD będą dodane później
+    """Rejestruje wszystkie parsery (moduły importowane przy pierwszym użyciu)"""
+    parser_registry.register_lazy('txt', _target('TxtParser'))
+    parser_registry.register_lazy('md', _target('MarkdownParser'))
+    parser_registry.register_lazy('json', _target('JsonParser'))
+    parser_registry.register_lazy('csv', _target('CsvParser'), sniff=_sniff_table(',;\t'))
+    parser_registry.register_lazy('tsv', _target('CsvParser'), {'delimiter': '\t'}, sniff=_sniff_table('\t'))
+    parser_registry.register_lazy('doc', _target('DocxParser'), sniff=_sniff_binary)
+    parser_registry.register_lazy('php', _target('PhpParser'), sniff=_sniff_php)
+    parser_registry.register_lazy('html', _target('HtmlParser'), sniff=_sniff_markup)
+    parser_registry.register_lazy('xml', _target('XmlParser'), sniff=_sniff_markup)
+    parser_registry.register_lazy('clipboard', _target('ClipboardParser'), sniff=_sniff_mixed)
 
 
-def parse_content(content: str, format_hint: str = None) -> ParsedData:
+def parse_content(content: str, format_hint: str = None, config: dict = None) -> ParsedData:
     """
     Główna funkcja parsująca zawartość.
     
     Args:
         content: Zawartość do sparsowania
         format_hint: Opcjonalna podpowiedź formatu ('txt', 'md', 'json', etc.)
+        config: Opcjonalne nadpisania konfiguracji parsera (np. {'allow_comments': True})
         
     Returns:
         ParsedData: Sparsowane dane
@@ -34,12 +142,40 @@ def parse_content(content: str, format_hint: str = None) -> ParsedData:
     
     # Jeśli podano format, użyj go
     if format_hint:
-        parser = parser_registry.get_parser(format_hint)
+        parser = parser_registry.get_parser(format_hint, config)
         if parser:
             return parser.parse(content)
     
     # Auto-detekcja
-    return parser_registry.parse_auto(content)
+    return parser_registry.parse_auto(content, config)
+
+
+def parse_file(path: str, format_hint: str = None, config: dict = None) -> ParsedData:
+    """
+    Parsuje plik z dysku.
+    
+    Jeśli parser dla danego formatu obsługuje strumieniowanie (np. CSV),
+    plik nie jest wczytywany do pamięci jako jeden string.
+    
+    Args:
+        path: Ścieżka do pliku
+        format_hint: Opcjonalna podpowiedź formatu
+        config: Opcjonalne nadpisania konfiguracji parsera
+        
+    Returns:
+        ParsedData: Sparsowane dane
+    """
+    if not parser_registry.list_parsers():
+        init_parsers()
+    
+    if format_hint:
+        parser = parser_registry.get_parser(format_hint, config)
+        if parser:
+            return parser.parse_file(path)
+    
+    with open(path, 'r', encoding='utf-8') as f:
+        content = f.read()
+    return parser_registry.parse_auto(content, config)
 
 
 def detect_format(content: str) -> tuple[str, float]:
@@ -58,16 +194,30 @@ def detect_format(content: str) -> tuple[str, float]:
     return parser_registry.detect_format(content)
 
 
-# Inicjalizuj parsery przy imporcie modułu
+def __getattr__(name: str):
+    """Leniwy eksport klas parserów - moduł importowany przy pierwszym odwołaniu"""
+    if name in _LAZY_EXPORTS:
+        return import_object(f"{__name__}.{_LAZY_EXPORTS[name]}:{name}")
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+# Zarejestruj parsery przy imporcie modułu (bez importowania ich kodu)
 init_parsers()
 
 
 __all__ = [
     'parse_content',
+    'parse_file',
     'detect_format',
     'parser_registry',
     'ParsedData',
     'TxtParser',
     'MarkdownParser',
-    'JsonParser'
+    'JsonParser',
+    'CsvParser',
+    'DocxParser',
+    'PhpParser',
+    'HtmlParser',
+    'XmlParser',
+    'ClipboardParser'
 ]
@@ -3,8 +3,12 @@ Base Parser Class
 Definiuje interfejs dla wszystkich parserów danych wejściowych.
 """
 
+import os
+import sys
+import threading
+from collections import OrderedDict
 from abc import ABC, abstractmethod
-from typing import Any, Dict, List, Optional
+from typing import Any, Callable, Dict, List, Optional, Union
 from dataclasses import dataclass
 from enum import Enum
 
@@ -104,6 +108,10 @@ class BaseParser(ABC):
     Każdy parser musi implementować metodę parse().
     """
     
+    # Klucze konfiguracji, które może nadpisać żądanie z zewnątrz (API web) -
+    # specyfikacja jak w filter_config(); pozostałe klucze zostają po stronie serwera
+    request_options: Dict[str, Any] = {}
+    
     def __init__(self, config: Optional[Dict[str, Any]] = None):
         """
         Args:
@@ -140,7 +148,26 @@ class BaseParser(ABC):
                    0.0 = na pewno nie ten format
         """
         pass
-    
+
+    def parse_file(self, path: str, **kwargs) -> ParsedData:
+        """
+        Parsuje plik z dysku.
+
+        Domyślnie wczytuje cały plik jako tekst i wywołuje parse().
+        Parsery strumieniowe (CSV, DOCX, ...) nadpisują tę metodę,
+        żeby nie trzymać całej zawartości w pamięci jako jednego stringa.
+
+        Args:
+            path: Ścieżka do pliku
+            **kwargs: Dodatkowe parametry przekazywane do parse()
+
+        Returns:
+            ParsedData: Sparsowane dane
+        """
+        with open(path, 'r', encoding=self.config.get('encoding', 'utf-8')) as f:
+            content = f.read()
+        return self.parse(content, **kwargs)
+
     def validate(self, content: str) -> tuple[bool, List[str]]:
         """
         Waliduje zawartość przed parsowaniem.
@@ -185,22 +212,273 @@ class BaseParser(ABC):
         }
 
 
+def import_object(target: str) -> Any:
+    """
+    Importuje obiekt wskazany ścieżką 'pakiet.moduł:Nazwa'.
+    
+    Args:
+        target: Ścieżka importu (format jak w entry points)
+        
+    Returns:
+        Any: Zaimportowany obiekt
+    """
+    module_name, _, attr = target.partition(':')
+    # __import__ zamiast importlib.import_module - import widoczny w `-X importtime`
+    obj = __import__(module_name, fromlist=['__name__'])
+    for part in filter(None, attr.split('.')):
+        obj = getattr(obj, part)
+    return obj
+
+
+def discover_plugins(group: str) -> Dict[str, str]:
+    """
+    Zwraca wtyczki zadeklarowane przez zainstalowane pakiety w danej
+    grupie entry points, jako {nazwa: 'moduł:Klasa'}. Nic nie importuje.
+    
+    Czyta bezpośrednio pliki entry_points.txt z katalogów *.dist-info /
+    *.egg-info na sys.path - importlib.metadata kosztuje przy starcie CLI
+    więcej niż cała leniwa rejestracja oszczędza.
+    """
+    plugins: Dict[str, str] = {}
+    header = f'[{group}]'
+    
+    for path in sys.path:
+        try:
+            with os.scandir(path or '.') as it:
+                dist_dirs = [e.path for e in it
+                             if e.name.endswith(('.dist-info', '.egg-info')) and e.is_dir()]
+        except OSError:
+            continue
+        
+        for dist_dir in dist_dirs:
+            try:
+                with open(os.path.join(dist_dir, 'entry_points.txt'), encoding='utf-8') as f:
+                    text = f.read()
+            except OSError:
+                continue
+            if header not in text:
+                continue
+            
+            in_group = False
+            for line in text.splitlines():
+                line = line.strip()
+                if line.startswith('['):
+                    in_group = line == header
+                elif in_group and '=' in line and not line.startswith(('#', ';')):
+                    name, _, value = line.partition('=')
+                    plugins.setdefault(name.strip(), value.split('[')[0].strip())
+    
+    return plugins
+
+
+def freeze_config(value: Any) -> Any:
+    """
+    Zamienia konfigurację (dict/list/set, zagnieżdżone) na hashowalny klucz.
+    Kolejność kluczy słownika nie ma znaczenia.
+    """
+    if isinstance(value, dict):
+        return tuple(sorted((str(k), freeze_config(v)) for k, v in value.items()))
+    if isinstance(value, (list, tuple)):
+        return tuple(freeze_config(v) for v in value)
+    if isinstance(value, (set, frozenset)):
+        return frozenset(freeze_config(v) for v in value)
+    try:
+        hash(value)
+    except TypeError:
+        return repr(value)
+    return value
+
+
+MAX_OPTION_LENGTH = 200    # Maks. długość tekstowej opcji w filter_config()
+
+
+def filter_config(overrides: Optional[Dict[str, Any]], options: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Zostawia z nadpisań konfiguracji tylko klucze dozwolone w `options`.
+    
+    Specyfikacja klucza w `options`:
+        bool / str - wartość musi mieć ten typ (tekst najwyżej MAX_OPTION_LENGTH znaków)
+        (min, max) - liczba, przycinana do przedziału (int, gdy granice są int)
+        [wartości] - jedna z wymienionych wartości
+    
+    Nieznane klucze i wartości złego typu są pomijane.
+    """
+    result = {}
+    for key, value in (overrides or {}).items():
+        spec = options.get(key)
+        if spec is None:
+            continue
+        if spec is bool:
+            if isinstance(value, bool):
+                result[key] = value
+        elif spec is str:
+            if isinstance(value, str) and len(value) <= MAX_OPTION_LENGTH:
+                result[key] = value
+        elif isinstance(spec, tuple):
+            if isinstance(value, (int, float)) and not isinstance(value, bool) and value == value:
+                low, high = spec
+                value = min(max(value, low), high)
+                result[key] = int(value) if isinstance(low, int) and isinstance(high, int) else float(value)
+        elif value in spec:
+            result[key] = value
+    return result
+
+
+class _LazyEntry:
+    """Wpis rejestru: ścieżka importu + konfiguracja, instancja tworzona przy pierwszym użyciu"""
+    
+    __slots__ = ('target', 'config', 'sniff', 'instance')
+    
+    def __init__(self, target: Union[str, type, Any], config: Optional[Dict[str, Any]] = None,
+                 sniff: Optional[Callable[[Any], bool]] = None):
+        self.target = target
+        self.config = config
+        self.sniff = sniff
+        self.instance = None
+
+
+class LazyRegistry:
+    """
+    Rejestr obiektów ładowanych leniwie.
+    Przechowuje ścieżki importu; moduł jest importowany, a obiekt tworzony
+    dopiero przy pierwszym get(). Wtyczki z entry points są dopisywane
+    przy pierwszym odwołaniu do pełnej listy albo nieznanej nazwy.
+    
+    Instancje z nadpisaną konfiguracją (get(name, config)) trafiają do
+    ograniczonego cache LRU kluczowanego zamrożoną konfiguracją, więc
+    powtarzające się opcje nie tworzą nowych obiektów przy każdym wywołaniu.
+    Instancje są współdzielone - nie wolno modyfikować ich `config`.
+    """
+    
+    def __init__(self, plugin_group: Optional[str] = None, max_variants: int = 64):
+        self._entries: Dict[str, _LazyEntry] = {}
+        self._variants: OrderedDict = OrderedDict()   # (nazwa, zamrożony config) -> instancja
+        self._max_variants = max_variants
+        self._plugin_group = plugin_group
+        self._plugins_loaded = plugin_group is None
+        self._lock = threading.RLock()
+    
+    def add(self, name: str, target: Union[str, type, Any], config: Optional[Dict[str, Any]] = None,
+            sniff: Optional[Callable[[Any], bool]] = None):
+        """Dodaje wpis: gotową instancję, klasę albo ścieżkę 'moduł:Klasa'"""
+        entry = _LazyEntry(target, config, sniff)
+        if not isinstance(target, (str, type)):
+            entry.instance = target
+        with self._lock:
+            self._entries[name] = entry
+            for key in [key for key in self._variants if key[0] == name]:
+                del self._variants[key]
+    
+    def get(self, name: str, config: Optional[Dict[str, Any]] = None) -> Optional[Any]:
+        """
+        Zwraca instancję dla nazwy (import i utworzenie przy pierwszym użyciu).
+        
+        Args:
+            name: Nazwa wpisu
+            config: Opcjonalne nadpisania konfiguracji dla tego wywołania
+        """
+        if config:
+            return self._get_variant(name, config)
+        
+        entry = self._entries.get(name)
+        if entry is None:
+            self.load_plugins()
+            entry = self._entries.get(name)
+            if entry is None:
+                return None
+        if entry.instance is None:
+            with self._lock:
+                if entry.instance is None:
+                    cls = import_object(entry.target) if isinstance(entry.target, str) else entry.target
+                    entry.instance = cls(entry.config) if entry.config is not None else cls()
+        return entry.instance
+    
+    def _get_variant(self, name: str, config: Dict[str, Any]) -> Optional[Any]:
+        key = (name, freeze_config(config))
+        with self._lock:
+            instance = self._variants.get(key)
+            if instance is not None:
+                self._variants.move_to_end(key)
+                return instance
+        
+        base = self.get(name)
+        if base is None:
+            return None
+        
+        # Konfiguracja bazowa wpisu (np. delimiter dla 'tsv') + nadpisania
+        merged = dict(base.config) if isinstance(getattr(base, 'config', None), dict) else {}
+        merged.update(config)
+        instance = type(base)(merged)
+        
+        with self._lock:
+            # Inny wątek mógł utworzyć ten sam wariant w międzyczasie
+            instance = self._variants.setdefault(key, instance)
+            self._variants.move_to_end(key)
+            while len(self._variants) > self._max_variants:
+                self._variants.popitem(last=False)
+        return instance
+    
+    def sniff(self, name: str, content: Any) -> bool:
+        """Tani test wstępny - False oznacza, że wpisu nie trzeba nawet ładować"""
+        entry = self._entries.get(name)
+        return entry is not None and (entry.sniff is None or entry.sniff(content))
+    
+    def names(self, include_plugins: bool = True) -> List[str]:
+        """Nazwy wpisów w kolejności rejestracji"""
+        if include_plugins:
+            self.load_plugins()
+        return list(self._entries.keys())
+    
+    def load_plugins(self):
+        """Dopisuje wtyczki z entry points (wbudowane wpisy mają pierwszeństwo)"""
+        if self._plugins_loaded:
+            return
+        with self._lock:
+            if self._plugins_loaded:
+                return
+            for name, target in discover_plugins(self._plugin_group).items():
+                self._entries.setdefault(name, _LazyEntry(target))
+            self._plugins_loaded = True
+
+
 class ParserRegistry:
     """
     Rejestr dostępnych parserów.
     Umożliwia auto-detekcję formatu i wybór odpowiedniego parsera.
+    Parsery rejestrowane przez register_lazy() są importowane dopiero
+    przy pierwszym użyciu; zewnętrzne pakiety mogą dodawać parsery przez
+    entry points w grupie 'drdoc.parsers'.
     """
     
     def __init__(self):
-        self._parsers: Dict[str, BaseParser] = {}
+        self._parsers = LazyRegistry(plugin_group='drdoc.parsers')
     
     def register(self, format_name: str, parser: BaseParser):
         """Rejestruje parser dla danego formatu"""
-        self._parsers[format_name] = parser
+        self._parsers.add(format_name, parser)
     
-    def get_parser(self, format_name: str) -> Optional[BaseParser]:
-        """Zwraca parser dla danego formatu"""
-        return self._parsers.get(format_name)
+    def register_lazy(self, format_name: str, target: str, config: Optional[Dict[str, Any]] = None,
+                      sniff: Optional[Callable[[Any], bool]] = None):
+        """
+        Rejestruje parser bez importowania jego modułu.
+        
+        Args:
+            format_name: Nazwa formatu
+            target: Ścieżka 'moduł:Klasa' parsera
+            config: Konfiguracja przekazywana do konstruktora
+            sniff: Tani test (content -> bool); False pomija parser przy detekcji
+        """
+        self._parsers.add(format_name, target, config, sniff)
+    
+    def get_parser(self, format_name: str, config: Optional[Dict[str, Any]] = None) -> Optional[BaseParser]:
+        """
+        Zwraca parser dla danego formatu.
+        
+        Args:
+            format_name: Nazwa formatu
+            config: Opcjonalne nadpisania konfiguracji (instancja z cache)
+        """
+        return self._parsers.get(format_name, config)
     
     def detect_format(self, content: str) -> tuple[str, float]:
         """
@@ -215,26 +493,30 @@ class ParserRegistry:
         best_format = "txt"  # fallback
         best_score = 0.0
         
-        for format_name, parser in self._parsers.items():
-            score = parser.can_parse(content)
+        for format_name in self._parsers.names():
+            # Tani test wstępny - parsery, które na pewno nie pasują, nie są importowane
+            if not self._parsers.sniff(format_name, content):
+                continue
+            score = self.get_parser(format_name).can_parse(content)
             if score > best_score:
                 best_score = score
                 best_format = format_name
         
         return best_format, best_score
     
-    def parse_auto(self, content: str) -> ParsedData:
+    def parse_auto(self, content: str, config: Optional[Dict[str, Any]] = None) -> ParsedData:
         """
         Automatyczne parsowanie z detekcją formatu.
         
         Args:
             content: Zawartość do sparsowania
+            config: Opcjonalne nadpisania konfiguracji wykrytego parsera
             
         Returns:
             ParsedData: Sparsowane dane
         """
         format_name, confidence = self.detect_format(content)
-        parser = self.get_parser(format_name)
+        parser = self.get_parser(format_name, config)
         
         if parser:
             result = parser.parse(content)
@@ -251,8 +533,8 @@ class ParserRegistry:
         )
     
     def list_parsers(self) -> List[str]:
-        """Zwraca listę zarejestrowanych parserów"""
-        return list(self._parsers.keys())
+        """Zwraca listę zarejestrowanych parserów (bez ich importowania)"""
+        return self._parsers.names()
 
 
 # Singleton instance
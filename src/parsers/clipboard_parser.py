@@ -0,0 +1,445 @@
+"""
+Clipboard Parser - Parser dla wklejonej zawartości mieszanej
+
+Wklejka dzielona jest na regiony (JSON, kod, Markdown, CSV, tekst),
+każdy region trafia do odpowiedniego zarejestrowanego parsera,
+a wyniki są scalane w jeden ParsedData.
+"""
+
+import json
+import os
+import re
+from typing import Dict, List, Any, Optional
+from .base_parser import BaseParser, ParsedData, DataType, parser_registry
+
+
+_MD_LINE_RE = re.compile(r'^(?:#{1,6}\s|>\s?|[-*+]\s+\S|\d+\.\s+\S)')
+_CODE_LINE_RE = re.compile(
+    r'^\s*(?:<\?php|(?:export\s+)?(?:async\s+)?function\b|class\s+\w|def\s+\w|import\s+[\w{*]|'
+    r'from\s+[\w.]+\s+import\b|(?:const|let|var)\s+\w+\s*=|public\s|private\s|protected\s|'
+    r'#include\b|package\s+\w|using\s+\w)'
+)
+_CODE_TAIL_RE = re.compile(r'[;{]\s*$')
+_FIRST_LINE_RE = re.compile(r'\S[^\n]*')
+_JSON_STRING_RE = re.compile(r'"(?:[^"\\]|\\.)*"')
+
+FALLBACK_TITLE_LENGTH = 60   # Tytuł sekcji regionu bez parsera: "<rodzaj>: <pierwsza linia>"
+
+# Rodzaje regionów -> nazwa parsera w rejestrze
+REGION_PARSERS = {
+    'json': 'json',
+    'md': 'md',
+    'txt': 'txt',
+    'csv': 'csv',
+    'php': 'php'
+}
+
+
+def _parse_region(format_name: str, text: str) -> ParsedData:
+    """Parsuje pojedynczy region"""
+    parser = parser_registry.get_parser(format_name)
+    return parser.parse(text)
+
+
+def _parse_batch(jobs: List[tuple]) -> List[ParsedData]:
+    """Parsuje paczkę regionów (funkcja modułowa - da się ją wysłać do procesu)"""
+    return [_parse_region(*job) for job in jobs]
+
+
+class ClipboardParser(BaseParser):
+    """Parser dla zawartości wklejonej ze schowka (mixed content)"""
+
+    request_options = {
+        'split_mixed_content': bool,
+        'min_table_lines': (3, 100),
+        'parallel': bool,
+        'parallel_min_size': (64 * 1024, 64 * 1024 * 1024),
+        'detect_sample_size': (1024, 1024 * 1024)
+    }
+
+    def __init__(self, config: Dict[str, Any] = None):
+        default_config = {
+            'auto_detect': True,
+            'detection_confidence_threshold': 0.7,
+            'split_mixed_content': True,
+            'fallback_to_plaintext': True,
+            'preserve_original': True,
+            'min_table_lines': 3,
+            'parallel': True,
+            'parallel_min_size': 256 * 1024,   # Poniżej tego rozmiaru parsujemy sekwencyjnie
+            'executor': 'thread',              # 'thread' lub 'process'
+            'max_workers': None,
+            'detect_sample_size': 64 * 1024
+        }
+        if config:
+            default_config.update(config)
+        super().__init__(default_config)
+
+    def can_parse(self, content: str) -> float:
+        """
+        Zawartość mieszana: co najmniej dwa różne rodzaje regionów z własnym
+        parserem (np. tekst + JSON). Regiony kodu bez parsera się nie liczą -
+        zwykły kod źródłowy z komentarzami to nie wklejka mieszana.
+        """
+        if not content:
+            return 0.0
+
+        sample = content[:self.config.get('detect_sample_size', 64 * 1024)]
+        regions = self.segment(sample)
+        kinds = {'prose' if r['kind'] in ('md', 'txt') else r['kind']
+                 for r in regions if r['kind'] in REGION_PARSERS}
+
+        if len(kinds) < 2:
+            return 0.0
+
+        return 0.8
+
+    def parse(self, content: str, **kwargs) -> ParsedData:
+        """Dzieli zawartość na regiony i parsuje każdy odpowiednim parserem"""
+        is_valid, errors = self.validate(content)
+
+        result = ParsedData(
+            format="clipboard",
+            data_type=DataType.MIXED,
+            content=content,
+            errors=errors
+        )
+
+        if not is_valid:
+            return result
+
+        result.stats = self.calculate_stats(content)
+        normalized = self._preprocess(content)
+
+        if self.config.get('split_mixed_content', True):
+            regions = self.segment(normalized)
+        else:
+            regions = [{'kind': 'txt', 'start': 0, 'end': len(normalized),
+                        'line_start': 0, 'line_end': normalized.count('\n')}]
+
+        parsed_regions = self._parse_regions(normalized, regions)
+        self._merge(result, normalized, regions, parsed_regions)
+
+        return result
+
+    # --- Segmentacja ------------------------------------------------------
+
+    def segment(self, content: str) -> List[Dict[str, Any]]:
+        """
+        Dzieli zawartość na typowane regiony.
+
+        Jedno przejście po liniach nadaje każdej linii etykietę (z prostą
+        maszyną stanów dla bloków ```, JSON i kodu), potem sąsiednie linie
+        o tej samej etykiecie są grupowane w regiony.
+
+        Returns:
+            List[Dict]: regiony {'kind', 'start', 'end', 'line_start', 'line_end'}
+                        (start/end to offsety znakowe, line_end włącznie)
+        """
+        lines = content.split('\n')
+        labels = self._label_lines(lines)
+        self._detect_tables(lines, labels)
+
+        # Offsety początków linii
+        offsets = []
+        pos = 0
+        for line in lines:
+            offsets.append(pos)
+            pos += len(line) + 1
+
+        regions: List[Dict[str, Any]] = []
+        current = None
+        pending_blank = False
+
+        for i, label in enumerate(labels):
+            if label == 'blank':
+                pending_blank = current is not None
+                continue
+
+            group = 'prose' if label in ('md', 'txt') else label
+            # JSON rozdzielony pustą linią to osobne dokumenty
+            continues = current is not None and current['group'] == group and \
+                not (group == 'json' and pending_blank)
+            if continues:
+                current['line_end'] = i
+                current['has_md'] = current['has_md'] or label == 'md'
+            else:
+                current = {'group': group, 'line_start': i, 'line_end': i, 'has_md': label == 'md'}
+                regions.append(current)
+            pending_blank = False
+
+        result = []
+        for region in regions:
+            kind = region['group']
+            if kind == 'prose':
+                kind = 'md' if region['has_md'] else 'txt'
+            start = offsets[region['line_start']]
+            end = offsets[region['line_end']] + len(lines[region['line_end']])
+            if kind == 'code' and '<?php' in content[start:end]:
+                kind = 'php'
+            result.append({
+                'kind': kind,
+                'start': start,
+                'end': end,
+                'line_start': region['line_start'],
+                'line_end': region['line_end']
+            })
+
+        return result
+
+    def _label_lines(self, lines: List[str]) -> List[str]:
+        """Nadaje etykietę każdej linii: blank/md/txt/json/code"""
+        labels = []
+        state = None          # None / 'fence' / 'json' / 'code'
+        json_start = 0
+        balance = 0
+        code_depth = 0
+
+        for i, line in enumerate(lines):
+            stripped = line.strip()
+
+            if state == 'fence':
+                labels.append('md')
+                if stripped.startswith('```'):
+                    state = None
+                continue
+
+            if state == 'json':
+                labels.append('json')
+                balance += self._bracket_delta(line)
+                if balance <= 0:
+                    state = None
+                    self._validate_json(lines, labels, json_start, i)
+                continue
+
+            if state == 'code':
+                if not stripped:
+                    labels.append('code' if code_depth > 0 else 'blank')
+                    continue
+                indented = line[:1] in (' ', '\t')
+                if code_depth > 0 or indented or _CODE_LINE_RE.match(line) or \
+                        _CODE_TAIL_RE.search(line) or stripped[:1] in ('}', ')', ']'):
+                    labels.append('code')
+                    code_depth = max(0, code_depth + self._brace_delta(line))
+                    continue
+                state = None
+
+            if not stripped:
+                labels.append('blank')
+            elif stripped.startswith('```'):
+                labels.append('md')
+                state = 'fence'
+            elif stripped[0] in '{[' and not re.match(r'\[[^\]]*\]\(', stripped):
+                labels.append('json')
+                balance = self._bracket_delta(line)
+                json_start = i
+                if balance > 0:
+                    state = 'json'
+                else:
+                    self._validate_json(lines, labels, i, i)
+            elif stripped.startswith('|'):
+                labels.append('md')
+            elif _CODE_LINE_RE.match(line):
+                labels.append('code')
+                state = 'code'
+                code_depth = max(0, self._brace_delta(line))
+            elif _MD_LINE_RE.match(stripped):
+                labels.append('md')
+            else:
+                labels.append('txt')
+
+        if state == 'json':
+            # Niezamknięty JSON - traktuj jak kod
+            self._validate_json(lines, labels, json_start, len(lines) - 1)
+
+        return labels
+
+    def _detect_tables(self, lines: List[str], labels: List[str]):
+        """Zamienia ciągi linii tekstu o stałej liczbie separatorów na regiony CSV"""
+        csv_parser = parser_registry.get_parser('csv')
+        if csv_parser is None:
+            return
+
+        min_lines = self.config.get('min_table_lines', 3)
+        i = 0
+        n = len(labels)
+        while i < n:
+            if labels[i] != 'txt':
+                i += 1
+                continue
+            j = i
+            while j < n and labels[j] == 'txt':
+                j += 1
+            if j - i >= min_lines and csv_parser.can_parse('\n'.join(lines[i:j])) > 0:
+                for k in range(i, j):
+                    labels[k] = 'csv'
+            i = j
+
+    def _bracket_delta(self, line: str) -> int:
+        cleaned = _JSON_STRING_RE.sub('', line) if '"' in line else line
+        return cleaned.count('{') + cleaned.count('[') - cleaned.count('}') - cleaned.count(']')
+
+    def _brace_delta(self, line: str) -> int:
+        return line.count('{') - line.count('}')
+
+    def _validate_json(self, lines: List[str], labels: List[str], start: int, end: int):
+        """Region JSON, który się nie parsuje, zostaje przeklasyfikowany na kod (lub tekst)"""
+        try:
+            json.loads('\n'.join(lines[start:end + 1]))
+        except json.JSONDecodeError:
+            # Pojedyncza linia typu "[WIP] ..." to zwykły tekst
+            fallback = 'txt' if start == end else 'code'
+            for k in range(start, end + 1):
+                labels[k] = fallback
+
+    # --- Parsowanie i scalanie ---------------------------------------------
+
+    def _parse_regions(self, content: str, regions: List[Dict[str, Any]]) -> List[Optional[ParsedData]]:
+        """Parsuje regiony - równolegle dla dużych wklejek"""
+        jobs = []
+        for region in regions:
+            format_name = REGION_PARSERS.get(region['kind'])
+            if format_name and parser_registry.get_parser(format_name) is not None:
+                jobs.append((format_name, content[region['start']:region['end']]))
+            else:
+                jobs.append(None)
+
+        runnable = [job for job in jobs if job is not None]
+        use_pool = (
+            self.config.get('parallel', True)
+            and len(runnable) > 1
+            and len(content) >= self.config.get('parallel_min_size', 256 * 1024)
+        )
+
+        if use_pool:
+            # Import na żądanie - pula jest potrzebna tylko dla dużych wklejek
+            from concurrent.futures import ThreadPoolExecutor, ProcessPoolExecutor
+            executor_cls = ProcessPoolExecutor if self.config.get('executor') == 'process' else ThreadPoolExecutor
+            max_workers = self.config.get('max_workers') or min(len(runnable), os.cpu_count() or 1)
+            # Regiony wysyłamy paczkami - przy tysiącach małych regionów narzut
+            # na zadanie (szczególnie między procesami) dominowałby nad parsowaniem
+            batch_count = max_workers * 4
+            batch_size = max(1, -(-len(runnable) // batch_count))
+            batches = [runnable[k:k + batch_size] for k in range(0, len(runnable), batch_size)]
+            with executor_cls(max_workers=max_workers) as pool:
+                parsed = iter([item for batch in pool.map(_parse_batch, batches) for item in batch])
+            return [next(parsed) if job else None for job in jobs]
+
+        return [_parse_region(*job) if job else None for job in jobs]
+
+    def _merge(self, result: ParsedData, normalized: str, regions: List[Dict[str, Any]],
+               parsed_regions: List[Optional[ParsedData]]):
+        """Scala wyniki regionów w jeden ParsedData (pozycje przesunięte o offset regionu)"""
+        raw_structures = []
+        region_meta = []
+
+        for region, parsed in zip(regions, parsed_regions):
+            offset = region['start']
+            line_offset = region['line_start']
+            text = normalized[region['start']:region['end']]
+
+            region_meta.append({
+                'format': region['kind'],
+                'start': region['start'],
+                'end': region['end'],
+                'line_start': region['line_start'] + 1,
+                'line_end': region['line_end'] + 1,
+                'confidence': parsed.confidence if parsed else 1.0
+            })
+
+            # Tytuł dla sekcji bez nagłówka: rodzaj regionu i jego pierwsza linia
+            match = _FIRST_LINE_RE.search(text)
+            first_line = match.group().strip() if match else ''
+            if len(first_line) > FALLBACK_TITLE_LENGTH:
+                first_line = first_line[:FALLBACK_TITLE_LENGTH - 1].rstrip() + '…'
+            fallback_title = f"{region['kind']}: {first_line}"
+
+            if parsed is None:
+                # Kod bez dedykowanego parsera - region staje się blokiem kodu
+                result.code_blocks.append({
+                    'language': self._guess_language(text),
+                    'code': text.strip('\n'),
+                    'position': offset
+                })
+                result.sections.append({
+                    'title': fallback_title,
+                    'level': 0,
+                    'content': f"```\n{text.strip()}\n```",
+                    'source_format': region['kind']
+                })
+                continue
+
+            if result.title is None and parsed.title:
+                result.title = parsed.title
+
+            for header in parsed.headers:
+                header = dict(header)
+                if 'line' in header:
+                    header['line'] += line_offset
+                if isinstance(header.get('position'), int) and parsed.format != 'csv':
+                    header['position'] += offset
+                result.headers.append(header)
+
+            for section in parsed.sections:
+                section = dict(section)
+                section['title'] = section.get('title') or fallback_title
+                section['source_format'] = parsed.format
+                result.sections.append(section)
+
+            for block in parsed.code_blocks:
+                block = dict(block)
+                if isinstance(block.get('position'), int):
+                    block['position'] += offset
+                result.code_blocks.append(block)
+
+            for table in parsed.tables:
+                table = dict(table)
+                table['position'] = table.get('position', 0) + offset
+                result.tables.append(table)
+
+            result.paragraphs.extend(parsed.paragraphs)
+            result.lists.extend(parsed.lists)
+            result.links.extend(parsed.links)
+            result.images.extend(parsed.images)
+            result.errors.extend(f"[{parsed.format} @ linia {region['line_start'] + 1}] {e}"
+                                 for e in parsed.errors)
+
+            if parsed.raw_structure is not None:
+                raw_structures.append(parsed.raw_structure)
+
+        if len(raw_structures) == 1:
+            result.raw_structure = raw_structures[0]
+        elif raw_structures:
+            result.raw_structure = raw_structures
+
+        kinds = {r['kind'] for r in regions}
+        if len(kinds) == 1 and parsed_regions and parsed_regions[0] is not None:
+            result.data_type = parsed_regions[0].data_type
+        elif kinds == {'code'}:
+            result.data_type = DataType.CODE
+
+        result.metadata.update({
+            'regions': region_meta,
+            'region_formats': sorted(kinds),
+            'detected_format': regions[0]['kind'] if len(kinds) == 1 else 'mixed'
+        })
+
+    def _preprocess(self, content: str) -> str:
+        """Usuwa BOM i normalizuje końce linii"""
+        if content.startswith('\ufeff'):
+            content = content[1:]
+        if '\r' in content:
+            content = content.replace('\r\n', '\n').replace('\r', '\n')
+        return content
+
+    def _guess_language(self, code: str) -> str:
+        """Prosta heurystyka języka dla regionów kodu"""
+        if re.search(r'^\s*(def\s+\w+\(|from\s+[\w.]+\s+import|import\s+\w+\s*$)', code, re.MULTILINE):
+            return 'python'
+        if re.search(r'\b(function\b|const\s|let\s|=>|console\.)', code):
+            return 'javascript'
+        if re.search(r'^\s*(public|private|protected)\s+(static\s+)?\w+', code, re.MULTILINE):
+            return 'java'
+        if re.search(r'^\s*#include\b', code, re.MULTILINE):
+            return 'c'
+        return 'text'
@@ -0,0 +1,446 @@
+"""
+CSV Parser - Parser dla plików CSV/TSV (dane tabelaryczne)
+"""
+
+import csv
+import hashlib
+import heapq
+import io
+import re
+from itertools import chain, islice, zip_longest
+from pathlib import Path
+from typing import Dict, List, Any, Iterable, Optional
+from .base_parser import BaseParser, ParsedData, DataType
+
+
+# Kandydaci na separator przy auto-detekcji ('|' zostawiamy tabelom Markdown)
+DELIMITER_CANDIDATES = [',', ';', '\t']
+MIN_DETECT_LINES = 3          # Mniej linii nie wystarcza do uznania tekstu za tabelę
+
+_INT_RE = re.compile(r'[+-]?\d+')
+_FLOAT_RE = re.compile(r'[+-]?(?:\d+\.?\d*|\.\d+)(?:[eE][+-]?\d+)?')
+_BOOL_VALUES = {'true': True, 'false': False, 'yes': True, 'no': False}
+
+
+def _to_bool(value: str) -> bool:
+    return _BOOL_VALUES[value.lower()]
+
+
+# Kolejność ma znaczenie - od najbardziej do najmniej restrykcyjnego typu
+_TYPE_CHECKS = [
+    ('int', lambda v: bool(_INT_RE.fullmatch(v)), int),
+    ('float', lambda v: bool(_FLOAT_RE.fullmatch(v)), float),
+    ('bool', lambda v: v.lower() in _BOOL_VALUES, _to_bool),
+]
+_CONVERTERS = {name: conv for name, _, conv in _TYPE_CHECKS}
+_CONVERTERS['str'] = str
+
+
+class _ColumnAccumulator:
+    """
+    Zbiera wartości jednej kolumny i liczy statystyki porcjami (chunkami).
+    Liczba unikalnych wartości jest estymowana szkicem KMV (k minimalnych hashy),
+    więc pamięć na statystyki nie rośnie z liczbą wierszy.
+
+    Wartości kolumny (keep_values) przechowywane są jako surowe stringi, bo typ
+    może jeszcze spaść do str - wtedy musi zostać oryginalny tekst ("007", "1.50").
+    Konwersja do typu kolumny następuje raz, w values().
+    """
+
+    def __init__(self, name: str, col_type: str, null_values: set,
+                 sketch_size: int, keep_values: bool):
+        self.name = name
+        self.type = col_type
+        self.null_values = null_values
+        self.sketch_size = sketch_size
+        self.keep_values = keep_values
+        self._raw: List[Optional[str]] = []    # Surowe wartości (None = pusta)
+        self.count = 0
+        self.nulls = 0
+        self.min = None
+        self.max = None
+        self._raw_min: Optional[str] = None    # Min/max surowych stringów (porządek po degradacji do str)
+        self._raw_max: Optional[str] = None
+        self._sketch: List[int] = []       # max-heap (zanegowane) k najmniejszych hashy
+        self._sketch_set: set = set()
+        self._demoted = False
+
+    def add_chunk(self, raw_values: Iterable[str]):
+        """Dodaje porcję surowych wartości (stringów) z jednej kolumny"""
+        nulls = self.null_values
+        present = [v for v in raw_values if v not in nulls]
+        chunk_len = len(raw_values)
+        self.count += chunk_len
+        self.nulls += chunk_len - len(present)
+
+        converted = self._convert(present)
+
+        if self.keep_values:
+            if len(present) == chunk_len:
+                self._raw.extend(raw_values)
+            else:
+                self._raw.extend(None if v in nulls else v for v in raw_values)
+
+        if converted:
+            chunk_min = min(converted)
+            chunk_max = max(converted)
+            if self.min is None or chunk_min < self.min:
+                self.min = chunk_min
+            if self.max is None or chunk_max > self.max:
+                self.max = chunk_max
+            if self.type != 'str':
+                raw_min, raw_max = min(present), max(present)
+                if self._raw_min is None or raw_min < self._raw_min:
+                    self._raw_min = raw_min
+                if self._raw_max is None or raw_max > self._raw_max:
+                    self._raw_max = raw_max
+            self._update_sketch(present)
+
+    def _convert(self, present: List[str]) -> List[Any]:
+        converter = _CONVERTERS[self.type]
+        try:
+            return [converter(v) for v in present]
+        except (ValueError, KeyError):
+            # Wartość spoza wywnioskowanego typu - degradacja kolumny do str
+            self._demote()
+            return list(present)
+
+    def _demote(self):
+        self.type = 'str'
+        self._demoted = True
+        # Porządek leksykograficzny różni się od liczbowego, a str(min) gubi
+        # oryginalny zapis ("007") - min/max z surowych wartości, także bez keep_values
+        self.min, self.max = self._raw_min, self._raw_max
+
+    def values(self) -> List[Any]:
+        """Wartości kolumny w jej ostatecznym typie (None dla pustych)"""
+        if self.type == 'str':
+            return list(self._raw)
+        converter = _CONVERTERS[self.type]
+        return [None if v is None else converter(v) for v in self._raw]
+
+    def _update_sketch(self, present: List[str]):
+        k = self.sketch_size
+        hashes = {
+            int.from_bytes(hashlib.blake2b(v.encode('utf-8'), digest_size=8).digest(), 'big')
+            for v in present
+        }
+        for h in heapq.nsmallest(k, hashes):
+            if h in self._sketch_set:
+                continue
+            if len(self._sketch) < k:
+                heapq.heappush(self._sketch, -h)
+                self._sketch_set.add(h)
+            elif h < -self._sketch[0]:
+                removed = -heapq.heapreplace(self._sketch, -h)
+                self._sketch_set.discard(removed)
+                self._sketch_set.add(h)
+            else:
+                break
+
+    def distinct_estimate(self) -> int:
+        """Estymacja liczby unikalnych wartości (dokładna poniżej rozmiaru szkicu)"""
+        if len(self._sketch) < self.sketch_size:
+            return len(self._sketch)
+        kth = -self._sketch[0]
+        return int((self.sketch_size - 1) * (2 ** 64) / (kth + 1))
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            'type': self.type,
+            'count': self.count,
+            'nulls': self.nulls,
+            'min': self.min,
+            'max': self.max,
+            'distinct_estimate': self.distinct_estimate(),
+            'demoted': self._demoted
+        }
+
+
+class CsvParser(BaseParser):
+    """Parser dla plików CSV/TSV (.csv, .tsv)"""
+
+    request_options = {
+        'delimiter': DELIMITER_CANDIDATES,
+        'has_header': bool,
+        'sample_rows': (1, 10000),
+        'chunk_size': (100, 100000),
+        'preview_rows': (0, 100),
+        'keep_columns': bool,
+        'distinct_sketch_size': (1, 4096)
+    }
+
+    def __init__(self, config: Dict[str, Any] = None):
+        default_config = {
+            'encoding': 'utf-8',
+            'delimiter': None,          # None = auto-detekcja (, ; \t)
+            'has_header': True,
+            'sample_rows': 1000,        # Wiersze użyte do wnioskowania typów kolumn
+            'chunk_size': 10000,        # Rozmiar porcji przy liczeniu statystyk
+            'preview_rows': 20,
+            'keep_columns': True,       # False = tylko statystyki, bez danych kolumnowych
+            'distinct_sketch_size': 256,
+            'null_values': ['', 'NA', 'N/A', 'null', 'NULL', 'None', 'nan', 'NaN', '-']
+        }
+        if config:
+            default_config.update(config)
+        super().__init__(default_config)
+
+    def can_parse(self, content: str) -> float:
+        """Wykrywa czy zawartość to CSV/TSV (równa liczba kolumn w liniach)"""
+        if not content:
+            return 0.0
+
+        stripped = content.lstrip()
+        if stripped[:1] in ('{', '[', '#', '<'):
+            return 0.0
+
+        sample_lines = self._sample_lines(content)
+        if len(sample_lines) < MIN_DETECT_LINES:
+            return 0.0
+
+        delimiter, columns = self._detect_delimiter(sample_lines)
+        if not delimiter:
+            return 0.0
+
+        # Pewność rośnie z liczbą zgodnych linii i kolumn: 3 linie x 2 kolumny
+        # (np. zdania z jednym przecinkiem) nie przebijają TxtParser (0.6)
+        score = min(0.8, 0.35 + 0.05 * min(len(sample_lines), 8) + 0.05 * min(columns, 5))
+        if self.config.get('delimiter') and delimiter == self.config['delimiter']:
+            score += 0.05
+        return score
+
+    def parse(self, content: str, **kwargs) -> ParsedData:
+        """Parsuje CSV przekazany jako string"""
+        is_valid, errors = self.validate(content)
+
+        if not is_valid:
+            return ParsedData(
+                format="csv",
+                data_type=DataType.STRUCTURED,
+                content=content,
+                errors=errors
+            )
+
+        result = self.parse_stream(io.StringIO(content, newline=''), **kwargs)
+        result.content = content
+        result.stats.update(self.calculate_stats(content))
+        return result
+
+    def parse_file(self, path: str, **kwargs) -> ParsedData:
+        """Parsuje plik CSV strumieniowo, bez wczytywania go w całości"""
+        with open(path, 'r', encoding=self.config.get('encoding', 'utf-8'), newline='') as f:
+            result = self.parse_stream(f, **kwargs)
+        if not result.title:
+            result.title = Path(path).stem
+        return result
+
+    def parse_stream(self, stream: Iterable[str], **kwargs) -> ParsedData:
+        """
+        Parsuje CSV z obiektu plikopodobnego (iterowalnego po liniach).
+
+        Typy kolumn są wnioskowane z próbki pierwszych wierszy, a statystyki
+        liczone porcjami po `chunk_size` wierszy. W `content` zostaje tylko
+        podgląd (nagłówek + kilka wierszy), nie cała zawartość.
+        """
+        lines = iter(stream)
+        sniff_lines = list(islice(lines, 20))
+
+        result = ParsedData(
+            format="csv",
+            data_type=DataType.STRUCTURED,
+            content=''
+        )
+
+        if not sniff_lines:
+            result.errors.append("Pusta zawartość")
+            return result
+
+        delimiter = self.config.get('delimiter')
+        if not delimiter:
+            delimiter, _ = self._detect_delimiter([l.rstrip('\r\n') for l in sniff_lines if l.strip()])
+            delimiter = delimiter or ','
+        if delimiter == '\t':
+            result.format = "tsv"
+
+        reader = csv.reader(chain(sniff_lines, lines), delimiter=delimiter)
+
+        if self.config.get('has_header', True):
+            header = next(reader, [])
+        else:
+            header = []
+
+        sample = list(islice(reader, self.config.get('sample_rows', 1000)))
+        width = max([len(header)] + [len(row) for row in sample])
+        headers = self._normalize_headers(header, width)
+        column_types = self._infer_types(sample, width)
+
+        null_values = set(self.config.get('null_values', []))
+        keep_columns = self.config.get('keep_columns', True)
+        accumulators = [
+            _ColumnAccumulator(name, column_types[i], null_values,
+                               self.config.get('distinct_sketch_size', 256), keep_columns)
+            for i, name in enumerate(headers)
+        ]
+
+        preview_rows = [row[:width] for row in sample[:self.config.get('preview_rows', 20)]]
+        row_count = 0
+        ragged_rows = 0
+
+        chunk_size = self.config.get('chunk_size', 10000)
+        chunk = sample
+        while chunk:
+            row_count += len(chunk)
+            ragged_rows += sum(1 for row in chunk if len(row) != width)
+            self._process_chunk(chunk, accumulators, width)
+            chunk = list(islice(reader, chunk_size))
+
+        column_stats = {acc.name: acc.stats() for acc in accumulators}
+
+        result.tables.append({
+            'headers': headers,
+            'rows': preview_rows,
+            'columns': {acc.name: acc.values() for acc in accumulators} if keep_columns else {},
+            'column_types': {acc.name: acc.type for acc in accumulators},
+            'column_stats': column_stats,
+            'row_count': row_count,
+            'delimiter': delimiter
+        })
+
+        if ragged_rows:
+            result.errors.append(f"{ragged_rows} wierszy ma inną liczbę kolumn niż nagłówek")
+
+        result.content = self._render_preview(headers, preview_rows, delimiter)
+        result.headers = [{'text': name, 'level': 2, 'position': i, 'style': 'column'}
+                          for i, name in enumerate(headers)]
+        result.sections = self._create_sections(headers, preview_rows, column_stats, row_count)
+        result.stats = {
+            'rows': row_count,
+            'columns': width
+        }
+        result.metadata = {
+            'delimiter': delimiter,
+            'row_count': row_count,
+            'column_count': width,
+            'column_types': {acc.name: acc.type for acc in accumulators},
+            'content_truncated': row_count > len(preview_rows)
+        }
+
+        return result
+
+    def _sample_lines(self, content: str, max_lines: int = 20) -> List[str]:
+        """Zwraca kilka pierwszych niepustych, pełnych linii"""
+        sample = content[:8192]
+        lines = sample.split('\n')
+        if len(content) > len(sample):
+            lines = lines[:-1]  # Ostatnia linia może być ucięta
+        return [l.rstrip('\r') for l in lines if l.strip()][:max_lines]
+
+    def _detect_delimiter(self, lines: List[str]) -> tuple[Optional[str], int]:
+        """
+        Wybiera separator, dla którego wszystkie linie mają tę samą liczbę
+        pól (co najmniej 2). Zwraca (separator, liczba_kolumn) lub (None, 0).
+        """
+        if len(lines) < 2:
+            return None, 0
+
+        candidates = [self.config['delimiter']] if self.config.get('delimiter') else DELIMITER_CANDIDATES
+        best, best_columns = None, 0
+
+        for delimiter in candidates:
+            if delimiter not in lines[0]:
+                continue
+            try:
+                widths = {len(row) for row in csv.reader(lines, delimiter=delimiter)}
+            except csv.Error:
+                continue
+            if len(widths) == 1:
+                columns = widths.pop()
+                if columns >= 2 and columns > best_columns:
+                    best, best_columns = delimiter, columns
+
+        return best, best_columns
+
+    def _normalize_headers(self, header: List[str], width: int) -> List[str]:
+        """Uzupełnia brakujące nazwy kolumn i usuwa duplikaty"""
+        headers = []
+        seen = {}
+        for i in range(width):
+            name = header[i].strip() if i < len(header) else ''
+            name = name or f"column_{i + 1}"
+            if name in seen:
+                seen[name] += 1
+                name = f"{name}_{seen[name]}"
+            else:
+                seen[name] = 1
+            headers.append(name)
+        return headers
+
+    def _infer_types(self, sample: List[List[str]], width: int) -> List[str]:
+        """Wnioskuje typ każdej kolumny na podstawie próbki wierszy"""
+        null_values = set(self.config.get('null_values', []))
+        columns = list(zip_longest(*sample, fillvalue='')) if sample else []
+        types = []
+
+        for i in range(width):
+            values = [v for v in (columns[i] if i < len(columns) else ()) if v not in null_values]
+            col_type = 'str'
+            if values:
+                for name, check, _ in _TYPE_CHECKS:
+                    if all(check(v) for v in values):
+                        col_type = name
+                        break
+            types.append(col_type)
+
+        return types
+
+    def _process_chunk(self, rows: List[List[str]], accumulators: List[_ColumnAccumulator],
+                       width: int):
+        """Transponuje porcję wierszy do kolumn i aktualizuje statystyki"""
+        columns = list(zip_longest(*rows, fillvalue=''))
+        for i, acc in enumerate(accumulators):
+            acc.add_chunk(columns[i] if i < len(columns) else ('',) * len(rows))
+
+    def _render_preview(self, headers: List[str], rows: List[List[str]], delimiter: str) -> str:
+        """Serializuje nagłówek i wiersze podglądu z powrotem do CSV"""
+        output = io.StringIO()
+        writer = csv.writer(output, delimiter=delimiter, lineterminator='\n')
+        writer.writerow(headers)
+        writer.writerows(rows)
+        return output.getvalue()
+
+    def _create_sections(self, headers: List[str], rows: List[List[str]],
+                         column_stats: Dict[str, Dict[str, Any]], row_count: int) -> List[Dict[str, Any]]:
+        """Tworzy sekcje: podgląd danych (tabela Markdown) i opis kolumn"""
+        def cell(value: Any) -> str:
+            return str(value).replace('|', '\\|').replace('\n', ' ')
+
+        table_lines = [
+            '| ' + ' | '.join(cell(h) for h in headers) + ' |',
+            '|' + '---|' * len(headers)
+        ]
+        for row in rows:
+            padded = list(row) + [''] * (len(headers) - len(row))
+            table_lines.append('| ' + ' | '.join(cell(v) for v in padded) + ' |')
+        if row_count > len(rows):
+            table_lines.append(f"\n_Pokazano {len(rows)} z {row_count} wierszy._")
+
+        column_lines = []
+        for name, stats in column_stats.items():
+            column_lines.append(
+                f"- **{name}** ({stats['type']}): min={stats['min']}, max={stats['max']}, "
+                f"puste={stats['nulls']}, unikalne≈{stats['distinct_estimate']}"
+            )
+
+        return [
+            {
+                'title': 'Dane',
+                'level': 1,
+                'content': '\n'.join(table_lines)
+            },
+            {
+                'title': 'Kolumny',
+                'level': 1,
+                'content': '\n'.join(column_lines)
+            }
+        ]
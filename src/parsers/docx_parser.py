@@ -0,0 +1,442 @@
+"""
+DOCX Parser - Parser dla dokumentów Word (.docx)
+
+DOCX to archiwum ZIP z plikami XML. word/document.xml jest czytany
+strumieniowo (iterparse) akapit po akapicie, a przetworzone elementy są
+od razu usuwane z drzewa - pamięć nie rośnie z rozmiarem dokumentu.
+Obrazy (word/media/*) nie są dekompresowane, czytamy tylko ich nagłówki z ZIP.
+"""
+
+import io
+import re
+import zipfile
+import xml.etree.ElementTree as ET
+from pathlib import Path
+from typing import Dict, List, Any, Optional
+from .base_parser import BaseParser, ParsedData, DataType
+
+
+W_NS = 'http://schemas.openxmlformats.org/wordprocessingml/2006/main'
+R_NS = 'http://schemas.openxmlformats.org/officeDocument/2006/relationships'
+REL_NS = 'http://schemas.openxmlformats.org/package/2006/relationships'
+WP_NS = 'http://schemas.openxmlformats.org/drawingml/2006/wordprocessingDrawing'
+A_NS = 'http://schemas.openxmlformats.org/drawingml/2006/main'
+DC_NS = 'http://purl.org/dc/elements/1.1/'
+DCTERMS_NS = 'http://purl.org/dc/terms/'
+CP_NS = 'http://schemas.openxmlformats.org/package/2006/metadata/core-properties'
+
+
+def _w(tag: str) -> str:
+    return f'{{{W_NS}}}{tag}'
+
+
+W_P = _w('p')
+W_TBL = _w('tbl')
+W_TR = _w('tr')
+W_TC = _w('tc')
+W_R = _w('r')
+W_T = _w('t')
+W_TAB = _w('tab')
+W_BR = _w('br')
+W_VAL = _w('val')
+W_HYPERLINK = _w('hyperlink')
+W_DRAWING = _w('drawing')
+W_BODY = _w('body')
+R_ID = f'{{{R_NS}}}id'
+R_EMBED = f'{{{R_NS}}}embed'
+
+_HEADING_RE = re.compile(r'^heading\s*([1-9])$', re.IGNORECASE)
+
+
+class DocxParser(BaseParser):
+    """Parser dla dokumentów Word (.docx)"""
+
+    request_options = {
+        'extract_text_only': bool,
+        'preserve_formatting': bool,
+        'extract_images': bool,
+        'extract_tables': bool,
+        'extract_metadata': bool
+    }
+
+    def __init__(self, config: Dict[str, Any] = None):
+        default_config = {
+            'extract_text_only': False,
+            'preserve_formatting': True,
+            'extract_images': True,
+            'extract_tables': True,
+            'extract_metadata': True,
+            'convert_to': 'markdown'
+        }
+        if config:
+            default_config.update(config)
+        super().__init__(default_config)
+
+    def can_parse(self, content) -> float:
+        """DOCX to archiwum ZIP - rozpoznajemy tylko surowe bajty z sygnaturą PK"""
+        if isinstance(content, (bytes, bytearray)) and content[:4] == b'PK\x03\x04':
+            return 0.9
+        return 0.0
+
+    def parse(self, content, **kwargs) -> ParsedData:
+        """Parsuje DOCX przekazany jako bajty"""
+        if isinstance(content, str):
+            result = ParsedData(format="doc", data_type=DataType.TEXT, content=content)
+            result.errors.append("DOCX to format binarny - przekaż bajty lub użyj parse_file()")
+            return result
+        return self._parse_source(io.BytesIO(content))
+
+    def parse_file(self, path: str, **kwargs) -> ParsedData:
+        """Parsuje plik DOCX z dysku (strumieniowo)"""
+        result = self._parse_source(path)
+        if not result.title:
+            result.title = Path(path).stem
+        return result
+
+    def _parse_source(self, source) -> ParsedData:
+        result = ParsedData(format="doc", data_type=DataType.TEXT, content='')
+
+        try:
+            zf = zipfile.ZipFile(source)
+        except zipfile.BadZipFile:
+            result.errors.append("Nieprawidłowy plik DOCX (stary binarny format .doc nie jest obsługiwany)")
+            result.confidence = 0.0
+            return result
+
+        with zf:
+            names = set(zf.namelist())
+            if 'word/document.xml' not in names:
+                result.errors.append("Brak word/document.xml w archiwum")
+                result.confidence = 0.0
+                return result
+
+            if self.config.get('extract_metadata', True) and 'docProps/core.xml' in names:
+                result.metadata.update(self._read_core_properties(zf))
+
+            styles = self._read_heading_styles(zf) if 'word/styles.xml' in names else {}
+            numbering = self._read_numbering(zf) if 'word/numbering.xml' in names else {}
+            rels = self._read_relationships(zf, 'word/_rels/document.xml.rels', names)
+
+            media = [info for info in zf.infolist() if info.filename.startswith('word/media/')]
+
+            with zf.open('word/document.xml') as f:
+                self._parse_document(f, result, styles, numbering, rels)
+
+        result.title = result.metadata.get('title') or result.title or (
+            result.headers[0]['text'] if result.headers else None
+        )
+        result.stats = self.calculate_stats(result.content)
+        result.metadata.update({
+            'header_count': len(result.headers),
+            'table_count': len(result.tables),
+            'image_count': len(result.images),
+            'media_files': len(media),
+            'media_bytes': sum(info.file_size for info in media)
+        })
+
+        return result
+
+    def _parse_document(self, stream, result: ParsedData, styles: Dict[str, int],
+                        numbering: Dict[tuple, str], rels: Dict[str, str]):
+        """Strumieniowe przejście po word/document.xml"""
+        out_lines: List[str] = []
+        section = {'title': None, 'level': 0, 'lines': []}
+        current_list: Optional[Dict[str, Any]] = None
+        position = 0
+
+        def flush_section():
+            content = '\n'.join(section['lines']).strip()
+            if section['title'] is not None or content:
+                result.sections.append({
+                    'title': section['title'],
+                    'level': section['level'],
+                    'content': content
+                })
+
+        body = None
+        depth = 0
+        body_depth = None
+
+        for event, elem in ET.iterparse(stream, events=('start', 'end')):
+            if event == 'start':
+                depth += 1
+                if elem.tag == W_BODY:
+                    body = elem
+                    body_depth = depth
+                continue
+
+            depth -= 1
+            # Interesują nas tylko bezpośrednie dzieci <w:body>
+            if body is None or depth != body_depth:
+                continue
+
+            if elem.tag == W_P:
+                info = self._read_paragraph(elem, styles, numbering, rels, result)
+                text = info['text']
+
+                if info['list_type']:
+                    if current_list is None or current_list['type'] != info['list_type']:
+                        current_list = {'type': info['list_type'], 'items': []}
+                        result.lists.append(current_list)
+                    current_list['items'].append(text)
+                    marker = '1.' if info['list_type'] == 'numeric' else '-'
+                    line = '  ' * info['list_level'] + f'{marker} {text}'
+                elif text.strip():
+                    current_list = None
+                    if info['heading']:
+                        flush_section()
+                        level = info['heading']
+                        result.headers.append({
+                            'text': text.strip(),
+                            'level': level,
+                            'position': position,
+                            'style': 'docx'
+                        })
+                        section = {'title': text.strip(), 'level': level, 'lines': []}
+                        line = '#' * min(level, 6) + ' ' + text.strip()
+                    else:
+                        result.paragraphs.append(info['plain'])
+                        line = text
+                else:
+                    current_list = None
+                    line = None
+
+                if line is not None:
+                    # Bloki rozdziela pusta linia (w treści dokumentu i sekcji), kolejne punkty listy - nie
+                    separate = not (info['list_type'] and current_list['items'][1:])
+                    if out_lines and out_lines[-1] and separate:
+                        out_lines.append('')
+                    out_lines.append(line)
+                    if not info['heading']:
+                        if section['lines'] and separate:
+                            section['lines'].append('')
+                        section['lines'].append(line)
+                position += 1
+
+            elif elem.tag == W_TBL and self.config.get('extract_tables', True):
+                current_list = None
+                table = self._read_table(elem, position)
+                if table:
+                    result.tables.append(table)
+                    table_md = self._table_to_markdown(table)
+                    if out_lines and out_lines[-1]:
+                        out_lines.append('')
+                    out_lines.append(table_md)
+                    if section['lines']:
+                        section['lines'].append('')
+                    section['lines'].append(table_md)
+                position += 1
+
+            # Zwolnij przetworzone poddrzewo
+            body.clear()
+
+        flush_section()
+        result.content = '\n'.join(out_lines).strip() + '\n'
+
+    def _read_paragraph(self, p, styles: Dict[str, int], numbering: Dict[tuple, str],
+                        rels: Dict[str, str], result: ParsedData) -> Dict[str, Any]:
+        """Wydobywa tekst, styl nagłówka i informacje o liście z akapitu"""
+        heading = 0
+        list_type = None
+        list_level = 0
+
+        ppr = p.find(_w('pPr'))
+        if ppr is not None:
+            pstyle = ppr.find(_w('pStyle'))
+            if pstyle is not None:
+                heading = styles.get(pstyle.get(W_VAL), 0)
+            numpr = ppr.find(_w('numPr'))
+            if numpr is not None:
+                ilvl = numpr.find(_w('ilvl'))
+                num_id = numpr.find(_w('numId'))
+                list_level = int(ilvl.get(W_VAL, 0)) if ilvl is not None else 0
+                num_id_val = num_id.get(W_VAL) if num_id is not None else None
+                if num_id_val and num_id_val != '0':
+                    list_type = numbering.get((num_id_val, str(list_level)), 'bullet')
+
+        parts = []
+        plain_parts = []
+        for child in p:
+            if child.tag == W_R:
+                text, plain = self._read_run(child, rels, result)
+                parts.append(text)
+                plain_parts.append(plain)
+            elif child.tag == W_HYPERLINK:
+                link_text = ''.join(self._read_run(r, rels, result)[1] for r in child.iter(W_R))
+                url = rels.get(child.get(R_ID), '')
+                if url:
+                    result.links.append({'text': link_text, 'url': url, 'type': 'hyperlink'})
+                    parts.append(f'[{link_text}]({url})')
+                else:
+                    parts.append(link_text)
+                plain_parts.append(link_text)
+
+        text = ''.join(parts)
+        if self.config.get('extract_text_only', False):
+            text = ''.join(plain_parts)
+
+        return {
+            'text': text,
+            'plain': ''.join(plain_parts),
+            'heading': heading,
+            'list_type': list_type,
+            'list_level': list_level
+        }
+
+    def _read_run(self, run, rels: Dict[str, str], result: ParsedData) -> tuple[str, str]:
+        """Zwraca (tekst_z_formatowaniem, czysty_tekst) dla elementu <w:r>"""
+        pieces = []
+        for child in run:
+            if child.tag == W_T:
+                pieces.append(child.text or '')
+            elif child.tag == W_TAB:
+                pieces.append('\t')
+            elif child.tag == W_BR:
+                pieces.append('\n')
+            elif child.tag == W_DRAWING and self.config.get('extract_images', True):
+                self._read_drawing(child, rels, result)
+
+        plain = ''.join(pieces)
+        if not plain.strip() or not self.config.get('preserve_formatting', True):
+            return plain, plain
+
+        text = plain
+        rpr = run.find(_w('rPr'))
+        if rpr is not None:
+            if self._is_on(rpr.find(_w('strike'))):
+                text = f'~~{text}~~'
+            if self._is_on(rpr.find(_w('i'))):
+                text = f'*{text}*'
+            if self._is_on(rpr.find(_w('b'))):
+                text = f'**{text}**'
+            if self._is_on(rpr.find(_w('u')), off_values=('0', 'false', 'none')):
+                text = f'<u>{text}</u>'
+        return text, plain
+
+    def _is_on(self, prop, off_values: tuple = ('0', 'false')) -> bool:
+        """Właściwości typu <w:b/> są włączone, chyba że w:val mówi inaczej"""
+        if prop is None:
+            return False
+        return prop.get(W_VAL, 'true').lower() not in off_values
+
+    def _read_drawing(self, drawing, rels: Dict[str, str], result: ParsedData):
+        """Rejestruje obraz (alt + ścieżka w archiwum) bez dekompresji danych"""
+        doc_pr = drawing.find(f'.//{{{WP_NS}}}docPr')
+        blip = drawing.find(f'.//{{{A_NS}}}blip')
+        target = rels.get(blip.get(R_EMBED), '') if blip is not None else ''
+        alt = ''
+        if doc_pr is not None:
+            alt = doc_pr.get('descr') or doc_pr.get('name') or ''
+        result.images.append({
+            'alt': alt,
+            'url': f'word/{target}' if target and not target.startswith('/') else target.lstrip('/')
+        })
+
+    def _read_table(self, tbl, position: int) -> Optional[Dict[str, Any]]:
+        """Zamienia <w:tbl> na listę wierszy (tekst komórek)"""
+        rows = []
+        for tr in tbl.iter(W_TR):
+            cells = []
+            for tc in tr.findall(W_TC):
+                cell_text = ' '.join(
+                    ''.join(t.text or '' for t in p.iter(W_T)) for p in tc.iter(W_P)
+                ).strip()
+                cells.append(cell_text)
+            if cells:
+                rows.append(cells)
+
+        if not rows:
+            return None
+
+        return {
+            'headers': rows[0],
+            'rows': rows[1:],
+            'position': position
+        }
+
+    def _table_to_markdown(self, table: Dict[str, Any]) -> str:
+        headers = table['headers']
+        lines = [
+            '| ' + ' | '.join(headers) + ' |',
+            '|' + '---|' * len(headers)
+        ]
+        for row in table['rows']:
+            padded = row + [''] * (len(headers) - len(row))
+            lines.append('| ' + ' | '.join(padded[:len(headers)]) + ' |')
+        return '\n'.join(lines)
+
+    def _read_heading_styles(self, zf: zipfile.ZipFile) -> Dict[str, int]:
+        """Mapuje styleId -> poziom nagłówka (Heading 1-9, Title jako 1)"""
+        styles = {}
+        with zf.open('word/styles.xml') as f:
+            for _, elem in ET.iterparse(f):
+                if elem.tag != _w('style'):
+                    continue
+                style_id = elem.get(_w('styleId'))
+                name_el = elem.find(_w('name'))
+                name = name_el.get(W_VAL, '') if name_el is not None else ''
+                match = _HEADING_RE.match(name) or _HEADING_RE.match(style_id or '')
+                if match:
+                    styles[style_id] = int(match.group(1))
+                elif name.lower() == 'title':
+                    styles[style_id] = 1
+                elem.clear()
+        return styles
+
+    def _read_numbering(self, zf: zipfile.ZipFile) -> Dict[tuple, str]:
+        """Mapuje (numId, ilvl) -> 'bullet' / 'numeric' na podstawie word/numbering.xml"""
+        abstract_formats: Dict[str, Dict[str, str]] = {}
+        num_to_abstract: Dict[str, str] = {}
+
+        with zf.open('word/numbering.xml') as f:
+            for _, elem in ET.iterparse(f):
+                if elem.tag == _w('abstractNum'):
+                    levels = {}
+                    for lvl in elem.findall(_w('lvl')):
+                        fmt = lvl.find(_w('numFmt'))
+                        fmt_val = fmt.get(W_VAL, 'bullet') if fmt is not None else 'bullet'
+                        levels[lvl.get(_w('ilvl'), '0')] = 'bullet' if fmt_val in ('bullet', 'none') else 'numeric'
+                    abstract_formats[elem.get(_w('abstractNumId'))] = levels
+                    elem.clear()
+                elif elem.tag == _w('num'):
+                    abstract = elem.find(_w('abstractNumId'))
+                    if abstract is not None:
+                        num_to_abstract[elem.get(_w('numId'))] = abstract.get(W_VAL)
+                    elem.clear()
+
+        numbering = {}
+        for num_id, abstract_id in num_to_abstract.items():
+            for ilvl, list_type in abstract_formats.get(abstract_id, {}).items():
+                numbering[(num_id, ilvl)] = list_type
+        return numbering
+
+    def _read_relationships(self, zf: zipfile.ZipFile, rels_path: str, names: set) -> Dict[str, str]:
+        """Mapuje rId -> Target (hiperłącza i obrazy)"""
+        rels = {}
+        if rels_path not in names:
+            return rels
+        with zf.open(rels_path) as f:
+            for _, elem in ET.iterparse(f):
+                if elem.tag == f'{{{REL_NS}}}Relationship':
+                    rels[elem.get('Id')] = elem.get('Target', '')
+        return rels
+
+    def _read_core_properties(self, zf: zipfile.ZipFile) -> Dict[str, Any]:
+        """Czyta metadane dokumentu z docProps/core.xml"""
+        fields = {
+            f'{{{DC_NS}}}title': 'title',
+            f'{{{DC_NS}}}creator': 'author',
+            f'{{{DC_NS}}}subject': 'subject',
+            f'{{{DC_NS}}}description': 'description',
+            f'{{{CP_NS}}}keywords': 'keywords',
+            f'{{{CP_NS}}}lastModifiedBy': 'last_modified_by',
+            f'{{{DCTERMS_NS}}}created': 'created',
+            f'{{{DCTERMS_NS}}}modified': 'modified'
+        }
+        metadata = {}
+        with zf.open('docProps/core.xml') as f:
+            for _, elem in ET.iterparse(f):
+                key = fields.get(elem.tag)
+                if key and elem.text and elem.text.strip():
+                    metadata[key] = elem.text.strip()
+        return metadata
@@ -0,0 +1,651 @@
+"""
+HTML/XML Parser - Parsery dla stron HTML i eksportów XML
+
+Oba parsery działają strumieniowo: HTML jest podawany do html.parser
+porcjami, XML czytany przez iterparse z czyszczeniem przetworzonych
+poddrzew. Pamięć zależy od wyniku, a nie od rozmiaru wejścia.
+"""
+
+import io
+import re
+import xml.etree.ElementTree as ET
+from html.parser import HTMLParser
+from pathlib import Path
+from typing import Dict, List, Any, Optional
+from .base_parser import BaseParser, ParsedData, DataType
+
+
+HEADING_TAGS = {'h1': 1, 'h2': 2, 'h3': 3, 'h4': 4, 'h5': 5, 'h6': 6}
+SKIP_TAGS = {'script', 'style', 'noscript', 'template', 'svg'}
+BLOCK_TAGS = {
+    'p', 'div', 'section', 'article', 'header', 'footer', 'main', 'nav', 'aside',
+    'blockquote', 'figure', 'figcaption', 'form', 'dl', 'dt', 'dd', 'hr', 'body',
+    'address', 'details', 'summary'
+}
+# Wewnętrzny podzbiór DTD z deklaracjami encji (<!DOCTYPE r [<!ENTITY ...]>)
+ENTITY_DECL_RE = re.compile(r'<!DOCTYPE[^\[>]*\[[^\]]*<!ENTITY', re.IGNORECASE)
+HTML_SIGNAL_RE = re.compile(r'<(?:p|div|h[1-6]|ul|ol|li|table|a|img|span|body|head|br)\b', re.IGNORECASE)
+READ_CHUNK = 64 * 1024
+
+
+class _DocumentBuilder:
+    """
+    Wspólne budowanie ParsedData (sekcje, nagłówki, Markdown) z ciągu
+    zdarzeń - używane przez parser HTML i XHTML.
+    """
+
+    def __init__(self, result: ParsedData):
+        self.result = result
+        self.lines: List[str] = []
+        self.section = {'title': None, 'level': 0, 'lines': []}
+
+    def heading(self, text: str, level: int, line: int):
+        self.flush_section()
+        self.result.headers.append({'text': text, 'level': level, 'line': line, 'style': 'html'})
+        self.section = {'title': text, 'level': level, 'lines': []}
+        self.emit('#' * level + ' ' + text, in_section=False)
+
+    def paragraph(self, text: str, plain: str):
+        self.result.paragraphs.append(plain)
+        self.emit(text)
+
+    def emit(self, block: str, in_section: bool = True):
+        if self.lines:
+            self.lines.append('')
+        self.lines.append(block)
+        if in_section:
+            self.section['lines'].append(block)
+
+    def flush_section(self):
+        content = '\n\n'.join(self.section['lines']).strip()
+        if self.section['title'] is not None or content:
+            self.result.sections.append({
+                'title': self.section['title'],
+                'level': self.section['level'],
+                'content': content
+            })
+
+    def finish(self) -> str:
+        self.flush_section()
+        return '\n'.join(self.lines).strip() + '\n'
+
+
+class _HtmlCollector(HTMLParser):
+    """Zbiera elementy strukturalne z HTML bez budowania drzewa DOM"""
+
+    def __init__(self, builder: _DocumentBuilder):
+        super().__init__(convert_charrefs=True)
+        self.builder = builder
+        self.result = builder.result
+        self.skip_depth = 0
+        self.in_title = False
+        self.title_parts: List[str] = []
+        self.heading_level = 0
+        self.buffer: List[str] = []         # Tekst bieżącego bloku (z Markdownem inline)
+        self.plain: List[str] = []          # Ten sam tekst bez formatowania
+        self.list_stack: List[Dict[str, Any]] = []
+        self.list_lines: List[List[str]] = []   # Linie Markdown otwartych list
+        self.in_li = False
+        self.pre_depth = 0
+        self.code_lang = None
+        self.code_parts: List[str] = []
+        self.table = None
+        self.table_depth = 0
+        self.row: Optional[List[str]] = None
+        self.row_is_header = True
+        self.cell: Optional[List[str]] = None
+        self.link: Optional[Dict[str, Any]] = None
+
+    # --- Zdarzenia parsera ---------------------------------------------------
+
+    def handle_starttag(self, tag, attrs):
+        if tag in SKIP_TAGS:
+            self.skip_depth += 1
+            return
+        if self.skip_depth:
+            return
+
+        attrs = dict(attrs)
+
+        if tag == 'title':
+            self.in_title = True
+        elif tag == 'meta':
+            name = (attrs.get('name') or attrs.get('property') or '').lower()
+            if name in ('description', 'author', 'keywords', 'og:title', 'og:description') and attrs.get('content'):
+                self.result.metadata[name.replace('og:', 'og_')] = attrs['content']
+        elif tag in HEADING_TAGS:
+            self.flush_block()
+            self.heading_level = HEADING_TAGS[tag]
+        elif tag in ('ul', 'ol'):
+            self.flush_block()
+            lst = {'type': 'numeric' if tag == 'ol' else 'bullet', 'items': []}
+            self.list_stack.append(lst)
+            self.list_lines.append([])
+            self.result.lists.append(lst)
+        elif tag == 'li':
+            self.flush_block()
+            self.in_li = True
+        elif tag == 'pre':
+            self.flush_block()
+            self.pre_depth += 1
+            self.code_lang = self._language_from_class(attrs.get('class'))
+            self.code_parts = []
+        elif tag == 'code':
+            if self.pre_depth:
+                self.code_lang = self._language_from_class(attrs.get('class')) or self.code_lang
+            else:
+                self._text('`', '')
+        elif tag == 'table':
+            self.table_depth += 1
+            if self.table_depth == 1:
+                self.flush_block()
+                self.table = {'headers': [], 'rows': [], 'line': self.getpos()[0]}
+        elif tag == 'tr' and self.table_depth == 1:
+            self.row = []
+            self.row_is_header = True
+        elif tag in ('td', 'th') and self.table_depth == 1 and self.row is not None:
+            self.cell = []
+            if tag == 'td':
+                self.row_is_header = False
+        elif tag == 'a':
+            self.link = {'href': attrs.get('href') or '', 'start': len(self.buffer), 'text': []}
+        elif tag == 'img':
+            src = attrs.get('src') or ''
+            alt = attrs.get('alt') or ''
+            self.result.images.append({'alt': alt, 'url': src})
+            self._text(f'![{alt}]({src})', alt)
+        elif tag == 'br':
+            self._text('\n', ' ')
+        elif tag in ('strong', 'b'):
+            self._text('**', '')
+        elif tag in ('em', 'i'):
+            self._text('*', '')
+        elif tag in BLOCK_TAGS:
+            self.flush_block()
+
+    def handle_startendtag(self, tag, attrs):
+        self.handle_starttag(tag, attrs)
+        if tag not in ('img', 'br', 'meta', 'hr'):
+            self.handle_endtag(tag)
+
+    def handle_endtag(self, tag):
+        if tag in SKIP_TAGS:
+            self.skip_depth = max(0, self.skip_depth - 1)
+            return
+        if self.skip_depth:
+            return
+
+        if tag == 'title':
+            self.in_title = False
+            if not self.result.title:
+                self.result.title = ' '.join(''.join(self.title_parts).split()) or None
+        elif tag in HEADING_TAGS:
+            _, text = self._take_block()
+            level = self.heading_level or HEADING_TAGS[tag]
+            self.heading_level = 0
+            if text:
+                self.builder.heading(text, level, self.getpos()[0])
+        elif tag == 'li':
+            self.flush_block()
+            self.in_li = bool(self.list_stack)
+        elif tag in ('ul', 'ol'):
+            self.flush_block()
+            if self.list_stack:
+                lst = self.list_stack.pop()
+                lines = self.list_lines.pop()
+                if not lst['items']:
+                    self.result.lists.remove(lst)
+                if self.list_lines:
+                    # Lista zagnieżdżona - renderowana pod elementem listy nadrzędnej
+                    self.list_lines[-1].extend('  ' + line for line in lines)
+                elif lines:
+                    self.builder.emit('\n'.join(lines))
+            self.in_li = bool(self.list_stack)
+        elif tag == 'pre' and self.pre_depth:
+            self.pre_depth -= 1
+            if not self.pre_depth:
+                code = ''.join(self.code_parts).strip('\n')
+                self.code_parts = []
+                if code.strip():
+                    language = self.code_lang or 'text'
+                    self.result.code_blocks.append({
+                        'language': language,
+                        'code': code,
+                        'position': self.getpos()[0]
+                    })
+                    self.builder.emit(f'```{language if language != "text" else ""}\n{code}\n```')
+        elif tag == 'code' and not self.pre_depth:
+            self._text('`', '')
+        elif tag in ('td', 'th') and self.cell is not None:
+            self.row.append(' '.join(''.join(self.cell).split()))
+            self.cell = None
+        elif tag == 'tr' and self.row is not None and self.table_depth == 1:
+            if self.row:
+                if self.row_is_header and not self.table['headers'] and not self.table['rows']:
+                    self.table['headers'] = self.row
+                else:
+                    self.table['rows'].append(self.row)
+            self.row = None
+        elif tag == 'table' and self.table_depth:
+            self.table_depth -= 1
+            if self.table_depth == 0 and self.table is not None:
+                self._finish_table()
+        elif tag == 'a' and self.link is not None:
+            link = self.link
+            self.link = None
+            text = ' '.join(''.join(link['text']).split())
+            if link['href']:
+                self.result.links.append({'text': text, 'url': link['href'], 'type': 'inline'})
+                if self.cell is None and link['start'] <= len(self.buffer):
+                    del self.buffer[link['start']:]
+                    self.buffer.append(f'[{text}]({link["href"]})')
+        elif tag in ('strong', 'b'):
+            self._text('**', '')
+        elif tag in ('em', 'i'):
+            self._text('*', '')
+        elif tag in BLOCK_TAGS:
+            self.flush_block()
+
+    def handle_data(self, data):
+        if self.skip_depth:
+            return
+        if self.in_title:
+            self.title_parts.append(data)
+        elif self.pre_depth:
+            self.code_parts.append(data)
+        elif self.cell is not None:
+            self.cell.append(data)
+            if self.link is not None:
+                self.link['text'].append(data)
+        else:
+            self._text(data, data)
+            if self.link is not None:
+                self.link['text'].append(data)
+
+    # --- Pomocnicze ----------------------------------------------------------
+
+    def _text(self, formatted: str, plain: str):
+        if self.cell is not None:
+            return
+        self.buffer.append(formatted)
+        self.plain.append(plain)
+
+    def _take_block(self) -> tuple[str, str]:
+        text = re.sub(r'[ \t\r\f\v]+', ' ', ''.join(self.buffer))
+        text = re.sub(r' ?\n ?', '\n', text)
+        text = re.sub(r'\n{2,}', '\n', text).strip()
+        plain = ' '.join(''.join(self.plain).split())
+        self.buffer = []
+        self.plain = []
+        # Puste znaczniki formatowania (** **) nie są treścią
+        if not plain:
+            return '', ''
+        return text, plain
+
+    def flush_block(self):
+        """Zamyka bieżący blok tekstu jako akapit albo element listy"""
+        text, plain = self._take_block()
+        if not text:
+            return
+        if self.heading_level:
+            # Blok otwarty wewnątrz nagłówka - dokończy go znacznik zamykający
+            self.buffer, self.plain = [text], [plain]
+            return
+        if self.in_li and self.list_stack:
+            self.list_stack[-1]['items'].append(text)
+            marker = '1.' if self.list_stack[-1]['type'] == 'numeric' else '-'
+            self.list_lines[-1].append(f'{marker} {text}')
+        else:
+            self.builder.paragraph(text, plain)
+
+    def _finish_table(self):
+        table = self.table
+        self.table = None
+        if not table['headers'] and table['rows']:
+            table['headers'] = table['rows'].pop(0)
+        if not table['headers']:
+            return
+        self.result.tables.append({
+            'headers': table['headers'],
+            'rows': table['rows'],
+            'position': table['line']
+        })
+        width = len(table['headers'])
+        lines = ['| ' + ' | '.join(table['headers']) + ' |', '|' + '---|' * width]
+        for row in table['rows']:
+            padded = (row + [''] * width)[:width]
+            lines.append('| ' + ' | '.join(padded) + ' |')
+        self.builder.emit('\n'.join(lines))
+
+    def _language_from_class(self, css_class: Optional[str]) -> Optional[str]:
+        if not css_class:
+            return None
+        match = re.search(r'(?:language|lang)-([\w+#-]+)', css_class)
+        return match.group(1) if match else None
+
+
+class HtmlParser(BaseParser):
+    """Parser dla stron HTML (.html, .htm)"""
+
+    request_options = {
+        'keep_original': bool
+    }
+
+    def __init__(self, config: Dict[str, Any] = None):
+        default_config = {
+            'encoding': 'utf-8',
+            'chunk_size': READ_CHUNK,
+            'keep_original': True      # parse(): zachowaj oryginalny HTML w `content`
+        }
+        if config:
+            default_config.update(config)
+        super().__init__(default_config)
+
+    def can_parse(self, content: str) -> float:
+        """Wykrywa HTML po doctype/<html> albo typowych znacznikach"""
+        if not content:
+            return 0.0
+
+        head = content[:4096].lstrip().lower()
+        if head.startswith('<!doctype html') or '<html' in head:
+            return 0.95
+        if len(HTML_SIGNAL_RE.findall(head)) >= 3 and not head.startswith('<?xml'):
+            return 0.7
+        return 0.0
+
+    def parse(self, content: str, **kwargs) -> ParsedData:
+        """Parsuje HTML przekazany jako string"""
+        is_valid, errors = self.validate(content)
+        if not is_valid:
+            return ParsedData(format="html", data_type=DataType.TEXT, content=content, errors=errors)
+
+        chunk_size = self.config.get('chunk_size', READ_CHUNK)
+        result = self.parse_stream(content[i:i + chunk_size] for i in range(0, len(content), chunk_size))
+        if self.config.get('keep_original', True):
+            result.content = content
+            result.stats = self.calculate_stats(content)
+        return result
+
+    def parse_file(self, path: str, **kwargs) -> ParsedData:
+        """Parsuje plik HTML porcjami, bez wczytywania całości"""
+        chunk_size = self.config.get('chunk_size', READ_CHUNK)
+        with open(path, 'r', encoding=self.config.get('encoding', 'utf-8'), errors='replace') as f:
+            result = self.parse_stream(iter(lambda: f.read(chunk_size), ''))
+        if not result.title:
+            result.title = Path(path).stem
+        return result
+
+    def parse_stream(self, chunks, **kwargs) -> ParsedData:
+        """
+        Parsuje HTML podawany porcjami (dowolny iterowalny obiekt stringów).
+        W `content` trafia wersja Markdown dokumentu.
+        """
+        result = ParsedData(format="html", data_type=DataType.TEXT, content='')
+        builder = _DocumentBuilder(result)
+        collector = _HtmlCollector(builder)
+
+        for chunk in chunks:
+            collector.feed(chunk)
+        collector.close()
+        collector.flush_block()
+
+        result.content = builder.finish()
+        if not result.title and result.headers:
+            result.title = result.headers[0]['text']
+        if result.code_blocks:
+            result.data_type = DataType.MIXED
+        result.stats = self.calculate_stats(result.content)
+        result.metadata.update({
+            'header_count': len(result.headers),
+            'code_block_count': len(result.code_blocks),
+            'table_count': len(result.tables),
+            'link_count': len(result.links),
+            'image_count': len(result.images)
+        })
+        return result
+
+
+class XmlParser(BaseParser):
+    """
+    Parser dla dokumentów XML (.xml).
+    Każdy rekord staje się sekcją i po przetworzeniu jest usuwany z drzewa.
+    Rekordy to dzieci elementu głównego albo - w eksportach opakowanych
+    (np. RSS: <rss><channel><item>...) - powtarzające się elementy złożone
+    na dowolnej głębokości; pola kontenera (tytuł kanału itp.) trafiają do
+    osobnej sekcji nagłówkowej. Dokumenty XHTML są przekazywane do HtmlParser.
+    """
+
+    request_options = {
+        'max_text_depth': (1, 16),
+        'max_section_lines': (1, 2000),
+        'record_repeats': (2, 1000)
+    }
+
+    def __init__(self, config: Dict[str, Any] = None):
+        default_config = {
+            'encoding': 'utf-8',
+            'max_text_depth': 4,         # Głębokość spłaszczania elementu do treści sekcji
+            'max_section_lines': 200,
+            'record_repeats': 32         # Tyle powtórzeń elementu złożonego - rekordy zapisywane strumieniowo
+        }
+        if config:
+            default_config.update(config)
+        super().__init__(default_config)
+
+    def can_parse(self, content: str) -> float:
+        """Wykrywa XML po deklaracji <?xml albo elemencie głównym"""
+        if not content:
+            return 0.0
+
+        head = content[:4096].lstrip()
+        lower = head.lower()
+        if '<html' in lower:
+            return 0.5  # XHTML - lepiej obsłuży go HtmlParser
+        if lower.startswith('<?xml'):
+            return 0.9
+        if re.match(r'<[A-Za-z_][\w:.-]*[^>]*>', head) and re.search(r'</[A-Za-z_][\w:.-]*>', head) \
+                and len(HTML_SIGNAL_RE.findall(lower)) < 3:
+            return 0.6
+        return 0.0
+
+    def parse(self, content: str, **kwargs) -> ParsedData:
+        """Parsuje XML przekazany jako string"""
+        is_valid, errors = self.validate(content)
+        if not is_valid:
+            return ParsedData(format="xml", data_type=DataType.STRUCTURED, content=content, errors=errors)
+
+        if self._is_xhtml(content[:4096]):
+            result = HtmlParser().parse(content)
+            result.format = "xml"
+            return result
+
+        result = self._parse_source(io.BytesIO(content.encode('utf-8')))
+        self._check_entities(content[:4096], result)
+        result.content = content
+        result.stats = self.calculate_stats(content)
+        return result
+
+    def parse_file(self, path: str, **kwargs) -> ParsedData:
+        """Parsuje plik XML strumieniowo (iterparse)"""
+        with open(path, 'rb') as f:
+            head = f.read(4096).decode('utf-8', errors='replace')
+        if self._is_xhtml(head):
+            result = HtmlParser({'encoding': self.config.get('encoding', 'utf-8')}).parse_file(path)
+            result.format = "xml"
+            return result
+
+        with open(path, 'rb') as f:
+            result = self._parse_source(f)
+        self._check_entities(head, result)
+        if not result.title:
+            result.title = Path(path).stem
+        return result
+
+    def _is_xhtml(self, head: str) -> bool:
+        return bool(re.search(r'<html\b', head, re.IGNORECASE))
+
+    def _check_entities(self, head: str, result: ParsedData):
+        """
+        Encje zadeklarowane w DOCTYPE są rozwijane przez parser (zewnętrzne nie są
+        wczytywane - odwołanie do nich kończy się błędem). Dokument z deklaracjami
+        encji jest odnotowywany w błędach - treść sekcji może różnić się od źródła.
+        """
+        if ENTITY_DECL_RE.search(head):
+            result.errors.append(
+                "Dokument XML deklaruje encje w DOCTYPE (<!ENTITY>) - encje wewnętrzne zostały rozwinięte, "
+                "zewnętrzne nie są obsługiwane"
+            )
+
+    def _parse_source(self, source) -> ParsedData:
+        result = ParsedData(format="xml", data_type=DataType.STRUCTURED, content='')
+        builder = _DocumentBuilder(result)
+        record_counts: Dict[str, int] = {}
+        repeats = max(self.config.get('record_repeats', 32), 2)
+
+        root = None
+        # Otwarte elementy: [element, {tag: liczba dzieci złożonych}, tag rekordów (kontener strumieniowy), tytuł]
+        stack: List[list] = []
+        streaming = 0           # Liczba otwartych kontenerów strumieniowych (rekordy w rekordach nie są dzielone)
+
+        def emit(elem, title: Optional[str] = None, children: Optional[list] = None):
+            """Sekcja elementu (`children` - tylko te dzieci, np. pola kontenera bez rekordów)"""
+            if title is None:
+                tag = self._local(elem.tag)
+                record_counts[tag] = record_counts.get(tag, 0) + 1
+                title = self._record_title(elem) or f"{tag} {record_counts[tag]}"
+            lines = self._flatten(elem, children)
+            builder.heading(title, 2, len(result.sections) + 1)
+            if lines:
+                builder.emit('\n'.join(lines))
+            for child in ([elem] if children is None else children):
+                self._collect_links(child, result)
+
+        def split(container, tag: str, last=None) -> str:
+            """
+            Sekcja z polami kontenera i sekcja dla każdego rekordu; przetworzone dzieci
+            (do `last` włącznie) usuwane z drzewa. iterparse buduje drzewo z wyprzedzeniem,
+            więc dalsze dzieci mogą już istnieć - zostaną obsłużone przy swoich zdarzeniach.
+            """
+            children = list(container)
+            if last is not None:
+                children = children[:children.index(last) + 1]
+            title = self._record_title(container) or self._local(container.tag)
+            header = [child for child in children if self._local(child.tag) != tag]
+            if header or container.attrib:
+                emit(container, title, header)
+            for child in children:
+                if self._local(child.tag) == tag:
+                    emit(child)
+                container.remove(child)
+            return title
+
+        try:
+            for event, elem in ET.iterparse(source, events=('start', 'end')):
+                if event == 'start':
+                    if root is None:
+                        root = elem
+                    stack.append([elem, {}, None, None])
+                    continue
+
+                _, counts, record_tag, container_title = stack.pop()
+                if record_tag is not None:
+                    streaming -= 1
+                    # Pola kontenera po ostatnim rekordzie (bez atrybutów - są już w nagłówku)
+                    if len(stack) == 1 and len(elem):
+                        rest = ET.Element(elem.tag)
+                        rest.extend(list(elem))
+                        emit(rest, container_title)
+                if not stack:
+                    continue
+
+                parent = stack[-1]
+                tag = self._local(elem.tag)
+                if len(stack) == 1:
+                    # Koniec dziecka elementu głównego - sekcja (lub nagłówek i rekordy) i zwolnienie
+                    if record_tag is None:
+                        repeated = [t for t, n in counts.items() if n >= 2]
+                        if repeated:
+                            split(elem, max(repeated, key=counts.get))
+                        else:
+                            emit(elem)
+                    root.clear()
+                    continue
+
+                if not len(elem):
+                    continue        # Pole proste - zostaje w rodzicu
+                if parent[2] == tag:
+                    emit(elem)
+                    parent[0].remove(elem)
+                    continue
+                parent[1][tag] = parent[1].get(tag, 0) + 1
+                if parent[2] is None and not streaming and parent[1][tag] >= repeats:
+                    # Powtarzający się element złożony - kontener przechodzi w tryb strumieniowy
+                    parent[2] = tag
+                    streaming += 1
+                    parent[3] = split(parent[0], tag, elem)
+        except ET.ParseError as e:
+            result.errors.append(f"XML parsing error: {e}")
+            result.confidence = 0.0
+
+        if root is not None and not result.sections and not result.errors \
+                and (len(root) or (root.text or '').strip() or root.attrib):
+            # Element główny bez rekordów (np. sam tekst) - jedna sekcja zamiast pustego wyniku
+            emit(root, root.get('title') or root.get('name') or self._local(root.tag))
+
+        if root is not None:
+            root_tag = self._local(root.tag)
+            result.title = root.get('title') or root.get('name') or root_tag
+            result.raw_structure = {
+                'root': root_tag,
+                'attributes': dict(root.attrib),
+                'children': record_counts
+            }
+            result.metadata.update({
+                'root': root_tag,
+                'record_count': sum(record_counts.values()),
+                'record_types': record_counts
+            })
+
+        result.content = builder.finish()
+        return result
+
+    def _flatten(self, elem, children: Optional[list] = None) -> List[str]:
+        """
+        Spłaszcza element do linii 'ścieżka: tekst' (ograniczona głębokość i długość);
+        `children` zastępuje listę dzieci elementu (np. pola kontenera bez rekordów).
+        """
+        lines = []
+        max_lines = self.config.get('max_section_lines', 200)
+        stack = [(elem, '', 0)]
+        while stack and len(lines) < max_lines:
+            node, path, level = stack.pop()
+            for key, value in node.attrib.items():
+                lines.append(f"- {path}@{self._local(key)}: {value}" if path else f"- @{self._local(key)}: {value}")
+            text = (node.text or '').strip()
+            if text and path:
+                lines.append(f"- {path}: {' '.join(text.split())}")
+            elif text:
+                lines.append(' '.join(text.split()))
+            if level < self.config.get('max_text_depth', 4):
+                for child in reversed(children if children is not None and level == 0 else list(node)):
+                    child_path = f"{path}/{self._local(child.tag)}" if path else self._local(child.tag)
+                    stack.append((child, child_path, level + 1))
+        return lines[:max_lines]
+
+    def _record_title(self, elem) -> Optional[str]:
+        for attr in ('title', 'name'):
+            if elem.get(attr):
+                return elem.get(attr)
+        for child in elem:
+            if self._local(child.tag) in ('title', 'name') and child.text and child.text.strip():
+                return child.text.strip()
+        return elem.get('id')
+
+    def _collect_links(self, elem, result: ParsedData):
+        for node in elem.iter():
+            href = node.get('href') or node.get('{http://www.w3.org/1999/xlink}href')
+            if href:
+                result.links.append({'text': (node.text or '').strip(), 'url': href, 'type': 'xml'})
+
+    def _local(self, tag: str) -> str:
+        return tag.rsplit('}', 1)[-1] if isinstance(tag, str) else str(tag)
@@ -11,6 +11,11 @@ from .base_parser import BaseParser, ParsedData, DataType
 class JsonParser(BaseParser):
     """Parser dla plików JSON"""
     
+    request_options = {
+        'allow_comments': bool,
+        'max_depth': (1, 100)
+    }
+    
     def __init__(self, config: Dict[str, Any] = None):
         default_config = {
             'strict_mode': True,
@@ -10,6 +10,10 @@ from .base_parser import BaseParser, ParsedData, DataType
 class MarkdownParser(BaseParser):
     """Parser dla plików Markdown (.md)"""
     
+    request_options = {
+        'parse_frontmatter': bool
+    }
+    
     def __init__(self, config: Dict[str, Any] = None):
         default_config = {
             'flavor': 'CommonMark',
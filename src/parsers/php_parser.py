@@ -0,0 +1,736 @@
+"""
+PHP Parser - Parser dla plików PHP (konfiguracje, klasy, skrypty)
+
+Statyczna analiza bez wykonywania kodu: jednoprzebiegowy tokenizer
+i parser działające w czasie liniowym względem długości pliku.
+"""
+
+import json
+import re
+from typing import Dict, List, Any, Optional
+from .base_parser import BaseParser, ParsedData, DataType
+
+
+# Typy tokenów
+T_INLINE_HTML = 'inline_html'
+T_OPEN_TAG = 'open_tag'
+T_CLOSE_TAG = 'close_tag'
+T_COMMENT = 'comment'
+T_DOC_COMMENT = 'doc_comment'
+T_VARIABLE = 'variable'
+T_IDENT = 'ident'
+T_STRING = 'string'
+T_NUMBER = 'number'
+T_OP = 'op'
+
+_IDENT_RE = re.compile(r'\\?[A-Za-z_\x80-\uffff][\w\x80-\uffff]*(?:\\[A-Za-z_\x80-\uffff][\w\x80-\uffff]*)*')
+_NUMBER_RE = re.compile(
+    r'0[xX][0-9a-fA-F_]+|0[bB][01_]+|(?:\d[\d_]*)?\.\d[\d_]*(?:[eE][+-]?\d+)?|\d[\d_]*\.?(?:[eE][+-]?\d+)?'
+)
+_HEREDOC_RE = re.compile(r'<<<[ \t]*(["\']?)([A-Za-z_]\w*)\1\r?\n')
+_OPEN_TAG_RE = re.compile(r'<\?(?:php\b|=)', re.IGNORECASE)
+_SQ_ESCAPE_RE = re.compile(r"\\([\\'])")
+
+# Operatory wieloznakowe (najdłuższe najpierw)
+_MULTI_OPS = ['<=>', '**=', '...', '??=', '<<=', '>>=', '===', '!==', '?->',
+              '=>', '->', '::', '==', '!=', '<>', '<=', '>=', '&&', '||', '??',
+              '++', '--', '+=', '-=', '*=', '/=', '.=', '%=', '&=', '|=', '^=',
+              '<<', '>>', '**']
+
+# Jedna alternatywa na typ tokenu - dopasowanie zawsze od bieżącej pozycji,
+# bez cofania się w źródle. Białe znaki są zjadane przed tokenem.
+_TOKEN_RE = re.compile(
+    r'\s*(?:'
+    r"(?P<sq>'(?:[^'\\]|\\.)*')"
+    r'|(?P<close>\?>)'
+    r'|(?P<heredoc><<<[ \t]*(?P<hq>["\']?)[A-Za-z_]\w*(?P=hq)\r?\n)'
+    r'|(?P<doc>/\*.*?\*/)'
+    r'|(?P<comment>(?://|#(?!\[))[^\n?]*(?:\?(?!>)[^\n?]*)*)'
+    r'|(?P<num>' + _NUMBER_RE.pattern + r')'
+    r'|(?P<op>' + '|'.join(re.escape(op) for op in _MULTI_OPS) + r'|[^\w\s$\'"\\\x80-\uffff])'
+    r'|(?P<ident>' + _IDENT_RE.pattern + r')'
+    r'|(?P<var>\$[A-Za-z_\x80-\uffff][\w\x80-\uffff]*)'
+    r'|(?P<dq>"(?:[^"\\]|\\.)*")'
+    r'|(?P<unclosed>[\'"]|/\*)'
+    r'|(?P<other>\S)'
+    r')',
+    re.DOTALL
+)
+
+_SIMPLE_ESCAPES = {'n': '\n', 't': '\t', 'r': '\r', 'v': '\v', 'f': '\f',
+                   '0': '\0', 'e': '\x1b', '\\': '\\', '$': '$', '"': '"'}
+_DQ_ESCAPE_RE = re.compile(r'\\([ntrvf0e\\$"])')
+
+_CLASS_KEYWORDS = {'class', 'interface', 'trait', 'enum'}
+_INCLUDE_KEYWORDS = {'require', 'require_once', 'include', 'include_once'}
+
+
+class Token:
+    """Token PHP z pozycją w źródle"""
+
+    __slots__ = ('type', 'value', 'start', 'end')
+
+    def __init__(self, type: str, value: Any, start: int, end: int):
+        self.type = type
+        self.value = value
+        self.start = start
+        self.end = end
+
+    def is_op(self, op: str) -> bool:
+        return self.type == T_OP and self.value == op
+
+    def is_ident(self, name: str) -> bool:
+        return self.type == T_IDENT and self.value.lower() == name
+
+    def __repr__(self):
+        return f"Token({self.type}, {self.value!r})"
+
+
+class PhpTokenizer:
+    """Jednoprzebiegowy tokenizer PHP (każdy znak odwiedzany raz)"""
+
+    def __init__(self, source: str):
+        self.source = source
+        self.errors: List[str] = []
+
+    def tokenize(self) -> List[Token]:
+        src = self.source
+        n = len(src)
+        tokens: List[Token] = []
+        append = tokens.append
+        match_token = _TOKEN_RE.match
+        i = 0
+        in_php = False
+
+        while i < n:
+            if not in_php:
+                match = _OPEN_TAG_RE.search(src, i)
+                end = match.start() if match else n
+                if end > i:
+                    append(Token(T_INLINE_HTML, src[i:end], i, end))
+                if match:
+                    append(Token(T_OPEN_TAG, match.group(0), match.start(), match.end()))
+                    in_php = True
+                    i = match.end()
+                else:
+                    i = n
+                continue
+
+            match = match_token(src, i)
+            if match is None:
+                break  # Same białe znaki do końca pliku
+            kind = match.lastgroup
+            end = match.end()
+            i = match.start(kind)
+
+            if kind == 'op':
+                append(Token(T_OP, match.group(kind), i, end))
+            elif kind == 'sq':
+                text = match.group(kind)[1:-1]
+                if '\\' in text:
+                    text = _SQ_ESCAPE_RE.sub(r'\1', text)
+                append(Token(T_STRING, text, i, end))
+            elif kind == 'ident':
+                append(Token(T_IDENT, match.group(kind), i, end))
+            elif kind == 'num':
+                append(Token(T_NUMBER, self._parse_number(match.group(kind)), i, end))
+            elif kind == 'var':
+                append(Token(T_VARIABLE, match.group(kind)[1:], i, end))
+            elif kind == 'dq':
+                append(Token(T_STRING, self._unescape_double(match.group(kind)[1:-1]), i, end))
+            elif kind == 'close':
+                append(Token(T_CLOSE_TAG, '?>', i, end))
+                append(Token(T_OP, ';', i, i))  # ?> domyka instrukcję
+                in_php = False
+            elif kind == 'doc':
+                text = match.group(kind)
+                kind_type = T_DOC_COMMENT if text.startswith('/**') and len(text) > 4 else T_COMMENT
+                append(Token(kind_type, text, i, end))
+            elif kind == 'comment':
+                append(Token(T_COMMENT, match.group(kind), i, end))
+            elif kind == 'heredoc':
+                end = self._read_heredoc(i, _HEREDOC_RE.match(src, i), tokens)
+            elif kind == 'unclosed':
+                # Niezamknięty string/komentarz - reszta pliku to jeden token
+                self.errors.append(f"Niezamknięty string lub komentarz od pozycji {i}")
+                append(Token(T_STRING, src[i + 1:], i, n))
+                end = n
+            else:
+                append(Token(T_OP, match.group(kind), i, end))
+
+            i = end
+
+        return tokens
+
+    def _read_heredoc(self, i: int, match, tokens: List[Token]) -> int:
+        src = self.source
+        quote, label = match.group(1), match.group(2)
+        closing = re.compile(r'^([ \t]*)' + re.escape(label) + r'\b', re.MULTILINE)
+        end_match = closing.search(src, match.end())
+        indent = ''
+        if not end_match:
+            self.errors.append(f"Niezamknięty heredoc '{label}' od pozycji {i}")
+            body_end = len(src)
+            end = len(src)
+        else:
+            body_end = max(match.end(), end_match.start() - 1)
+            end = end_match.end()
+            indent = end_match.group(1)
+        body = src[match.end():body_end]
+        if indent:
+            # Wcięcie znacznika zamykającego jest usuwane z każdej linii (PHP 7.3+)
+            body = '\n'.join(line[len(indent):] if line.startswith(indent) else line.lstrip(' \t')
+                             for line in body.split('\n'))
+        if quote != "'":
+            body = self._unescape_double(body)
+        tokens.append(Token(T_STRING, body, i, end))
+        return end
+
+    def _unescape_double(self, text: str) -> str:
+        """Dekoduje podstawowe sekwencje ucieczki (interpolacja zostaje dosłownie)"""
+        if '\\' not in text:
+            return text
+        return _DQ_ESCAPE_RE.sub(lambda m: _SIMPLE_ESCAPES[m.group(1)], text)
+
+    def _parse_number(self, text: str):
+        clean = text.replace('_', '')
+        try:
+            if clean[:2].lower() == '0x':
+                return int(clean, 16)
+            if clean[:2].lower() == '0b':
+                return int(clean, 2)
+            if any(ch in clean for ch in '.eE'):
+                return float(clean)
+            if len(clean) > 1 and clean[0] == '0':
+                return int(clean, 8)
+            return int(clean)
+        except ValueError:
+            return text
+
+
+class PhpParser(BaseParser):
+    """Parser dla plików PHP (.php)"""
+
+    request_options = {
+        'extract_variables': bool,
+        'extract_functions': bool,
+        'extract_classes': bool,
+        'parse_phpdoc': bool,
+        'max_depth': (1, 100)
+    }
+
+    def __init__(self, config: Dict[str, Any] = None):
+        default_config = {
+            'parse_mode': 'config_array',
+            'execute_php': False,          # Nigdy nie wykonujemy kodu - tylko analiza statyczna
+            'extract_variables': True,
+            'extract_functions': True,
+            'extract_classes': True,
+            'parse_phpdoc': True,
+            'safe_mode': True,
+            'max_depth': 100
+        }
+        if config:
+            default_config.update(config)
+        super().__init__(default_config)
+
+    def can_parse(self, content: str) -> float:
+        """Wykrywa czy zawartość to PHP"""
+        if not content:
+            return 0.0
+
+        head = content[:4096]
+        if re.search(r'<\?php\b', head, re.IGNORECASE):
+            return 0.95
+        if '<?=' in head:
+            return 0.7
+        return 0.0
+
+    def parse(self, content: str, **kwargs) -> ParsedData:
+        """Parsuje plik PHP"""
+        is_valid, errors = self.validate(content)
+
+        result = ParsedData(
+            format="php",
+            data_type=DataType.CODE,
+            content=content,
+            errors=errors
+        )
+
+        if not is_valid:
+            return result
+
+        result.stats = self.calculate_stats(content)
+
+        tokenizer = PhpTokenizer(content)
+        tokens = tokenizer.tokenize()
+        result.errors.extend(tokenizer.errors)
+
+        analysis = _PhpAnalyzer(content, tokens, self.config, result.errors).run()
+
+        # Dane: `return [...]` ma pierwszeństwo, potem tablice przypisane do zmiennych
+        if analysis['return_value'] is not None:
+            result.raw_structure = analysis['return_value']
+        elif self.config.get('extract_variables', True) and analysis['variables']:
+            result.raw_structure = analysis['variables']
+
+        has_html = any(t.type == T_INLINE_HTML and t.value.strip() for t in tokens)
+        has_code = bool(analysis['functions'] or analysis['classes'])
+        if isinstance(result.raw_structure, (dict, list)) and not has_code and not has_html:
+            result.data_type = DataType.STRUCTURED
+        elif has_html:
+            result.data_type = DataType.MIXED
+
+        # Bloki kodu
+        if self.config.get('extract_classes', True):
+            result.code_blocks.extend(analysis['classes'])
+        if self.config.get('extract_functions', True):
+            result.code_blocks.extend(analysis['functions'])
+        result.code_blocks.sort(key=lambda block: block['position'])
+
+        # Sekcje - jak w JsonParser dla danych, w przeciwnym razie z bloków kodu
+        result.sections = self._create_sections(result.raw_structure, result.code_blocks)
+
+        result.title = self._extract_title(result.raw_structure, analysis)
+
+        result.metadata = {
+            'namespace': analysis['namespace'],
+            'uses': analysis['uses'],
+            'includes': analysis['includes'],
+            'constants': analysis['constants'],
+            'variables': list(analysis['variables'].keys()),
+            'functions': [{'name': f['name'], 'signature': f['signature']} for f in analysis['functions']],
+            'classes': [{'name': c['name'], 'kind': c['kind'], 'methods': c['methods']}
+                        for c in analysis['classes']],
+            'has_return_array': analysis['return_value'] is not None,
+            'has_inline_html': has_html,
+            'token_count': len(tokens)
+        }
+
+        return result
+
+    def _create_sections(self, data: Any, code_blocks: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        sections = []
+
+        if isinstance(data, dict):
+            for key, value in data.items():
+                sections.append({
+                    'title': str(key),
+                    'level': 1,
+                    'content': json.dumps(value, indent=2),
+                    'data': value
+                })
+        elif isinstance(data, list):
+            for i, item in enumerate(data):
+                sections.append({
+                    'title': f"Item {i + 1}",
+                    'level': 1,
+                    'content': json.dumps(item, indent=2),
+                    'data': item
+                })
+
+        for block in code_blocks:
+            content = block['code']
+            if block.get('doc') and self.config.get('parse_phpdoc', True):
+                content = f"{block['doc']}\n\n{content}"
+            sections.append({
+                'title': f"{block['kind']} {block['name']}",
+                'level': 2 if sections else 1,
+                'content': content
+            })
+
+        return sections
+
+    def _extract_title(self, data: Any, analysis: Dict[str, Any]) -> Optional[str]:
+        if isinstance(data, dict):
+            for title_field in ['title', 'name', 'label', 'id']:
+                if title_field in data and not isinstance(data[title_field], (dict, list)):
+                    return str(data[title_field])
+        if analysis['classes']:
+            return analysis['classes'][0]['name']
+        if analysis['file_doc']:
+            return analysis['file_doc']
+        return None
+
+
+class _PhpAnalyzer:
+    """
+    Jednoprzebiegowa analiza strumienia tokenów: tablice, stałe, funkcje,
+    klasy, namespace i include. Indeks tokenu tylko rośnie - czas liniowy.
+    """
+
+    def __init__(self, source: str, tokens: List[Token], config: Dict[str, Any], errors: List[str]):
+        self.source = source
+        # Komentarze nie biorą udziału w analizie, ale PHPDoc przypinamy do deklaracji
+        self.tokens = [t for t in tokens if t.type not in (T_COMMENT, T_INLINE_HTML, T_OPEN_TAG, T_CLOSE_TAG)]
+        self.config = config
+        self.errors = errors
+        self.pos = 0
+
+    def run(self) -> Dict[str, Any]:
+        result = {
+            'return_value': None,
+            'variables': {},
+            'constants': {},
+            'functions': [],
+            'classes': [],
+            'namespace': None,
+            'uses': [],
+            'includes': [],
+            'file_doc': None
+        }
+
+        tokens = self.tokens
+        depth = 0
+        class_stack: List[tuple] = []   # (block, głębokość otwarcia)
+        pending_doc = None
+
+        while self.pos < len(tokens):
+            tok = tokens[self.pos]
+
+            if tok.type == T_DOC_COMMENT:
+                pending_doc = tok.value
+                if result['file_doc'] is None and not result['classes'] and not result['functions']:
+                    result['file_doc'] = self._doc_summary(tok.value)
+                self.pos += 1
+                continue
+
+            if tok.type == T_OP:
+                if tok.value == '{':
+                    depth += 1
+                elif tok.value == '}':
+                    depth -= 1
+                    if class_stack and depth == class_stack[-1][1]:
+                        block, _ = class_stack.pop()
+                        block['code'] = self.source[block['position']:tok.end]
+                elif tok.value == ';':
+                    pending_doc = None
+                self.pos += 1
+                continue
+
+            at_top = depth == 0 or (class_stack and depth == class_stack[-1][1] + 1)
+
+            if tok.type == T_IDENT:
+                word = tok.value.lower()
+
+                if word == 'return' and depth == 0 and result['return_value'] is None:
+                    self.pos += 1
+                    if self._at_array():
+                        result['return_value'] = self._parse_value(0)
+                    continue
+
+                if word == 'namespace' and depth == 0:
+                    name = self._peek(1)
+                    if name and name.type == T_IDENT:
+                        result['namespace'] = name.value
+                    self.pos += 1
+                    continue
+
+                if word == 'use' and depth == 0:
+                    name = self._peek(1)
+                    if name and name.type == T_IDENT:
+                        result['uses'].append(name.value)
+                    self.pos += 1
+                    continue
+
+                if word in _INCLUDE_KEYWORDS:
+                    target = self._peek(1)
+                    if target and target.is_op('('):
+                        target = self._peek(2)
+                    if target and target.type == T_STRING:
+                        result['includes'].append({'type': word, 'path': target.value})
+                    self.pos += 1
+                    continue
+
+                if word == 'define':
+                    self._parse_define(result['constants'])
+                    continue
+
+                if word == 'const' and at_top:
+                    self._parse_const(result['constants'], class_stack[-1][0]['name'] if class_stack and depth else None)
+                    continue
+
+                if word in _CLASS_KEYWORDS and at_top and depth == 0:
+                    name = self._peek(1)
+                    prev = tokens[self.pos - 1] if self.pos else None
+                    if name and name.type == T_IDENT and not (prev and prev.is_op('::')):
+                        block = self._start_block(word, name.value, tok, pending_doc)
+                        result['classes'].append(block)
+                        class_stack.append((block, depth))
+                        pending_doc = None
+                    self.pos += 1
+                    continue
+
+                if word == 'function':
+                    name = self._peek(1)
+                    if name and name.is_op('&'):
+                        name = self._peek(2)
+                    if name and name.type == T_IDENT:
+                        signature = self._signature_from(tok)
+                        if class_stack and depth == class_stack[-1][1] + 1:
+                            class_stack[-1][0]['methods'].append(name.value)
+                        elif depth == 0:
+                            block = self._start_block('function', name.value, tok, pending_doc)
+                            block['signature'] = signature
+                            self._finish_function(block)
+                            result['functions'].append(block)
+                            pending_doc = None
+                            continue
+                    self.pos += 1
+                    continue
+
+            if tok.type == T_VARIABLE and depth == 0 and self.config.get('extract_variables', True):
+                nxt = self._peek(1)
+                if nxt and nxt.is_op('='):
+                    self.pos += 2
+                    if self._at_array():
+                        result['variables'][tok.value] = self._parse_value(0)
+                    continue
+
+            self.pos += 1
+
+        # Niezamknięte klasy - kod do końca pliku
+        for block, _ in class_stack:
+            block['code'] = self.source[block['position']:]
+            self.errors.append(f"Niezamknięta deklaracja {block['kind']} {block['name']}")
+
+        return result
+
+    # --- Deklaracje -------------------------------------------------------
+
+    def _start_block(self, kind: str, name: str, tok: Token, doc: Optional[str]) -> Dict[str, Any]:
+        # Modyfikatory przed deklaracją (abstract, final, readonly) należą do bloku
+        start = tok.start
+        k = self.pos - 1
+        while k >= 0 and self.tokens[k].type == T_IDENT and \
+                self.tokens[k].value.lower() in ('abstract', 'final', 'readonly'):
+            start = self.tokens[k].start
+            k -= 1
+        return {
+            'language': 'php',
+            'kind': kind,
+            'name': name,
+            'code': None,           # Ustawiany po domknięciu bloku (bez kopii reszty pliku)
+            'position': start,
+            'doc': doc if self.config.get('parse_phpdoc', True) else None,
+            'methods': [],
+            'signature': None
+        }
+
+    def _signature_from(self, tok: Token) -> str:
+        """Sygnatura funkcji: od słowa `function` do `{` lub `;`"""
+        tokens = self.tokens
+        k = self.pos
+        paren = 0
+        while k < len(tokens):
+            t = tokens[k]
+            if t.is_op('('):
+                paren += 1
+            elif t.is_op(')'):
+                paren -= 1
+            elif paren == 0 and (t.is_op('{') or t.is_op(';')):
+                break
+            k += 1
+            # Sygnatury są krótkie - nie skanujemy w nieskończoność
+            if k - self.pos > 256:
+                break
+        end = tokens[k - 1].end if k > self.pos else tok.end
+        return ' '.join(self.source[tok.start:end].split())
+
+    def _finish_function(self, block: Dict[str, Any]):
+        """Przesuwa kursor za ciało funkcji top-level i ustawia jej kod"""
+        tokens = self.tokens
+        depth = 0
+        paren = 0
+        while self.pos < len(tokens):
+            t = tokens[self.pos]
+            self.pos += 1
+            if t.is_op('('):
+                paren += 1
+            elif t.is_op(')'):
+                paren -= 1
+            elif t.is_op(';') and depth == 0 and paren == 0:
+                block['code'] = self.source[block['position']:t.end]
+                return
+            elif t.is_op('{'):
+                depth += 1
+            elif t.is_op('}'):
+                depth -= 1
+                if depth == 0:
+                    block['code'] = self.source[block['position']:t.end]
+                    return
+        block['code'] = self.source[block['position']:]
+        self.errors.append(f"Niezamknięta funkcja {block['name']}")
+
+    def _parse_define(self, constants: Dict[str, Any]):
+        # define('NAME', value)
+        self.pos += 1
+        if not self._expect('('):
+            return
+        name = self._current()
+        if not name or name.type != T_STRING:
+            return
+        self.pos += 1
+        if not self._expect(','):
+            return
+        constants[name.value] = self._parse_value(0, terminators=(')',))
+
+    def _parse_const(self, constants: Dict[str, Any], class_name: Optional[str]):
+        # const NAME = value[, NAME2 = value2];
+        self.pos += 1
+        while True:
+            name = self._current()
+            # Opcjonalny typ stałej (PHP 8.3): const string NAME = ...
+            if name and name.type == T_IDENT and self._peek(1) and self._peek(1).type == T_IDENT:
+                self.pos += 1
+                name = self._current()
+            if not name or name.type != T_IDENT:
+                return
+            self.pos += 1
+            if not self._expect('='):
+                return
+            key = f"{class_name}::{name.value}" if class_name else name.value
+            constants[key] = self._parse_value(0, terminators=(',', ';'))
+            if not self._expect(','):
+                return
+
+    # --- Wartości ---------------------------------------------------------
+
+    def _at_array(self) -> bool:
+        tok = self._current()
+        if tok is None:
+            return False
+        if tok.is_op('['):
+            return True
+        return tok.is_ident('array') and self._peek(1) is not None and self._peek(1).is_op('(')
+
+    def _parse_value(self, depth: int, terminators: tuple = (',', ']', ')', ';')) -> Any:
+        """Parsuje literał (tablica, string, liczba, bool, null) lub zwraca wyrażenie jako tekst"""
+        if depth > self.config.get('max_depth', 100):
+            self.errors.append("Przekroczono maksymalną głębokość tablicy")
+            return self._skip_expression(terminators)
+
+        tok = self._current()
+        if tok is None:
+            return None
+
+        start_pos = self.pos
+        value = None
+        simple = True
+
+        if tok.is_op('['):
+            self.pos += 1
+            value = self._parse_array_items(depth, ']')
+        elif tok.is_ident('array') and self._peek(1) is not None and self._peek(1).is_op('('):
+            self.pos += 2
+            value = self._parse_array_items(depth, ')')
+        elif tok.type in (T_STRING, T_NUMBER):
+            value = tok.value
+            self.pos += 1
+        elif tok.is_op('-') and self._peek(1) is not None and self._peek(1).type == T_NUMBER:
+            value = -self._peek(1).value if not isinstance(self._peek(1).value, str) else '-' + self._peek(1).value
+            self.pos += 2
+        elif tok.type == T_IDENT and tok.value.lower() in ('true', 'false', 'null'):
+            value = {'true': True, 'false': False, 'null': None}[tok.value.lower()]
+            self.pos += 1
+        else:
+            simple = False
+
+        # Literał zakończony - albo dalej jest wyrażenie (np. 'a' . 'b', env('X'))
+        nxt = self._current()
+        if simple and (nxt is None or (nxt.type == T_OP and nxt.value in terminators)):
+            return value
+
+        self.pos = start_pos
+        return self._skip_expression(terminators)
+
+    def _parse_array_items(self, depth: int, closing: str) -> Any:
+        items: List[tuple] = []
+        next_index = 0
+        is_list = True
+
+        while True:
+            tok = self._current()
+            if tok is None:
+                self.errors.append("Niezamknięta tablica")
+                break
+            if tok.is_op(closing):
+                self.pos += 1
+                break
+            if tok.is_op(','):
+                self.pos += 1
+                continue
+            if tok.type == T_DOC_COMMENT:
+                self.pos += 1
+                continue
+
+            value = self._parse_value(depth + 1, terminators=(',', closing, '=>'))
+            after = self._current()
+            if after is not None and after.is_op('=>'):
+                self.pos += 1
+                key = value
+                value = self._parse_value(depth + 1, terminators=(',', closing))
+                if isinstance(key, bool) or key is None:
+                    key = int(bool(key)) if key is not None else ''
+                if isinstance(key, float):
+                    key = int(key)
+                if not isinstance(key, (str, int)):
+                    key = str(key)
+                if key != next_index:
+                    is_list = False
+                if isinstance(key, int) and key >= next_index:
+                    next_index = key + 1
+                items.append((key, value))
+            else:
+                items.append((next_index, value))
+                next_index += 1
+
+        if is_list:
+            return [value for _, value in items]
+        return {key: value for key, value in items}
+
+    def _skip_expression(self, terminators: tuple) -> Optional[str]:
+        """Pomija wyrażenie do terminatora na zerowej głębokości i zwraca jego źródło"""
+        tokens = self.tokens
+        start = self.pos
+        depth = 0
+        while self.pos < len(tokens):
+            t = tokens[self.pos]
+            if t.type == T_OP:
+                if t.value in ('(', '[', '{'):
+                    depth += 1
+                elif t.value in (')', ']', '}'):
+                    if depth == 0:
+                        break
+                    depth -= 1
+                elif depth == 0 and t.value in terminators:
+                    break
+            self.pos += 1
+        if self.pos == start:
+            return None
+        end_tok = tokens[self.pos - 1]
+        return self.source[tokens[start].start:end_tok.end]
+
+    # --- Pomocnicze -------------------------------------------------------
+
+    def _current(self) -> Optional[Token]:
+        return self.tokens[self.pos] if self.pos < len(self.tokens) else None
+
+    def _peek(self, offset: int) -> Optional[Token]:
+        k = self.pos + offset
+        return self.tokens[k] if k < len(self.tokens) else None
+
+    def _expect(self, op: str) -> bool:
+        tok = self._current()
+        if tok is not None and tok.is_op(op):
+            self.pos += 1
+            return True
+        return False
+
+    def _doc_summary(self, doc: str) -> Optional[str]:
+        """Pierwsza linia opisu z komentarza PHPDoc"""
+        for line in doc.strip('/*').split('\n'):
+            line = line.strip().lstrip('*').strip()
+            if line and not line.startswith('@'):
+                return line
+        return None
@@ -10,6 +10,11 @@ from .base_parser import BaseParser, ParsedData, DataType
 class TxtParser(BaseParser):
     """Parser dla plików tekstowych (.txt)"""
     
+    request_options = {
+        'detect_headers': bool,
+        'first_line_as_title': bool
+    }
+    
     def __init__(self, config: Dict[str, Any] = None):
         default_config = {
             'encoding': 'utf-8',
@@ -3,26 +3,39 @@ Transformer Manager
 Inicjalizuje transformery i zapewnia łatwy dostęp
 """
 
-from .base_transformer import transformer_registry, TransformedData
-from .github_transformer import GitHubTransformer
-from .chatgpt_transformer import ChatGPTTransformer
-from ..parsers.base_parser import ParsedData
+from .base_transformer import transformer_registry, TransformedData, StreamedFile
+from ..parsers.base_parser import ParsedData, import_object
+
+
+# Klasy transformerów eksportowane leniwie {nazwa: moduł}
+_LAZY_EXPORTS = {
+    'GitHubTransformer': 'github_transformer',
+    'ChatGPTTransformer': 'chatgpt_transformer',
+    'RAGTransformer': 'rag_transformer',
+    'ProjectBriefTransformer': 'project_brief_transformer'
+}
+
+
+def _target(class_name: str) -> str:
+    return f"{__name__}.{_LAZY_EXPORTS[class_name]}:{class_name}"
 
 
 def init_transformers():
-    """Inicjalizuje i rejestruje wszystkie transformery"""
-    transformer_registry.register('github', GitHubTransformer())
-    transformer_registry.register('chatgpt', ChatGPTTransformer())
-    # PROJECT_BRIEF będzie dodany później
+    """Rejestruje wszystkie transformery (moduły importowane przy pierwszym użyciu)"""
+    transformer_registry.register_lazy('github', _target('GitHubTransformer'))
+    transformer_registry.register_lazy('chatgpt', _target('ChatGPTTransformer'))
+    transformer_registry.register_lazy('rag', _target('RAGTransformer'))
+    transformer_registry.register_lazy('project_brief', _target('ProjectBriefTransformer'))
 
 
-def transform_data(destination: str, parsed_data: ParsedData, **kwargs) -> TransformedData:
+def transform_data(destination: str, parsed_data: ParsedData, config: dict = None, **kwargs) -> TransformedData:
     """
     Główna funkcja transformująca dane.
     
     Args:
-        destination: Typ destinacji ('github', 'chatgpt', 'project_brief')
+        destination: Typ destinacji ('github', 'chatgpt', 'rag', 'project_brief')
         parsed_data: Sparsowane dane
+        config: Opcjonalne nadpisania konfiguracji transformera (np. {'max_tokens': 4000})
         **kwargs: Dodatkowe parametry dla transformera
         
     Returns:
@@ -32,17 +45,49 @@ def transform_data(destination: str, parsed_data: ParsedData, **kwargs) -> Trans
     if not transformer_registry.list_destinations():
         init_transformers()
     
-    return transformer_registry.transform(destination, parsed_data, **kwargs)
+    return transformer_registry.transform(destination, parsed_data, config, **kwargs)
+
+
+def transform_many(destinations: list, parsed_data: ParsedData, configs: dict = None,
+                   max_workers: int = None, **kwargs) -> dict:
+    """
+    Transformuje jedne sparsowane dane do kilku destinacji naraz (pula wątków).
+    
+    Args:
+        destinations: Typy destinacji, np. ['github', 'chatgpt']
+        parsed_data: Sparsowane dane (parsowane raz, współdzielone przez transformery)
+        configs: Opcjonalne nadpisania konfiguracji {destinacja: config}
+        max_workers: Liczba wątków puli
+        **kwargs: Dodatkowe parametry dla transformerów
+        
+    Returns:
+        Dict: {destinacja: TransformedData}
+    """
+    if not transformer_registry.list_destinations():
+        init_transformers()
+    
+    return transformer_registry.transform_many(destinations, parsed_data, configs, max_workers, **kwargs)
+
+
+def __getattr__(name: str):
+    """Leniwy eksport klas transformerów - moduł importowany przy pierwszym odwołaniu"""
+    if name in _LAZY_EXPORTS:
+        return import_object(f"{__name__}.{_LAZY_EXPORTS[name]}:{name}")
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
 
 
-# Inicjalizuj transformery przy imporcie
+# Zarejestruj transformery przy imporcie (bez importowania ich kodu)
 init_transformers()
 
 
 __all__ = [
     'transform_data',
+    'transform_many',
     'transformer_registry',
     'TransformedData',
+    'StreamedFile',
     'GitHubTransformer',
-    'ChatGPTTransformer'
+    'ChatGPTTransformer',
+    'RAGTransformer',
+    'ProjectBriefTransformer'
 ]
@@ -3,9 +3,56 @@ Base Transformer Class
 Definiuje interfejs dla transformerów przekształcających dane
 """
 
+import hashlib
+import json
+import os
 from abc import ABC, abstractmethod
-from typing import Dict, Any, List
-from ..parsers.base_parser import ParsedData
+from typing import Callable, Dict, Any, Iterable, Iterator, List, Optional, Union
+from ..parsers.base_parser import ParsedData, LazyRegistry
+from ..version import __version__
+from .dedup import deduplicate_parsed
+
+
+class StreamedFile:
+    """
+    Plik generowany strumieniowo.
+    Przechowuje fabrykę zwracającą iterator fragmentów tekstu, nie samą treść -
+    każda iteracja generuje plik od nowa, więc można go czytać wielokrotnie
+    (podgląd, zapis) bez trzymania całości w pamięci.
+    """
+    
+    def __init__(self, factory: Callable[[], Iterable[str]]):
+        """
+        Args:
+            factory: Funkcja bez argumentów zwracająca iterator fragmentów (str)
+        """
+        self._factory = factory
+    
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._factory())
+    
+    def read(self) -> str:
+        """Zwraca całą treść (materializuje plik w pamięci)"""
+        return ''.join(self)
+    
+    def __str__(self) -> str:
+        return self.read()
+
+
+FileContent = Union[str, StreamedFile]
+
+
+def source_hash(*parts: Any) -> str:
+    """
+    Hash źródeł pliku wyjściowego: elementów ParsedData (sekcje, bloki kodu...)
+    i ustawień, od których zależy jego treść. Równe hashe - równa treść pliku.
+    """
+    digest = hashlib.blake2b(digest_size=16)
+    for part in parts:
+        digest.update(json.dumps(part, sort_keys=True, ensure_ascii=False, default=str)
+                      .encode('utf-8', 'surrogatepass'))
+        digest.update(b'\0')
+    return digest.hexdigest()
 
 
 class TransformedData:
@@ -13,20 +60,42 @@ class TransformedData:
     
     def __init__(self):
         self.destination: str = ""           # Typ destinacji (github, chatgpt, etc.)
-        self.files: Dict[str, str] = {}      # Pliki do wygenerowania {path: content}
+        self.files: Dict[str, FileContent] = {}  # Pliki do wygenerowania {path: content}
         self.structure: Dict[str, Any] = {}  # Struktura katalogów
         self.metadata: Dict[str, Any] = {}   # Metadane transformacji
         self.errors: List[str] = []          # Błędy podczas transformacji
+        self.sources: Dict[str, str] = {}    # Hash źródeł plików {path: hash} (regeneracja przyrostowa)
     
-    def add_file(self, path: str, content: str):
-        """Dodaje plik do wyniku transformacji"""
+    def add_file(self, path: str, content: FileContent, sources: Optional[str] = None):
+        """
+        Dodaje plik do wyniku transformacji.
+        
+        Args:
+            path: Ścieżka względna pliku
+            content: Treść lub StreamedFile
+            sources: Hash źródeł pliku (source_hash) - plik o niezmienionych
+                     źródłach nie jest ponownie renderowany przez FileGenerator
+        """
         self.files[path] = content
+        if sources:
+            self.sources[path] = sources
+        else:
+            self.sources.pop(path, None)
+    
+    def add_stream(self, path: str, factory: Callable[[], Iterable[str]], sources: Optional[str] = None):
+        """Dodaje plik generowany strumieniowo (fabryka iteratora fragmentów)"""
+        self.add_file(path, StreamedFile(factory), sources)
+    
+    def read_file(self, path: str) -> str:
+        """Zwraca pełną treść pliku (pliki strumieniowe są materializowane)"""
+        content = self.files[path]
+        return content if isinstance(content, str) else content.read()
     
     def to_dict(self) -> Dict[str, Any]:
-        """Konwertuje do słownika"""
+        """Konwertuje do słownika (pliki strumieniowe są materializowane)"""
         return {
             'destination': self.destination,
-            'files': self.files,
+            'files': {path: self.read_file(path) for path in self.files},
             'structure': self.structure,
             'metadata': self.metadata,
             'errors': self.errors
@@ -39,12 +108,30 @@ class BaseTransformer(ABC):
     Każdy transformer przekształca sparsowane dane do formatu docelowego.
     """
     
+    # Klucze konfiguracji, które może nadpisać żądanie z zewnątrz (API web) -
+    # specyfikacja jak w filter_config(); pozostałe klucze zostają po stronie serwera
+    request_options: Dict[str, Any] = {
+        'deduplicate': bool,
+        'dedup_threshold': (0.5, 1.0)
+    }
+    
     def __init__(self, config: Dict[str, Any] = None):
         """
         Args:
             config: Konfiguracja transformera
         """
         self.config = config or {}
+        self._config_hash: Optional[str] = None
+    
+    def file_sources(self, *parts: Any) -> str:
+        """
+        Hash źródeł pliku (source_hash) uwzględniający wersję programu, destinację
+        i konfigurację transformera. Szablony, z których powstaje plik, przekazuje
+        wywołujący (TemplateEngine.fingerprint).
+        """
+        if self._config_hash is None:
+            self._config_hash = source_hash(__version__, self.get_destination_type(), self.config)
+        return source_hash(self._config_hash, *parts)
     
     @abstractmethod
     def transform(self, parsed_data: ParsedData, **kwargs) -> TransformedData:
@@ -86,39 +173,72 @@ class BaseTransformer(ABC):
             return False, errors
         
         return True, errors
+    
+    def deduplicate(self, parsed_data: ParsedData) -> tuple[ParsedData, Optional[Dict[str, Any]]]:
+        """
+        Usuwa prawie-duplikaty sekcji i bloków kodu (MinHash + LSH), jeśli
+        włączone w konfiguracji ('deduplicate', próg 'dedup_threshold').
+        
+        Returns:
+            tuple: (dane bez duplikatów, raport lub None gdy nic nie usunięto)
+        """
+        if not self.config.get('deduplicate', False):
+            return parsed_data, None
+        
+        deduped, report = deduplicate_parsed(parsed_data, {
+            'threshold': self.config.get('dedup_threshold', 0.85)
+        })
+        return deduped, report if report['collapsed'] else None
 
 
 class TransformerRegistry:
-    """Rejestr transformerów"""
+    """
+    Rejestr transformerów.
+    Transformery rejestrowane przez register_lazy() są importowane dopiero
+    przy pierwszym użyciu; zewnętrzne pakiety mogą dodawać destinacje przez
+    entry points w grupie 'drdoc.transformers'.
+    """
     
     def __init__(self):
-        self._transformers: Dict[str, BaseTransformer] = {}
+        self._transformers = LazyRegistry(plugin_group='drdoc.transformers')
     
     def register(self, destination: str, transformer: BaseTransformer):
         """Rejestruje transformer dla danej destinacji"""
-        self._transformers[destination] = transformer
+        self._transformers.add(destination, transformer)
+    
+    def register_lazy(self, destination: str, target: str, config: Optional[Dict[str, Any]] = None):
+        """Rejestruje transformer ('moduł:Klasa') bez importowania jego modułu"""
+        self._transformers.add(destination, target, config)
     
-    def get_transformer(self, destination: str) -> BaseTransformer:
-        """Zwraca transformer dla danej destinacji"""
-        return self._transformers.get(destination)
+    def get_transformer(self, destination: str, config: Optional[Dict[str, Any]] = None) -> BaseTransformer:
+        """
+        Zwraca transformer dla danej destinacji.
+        
+        Args:
+            destination: Typ destinacji
+            config: Opcjonalne nadpisania konfiguracji (instancja z cache)
+        """
+        return self._transformers.get(destination, config)
     
     def list_destinations(self) -> List[str]:
         """Zwraca listę dostępnych destinacji"""
-        return list(self._transformers.keys())
+        return self._transformers.names()
     
-    def transform(self, destination: str, parsed_data: ParsedData, **kwargs) -> TransformedData:
+    def transform(self, destination: str, parsed_data: ParsedData,
+                  config: Optional[Dict[str, Any]] = None, **kwargs) -> TransformedData:
         """
         Transformuje dane używając odpowiedniego transformera.
         
         Args:
             destination: Typ destinacji
             parsed_data: Sparsowane dane
+            config: Opcjonalne nadpisania konfiguracji transformera
             **kwargs: Dodatkowe parametry
             
         Returns:
             TransformedData: Przetransformowane dane
         """
-        transformer = self.get_transformer(destination)
+        transformer = self.get_transformer(destination, config)
         
         if not transformer:
             result = TransformedData()
@@ -127,6 +247,52 @@ class TransformerRegistry:
             return result
         
         return transformer.transform(parsed_data, **kwargs)
+    
+    def transform_many(self, destinations: List[str], parsed_data: ParsedData,
+                       configs: Optional[Dict[str, Dict[str, Any]]] = None,
+                       max_workers: Optional[int] = None, **kwargs) -> Dict[str, TransformedData]:
+        """
+        Transformuje jedne sparsowane dane do wielu destinacji równolegle.
+        
+        Transformery nie modyfikują ParsedData, więc wszystkie wątki puli
+        współdzielą ten sam obiekt - bez ponownego parsowania i kopiowania.
+        
+        Args:
+            destinations: Typy destinacji (duplikaty pomijane)
+            parsed_data: Sparsowane dane
+            configs: Opcjonalne nadpisania konfiguracji {destinacja: config}
+            max_workers: Liczba wątków (domyślnie liczba destinacji, max liczba CPU)
+            **kwargs: Dodatkowe parametry dla każdego transformera
+            
+        Returns:
+            Dict: {destinacja: TransformedData} w kolejności `destinations`
+        """
+        destinations = list(dict.fromkeys(destinations))
+        configs = configs or {}
+        
+        if len(destinations) <= 1:
+            return {dest: self.transform(dest, parsed_data, configs.get(dest), **kwargs) for dest in destinations}
+        
+        from concurrent.futures import ThreadPoolExecutor
+        
+        workers = max_workers or min(len(destinations), os.cpu_count() or 1)
+        results = {}
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            futures = {
+                dest: pool.submit(self.transform, dest, parsed_data, configs.get(dest), **kwargs)
+                for dest in destinations
+            }
+            for dest, future in futures.items():
+                try:
+                    results[dest] = future.result()
+                except Exception as e:
+                    # Błąd jednej destinacji nie przerywa pozostałych
+                    result = TransformedData()
+                    result.destination = dest
+                    result.errors.append(f"Błąd transformacji: {e}")
+                    results[dest] = result
+        
+        return results
 
 
 # Singleton instance
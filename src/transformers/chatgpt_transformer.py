@@ -3,14 +3,29 @@ ChatGPT Context Transformer
 Optymalizuje dane jako kontekst dla AI (ChatGPT/Claude/etc.)
 """
 
-from typing import Dict, Any
+from typing import Dict, Any, Iterator, List, Optional
 from .base_transformer import BaseTransformer, TransformedData
+from .packer import PackItem, ancestors, pack, section_priority, code_priority
+from .summarizer import DocumentSummarizer
+from .tokenizer import get_token_counter
 from ..parsers.base_parser import ParsedData
 
 
 class ChatGPTTransformer(BaseTransformer):
     """Transformer optymalizujący dane jako kontekst AI"""
     
+    request_options = {
+        **BaseTransformer.request_options,
+        'max_tokens': (100, 32000),
+        'optimize_tokens': bool,
+        'include_examples': bool,
+        'code_block_limit': (0, 500),
+        'summarize_long_sections': bool,
+        'token_count_mode': ['auto', 'exact', 'approximate'],
+        'section_token_limit': (50, 32000),
+        'summary_max_tokens': (10, 1000)
+    }
+    
     def __init__(self, config: Dict[str, Any] = None):
         default_config = {
             'max_tokens': 4000,
@@ -20,7 +35,12 @@ class ChatGPTTransformer(BaseTransformer):
             'structure_type': 'auto',
             'add_emojis': True,
             'code_block_limit': 50,
-            'summarize_long_sections': True
+            'summarize_long_sections': True,
+            'token_count_mode': 'auto',       # 'auto' / 'exact' / 'approximate'
+            'section_token_limit': None,      # Limit tokenów na sekcję (domyślnie 1/4 budżetu)
+            'summary_max_tokens': 150,        # Długość streszczenia sekcji bez optimize_tokens
+            'deduplicate': False,
+            'dedup_threshold': 0.85
         }
         if config:
             default_config.update(config)
@@ -40,194 +60,345 @@ class ChatGPTTransformer(BaseTransformer):
             result.errors = errors
             return result
         
+        # Prawie-duplikaty sekcji i bloków kodu
+        parsed_data, dedup_report = self.deduplicate(parsed_data)
+        
         # Typ kontekstu
         context_type = kwargs.get('context_type', 'general')
         
-        # Generuj kontekst
+        # Tokeny treści sekcji liczone raz - dla pakowania, streszczeń i statystyk
+        counter = get_token_counter()
+        mode = self._approximate_mode()
+        content_tokens = [counter.count(section.get('content') or '', mode) for section in parsed_data.sections]
+        
+        # Generator fragmentów kontekstu (wywoływany przy każdym odczycie pliku)
         if context_type == 'code':
-            context = self._generate_code_context(parsed_data, **kwargs)
+            render = lambda: self._generate_code_context(parsed_data, **kwargs)
         elif context_type == 'project_brief':
-            context = self._generate_project_context(parsed_data, **kwargs)
+            render = lambda: self._generate_project_context(parsed_data, **kwargs)
         elif context_type == 'debug':
-            context = self._generate_debug_context(parsed_data, **kwargs)
+            render = lambda: self._generate_debug_context(parsed_data, **kwargs)
         else:
-            context = self._generate_general_context(parsed_data, **kwargs)
-        
-        result.add_file('context.md', context)
+            render = lambda: self._generate_general_context(parsed_data, content_tokens, **kwargs)
+        
+        if self.config.get('optimize_tokens', True):
+            # Kontekst ograniczony do max_tokens - składany w całości, z twardym limitem
+            # (np. gdy same stałe elementy go przekraczają)
+            context = self.optimize_for_tokens(''.join(render()), self.config.get('max_tokens', 4000))
+            result.add_file('context.md', context)
+            token_estimate = self._estimate_tokens(context)
+        else:
+            # Bez limitu - plik generowany strumieniowo podczas zapisu; tokeny liczone
+            # fragment po fragmencie w osobnym przebiegu, bez składania całego kontekstu
+            result.add_stream('context.md', render)
+            token_estimate = sum(counter.count(fragment, mode) for fragment in render())
         
-        # Statystyki
-        token_estimate = self._estimate_tokens(context)
+        # Statystyki (tytuł + treść, jak TokenCounter.count_sections)
         result.metadata = {
             'context_type': context_type,
             'token_estimate': token_estimate,
+            'section_tokens': [
+                {'title': section.get('title'), 'tokens': counter.count(section.get('title') or '', mode) + tokens}
+                for section, tokens in zip(parsed_data.sections, content_tokens)
+            ],
             'optimized': self.config.get('optimize_tokens', True)
         }
+        if dedup_report:
+            result.metadata['dedup'] = dedup_report
         
         return result
     
-    def _generate_general_context(self, data: ParsedData, **kwargs) -> str:
-        """Generuje ogólny kontekst AI"""
+    def _generate_general_context(self, data: ParsedData, content_tokens: Optional[List[int]] = None,
+                                  **kwargs) -> Iterator[str]:
+        """
+        Generuje ogólny kontekst AI (fragment po fragmencie).
+        `content_tokens` - policzone wcześniej tokeny treści sekcji (liczone tu, gdy brak).
+        """
         title = data.title or "Context"
         
-        context = f"# {title}\n\n"
+        header = f"# {title}\n\n"
         
         # Cel (jeśli podany)
         if 'goal' in kwargs:
-            context += f"## 🎯 Cel\n\n{kwargs['goal']}\n\n"
+            header += f"## 🎯 Cel\n\n{kwargs['goal']}\n\n"
+        
+        # Wymagania (jeśli podane) i metadata na końcu
+        footer = ""
+        if 'requirements' in kwargs:
+            footer += f"## 🔧 Wymagania\n\n{kwargs['requirements']}\n\n"
+        footer += "\n---\n\n"
+        footer += f"**Meta**: Format: {data.format}, Type: {data.data_type.value}\n"
         
+        yield header
+        if self.config.get('optimize_tokens', True):
+            yield self._pack_body(data, header + footer, content_tokens)
+        else:
+            yield from self._render_body(data, content_tokens)
+        yield footer
+    
+    def _render_body(self, data: ParsedData, content_tokens: Optional[List[int]] = None) -> Iterator[str]:
+        """Treść bez limitu tokenów (optimize_tokens wyłączone), sekcja po sekcji"""
         # Dane wejściowe
-        context += "## 📊 Dane\n\n"
+        yield "## 📊 Dane\n\n"
         
         # Jeśli są sekcje, użyj ich
         if data.sections:
-            for section in data.sections:
-                context += f"### {section['title']}\n\n"
+            counter = get_token_counter()
+            mode = self._approximate_mode()
+            summarizer = DocumentSummarizer([section['content'] for section in data.sections])
+            count = lambda text: counter.count(text, mode)
+            for i, section in enumerate(data.sections):
                 content = section['content']
+                tokens = content_tokens[i] if content_tokens else count(content)
                 
-                # Skróć długie sekcje
-                if self.config.get('summarize_long_sections', True) and len(content) > 500:
-                    content = content[:500] + "\n\n[...treść skrócona...]"
+                # Streść długie sekcje (zdania wybrane przez TF-IDF w limicie tokenów)
+                limit = self.config.get('summary_max_tokens', 150)
+                if self.config.get('summarize_long_sections', True) and tokens > limit:
+                    summary = summarizer.summarize(content, limit, count) or counter.truncate(content, limit)
+                    content = summary + "\n\n[...treść skrócona...]"
                 
-                context += f"{content}\n\n"
+                yield f"### {section['title']}\n\n{content}\n\n"
         else:
             # Bez sekcji - użyj paragrafów
             for para in data.paragraphs[:5]:  # Max 5 paragrafów
-                context += f"{para}\n\n"
+                yield f"{para}\n\n"
         
         # Code blocks
         if data.code_blocks and self.config.get('include_examples', True):
-            context += "## 💻 Kod\n\n"
+            yield "## 💻 Kod\n\n"
             for i, block in enumerate(data.code_blocks[:3]):  # Max 3 bloki
-                lang = block.get('language', 'text')
-                code = block['code']
-                
-                # Ogranicz długość kodu
-                if len(code) > self.config.get('code_block_limit', 50) * 10:
-                    code = code[:self.config.get('code_block_limit', 50) * 10] + "\n// ..."
-                
-                context += f"```{lang}\n{code}\n```\n\n"
+                yield self._render_code(block)
+    
+    def _render_code(self, block: Dict[str, Any]) -> str:
+        lang = block.get('language', 'text')
+        code = block['code']
         
-        # Wymagania (jeśli podane)
-        if 'requirements' in kwargs:
-            context += f"## 🔧 Wymagania\n\n{kwargs['requirements']}\n\n"
+        # Ogranicz długość kodu
+        if len(code) > self.config.get('code_block_limit', 50) * 10:
+            code = code[:self.config.get('code_block_limit', 50) * 10] + "\n// ..."
+        
+        return f"```{lang}\n{code}\n```\n\n"
+    
+    def _pack_body(self, data: ParsedData, fixed: str, content_tokens: Optional[List[int]] = None) -> str:
+        """
+        Treść dobrana do limitu `max_tokens`: sekcje, akapity, listy i bloki
+        kodu są renderowane i liczone raz, a następnie pakowane wg priorytetu.
+        """
+        counter = get_token_counter()
+        mode = self._approximate_mode()
+        data_header = "## 📊 Dane\n\n"
+        code_header = "## 💻 Kod\n\n"
+        
+        budget = self.config.get('max_tokens', 4000) - counter.count(fixed, mode) \
+            - counter.count(data_header, mode) - counter.count(code_header, mode)
+        section_limit = self.config.get('section_token_limit') or max(budget // 4, 1)
         
-        # Metadata na końcu
-        context += "\n---\n\n"
-        context += f"**Meta**: Format: {data.format}, Type: {data.data_type.value}\n"
+        # Statystyki termów dla streszczeń liczone raz dla całego dokumentu (leniwie)
+        summarizer = DocumentSummarizer([section.get('content') or '' for section in data.sections]
+                                        if data.sections else data.paragraphs)
+        shorten = lambda item, max_tokens: self._shorten_item(item, max_tokens, summarizer)
         
-        return context
+        items = []
+        if data.sections:
+            total = len(data.sections)
+            for i, section in enumerate(data.sections):
+                heading = f"### {section['title']}\n\n" if section.get('title') else ''
+                content = section.get('content') or ''
+                tokens = content_tokens[i] if content_tokens else counter.count(content, mode)
+                cost = counter.count(heading, mode) + tokens + 1
+                item = PackItem('section', i, f"{heading}{content}\n\n", cost, section_priority(section, i, total))
+                item.payload = (heading, content)
+                if self.config.get('summarize_long_sections', True) and cost > section_limit:
+                    item = shorten(item, section_limit) or item
+                items.append(item)
+        else:
+            total = len(data.paragraphs) + len(data.lists)
+            for i, para in enumerate(data.paragraphs):
+                item = PackItem('paragraph', i, f"{para}\n\n", counter.count(para, mode) + 1,
+                                1.0 - 0.3 * (i / max(total, 1)))
+                item.payload = ('', para)
+                items.append(item)
+            for j, lst in enumerate(data.lists, len(data.paragraphs)):
+                text = '\n'.join(f"- {entry}" for entry in lst['items'])
+                item = PackItem('list', j, f"{text}\n\n", counter.count(text, mode) + 1, 0.9)
+                item.payload = ('', text)
+                items.append(item)
+        
+        if data.code_blocks and self.config.get('include_examples', True):
+            offset = len(items)
+            total = len(data.code_blocks)
+            for i, block in enumerate(data.code_blocks):
+                text = self._render_code(block)
+                items.append(PackItem('code', offset + i, text, counter.count(text, mode), code_priority(block, i, total)))
+        
+        chosen = pack(items, budget, truncate=shorten)
+        if data.sections:
+            # Nagłówki nadrzędne wybranych sekcji zostają w kontekście (bez treści, gdy
+            # sama sekcja się nie zmieściła); ich koszt zmniejsza budżet pakowania
+            parents = self._parent_headings(data.sections, chosen, counter, mode)
+            extra = sum(item.cost for item in parents)
+            if extra and sum(item.cost for item in chosen) + extra > budget:
+                chosen = pack(items, budget - extra, truncate=shorten)
+                parents = self._parent_headings(data.sections, chosen, counter, mode)
+            chosen = sorted(chosen + parents, key=lambda item: item.index)
+        
+        body = data_header + ''.join(item.text for item in chosen if item.kind != 'code')
+        code = ''.join(item.text for item in chosen if item.kind == 'code')
+        if code:
+            body += code_header + code
+        return body
     
-    def _generate_code_context(self, data: ParsedData, **kwargs) -> str:
-        """Generuje kontekst dla kodu"""
-        context = "# CODE CONTEXT\n\n"
+    def _parent_headings(self, sections: List[Dict[str, Any]], chosen: List[PackItem],
+                         counter, mode) -> List[PackItem]:
+        """Same nagłówki sekcji nadrzędnych wybranych sekcji, których nie wybrano"""
+        levels = [section.get('level') or 0 for section in sections]
+        selected = [item.index for item in chosen if item.kind == 'section']
+        parents = []
+        for i in ancestors(levels, selected):
+            if not sections[i].get('title'):
+                continue
+            heading = f"### {sections[i]['title']}\n\n"
+            parents.append(PackItem('section', i, heading, counter.count(heading, mode), 0.0))
+        return parents
+    
+    def _shorten_item(self, item: PackItem, max_tokens: int,
+                      summarizer: Optional[DocumentSummarizer] = None) -> Optional[PackItem]:
+        """
+        Skraca sekcję/akapit/listę do `max_tokens`: streszczenie ekstrakcyjne
+        (summarize_long_sections), a gdy się nie da - przycięcie na granicy
+        tokenu. Bloków kodu nie skracamy.
+        """
+        if item.kind == 'code':
+            return None
+        
+        counter = get_token_counter()
+        mode = self._approximate_mode()
+        count = lambda text: counter.count(text, mode)
+        heading, content = item.payload
+        marker = "\n\n[...treść skrócona...]"
+        room = max_tokens - count(heading) - count(marker) - 1
+        if room <= 0:
+            return None
+        
+        short = ''
+        if summarizer is not None and self.config.get('summarize_long_sections', True):
+            short = summarizer.summarize(content, room, count)
+        if not short:
+            short = counter.truncate(content, room).rstrip()
+        
+        text = f"{heading}{short}{marker}\n\n"
+        shortened = PackItem(item.kind, item.index, text, count(text), item.priority)
+        shortened.payload = item.payload
+        return shortened
+    
+    def _generate_code_context(self, data: ParsedData, **kwargs) -> Iterator[str]:
+        """Generuje kontekst dla kodu (fragment po fragmencie)"""
+        yield "# CODE CONTEXT\n\n"
         
         # Cel
         if 'goal' in kwargs:
-            context += f"## Cel\n\n{kwargs['goal']}\n\n"
+            yield f"## Cel\n\n{kwargs['goal']}\n\n"
         
         # Obecna implementacja
         if data.code_blocks:
-            context += "## Obecna implementacja\n\n"
+            yield "## Obecna implementacja\n\n"
             for block in data.code_blocks:
-                context += f"```{block['language']}\n{block['code']}\n```\n\n"
+                yield f"```{block['language']}\n{block['code']}\n```\n\n"
         
         # Problem/Zadanie
         if 'problem' in kwargs:
-            context += f"## Problem\n\n{kwargs['problem']}\n\n"
+            yield f"## Problem\n\n{kwargs['problem']}\n\n"
         
         # Wymagania
         if 'requirements' in kwargs:
             reqs = kwargs['requirements']
             if isinstance(reqs, list):
-                context += "## Wymagania\n\n"
+                yield "## Wymagania\n\n"
                 for i, req in enumerate(reqs, 1):
-                    context += f"{i}. {req}\n"
+                    yield f"{i}. {req}\n"
             else:
-                context += f"## Wymagania\n\n{reqs}\n"
-            context += "\n"
-        
-        return context
+                yield f"## Wymagania\n\n{reqs}\n"
+            yield "\n"
     
-    def _generate_project_context(self, data: ParsedData, **kwargs) -> str:
-        """Generuje kontekst projektu (brief)"""
+    def _generate_project_context(self, data: ParsedData, **kwargs) -> Iterator[str]:
+        """Generuje kontekst projektu - brief (fragment po fragmencie)"""
         project_name = kwargs.get('project_name', data.title or 'Project')
         
-        context = f"# PROJECT: {project_name}\n\n"
+        yield f"# PROJECT: {project_name}\n\n"
         
         # Typ projektu
         if 'project_type' in kwargs:
-            context += f"**Typ**: {kwargs['project_type']}\n\n"
+            yield f"**Typ**: {kwargs['project_type']}\n\n"
         
         # Technologie
         if 'technologies' in kwargs:
-            context += f"**Technologie**: {kwargs['technologies']}\n\n"
+            yield f"**Technologie**: {kwargs['technologies']}\n\n"
         
         # Cel biznesowy
         if 'business_goal' in kwargs:
-            context += f"## Cel biznesowy\n\n{kwargs['business_goal']}\n\n"
+            yield f"## Cel biznesowy\n\n{kwargs['business_goal']}\n\n"
         
         # Funkcje główne
         if data.lists:
-            context += "## Funkcje główne\n\n"
+            yield "## Funkcje główne\n\n"
             for item in data.lists[0]['items']:
-                context += f"- {item}\n"
-            context += "\n"
+                yield f"- {item}\n"
+            yield "\n"
         
         # Wymagania techniczne
         if 'tech_requirements' in kwargs:
-            context += f"## Wymagania techniczne\n\n{kwargs['tech_requirements']}\n\n"
+            yield f"## Wymagania techniczne\n\n{kwargs['tech_requirements']}\n\n"
         
         # Constraints
         if 'constraints' in kwargs:
-            context += f"## Ograniczenia\n\n{kwargs['constraints']}\n\n"
-        
-        return context
+            yield f"## Ograniczenia\n\n{kwargs['constraints']}\n\n"
     
-    def _generate_debug_context(self, data: ParsedData, **kwargs) -> str:
-        """Generuje kontekst debugowania"""
-        context = "# DEBUG CONTEXT\n\n"
+    def _generate_debug_context(self, data: ParsedData, **kwargs) -> Iterator[str]:
+        """Generuje kontekst debugowania (fragment po fragmencie)"""
+        yield "# DEBUG CONTEXT\n\n"
         
         # Błąd
         if 'error' in kwargs:
-            context += f"## Błąd\n\n```\n{kwargs['error']}\n```\n\n"
+            yield f"## Błąd\n\n```\n{kwargs['error']}\n```\n\n"
         
         # Kod problematyczny
         if data.code_blocks:
-            context += "## Kod\n\n"
+            yield "## Kod\n\n"
             for block in data.code_blocks:
-                context += f"```{block['language']}\n{block['code']}\n```\n\n"
+                yield f"```{block['language']}\n{block['code']}\n```\n\n"
         
         # Środowisko
         if 'environment' in kwargs:
-            context += f"## Środowisko\n\n{kwargs['environment']}\n\n"
+            yield f"## Środowisko\n\n{kwargs['environment']}\n\n"
         
         # Kroki do reprodukcji
         if 'steps' in kwargs:
-            context += "## Kroki do reprodukcji\n\n"
+            yield "## Kroki do reprodukcji\n\n"
             if isinstance(kwargs['steps'], list):
                 for i, step in enumerate(kwargs['steps'], 1):
-                    context += f"{i}. {step}\n"
+                    yield f"{i}. {step}\n"
             else:
-                context += kwargs['steps']
-            context += "\n"
+                yield kwargs['steps']
+            yield "\n"
         
         # Oczekiwane vs aktualne
         if 'expected' in kwargs:
-            context += f"## Oczekiwane zachowanie\n\n{kwargs['expected']}\n\n"
+            yield f"## Oczekiwane zachowanie\n\n{kwargs['expected']}\n\n"
         
         if 'actual' in kwargs:
-            context += f"## Aktualne zachowanie\n\n{kwargs['actual']}\n\n"
-        
-        return context
+            yield f"## Aktualne zachowanie\n\n{kwargs['actual']}\n\n"
+    
+    def _approximate_mode(self):
+        """Tryb licznika wg konfiguracji: None (auto), False (dokładny), True (przybliżony)"""
+        mode = self.config.get('token_count_mode', 'auto')
+        return None if mode == 'auto' else mode == 'approximate'
     
     def _estimate_tokens(self, text: str) -> int:
         """
-        Szacuje liczbę tokenów (przybliżenie).
-        ~4 znaki = 1 token dla języka angielskiego
-        ~3 znaki = 1 token dla języka polskiego (więcej znaków diakrytycznych)
+        Liczy tokeny lokalnym tokenizerem BPE (tokenizer.py).
+        Wyniki są zapamiętywane po hashu treści.
         """
-        # Proste przybliżenie
-        return len(text) // 4
+        return get_token_counter().count(text, self._approximate_mode())
     
     def optimize_for_tokens(self, text: str, max_tokens: int) -> str:
         """Optymalizuje tekst do limitu tokenów"""
@@ -236,6 +407,7 @@ class ChatGPTTransformer(BaseTransformer):
         if estimated <= max_tokens:
             return text
         
-        # Przytnij do odpowiedniej długości
-        target_chars = max_tokens * 4
-        return text[:target_chars] + "\n\n[...treść przycięta do limitu tokenów...]"
+        # Przytnij na granicy tokenu, zostawiając miejsce na znacznik
+        marker = "\n\n[...treść przycięta do limitu tokenów...]"
+        counter = get_token_counter()
+        return counter.truncate(text, max_tokens - counter.count(marker)) + marker
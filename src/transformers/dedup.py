@@ -0,0 +1,249 @@
+"""
+Near-Duplicate Detection - Usuwanie prawie identycznych sekcji (MinHash + LSH)
+
+Każdy tekst zamieniany jest na zbiór shingli (n-gramy słów) i sygnaturę
+MinHash w wariancie one-permutation hashing: jeden hash na shingiel,
+minimum w każdym z `num_perm` kubełków. Hash shingla to XOR wartości jego
+słów z tablic pozycji (hashowanie tabelaryczne) - blake2b liczony jest raz
+na słowo, a shingle całego tekstu hashowane są wsadowo. Pasma sygnatury (LSH) wskazują
+kandydatów, a dopiero pary kandydatów są porównywane - bez porównywania
+wszystkiego ze wszystkim.
+
+Dokładne powtórzenia bloków kodu (np. ten sam fragment w wielu miejscach
+tutorialu) rozpoznaje tańszy code_fingerprint() - hash znormalizowanej treści.
+"""
+
+import bisect
+import dataclasses
+import functools
+import hashlib
+import re
+import operator
+import textwrap
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Sequence, Tuple
+from ..parsers.base_parser import ParsedData
+
+
+WORD_RE = re.compile(r'\w+')
+SHINGLE_BITS = 30               # Wartości mieszczą się w jednej "cyfrze" int - szybka arytmetyka
+SHINGLE_MASK = (1 << SHINGLE_BITS) - 1
+MAX_SHINGLE_SIZE = 16           # digest blake2b ma najwyżej 64 bajty - 4 bajty na pozycję
+
+
+def _word_codes(word: str, k: int) -> List[int]:
+    """
+    k niezależnych 30-bitowych wartości słowa - po jednej na pozycję w shinglu.
+    blake2b zamiast hash(), który jest losowany per proces (wyniki różniłyby się
+    między uruchomieniami).
+    """
+    digest = hashlib.blake2b(word.encode('utf-8', 'surrogatepass'), digest_size=4 * k).digest()
+    return [int.from_bytes(digest[i:i + 4], 'little') & SHINGLE_MASK for i in range(0, 4 * k, 4)]
+
+
+def _xor_columns(left: Iterable[int], right: Iterable[int]) -> Iterator[int]:
+    return map(operator.xor, left, right)
+
+
+def _lsh_shape(num_perm: int, threshold: float) -> Tuple[int, int]:
+    """Dobiera (pasma, wiersze) tak, by próg LSH (1/b)^(1/r) był najbliżej progu podobieństwa"""
+    best = (num_perm, 1)
+    best_error = float('inf')
+    for rows in range(1, num_perm + 1):
+        if num_perm % rows:
+            continue
+        bands = num_perm // rows
+        # Lekko poniżej progu - wolimy sprawdzić więcej kandydatów niż przeoczyć duplikat
+        error = abs((1 / bands) ** (1 / rows) - (threshold - 0.1))
+        if error < best_error:
+            best, best_error = (bands, rows), error
+    return best
+
+
+def code_fingerprint(code: str) -> bytes:
+    """
+    Hash treści bloku kodu po normalizacji: końce linii, tabulatory, wspólne
+    wcięcie, białe znaki na końcach linii i puste linie na brzegach bloku.
+    """
+    code = textwrap.dedent(code.replace('\r\n', '\n').replace('\r', '\n').expandtabs(4))
+    normalized = '\n'.join(line.rstrip() for line in code.split('\n')).strip('\n')
+    return hashlib.blake2b(normalized.encode('utf-8', 'surrogatepass'), digest_size=16).digest()
+
+
+class Deduplicator:
+    """Wykrywa prawie-duplikaty w liście tekstów"""
+
+    def __init__(self, config: Dict[str, Any] = None):
+        default_config = {
+            'threshold': 0.85,      # Minimalne (szacowane) podobieństwo Jaccarda
+            'num_perm': 64,         # Długość sygnatury (potęga 2)
+            'shingle_size': 3,      # Długość n-gramu słów
+            'min_words': 3          # Krótszych tekstów (w słowach) nie porównujemy wcale
+        }
+        if config:
+            default_config.update(config)
+        self.config = default_config
+
+        num_perm = self.config['num_perm']
+        if num_perm & (num_perm - 1):
+            raise ValueError("num_perm musi być potęgą 2")
+        if not 1 <= self.config['shingle_size'] <= MAX_SHINGLE_SIZE:
+            raise ValueError(f"shingle_size musi być w zakresie 1-{MAX_SHINGLE_SIZE}")
+        self._bucket_bits = num_perm.bit_length() - 1
+        self._bands, self._rows = _lsh_shape(num_perm, self.config['threshold'])
+
+    def signatures(self, texts: Sequence[str]) -> List[Optional[Tuple[int, ...]]]:
+        """Sygnatury MinHash dla wszystkich tekstów (None dla tekstów krótszych niż min_words)"""
+        num_perm = self.config['num_perm']
+        k = self.config['shingle_size']
+        min_words = self.config['min_words']
+        mask = num_perm - 1
+        shift = self._bucket_bits
+        # Hashowanie tabelaryczne: słowo dostaje raz na wywołanie (blake2b) losową wartość
+        # dla każdej pozycji w shinglu, a hash shingla to XOR wartości jego słów -
+        # shingle całego tekstu liczone są wsadowo przez map(), bez pętli w Pythonie
+        positions: List[Dict[str, int]] = [{} for _ in range(k)]
+        all_buckets = set(range(num_perm))
+        result = []
+
+        for text in texts:
+            words = WORD_RE.findall(text.lower()) if text else []
+            # Krótkich tekstów nie porównujemy wcale (także identycznych)
+            if not words or len(words) < min_words:
+                result.append(None)
+                continue
+
+            for word in set(words).difference(positions[0]):
+                for code, table in zip(_word_codes(word, k), positions):
+                    table[word] = code
+
+            width = min(k, len(words))
+            count = len(words) - width + 1
+            columns = [map(positions[i].__getitem__, words[i:i + count]) for i in range(width)]
+            # Malejąco - przy zapisie do słownika kubełka wygrywa najmniejszy hash
+            ordered = sorted(set(functools.reduce(_xor_columns, columns)), reverse=True)
+            buckets = dict(zip(map(mask.__and__, ordered), map(shift.__rrshift__, ordered)))
+            sig = list(map(buckets.get, range(num_perm)))
+
+            # Densyfikacja: puste kubełki przejmują wartość następnego niepustego (cyklicznie)
+            if len(buckets) < num_perm:
+                filled = sorted(buckets)
+                for i in all_buckets.difference(buckets):
+                    donor = filled[bisect.bisect(filled, i) % len(filled)]
+                    sig[i] = buckets[donor] ^ ((i - donor) % num_perm)
+            result.append(tuple(sig))
+
+        return result
+
+    def find_duplicates(self, texts: Sequence[str]) -> List[Tuple[int, int, float]]:
+        """
+        Zwraca listę (indeks_duplikatu, indeks_zachowanego, podobieństwo).
+        Zachowywane jest pierwsze wystąpienie z każdej grupy.
+        """
+        signatures = self.signatures(texts)
+        threshold = self.config['threshold']
+        num_perm = self.config['num_perm']
+        rows = self._rows
+
+        parent = list(range(len(texts)))
+
+        def find(i: int) -> int:
+            while parent[i] != i:
+                parent[i] = parent[parent[i]]
+                i = parent[i]
+            return i
+
+        similarity: Dict[int, float] = {}
+        checked = set()
+        for band in range(self._bands):
+            # Kubełek pasma -> reprezentanci grup, które do niego trafiły
+            buckets: Dict[Tuple[int, ...], List[int]] = {}
+            start = band * rows
+            for idx, sig in enumerate(signatures):
+                if sig is None:
+                    continue
+                members = buckets.setdefault(sig[start:start + rows], [])
+                for rep in members:
+                    root = find(rep)
+                    if root == find(idx) or (root, idx) in checked:
+                        break
+                    checked.add((root, idx))
+                    score = sum(1 for a, b in zip(sig, signatures[root]) if a == b) / num_perm
+                    if score >= threshold:
+                        own = find(idx)
+                        parent[max(own, root)] = min(own, root)
+                        similarity[idx] = max(similarity.get(idx, 0.0), score)
+                        break
+                else:
+                    members.append(idx)
+
+        duplicates = []
+        for idx in range(len(texts)):
+            root = find(idx)
+            if root != idx:
+                duplicates.append((idx, root, round(similarity.get(idx, 1.0), 3)))
+        return duplicates
+
+
+def _same_title(a: Optional[str], b: Optional[str]) -> bool:
+    return ' '.join((a or '').lower().split()) == ' '.join((b or '').lower().split())
+
+
+def deduplicate_parsed(parsed_data: ParsedData, config: Dict[str, Any] = None) -> Tuple[ParsedData, Dict[str, Any]]:
+    """
+    Usuwa prawie-duplikaty z sekcji i bloków kodu.
+
+    Sekcje porównywane są razem z tytułem. Duplikat o tym samym tytule jest
+    usuwany; duplikat o innym tytule zostaje (nagłówek jest częścią struktury
+    dokumentu), a jego treść zastępuje odwołanie do zachowanej sekcji.
+
+    Returns:
+        tuple: (ParsedData bez duplikatów - kopia, raport)
+    """
+    dedup = Deduplicator(config)
+    report = {'sections_removed': 0, 'sections_referenced': 0, 'code_blocks_removed': 0, 'collapsed': []}
+
+    sections = list(parsed_data.sections)
+    duplicates = dedup.find_duplicates([f"{s.get('title') or ''}\n{s.get('content') or ''}" for s in sections])
+    removed_sections = set()
+    referenced = 0
+    for idx, kept, score in duplicates:
+        title = sections[idx].get('title')
+        kept_title = sections[kept].get('title')
+        if _same_title(title, kept_title):
+            removed_sections.add(idx)
+            action = 'removed'
+        else:
+            sections[idx] = dict(sections[idx], content=f"_Treść jak w sekcji „{kept_title}”._" if kept_title
+                                 else "_Treść jak we wcześniejszej sekcji._")
+            referenced += 1
+            action = 'referenced'
+        report['collapsed'].append({
+            'type': 'section',
+            'title': title,
+            'duplicate_of': kept_title,
+            'similarity': score,
+            'action': action
+        })
+
+    blocks = parsed_data.code_blocks
+    duplicates = dedup.find_duplicates([b.get('code') or '' for b in blocks])
+    removed_blocks = {idx for idx, _, _ in duplicates}
+    for idx, kept, score in duplicates:
+        report['collapsed'].append({
+            'type': 'code_block',
+            'index': idx,
+            'duplicate_of': kept,
+            'similarity': score
+        })
+
+    report['sections_removed'] = len(removed_sections)
+    report['sections_referenced'] = referenced
+    report['code_blocks_removed'] = len(removed_blocks)
+    if not report['collapsed']:
+        return parsed_data, report
+
+    return dataclasses.replace(
+        parsed_data,
+        sections=[s for i, s in enumerate(sections) if i not in removed_sections],
+        code_blocks=[b for i, b in enumerate(blocks) if i not in removed_blocks]
+    ), report
@@ -3,14 +3,36 @@ GitHub Transformer
 Przekształca dane do struktury repozytorium GitHub
 """
 
-from typing import Dict, Any
+import time
+from typing import Callable, Dict, Any, Iterator, List, Tuple
 from .base_transformer import BaseTransformer, TransformedData
+from .dedup import code_fingerprint
+from .language import extension_for, get_language_classifier, normalize_language
+from .sharding import render_index, render_shard, shard_sections
+from .templates import TemplateEngine, get_template_engine
 from ..parsers.base_parser import ParsedData
 
 
+# Szablony fragmentów README.md (część hasha źródeł pliku)
+README_TEMPLATES = ('readme/header', 'readme/features', 'readme/install', 'readme/example', 'readme/footer')
+
+
 class GitHubTransformer(BaseTransformer):
     """Transformer dla repozytorium GitHub"""
     
+    request_options = {
+        **BaseTransformer.request_options,
+        'include_license': bool,
+        'include_contributing': bool,
+        'split_large_docs': bool,
+        'extract_code_blocks': bool,
+        'add_emojis': bool,
+        'docs_max_chars': (1000, 200000),
+        'docs_split_level': (1, 6),
+        'classify_languages': bool,
+        'dedup_examples': bool
+    }
+    
     def __init__(self, config: Dict[str, Any] = None):
         default_config = {
             'include_license': True,
@@ -22,12 +44,23 @@ class GitHubTransformer(BaseTransformer):
             'extract_code_blocks': True,
             'add_badges': True,
             'add_emojis': True,
-            'license_type': 'MIT'
+            'license_type': 'MIT',
+            'deduplicate': False,
+            'dedup_threshold': 0.85,
+            'template_dir': None,       # Nadpisania szablonów (domyślnie config/destinations/github/)
+            'docs_max_chars': 20000,    # Limit rozmiaru pliku w docs/
+            'docs_split_level': None,   # Poziom nagłówków otwierających plik (None - automatycznie)
+            'classify_languages': True, # Język bloków kodu bez etykiety z klasyfikatora
+            'dedup_examples': True      # Powtórzone bloki kodu jako odwołania w examples/README.md
         }
         if config:
             default_config.update(config)
         super().__init__(default_config)
     
+    @property
+    def templates(self) -> TemplateEngine:
+        return get_template_engine('github', self.config.get('template_dir'))
+    
     def get_destination_type(self) -> str:
         return "github"
     
@@ -42,48 +75,67 @@ class GitHubTransformer(BaseTransformer):
             result.errors = errors
             return result
         
+        # Prawie-duplikaty sekcji i bloków kodu
+        parsed_data, dedup_report = self.deduplicate(parsed_data)
+        
         # Metadata projektu
         project_meta = kwargs.get('metadata', {})
         project_name = project_meta.get('project_name', parsed_data.title or 'Untitled')
         description = project_meta.get('description', 'Project description')
         author = project_meta.get('author', 'Author')
         
-        # Generuj README.md
-        readme = self._generate_readme(parsed_data, project_name, description, author)
-        result.add_file('README.md', readme)
+        # Języki bloków kodu (etykieta lub klasyfikacja bloków bez etykiety)
+        languages = self._block_languages(parsed_data)
+        
+        # Generuj README.md (strumieniowo - fragmenty powstają podczas zapisu)
+        templates = self.templates
+        readme_sources = self.file_sources(
+            'README.md', project_name, description, author,
+            parsed_data.lists[0]['items'][:5] if parsed_data.lists else None,
+            parsed_data.code_blocks[0]['code'][:200] if parsed_data.code_blocks else None,
+            languages[:1], templates.fingerprint(*README_TEMPLATES)
+        )
+        result.add_stream('README.md', lambda: self._generate_readme(parsed_data, project_name, description,
+                                                                     author, languages), readme_sources)
         
         # Generuj .gitignore
-        gitignore = self._generate_gitignore(parsed_data)
-        result.add_file('.gitignore', gitignore)
+        # (fingerprint przed memoize - zmieniony szablon unieważnia zapamiętany wynik)
+        fragments = self._gitignore_fragments(set(languages))
+        gitignore_sources = self.file_sources('.gitignore', templates.fingerprint(*fragments))
+        result.add_file('.gitignore', self._generate_gitignore(fragments), gitignore_sources)
         
         # LICENSE
         if self.config.get('include_license', True):
-            license_content = self._generate_license(author)
-            result.add_file('LICENSE', license_content)
+            year = time.localtime().tm_year
+            result.add_file('LICENSE', self._generate_license(author, year),
+                            self.file_sources('LICENSE', author, year, templates.fingerprint('LICENSE')))
         
         # CONTRIBUTING.md
         if self.config.get('include_contributing', True):
-            contributing = self._generate_contributing()
-            result.add_file('CONTRIBUTING.md', contributing)
+            result.add_file('CONTRIBUTING.md', self._generate_contributing(),
+                            self.file_sources('CONTRIBUTING.md', templates.fingerprint('CONTRIBUTING.md')))
         
-        # Dokumentacja w docs/
+        # Dokumentacja w docs/ - sekcje podzielone wg hierarchii nagłówków
+        docs_files = []
         if self.config.get('split_large_docs', True) and len(parsed_data.sections) > 3:
-            docs = self._generate_docs(parsed_data)
-            for filename, content in docs.items():
-                result.add_file(f'docs/{filename}', content)
+            for filename, (render, sources) in self._generate_docs(parsed_data).items():
+                result.add_stream(f'docs/{filename}', render, sources)
+                docs_files.append(filename)
         
-        # Code blocks → src/
+        # Code blocks → examples/ (jeden plik na unikalny blok, indeks w examples/README.md)
+        example_files = []
         if self.config.get('extract_code_blocks', True) and parsed_data.code_blocks:
-            for i, code_block in enumerate(parsed_data.code_blocks):
-                ext = code_block.get('language', 'txt')
-                filename = f'example_{i+1}.{ext}'
-                result.add_file(f'examples/{filename}', code_block['code'])
+            examples = self._collect_examples(parsed_data, languages, dedup_report)
+            for example in examples:
+                result.add_file(f"examples/{example['file']}", example['code'])
+            result.add_file('examples/README.md', self._generate_examples_index(examples))
+            example_files = [example['file'] for example in examples] + ['README.md']
         
         # Struktura katalogów
         result.structure = {
             'root': ['README.md', 'LICENSE', '.gitignore'],
-            'docs/': ['installation.md', 'usage.md'],
-            'examples/': [],
+            'docs/': docs_files,
+            'examples/': example_files,
             'src/': [],
             'tests/': []
         }
@@ -94,232 +146,151 @@ class GitHubTransformer(BaseTransformer):
             'files_generated': len(result.files),
             'has_code_examples': len(parsed_data.code_blocks) > 0 if parsed_data.code_blocks else False
         }
+        if dedup_report:
+            result.metadata['dedup'] = dedup_report
         
         return result
     
+    def _block_languages(self, data: ParsedData) -> List[str]:
+        """Kanoniczne języki bloków kodu (bloki bez etykiety klasyfikowane jedną partią)"""
+        if not data.code_blocks:
+            return []
+        if self.config.get('classify_languages', True):
+            return get_language_classifier().resolve(data.code_blocks)
+        return [normalize_language(block.get('language')) for block in data.code_blocks]
+    
+    def _collect_examples(self, data: ParsedData, languages: List[str],
+                          dedup_report: Dict[str, Any] = None) -> List[Dict[str, Any]]:
+        """
+        Unikalne bloki kodu jako przykłady: {'file', 'language', 'code', 'blocks'}.
+        
+        Bloki o tym samym hashu znormalizowanej treści trafiają do jednego pliku;
+        'blocks' to numery wszystkich bloków dokumentu (od 1) z tą treścią, łącznie
+        z prawie-duplikatami usuniętymi wcześniej przez deduplicate().
+        """
+        # Numery bloków w dokumencie przed usunięciem prawie-duplikatów
+        collapsed = [entry for entry in (dedup_report or {}).get('collapsed', []) if entry['type'] == 'code_block']
+        removed = {entry['index'] for entry in collapsed}
+        origin = [i for i in range(len(data.code_blocks) + len(removed)) if i not in removed]
+        
+        dedup = self.config.get('dedup_examples', True)
+        examples: List[Dict[str, Any]] = []
+        by_origin: Dict[int, Dict[str, Any]] = {}
+        by_fingerprint: Dict[bytes, Dict[str, Any]] = {}
+        for i, code_block in enumerate(data.code_blocks):
+            code = code_block['code']
+            key = code_fingerprint(code) if dedup else None
+            example = by_fingerprint.get(key) if dedup else None
+            if example is None:
+                example = {
+                    'file': f'example_{len(examples) + 1}.{extension_for(languages[i])}',
+                    'language': languages[i],
+                    'code': code,
+                    'blocks': []
+                }
+                examples.append(example)
+                if dedup:
+                    by_fingerprint[key] = example
+            example['blocks'].append(origin[i] + 1)
+            by_origin[origin[i]] = example
+        
+        for entry in collapsed:
+            by_origin[entry['duplicate_of']]['blocks'].append(entry['index'] + 1)
+        for example in examples:
+            example['blocks'].sort()
+        return examples
+    
+    def _generate_examples_index(self, examples: List[Dict[str, Any]]) -> str:
+        """Generuje examples/README.md - pliki przykładów i bloki dokumentu, z których pochodzą"""
+        total = sum(len(example['blocks']) for example in examples)
+        lines = [
+            "# Przykłady\n",
+            f"Bloki kodu z dokumentu: {total}, unikalne: {len(examples)}.\n",
+            "| Plik | Język | Bloki w dokumencie |",
+            "|------|-------|--------------------|"
+        ]
+        for example in examples:
+            blocks = ', '.join(f"#{number}" for number in example['blocks'])
+            lines.append(f"| [{example['file']}]({example['file']}) | {example['language']} | {blocks} |")
+        return '\n'.join(lines) + '\n'
+    
     def _generate_readme(self, data: ParsedData, project_name: str, 
-                        description: str, author: str) -> str:
-        """Generuje README.md"""
+                        description: str, author: str, languages: List[str]) -> Iterator[str]:
+        """Generuje README.md (fragment po fragmencie, z szablonów readme/*)"""
+        templates = self.templates
         emoji = "📦" if self.config.get('add_emojis', True) else ""
         
-        readme = f"""# {emoji} {project_name}
-
-## 📋 Opis
-
-{description}
-
-"""
+        # Fragmenty zależne od treści dokumentu renderowane bez zapamiętywania (get().render)
+        yield templates.get('readme/header').render(
+            {'emoji': emoji, 'project_name': project_name, 'description': description}
+        )
         
         # Features z list/sekcji
         if data.lists:
-            readme += "## ✨ Funkcje\n\n"
-            for lst in data.lists[:1]:  # Pierwsza lista
-                for item in lst['items'][:5]:  # Max 5 items
-                    readme += f"- {item}\n"
-            readme += "\n"
+            items = ''.join(f"- {item}\n" for item in data.lists[0]['items'][:5])  # Max 5 items
+            yield templates.get('readme/features').render({'items': items})
         
-        # Instalacja
-        readme += """## 🚀 Instalacja
-
-```bash
-# Clone repository
-git clone https://github.com/user/repo.git
-cd repo
-
-# Install dependencies
-npm install  # or: pip install -r requirements.txt
-```
-
-## 💻 Użycie
-
-```bash
-# Run the application
-npm start  # or: python main.py
-```
-
-"""
+        # Instalacja i użycie
+        yield templates.render('readme/install')
         
         # Kod jeśli są code blocks
         if data.code_blocks:
-            readme += "## 📚 Przykłady\n\n"
             first_block = data.code_blocks[0]
-            readme += f"```{first_block['language']}\n{first_block['code'][:200]}\n```\n\n"
-        
-        # Dokumentacja
-        readme += """## 📖 Dokumentacja
-
-Szczegółowa dokumentacja dostępna w katalogu [docs/](docs/).
-
-## 🤝 Współpraca
-
-Pull requesty są mile widziane! Zobacz [CONTRIBUTING.md](CONTRIBUTING.md).
-
-"""
-        
-        # Licencja
-        readme += f"""## 📝 Licencja
-
-Projekt licencjonowany na [MIT License](LICENSE).
-
-## 👥 Autor
-
-- {author}
-"""
+            yield templates.get('readme/example').render(
+                {'language': languages[0], 'code': first_block['code'][:200]}
+            )
         
-        return readme
+        # Dokumentacja, współpraca, licencja, autor
+        yield templates.render('readme/footer', author=author)
     
-    def _generate_gitignore(self, data: ParsedData) -> str:
-        """Generuje .gitignore na podstawie wykrytych technologii"""
-        gitignore = "# Dr.Doc generated .gitignore\n\n"
-        
-        # Auto-detect języka z code blocks
-        languages = set()
-        if data.code_blocks:
-            for block in data.code_blocks:
-                languages.add(block.get('language', '').lower())
-        
-        # Python
-        if 'python' in languages or 'py' in languages:
-            gitignore += """# Python
-__pycache__/
-*.py[cod]
-*$py.class
-*.so
-.Python
-venv/
-env/
-*.egg-info/
-
-"""
-        
-        # Node.js
-        if 'javascript' in languages or 'typescript' in languages or 'js' in languages:
-            gitignore += """# Node.js
-node_modules/
-npm-debug.log
-yarn-error.log
-package-lock.json
-.npm
-
-"""
-        
-        # IDE
-        gitignore += """# IDEs
-.vscode/
-.idea/
-*.swp
-*.swo
-
-"""
-        
-        # OS
-        gitignore += """# OS
-.DS_Store
-Thumbs.db
-desktop.ini
-
-"""
-        
-        # Data
-        gitignore += """# Dr.Doc
-data/output/
-*.tmp
-*.log
-"""
-        
-        return gitignore
+    @staticmethod
+    def _gitignore_fragments(languages: set) -> Tuple[str, ...]:
+        """Fragmenty .gitignore dla wykrytych technologii (kanoniczne języki bloków kodu)"""
+        fragments = ['gitignore/header']
+        if 'python' in languages:
+            fragments.append('gitignore/python')
+        if 'javascript' in languages or 'typescript' in languages:
+            fragments.append('gitignore/node')
+        fragments += ['gitignore/ide', 'gitignore/os', 'gitignore/drdoc']
+        return tuple(fragments)
     
-    def _generate_license(self, author: str) -> str:
+    def _generate_gitignore(self, fragments: Tuple[str, ...]) -> str:
+        """Generuje .gitignore z wybranych fragmentów"""
+        # Wynik zależy tylko od wybranych fragmentów
+        templates = self.templates
+        return templates.memoize(fragments, lambda: ''.join(templates.render(name) for name in fragments))
+    
+    def _generate_license(self, author: str, year: int) -> str:
         """Generuje plik LICENSE (MIT)"""
-        from datetime import datetime
-        year = datetime.now().year
-        
-        return f"""MIT License
-
-Copyright (c) {year} {author}
-
-Permission is hereby granted, free of charge, to any person obtaining a copy
-of this software and associated documentation files (the "Software"), to deal
-in the Software without restriction, including without limitation the rights
-to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
-copies of the Software, and to permit persons to whom the Software is
-furnished to do so, subject to the following conditions:
-
-The above copyright notice and this permission notice shall be included in all
-copies or substantial portions of the Software.
-
-THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
-IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
-FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
-AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
-LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
-OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
-SOFTWARE.
-"""
+        return self.templates.render('LICENSE', year=year, author=author)
     
     def _generate_contributing(self) -> str:
         """Generuje CONTRIBUTING.md"""
-        return """# Contributing to this project
-
-Thank you for your interest in contributing! 
-
-## How to Contribute
-
-1. Fork the repository
-2. Create a feature branch (`git checkout -b feature/amazing-feature`)
-3. Commit your changes (`git commit -m 'Add amazing feature'`)
-4. Push to the branch (`git push origin feature/amazing-feature`)
-5. Open a Pull Request
-
-## Code Style
-
-Please follow the existing code style in the project.
-
-## Reporting Issues
-
-Use GitHub Issues to report bugs or suggest features.
-
-## Code of Conduct
-
-Be respectful and inclusive in all interactions.
-"""
+        return self.templates.render('CONTRIBUTING.md')
     
-    def _generate_docs(self, data: ParsedData) -> Dict[str, str]:
-        """Generuje pliki dokumentacji w docs/"""
-        docs = {}
-        
-        # installation.md
-        docs['installation.md'] = """# Instalacja
-
-## Wymagania
-
-- [Lista wymagań]
-
-## Kroki instalacji
-
-1. Krok 1
-2. Krok 2
-3. Krok 3
-
-## Weryfikacja
-
-Sprawdź czy instalacja przebiegła poprawnie...
-"""
+    def _generate_docs(self, data: ParsedData) -> Dict[str, Tuple[Callable[[], Iterator[str]], str]]:
+        """
+        Dzieli sekcje na pliki docs/ (jeden przebieg) i dodaje spis treści index.md.
         
-        # usage.md
-        docs['usage.md'] = """# Użycie
-
-## Podstawowe użycie
-
-[Opis podstawowego użycia]
-
-## Zaawansowane funkcje
-
-[Opis zaawansowanych funkcji]
-
-## Przykłady
-
-[Przykłady użycia]
-"""
+        Returns:
+            Dict: {nazwa_pliku: (fabryka fragmentów, hash źródeł)} - każdy plik renderowany
+                  niezależnie; hash obejmuje tylko sekcje pliku, więc zmiana jednej sekcji
+                  unieważnia jej plik (i spis treści tylko przy zmianie nagłówków)
+        """
+        sections = data.sections
+        shards = shard_sections(sections, self.config.get('docs_max_chars', 20000),
+                                self.config.get('docs_split_level'))
+        title = data.title or 'Dokumentacja'
         
+        headings = [
+            (shard.filename, shard.part, shard.offset,
+             [(sections[i].get('title'), sections[i].get('level')) for i in shard.sections])
+            for shard in shards
+        ]
+        docs = {'index.md': (lambda: render_index(shards, sections, title),
+                             self.file_sources('docs/index.md', title, headings))}
+        for shard in shards:
+            sources = self.file_sources('docs/shard', shard.title, shard.part, shard.offset,
+                                        [sections[i] for i in shard.sections])
+            docs[shard.filename] = (lambda shard=shard: render_shard(shard, sections), sources)
         return docs
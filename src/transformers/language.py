@@ -0,0 +1,220 @@
+"""
+Language Classifier - Rozpoznawanie języka bloków kodu bez etykiety
+
+Naiwny klasyfikator Bayesa na częstościach cech: słów kluczowych,
+operatorów oraz pierwszej i ostatniej cechy każdej linii. Wagi (logarytmy
+prawdopodobieństw cech dla każdego języka) są dostarczone w repo
+(resources/language_weights.json, budowane przez
+scripts/build_language_model.py), więc klasyfikacja działa offline.
+
+Bloki są klasyfikowane partiami: identyczne bloki w partii liczone są raz,
+wagi pobierane raz dla każdej unikalnej cechy partii, a wyniki zapamiętywane
+po hashu treści - dokument z tysiącami fragmentów kodu kosztuje niewiele
+więcej niż jego unikalne bloki.
+"""
+
+import hashlib
+import json
+import re
+import threading
+from collections import Counter, OrderedDict
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+
+
+WEIGHTS_PATH = Path(__file__).parent / 'resources' / 'language_weights.json'
+
+# Język bloku bez etykiety (i wynik, gdy klasyfikator nie ma pewności)
+UNKNOWN = 'text'
+
+FEATURE_RE = re.compile(
+    r"<\?php|\?>|<!--|-->|</?[A-Za-z][\w:.-]*|#!|#include|#define|//|/\*|\*/"
+    r"|[A-Za-z_$@][\w$]*"
+    r"|===|!==|==|!=|<=|>=|:=|=>|->|::|\+\+|\+=|-=|&&|\|\||<<|>>|\$\(|\$\{|\{\{|\}\}|\.\.\.|\.\."
+    r"|[^\s\w]"
+)
+
+# Nazwy języków w etykietach bloków -> nazwa kanoniczna
+ALIASES = {
+    'py': 'python', 'python3': 'python', 'py3': 'python', 'pycon': 'python',
+    'js': 'javascript', 'node': 'javascript', 'nodejs': 'javascript', 'mjs': 'javascript', 'jsx': 'javascript',
+    'ts': 'typescript', 'tsx': 'typescript',
+    'sh': 'bash', 'shell': 'bash', 'zsh': 'bash', 'console': 'bash', 'shell-session': 'bash',
+    'yml': 'yaml',
+    'c++': 'cpp', 'cc': 'cpp', 'cxx': 'cpp', 'hpp': 'cpp',
+    'h': 'c',
+    'rs': 'rust',
+    'rb': 'ruby',
+    'golang': 'go',
+    'htm': 'html', 'xhtml': 'html',
+    'pl': 'perl',
+    'cfg': 'ini', 'conf': 'ini',
+    'plaintext': 'text', 'plain': 'text', 'txt': 'text', 'none': 'text', 'output': 'text'
+}
+
+# Nazwa kanoniczna -> rozszerzenie pliku (examples/example_N.<ext>)
+EXTENSIONS = {
+    'python': 'py', 'javascript': 'js', 'typescript': 'ts', 'bash': 'sh',
+    'json': 'json', 'html': 'html', 'css': 'css', 'xml': 'xml', 'yaml': 'yml',
+    'toml': 'toml', 'ini': 'ini', 'c': 'c', 'cpp': 'cpp', 'go': 'go', 'rust': 'rs',
+    'ruby': 'rb', 'perl': 'pl', 'java': 'java', 'php': 'php', 'sql': 'sql',
+    'text': 'txt'
+}
+
+EXTENSION_RE = re.compile(r'^[a-z0-9]{1,10}$')
+
+
+def normalize_language(tag: Optional[str]) -> str:
+    """Kanoniczna nazwa języka z etykiety bloku ('' lub brak -> 'text')"""
+    tag = (tag or '').strip().lower()
+    if not tag:
+        return UNKNOWN
+    return ALIASES.get(tag, tag)
+
+
+def extension_for(language: Optional[str]) -> str:
+    """Rozszerzenie pliku dla języka (nieznany język - jego nazwa, o ile nadaje się na rozszerzenie)"""
+    language = normalize_language(language)
+    ext = EXTENSIONS.get(language)
+    if ext:
+        return ext
+    return language if EXTENSION_RE.match(language) else 'txt'
+
+
+def extract_features(code: str) -> Counter:
+    """
+    Cechy bloku kodu: tokeny oraz pierwsza ('^x') i ostatnia ('x$') cecha
+    każdej niepustej linii (np. '^def', ':$', ';$', '^#').
+    """
+    features = Counter()
+    for line in code.splitlines():
+        tokens = FEATURE_RE.findall(line)
+        if not tokens:
+            continue
+        features.update(tokens)
+        features['^' + tokens[0]] += 1
+        features[tokens[-1] + '$'] += 1
+    return features
+
+
+class LanguageClassifier:
+    """
+    Klasyfikator języka bloków kodu.
+
+    - classify(): język jednego bloku
+    - classify_batch(): języki listy bloków (partia, cache po hashu treści)
+    - resolve(): języki bloków z ParsedData - etykieta, a gdy jej brak - klasyfikacja
+    """
+
+    def __init__(self, config: Dict = None):
+        default_config = {
+            'weights_path': WEIGHTS_PATH,
+            'cache_size': 8192,     # Liczba zapamiętanych bloków
+            'max_chars': 4000,      # Klasyfikowany jest tylko początek długiego bloku
+            'min_features': 3,      # Mniej rozpoznanych cech - wynik 'text'
+            'min_margin': 0.05      # Minimalna przewaga zwycięzcy (średnio na cechę)
+        }
+        if config:
+            default_config.update(config)
+        self.config = default_config
+
+        with open(self.config['weights_path'], 'r', encoding='utf-8') as f:
+            model = json.load(f)
+        self.languages: List[str] = model['languages']
+        self._priors: List[float] = model['priors']
+        self._floors: List[float] = model['floors']
+        # Wiersze rzadkie {cecha: ((indeks języka, przyrost log p ponad próg), ...)}
+        self._weights: Dict[str, Tuple[Tuple[int, float], ...]] = {
+            feature: tuple((index, delta) for index, delta in row) for feature, row in model['weights'].items()
+        }
+        self._results: OrderedDict = OrderedDict()
+        self._lock = threading.Lock()
+
+    # --- API -----------------------------------------------------------------
+
+    def classify(self, code: str) -> str:
+        """Zwraca kanoniczną nazwę języka bloku ('text' gdy brak pewności)"""
+        return self.classify_batch([code])[0]
+
+    def classify_batch(self, codes: Sequence[str]) -> List[str]:
+        """Klasyfikuje bloki partią; wyniki w kolejności wejścia"""
+        keys = [
+            hashlib.blake2b(code[:self.config['max_chars']].encode('utf-8', 'surrogatepass'), digest_size=16).digest()
+            for code in codes
+        ]
+
+        results: Dict[bytes, str] = {}
+        with self._lock:
+            for key in keys:
+                cached = self._results.get(key)
+                if cached is not None:
+                    self._results.move_to_end(key)
+                    results[key] = cached
+
+        # Unikalne bloki spoza cache - cechy liczone raz na blok
+        pending: Dict[bytes, Counter] = {}
+        for key, code in zip(keys, codes):
+            if key not in results and key not in pending:
+                pending[key] = extract_features(code[:self.config['max_chars']])
+
+        if pending:
+            # Wiersze wag pobierane raz dla każdej cechy występującej w partii
+            vocabulary = set().union(*pending.values())
+            rows = {feature: self._weights[feature] for feature in vocabulary if feature in self._weights}
+            scored = {key: self._decide(features, rows) for key, features in pending.items()}
+            results.update(scored)
+
+            with self._lock:
+                self._results.update(scored)
+                while len(self._results) > self.config['cache_size']:
+                    self._results.popitem(last=False)
+
+        return [results[key] for key in keys]
+
+    def resolve(self, blocks: Iterable[Dict]) -> List[str]:
+        """Języki bloków kodu ({'language', 'code'}): etykieta lub wynik klasyfikacji"""
+        blocks = list(blocks)
+        languages = [normalize_language(block.get('language')) for block in blocks]
+        unlabeled = [i for i, language in enumerate(languages) if language == UNKNOWN]
+        if unlabeled:
+            guesses = self.classify_batch([blocks[i].get('code') or '' for i in unlabeled])
+            for i, guess in zip(unlabeled, guesses):
+                languages[i] = guess
+        return languages
+
+    def clear_cache(self):
+        with self._lock:
+            self._results.clear()
+
+    # --- Klasyfikacja ----------------------------------------------------------
+
+    def _decide(self, features: Counter, rows: Dict[str, Tuple[Tuple[int, float], ...]]) -> str:
+        known = [(rows[feature], count) for feature, count in features.items() if feature in rows]
+        total = sum(count for _, count in known)
+        if total < self.config['min_features']:
+            return UNKNOWN
+
+        # log p(cecha | język) = próg wygładzania języka + przyrost zapisany w modelu
+        scores = [prior + total * floor for prior, floor in zip(self._priors, self._floors)]
+        for row, count in known:
+            for index, delta in row:
+                scores[index] += count * delta
+
+        best, second = sorted(range(len(scores)), key=scores.__getitem__, reverse=True)[:2]
+        if (scores[best] - scores[second]) / total < self.config['min_margin']:
+            return UNKNOWN
+        return self.languages[best]
+
+
+_classifier: Optional[LanguageClassifier] = None
+_classifier_lock = threading.Lock()
+
+
+def get_language_classifier() -> LanguageClassifier:
+    """Współdzielony klasyfikator (wagi wczytywane raz, przy pierwszym użyciu)"""
+    global _classifier
+    if _classifier is None:
+        with _classifier_lock:
+            if _classifier is None:
+                _classifier = LanguageClassifier()
+    return _classifier
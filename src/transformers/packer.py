@@ -0,0 +1,137 @@
+"""
+Token Budget Packer - Wybór fragmentów kontekstu w limicie tokenów
+
+Każdy kandydat (sekcja, blok kodu, lista, akapit) jest renderowany
+i liczony raz. Pakowanie to zachłanny plecak: kandydaci sortowani wg
+gęstości wartości (wartość / koszt), dobierani dopóki mieszczą się
+w budżecie; resztę budżetu wypełnia przycięty najlepszy z pominiętych.
+Wynik zachowuje kolejność dokumentu.
+"""
+
+import math
+import re
+from typing import Callable, Iterable, List, Optional
+
+
+# Sekcje o niskiej wartości dla kontekstu AI
+BOILERPLATE_RE = re.compile(
+    r'licen[sc]|contribut|współprac|changelog|historia zmian|table of contents|spis treści|'
+    r'toc\b|acknowledg|podziękowania|badges?\b|kontakt|contact|support|wsparcie',
+    re.IGNORECASE
+)
+
+
+class PackItem:
+    """Kandydat do kontekstu: wyrenderowany tekst + koszt w tokenach + priorytet"""
+
+    __slots__ = ('kind', 'index', 'text', 'cost', 'priority', 'truncated', 'payload')
+
+    def __init__(self, kind: str, index: int, text: str, cost: int, priority: float):
+        self.kind = kind          # 'section' / 'code' / 'list' / 'paragraph'
+        self.index = index        # Pozycja w dokumencie (kolejność wyjścia)
+        self.text = text
+        self.cost = cost
+        self.priority = priority
+        self.truncated = False
+        self.payload = None       # Dane źródłowe do ponownego (skróconego) renderowania
+
+    @property
+    def value(self) -> float:
+        # Malejące korzyści z długości: dwa razy dłuższa sekcja nie jest dwa razy cenniejsza
+        return self.priority * math.sqrt(max(self.cost, 1))
+
+    @property
+    def density(self) -> float:
+        # value / cost = priority / sqrt(cost)
+        return self.priority / math.sqrt(max(self.cost, 1))
+
+
+def section_priority(section: dict, position: int, total: int) -> float:
+    """Priorytet sekcji: poziom nagłówka, pozycja w dokumencie, boilerplate"""
+    level = section.get('level') or 0
+    priority = {0: 1.0, 1: 1.5, 2: 1.3, 3: 1.1}.get(level, 1.0)
+
+    # Wcześniejsze sekcje zwykle niosą opis i kontekst
+    priority *= 1.0 - 0.3 * (position / max(total, 1))
+
+    if BOILERPLATE_RE.search(section.get('title') or ''):
+        priority *= 0.3
+    if not (section.get('content') or '').strip():
+        return 0.0  # Sam nagłówek trafia do kontekstu tylko jako przodek wybranej sekcji (ancestors)
+    return priority
+
+
+def ancestors(levels: List[int], indices: Iterable[int]) -> List[int]:
+    """
+    Indeksy sekcji nadrzędnych (wg poziomów nagłówków) sekcji `indices`,
+    których nie ma wśród `indices` - np. "Technologie" nad wybranym "Backend".
+    Sekcje bez nagłówka (poziom 0) nie są niczyim przodkiem.
+    """
+    wanted = set(indices)
+    found = set()
+    stack: List[int] = []   # Otwarte nagłówki: indeksy o rosnących poziomach
+    for i, level in enumerate(levels):
+        if level > 0:
+            while stack and levels[stack[-1]] >= level:
+                stack.pop()
+        if i in wanted:
+            found.update(stack)
+        if level > 0:
+            stack.append(i)
+    return sorted(found - wanted)
+
+
+def code_priority(block: dict, position: int, total: int) -> float:
+    """Priorytet bloku kodu: przykłady ze znanym językiem są cenniejsze"""
+    priority = 0.8 if block.get('language') not in (None, '', 'text') else 0.6
+    return priority * (1.0 - 0.3 * (position / max(total, 1)))
+
+
+def pack(items: List[PackItem], budget: int,
+         truncate: Optional[Callable[[PackItem, int], Optional[PackItem]]] = None,
+         min_fill: int = 32) -> List[PackItem]:
+    """
+    Wybiera kandydatów mieszczących się w budżecie.
+
+    Args:
+        items: Kandydaci (koszty już policzone)
+        budget: Limit tokenów
+        truncate: Opcjonalnie (item, tokens) -> przycięty item; używane do
+                  wypełnienia reszty budżetu najlepszym pominiętym kandydatem
+        min_fill: Minimalna reszta budżetu, dla której warto przycinać
+
+    Returns:
+        List[PackItem]: Wybrani kandydaci w kolejności dokumentu
+    """
+    if budget <= 0 or not items:
+        return []
+
+    sqrt = math.sqrt
+    ranked = sorted(
+        (item for item in items if item.priority > 0),
+        key=lambda item: (-item.priority / sqrt(item.cost if item.cost > 1 else 1), item.index)
+    )
+    chosen = []
+    skipped = []
+    remaining = budget
+
+    for item in ranked:
+        if remaining <= 0:
+            skipped.append(item)
+            break
+        if item.cost <= remaining:
+            chosen.append(item)
+            remaining -= item.cost
+        else:
+            skipped.append(item)
+
+    if truncate and remaining >= min_fill and skipped:
+        # Najcenniejszy z pominiętych (wg priorytetu, nie gęstości) - przycięty do reszty
+        best = max(skipped, key=lambda item: (item.priority, -item.index))
+        partial = truncate(best, remaining)
+        if partial is not None and partial.cost <= remaining:
+            partial.truncated = True
+            chosen.append(partial)
+
+    chosen.sort(key=lambda item: item.index)
+    return chosen
@@ -0,0 +1,319 @@
+"""
+Project Brief Transformer
+Tworzy brief projektowy (PROJECT_BRIEF_[Nazwa].md) ze sparsowanego dokumentu
+
+Sekcje dokumentu są przypisywane do slotów briefu (cele, zakres, ryzyka,
+harmonogram, ...) przez indeks budowany w jednym przebiegu: jedno wyrażenie
+regularne z grupą nazwaną na każdy slot skanuje tytuł i treść sekcji raz,
+zliczając trafienia wszystkich slotów naraz. Koszt jest liniowy względem
+długości dokumentu i nie rośnie z liczbą slotów.
+"""
+
+import re
+import time
+from typing import Any, Dict, Iterator, List, Optional
+from .base_transformer import BaseTransformer, TransformedData
+from .summarizer import DocumentSummarizer
+from .tokenizer import get_token_counter
+from ..parsers.base_parser import ParsedData
+
+
+# Słowa kluczowe slotów (PL + EN); kolejność = priorytet przy remisie
+SLOT_KEYWORDS = {
+    'out_of_scope': r'out of scope|poza zakresem|future work|non-goals?|not in scope',
+    'summary': r'overview|summary|about|introduction|opis\w*|wprowadzeni\w*|streszczeni\w*|podsumowani\w*',
+    'goals': r'goals?|objectives?|aims?|purpose|mission|cel(?:e|ów|u|em|ami)?|misj\w*',
+    'problem': r'problems?|challenges?|pain points?|wyzwani\w*|problem\w*',
+    'scope': r'scope|zakres\w*|features?|funkcj\w*|requirements?|wymagani\w*',
+    'stack': r'stack|technolog\w*|architecture|architektur\w*|frameworks?|backend|frontend|databases?|'
+             r'infrastructure|infrastruktur\w*',
+    'deliverables': r'deliverables?|rezultat\w*|produkty?|outputs?',
+    'timeline': r'timeline|harmonogram\w*|milestones?|kamie[nń]\w*|deadlines?|schedule|sprint\w*|'
+                r'phases?|faz[aye]\w*|roadmap|etap\w*',
+    'risks': r'risks?|ryzyk\w*|assumptions?|założeni\w*|threats?|zagroże\w*|mitigation|constraints?|ograniczeni\w*',
+    'stakeholders': r'stakeholders?|team|zesp[oó]ł\w*|owners?|właściciel\w*|contributors?|roles?|interesariusz\w*',
+    'budget': r'budget\w*|budżet\w*|costs?|koszt\w*'
+}
+
+SLOT_RE = re.compile(
+    '|'.join(rf'\b(?P<{slot}>{pattern})\b' for slot, pattern in SLOT_KEYWORDS.items()),
+    re.IGNORECASE
+)
+BULLET_RE = re.compile(r'^\s*(?:[-*+]|\d+[.)]|✅|❌)\s+(.+?)\s*$', re.MULTILINE)
+WORD_RE = re.compile(r'\w+')
+
+TITLE_WEIGHT = 5        # Trafienie w tytule sekcji waży tyle co 5 w treści
+MIN_CONTENT_HITS = 2    # Minimum trafień w treści do klasyfikacji bez tytułu
+
+
+class BriefIndex:
+    """
+    Indeks slotów briefu zbudowany w jednym przebiegu po sekcjach.
+
+    - slots: {slot: [indeksy sekcji]} w kolejności dokumentu
+    - assignment: slot każdej sekcji (None - niesklasyfikowana)
+    """
+
+    def __init__(self, sections: List[Dict[str, Any]]):
+        self.sections = sections
+        self.assignment: List[Optional[str]] = []
+        self.slots: Dict[str, List[int]] = {slot: [] for slot in SLOT_KEYWORDS}
+
+        parents: List[tuple] = []  # Stos (poziom, slot) nagłówków nadrzędnych
+        for index, section in enumerate(sections):
+            level = section.get('level') or 0
+            while parents and parents[-1][0] >= level:
+                parents.pop()
+
+            slot = self._classify(section.get('title') or '', section.get('content') or '')
+            if slot is None and parents:
+                # Podsekcja bez własnych sygnałów dziedziczy slot rodzica ("## Cele" > "### Cel główny")
+                slot = parents[-1][1]
+            if level:
+                parents.append((level, slot))
+
+            self.assignment.append(slot)
+            if slot is not None:
+                self.slots[slot].append(index)
+
+    @staticmethod
+    def _classify(title: str, content: str) -> Optional[str]:
+        scores: Dict[str, int] = {}
+        for match in SLOT_RE.finditer(title):
+            scores[match.lastgroup] = scores.get(match.lastgroup, 0) + TITLE_WEIGHT
+        if not scores:
+            for match in SLOT_RE.finditer(content):
+                scores[match.lastgroup] = scores.get(match.lastgroup, 0) + 1
+            if not scores or max(scores.values()) < MIN_CONTENT_HITS:
+                return None
+        # max() zwraca pierwszy z remisujących - kolejność SLOT_KEYWORDS to priorytet
+        best = max(scores.values())
+        return next(slot for slot in SLOT_KEYWORDS if scores.get(slot) == best)
+
+    def sections_for(self, slot: str) -> List[Dict[str, Any]]:
+        return [self.sections[i] for i in self.slots[slot]]
+
+    def unclassified(self) -> int:
+        return sum(1 for slot in self.assignment if slot is None)
+
+
+class ProjectBriefTransformer(BaseTransformer):
+    """Transformer tworzący brief projektowy"""
+
+    request_options = {
+        **BaseTransformer.request_options,
+        'include_budget': bool,
+        'include_risks': bool,
+        'include_approval_section': bool,
+        'detail_level': ['concise', 'detailed'],
+        'slot_max_tokens': (20, 2000),
+        'max_items': (1, 50),
+        'status': str,
+        'version': str
+    }
+
+    def __init__(self, config: Dict[str, Any] = None):
+        default_config = {
+            'include_budget': False,
+            'include_risks': True,
+            'include_approval_section': False,
+            'detail_level': 'concise',      # 'concise' / 'detailed' (2x dłuższe sloty)
+            'slot_max_tokens': 200,         # Limit treści slotu (streszczenie TF-IDF)
+            'max_items': 8,                 # Maksymalna liczba punktów listy w slocie
+            'status': 'Planning',
+            'version': '1.0',
+            'deduplicate': False,
+            'dedup_threshold': 0.85
+        }
+        if config:
+            default_config.update(config)
+        super().__init__(default_config)
+
+    def get_destination_type(self) -> str:
+        return "project_brief"
+
+    def transform(self, parsed_data: ParsedData, **kwargs) -> TransformedData:
+        """Transformuje dane do briefu projektowego"""
+        result = TransformedData()
+        result.destination = "project_brief"
+
+        # Walidacja
+        is_valid, errors = self.validate_input(parsed_data)
+        if not is_valid:
+            result.errors = errors
+            return result
+
+        # Prawie-duplikaty sekcji i bloków kodu
+        parsed_data, dedup_report = self.deduplicate(parsed_data)
+
+        project_meta = kwargs.get('metadata', {})
+        project_name = project_meta.get('project_name') or parsed_data.title or 'Project'
+
+        # Indeks slotów - jeden przebieg po dokumencie
+        sections = parsed_data.sections or [{'title': None, 'level': 0, 'content': parsed_data.content}]
+        index = BriefIndex(sections)
+
+        filename = f"PROJECT_BRIEF_{self._safe_name(project_name)}.md"
+        result.add_stream(filename, lambda: self._generate_brief(parsed_data, index, project_name, project_meta))
+
+        result.metadata = {
+            'project_name': project_name,
+            'slots': {
+                slot: [sections[i].get('title') for i in indices]
+                for slot, indices in index.slots.items() if indices
+            },
+            'unclassified_sections': index.unclassified()
+        }
+        if dedup_report:
+            result.metadata['dedup'] = dedup_report
+
+        return result
+
+    def _generate_brief(self, data: ParsedData, index: BriefIndex, project_name: str,
+                        meta: Dict[str, Any]) -> Iterator[str]:
+        """Generuje brief (fragment po fragmencie) w układzie z PROJECT_BRIEF.md"""
+        summarizer = DocumentSummarizer([section.get('content') or '' for section in index.sections])
+        missing = "_Brak informacji w dokumencie źródłowym._\n\n"
+
+        yield (
+            f"# PROJECT BRIEF: {project_name}\n\n"
+            f"**Data**: {time.strftime('%Y-%m-%d')}\n"
+            f"**Status**: {self.config.get('status', 'Planning')}\n"
+            f"**Autor**: {meta.get('author') or 'Unknown'}\n"
+            f"**Version**: {self.config.get('version', '1.0')}\n\n---\n\n"
+        )
+
+        # Executive Summary: opis z metadanych, sekcja opisowa, albo początek dokumentu
+        yield "## 📋 Executive Summary\n\n"
+        description = meta.get('description')
+        if description and description != 'Project description':
+            yield f"{description}\n\n"
+        else:
+            summary_sections = index.sections_for('summary') or [
+                section for section in index.sections if (section.get('content') or '').strip()
+            ][:1]
+            yield self._render_text(summary_sections, summarizer, max_tokens=100) or missing
+        yield "---\n\n"
+
+        # Cele
+        yield "## 🎯 Cele Projektu\n\n"
+        yield self._render_slot(index.sections_for('goals'), summarizer, numbered=True) or missing
+        yield "---\n\n"
+
+        # Problem
+        problem = self._render_slot(index.sections_for('problem'), summarizer)
+        if problem:
+            yield f"## 🔍 Problem Statement\n\n{problem}---\n\n"
+
+        # Zakres: In scope / Out of scope
+        yield "## 💡 Scope\n\n### In Scope\n"
+        in_scope = self._items(index.sections_for('scope'))
+        if not in_scope and data.lists:
+            in_scope = data.lists[0]['items'][:self.config.get('max_items', 8)]
+        yield ''.join(f"✅ {item}\n" for item in in_scope) + "\n" if in_scope else "\n" + missing
+        out_scope = self._items(index.sections_for('out_of_scope'))
+        if out_scope:
+            yield "### Out of Scope\n" + ''.join(f"❌ {item}\n" for item in out_scope) + "\n"
+        yield "---\n\n"
+
+        # Stack: wykryte języki bloków kodu + sekcje architektury
+        languages = sorted({
+            block.get('language') for block in data.code_blocks
+            if block.get('language') not in (None, '', 'text')
+        })
+        stack = self._render_slot(index.sections_for('stack'), summarizer)
+        if languages or stack:
+            yield "## 🏗️ Architektura / Stack Technologiczny\n\n"
+            if languages:
+                yield "**Języki (z przykładów kodu)**: " + ', '.join(languages) + "\n\n"
+            yield stack
+            yield "---\n\n"
+
+        # Stakeholderzy
+        yield "## 👥 Stakeholderzy\n\n| Rola | Osoba | Odpowiedzialność |\n|------|-------|------------------|\n"
+        yield f"| Autor | {meta.get('author') or 'Unknown'} | Dokument źródłowy |\n\n"
+        yield self._render_slot(index.sections_for('stakeholders'), summarizer)
+        yield "---\n\n"
+
+        # Deliverables, harmonogram
+        for slot, heading in (('deliverables', "## 📦 Deliverables"), ('timeline', "## 📅 Timeline")):
+            body = self._render_slot(index.sections_for(slot), summarizer, numbered=slot == 'deliverables')
+            if body:
+                yield f"{heading}\n\n{body}---\n\n"
+
+        # Budżet (opcjonalnie)
+        if self.config.get('include_budget', False):
+            yield "## 💰 Budget\n\n"
+            yield self._render_slot(index.sections_for('budget'), summarizer) or missing
+            yield "---\n\n"
+
+        # Ryzyka i założenia
+        if self.config.get('include_risks', True):
+            yield "## ⚠️ Risks & Assumptions\n\n"
+            yield self._render_slot(index.sections_for('risks'), summarizer) or missing
+            yield "---\n\n"
+
+        # Zasoby: linki z dokumentu
+        if data.links:
+            yield "## 📚 Resources\n\n"
+            yield ''.join(
+                f"- [{link.get('text') or link.get('url')}]({link.get('url')})\n"
+                for link in data.links[:self.config.get('max_items', 8)]
+            ) + "\n---\n\n"
+
+        if self.config.get('include_approval_section', False):
+            yield (
+                "## ✅ Approval\n\n| Role | Name | Signature | Date |\n|------|------|-----------|------|\n"
+                "| Project Owner | | _______ | ____ |\n\n---\n\n"
+            )
+
+        yield (
+            "## 📝 Change Log\n\n| Version | Date | Changes | Author |\n|---------|------|---------|--------|\n"
+            f"| {self.config.get('version', '1.0')} | {time.strftime('%Y-%m-%d')} | Initial brief | "
+            f"{meta.get('author') or 'Unknown'} |\n"
+        )
+
+    def _slot_tokens(self) -> int:
+        limit = self.config.get('slot_max_tokens', 200)
+        return limit * 2 if self.config.get('detail_level') == 'detailed' else limit
+
+    def _items(self, sections: List[Dict[str, Any]]) -> List[str]:
+        """Punkty list z sekcji slotu (max `max_items`)"""
+        limit = self.config.get('max_items', 8)
+        items = []
+        for section in sections:
+            for match in BULLET_RE.finditer(section.get('content') or ''):
+                items.append(match.group(1))
+                if len(items) >= limit:
+                    return items
+        return items
+
+    def _render_slot(self, sections: List[Dict[str, Any]], summarizer: DocumentSummarizer,
+                     numbered: bool = False) -> str:
+        """Treść slotu: punkty list, a gdy ich brak - streszczenie sekcji"""
+        if not sections:
+            return ''
+        items = self._items(sections)
+        if items:
+            if numbered:
+                return ''.join(f"{i}. {item}\n" for i, item in enumerate(items, 1)) + "\n"
+            return ''.join(f"- {item}\n" for item in items) + "\n"
+        return self._render_text(sections, summarizer)
+
+    def _render_text(self, sections: List[Dict[str, Any]], summarizer: DocumentSummarizer,
+                     max_tokens: Optional[int] = None) -> str:
+        """Streszczenie treści sekcji w limicie tokenów slotu"""
+        text = '\n\n'.join((section.get('content') or '').strip() for section in sections).strip()
+        if not text:
+            return ''
+        counter = get_token_counter()
+        limit = max_tokens or self._slot_tokens()
+        if counter.count(text) > limit:
+            text = summarizer.summarize(text, limit, counter.count) or counter.truncate(text, limit).rstrip()
+        return f"{text}\n\n"
+
+    @staticmethod
+    def _safe_name(name: str) -> str:
+        """Nazwa projektu bezpieczna dla nazwy pliku"""
+        name = re.sub(r'[^\w-]+', '_', name.strip()).strip('_')
+        return name or 'Project'
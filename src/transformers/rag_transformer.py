@@ -0,0 +1,275 @@
+"""
+RAG Chunks Transformer
+Dzieli dokument na fragmenty (chunki) dla systemów wyszukiwania (RAG)
+
+Chunki nie przekraczają granic sekcji wyznaczonych przez parser, mają
+limit tokenów i konfigurowalną zakładkę (overlap) z poprzednim chunkiem
+tej samej sekcji. Każdy chunk niesie ścieżkę nagłówków, pod którymi leży.
+Wynik (chunks.jsonl) jest generowany strumieniowo - chunki powstają
+w trakcie zapisu, nie są trzymane w pamięci wszystkie naraz.
+"""
+
+import json
+from typing import Any, Dict, Iterator, List, Tuple
+from .base_transformer import BaseTransformer, TransformedData
+from .summarizer import SENTENCE_RE
+from .tokenizer import get_token_counter
+from ..parsers.base_parser import ParsedData
+
+
+# Jednostka chunku: (separator przed jednostką, tekst, liczba tokenów)
+Unit = Tuple[str, str, int]
+
+
+def split_paragraphs(text: str) -> List[str]:
+    """Dzieli treść na akapity; bloki kodu (```) pozostają w całości"""
+    paragraphs = []
+    current = []
+    in_fence = False
+    for line in text.split('\n'):
+        if line.lstrip().startswith('```'):
+            in_fence = not in_fence
+        if not in_fence and not line.strip():
+            if current:
+                paragraphs.append('\n'.join(current))
+                current = []
+            continue
+        current.append(line)
+    if current:
+        paragraphs.append('\n'.join(current))
+    return paragraphs
+
+
+class RAGTransformer(BaseTransformer):
+    """Transformer dzielący dokument na chunki z metadanymi dla RAG"""
+
+    request_options = {
+        **BaseTransformer.request_options,
+        'chunk_tokens': (32, 8192),
+        'overlap_tokens': (0, 1024),
+        'prepend_header_path': bool
+    }
+
+    def __init__(self, config: Dict[str, Any] = None):
+        default_config = {
+            'chunk_tokens': 512,            # Maksymalna długość chunku
+            'overlap_tokens': 64,           # Zakładka z poprzednim chunkiem sekcji
+            'prepend_header_path': False,   # Dołącz ścieżkę nagłówków do tekstu chunku
+            'output_file': 'chunks.jsonl',
+            'deduplicate': False,
+            'dedup_threshold': 0.85
+        }
+        if config:
+            default_config.update(config)
+        super().__init__(default_config)
+
+    def get_destination_type(self) -> str:
+        return "rag"
+
+    def transform(self, parsed_data: ParsedData, **kwargs) -> TransformedData:
+        """Transformuje dane do strumienia chunków JSONL"""
+        result = TransformedData()
+        result.destination = "rag"
+
+        # Walidacja
+        is_valid, errors = self.validate_input(parsed_data)
+        if self.config['overlap_tokens'] >= self.config['chunk_tokens']:
+            errors.append("overlap_tokens musi być mniejsze niż chunk_tokens")
+            is_valid = False
+        if not is_valid:
+            result.errors = errors
+            return result
+
+        # Prawie-duplikaty sekcji i bloków kodu
+        parsed_data, dedup_report = self.deduplicate(parsed_data)
+
+        # Chunki powstają dopiero podczas zapisu pliku
+        result.add_stream(self.config['output_file'], lambda: self._generate_jsonl(parsed_data))
+
+        result.metadata = {
+            'chunk_tokens': self.config['chunk_tokens'],
+            'overlap_tokens': self.config['overlap_tokens'],
+            'sections': len(parsed_data.sections),
+            'format': 'jsonl'
+        }
+        if dedup_report:
+            result.metadata['dedup'] = dedup_report
+
+        return result
+
+    def iter_chunks(self, data: ParsedData) -> Iterator[Dict[str, Any]]:
+        """
+        Generuje chunki dokumentu po kolei.
+
+        Yields:
+            Dict: {id, text, tokens, header_path, section, chunk, overlap_tokens, document}
+        """
+        counter = get_token_counter()
+        sections = data.sections or [{'title': None, 'level': 0, 'content': data.content}]
+        path: List[Tuple[int, str]] = []
+        chunk_id = 0
+
+        for section_index, section in enumerate(sections):
+            # Ścieżka nagłówków: zdejmij nagłówki tego samego lub niższego poziomu
+            level = section.get('level') or 0
+            title = section.get('title')
+            if title:
+                while path and path[-1][0] >= level:
+                    path.pop()
+                path.append((level, title))
+            header_path = [t for _, t in path]
+
+            content = (section.get('content') or '').strip()
+            if not content:
+                continue
+
+            # Prefiks ścieżki nagłówków wlicza się do limitu chunku (najwyżej połowa limitu)
+            prefix = ''
+            limit = self.config['chunk_tokens']
+            if self.config.get('prepend_header_path') and header_path:
+                prefix = ' > '.join(header_path)
+                if counter.count(prefix) > limit // 2:
+                    prefix = counter.truncate(prefix, limit // 2)
+                prefix += '\n\n'
+                limit -= counter.count(prefix)
+
+            for chunk_index, (text, overlap) in enumerate(self._chunk_section(content, counter, limit, prefix)):
+                yield {
+                    'id': chunk_id,
+                    'text': text,
+                    'tokens': counter.count(text),
+                    'header_path': header_path,
+                    'section': section_index,
+                    'chunk': chunk_index,
+                    'overlap_tokens': overlap,
+                    'document': data.title
+                }
+                chunk_id += 1
+
+    def _generate_jsonl(self, data: ParsedData) -> Iterator[str]:
+        for chunk in self.iter_chunks(data):
+            yield json.dumps(chunk, ensure_ascii=False) + '\n'
+
+    def _chunk_section(self, content: str, counter, limit: int, prefix: str = '') -> Iterator[Tuple[str, int]]:
+        """
+        Skleja jednostki sekcji w chunki w limicie `limit` tokenów.
+        Po zamknięciu chunku jego końcowe jednostki (do overlap_tokens)
+        otwierają kolejny.
+
+        Suma tokenów jednostek to tylko szacunek (tokenizer scala znaki na
+        granicach), dlatego gotowy chunk z prefiksem jest liczony ponownie
+        i w razie potrzeby przycinany (_fit).
+
+        Yields:
+            tuple: (tekst chunku z prefiksem, liczba tokenów zakładki)
+        """
+        overlap = self.config['overlap_tokens']
+        units = self._units(content, counter, limit)
+        pending: List[Unit] = []  # Jednostki cofnięte z przepełnionego chunku (stos)
+        window: List[Unit] = []
+        used = 0
+        carried = 0      # Liczba jednostek zakładki na początku okna
+        fresh = False    # Czy okno ma jednostki jeszcze nie wyemitowane
+
+        while True:
+            unit = pending.pop() if pending else next(units, None)
+            if unit is not None:
+                cost = unit[2] + 1  # +1 na separator
+                if not fresh:
+                    # Zakładka nie może wypchnąć nowej jednostki poza limit
+                    while window and used + cost > limit:
+                        used -= window.pop(0)[2] + 1
+                        carried -= 1
+                if not window or used + cost <= limit:
+                    window.append(unit)
+                    used += cost
+                    fresh = True
+                    continue
+                pending.append(unit)
+            elif not fresh:
+                break
+
+            text, rest, carried = self._fit(window, carried, prefix, counter)
+            pending.extend(reversed(rest))
+            yield text, sum(u[2] + 1 for u in window[:carried])
+
+            kept: List[Unit] = []
+            used = 0
+            for previous in reversed(window):
+                if used + previous[2] + 1 > overlap:
+                    break
+                kept.append(previous)
+                used += previous[2] + 1
+            window = kept[::-1]
+            carried = len(window)
+            fresh = False
+
+    def _fit(self, window: List[Unit], carried: int, prefix: str, counter) -> Tuple[str, List[Unit], int]:
+        """
+        Przycina okno (w miejscu), aż chunk z prefiksem zmieści się w chunk_tokens:
+        cofa końcowe jednostki, potem zdejmuje zakładkę, w ostateczności skraca
+        jedyną jednostkę. Okno zawsze zachowuje co najmniej jedną nową jednostkę.
+
+        Returns:
+            tuple: (tekst chunku, jednostki do kolejnego chunku, liczba jednostek zakładki)
+        """
+        budget = self.config['chunk_tokens']
+        rest: List[Unit] = []
+        while True:
+            text = prefix + self._join(window)
+            tokens = counter.count(text)
+            if tokens <= budget:
+                return text, rest[::-1], carried
+
+            if len(window) - carried > 1:
+                rest.append(window.pop())
+            elif carried:
+                window.pop(0)
+                carried -= 1
+            else:
+                sep, piece, _ = window[0]
+                max_tokens = budget - counter.count(prefix)
+                head = piece
+                while len(head) > 1 and tokens > budget:
+                    max_tokens -= max(tokens - budget, 1)
+                    head = (counter.truncate(piece, max_tokens) if max_tokens > 0 else '') or head[:len(head) // 2]
+                    tokens = counter.count(prefix + head.strip())
+                window[0] = (sep, head, counter.count(head))
+                tail = piece[len(head):]
+                if tail.strip():
+                    rest.append(('', tail, counter.count(tail)))
+
+    def _units(self, content: str, counter, limit: int) -> Iterator[Unit]:
+        """
+        Jednostki chunku nie dłuższe niż limit: akapity, a gdy akapit
+        jest za długi - zdania (linie dla kodu), w ostateczności fragmenty
+        przycięte na granicy pre-tokenu.
+        """
+        for paragraph in split_paragraphs(content):
+            tokens = counter.count(paragraph)
+            if tokens <= limit:
+                yield '\n\n', paragraph, tokens
+                continue
+
+            if paragraph.lstrip().startswith('```'):
+                pieces, separator = paragraph.split('\n'), '\n'
+            else:
+                pieces, separator = SENTENCE_RE.split(paragraph), ' '
+
+            first = True
+            for piece in pieces:
+                sep = '\n\n' if first else separator
+                first = False
+                tokens = counter.count(piece)
+                while tokens > limit:
+                    head = counter.truncate(piece, limit) or piece[:max(len(piece) // 2, 1)]
+                    yield sep, head, counter.count(head)
+                    sep = ''
+                    piece = piece[len(head):]
+                    tokens = counter.count(piece)
+                if piece:
+                    yield sep, piece, tokens
+
+    @staticmethod
+    def _join(window: List[Unit]) -> str:
+        return (window[0][1] + ''.join(sep + text for sep, text, _ in window[1:])).strip()
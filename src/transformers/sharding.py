@@ -0,0 +1,141 @@
+"""
+Docs Sharding - Podział sekcji dokumentu na pliki docs/
+
+Jeden przebieg po sekcjach: każda sekcja na poziomie podziału (lub wyższym)
+otwiera nowy plik, podsekcje trafiają do pliku rodzica, a plik przekraczający
+limit rozmiaru jest kontynuowany w kolejnej części. Plik (shard) przechowuje
+tylko indeksy swoich sekcji - renderowany jest niezależnie od pozostałych,
+więc shardy można generować i zapisywać równolegle.
+"""
+
+import re
+import unicodedata
+from typing import Any, Dict, Iterator, List, Optional
+
+
+SLUG_RE = re.compile(r'[^a-z0-9]+')
+ANCHOR_RE = re.compile(r'[^\w\- ]')
+
+
+def slugify(title: str, max_length: int = 50) -> str:
+    """Nazwa pliku z tytułu: ASCII, małe litery, myślniki"""
+    text = unicodedata.normalize('NFKD', title.replace('ł', 'l').replace('Ł', 'L'))
+    text = text.encode('ascii', 'ignore').decode('ascii').lower()
+    slug = SLUG_RE.sub('-', text).strip('-')[:max_length].rstrip('-')
+    return slug or 'section'
+
+
+def github_anchor(title: str) -> str:
+    """Kotwica nagłówka w stylu GitHub (#moj-naglowek)"""
+    return ANCHOR_RE.sub('', title.strip().lower()).replace(' ', '-')
+
+
+class DocShard:
+    """Plik docs/: grupa sekcji (indeksy) pod jednym nagłówkiem podziału"""
+
+    __slots__ = ('group', 'title', 'part', 'offset', 'sections', 'filename')
+
+    def __init__(self, group: int, title: str, part: int, offset: int):
+        self.group = group          # Numer grupy (kolejność w dokumencie)
+        self.title = title          # Tytuł sekcji otwierającej grupę
+        self.part = part            # Część grupy (>1 gdy przekroczono limit rozmiaru)
+        self.offset = offset        # Przesunięcie poziomów nagłówków (grupa zaczyna się od #)
+        self.sections: List[int] = []
+        self.filename = ''
+
+
+def split_level(levels: List[int]) -> int:
+    """
+    Poziom podziału: najwyższy poziom nagłówków, a gdy występuje na nim
+    tylko jeden nagłówek (tytuł dokumentu) - poziom niżej.
+    """
+    positive = [level for level in levels if level > 0]
+    if not positive:
+        return 1
+    top = min(positive)
+    if positive.count(top) == 1 and len(positive) > 1:
+        return top + 1
+    return top
+
+
+def shard_sections(sections: List[Dict[str, Any]], max_chars: int = 20000,
+                   level: Optional[int] = None) -> List[DocShard]:
+    """
+    Dzieli sekcje na shardy.
+
+    Args:
+        sections: Sekcje z ParsedData ({'title', 'level', 'content'})
+        max_chars: Limit rozmiaru pliku; pojedyncza większa sekcja trafia do osobnej części w całości
+        level: Poziom nagłówków otwierających nowy plik (domyślnie wyznaczany automatycznie)
+
+    Returns:
+        List[DocShard]: Shardy w kolejności dokumentu, z nadanymi nazwami plików
+    """
+    levels = [section.get('level') or 0 for section in sections]
+    if level is None:
+        level = split_level(levels)
+
+    shards: List[DocShard] = []
+    current: Optional[DocShard] = None
+    group = 0
+    size = 0
+    for index, section in enumerate(sections):
+        section_level = levels[index]
+        length = len(section.get('title') or '') + len(section.get('content') or '') + 8
+
+        if current is None or 0 < section_level <= level:
+            group += 1
+            current = DocShard(group, section.get('title') or 'Wprowadzenie', 1, max(section_level - 1, 0))
+            shards.append(current)
+            size = 0
+        elif size + length > max_chars and current.sections:
+            current = DocShard(current.group, current.title, current.part + 1, current.offset)
+            shards.append(current)
+            size = 0
+
+        current.sections.append(index)
+        size += length
+
+    width = max(len(str(group)), 2)
+    for shard in shards:
+        suffix = f"-{shard.part}" if shard.part > 1 else ''
+        shard.filename = f"{shard.group:0{width}d}-{slugify(shard.title)}{suffix}.md"
+    return shards
+
+
+def render_shard(shard: DocShard, sections: List[Dict[str, Any]]) -> Iterator[str]:
+    """Treść pliku sharda (fragment po fragmencie)"""
+    if shard.part > 1:
+        yield f"# {shard.title} (cz. {shard.part})\n\n"
+    for index in shard.sections:
+        section = sections[index]
+        title = section.get('title')
+        if title:
+            level = max((section.get('level') or 1) - shard.offset, 1)
+            yield f"{'#' * level} {title}\n\n"
+        content = (section.get('content') or '').strip()
+        if content:
+            yield f"{content}\n\n"
+    yield "---\n\n[← Spis treści](index.md)\n"
+
+
+def render_index(shards: List[DocShard], sections: List[Dict[str, Any]], title: str) -> Iterator[str]:
+    """Spis treści docs/index.md: nagłówki wszystkich shardów z linkami do kotwic"""
+    yield f"# {title}\n\n"
+    for shard in shards:
+        anchors: Dict[str, int] = {}
+        for position, index in enumerate(shard.sections):
+            section = sections[index]
+            heading = section.get('title')
+            if not heading:
+                continue
+            anchor = github_anchor(heading)
+            # GitHub numeruje powtórzone kotwice w pliku: #x, #x-1, #x-2
+            seen = anchors.get(anchor, 0)
+            anchors[anchor] = seen + 1
+            if seen:
+                anchor = f"{anchor}-{seen}"
+
+            depth = max((section.get('level') or 1) - shard.offset - 1, 0)
+            link = shard.filename if position == 0 and shard.part == 1 else f"{shard.filename}#{anchor}"
+            yield f"{'  ' * depth}- [{heading}]({link})\n"
@@ -0,0 +1,112 @@
+"""
+Extractive Summarizer - Streszczenia sekcji oparte na TF-IDF
+
+Statystyki termów (document frequency) liczone są raz dla całego
+dokumentu - każda sekcja to jeden "dokument" w sensie IDF. Streszczenie
+sekcji to wybór najwyżej ocenionych zdań (waga TF-IDF, znormalizowana
+długością) mieszczących się w limicie tokenów, w oryginalnej kolejności.
+"""
+
+import math
+import re
+from collections import Counter
+from typing import Callable, Dict, List, Optional, Sequence
+
+
+TERM_RE = re.compile(r'[^\W\d_]{2,}')
+SENTENCE_RE = re.compile(r'(?<=[.!?…])\s+(?=["„(\[]?[A-ZĄĆĘŁŃÓŚŹŻ0-9])')
+LIST_LINE_RE = re.compile(r'^\s*(?:[-*+]|\d+[.)])\s+|^\s*\|')
+FENCE_RE = re.compile(r'```.*?(?:```|$)', re.DOTALL)
+
+STOPWORDS = frozenset('''
+a aby ale albo bo by być był była było będzie co czy dla do go i ich ile im jak jako je jego jej jest
+już ma mi może na nad nie nim nich no o od oraz po pod przez przy się są ta tak te tego tej ten to
+tu tym u w we więc z za ze że także który która które których tylko lub jeśli gdy
+an and are as at be but by for from has have if in into is it its not of on or that the their then
+there these this to was were which will with you your can all also more than
+'''.split())
+
+
+def split_units(text: str) -> List[str]:
+    """Dzieli treść na jednostki streszczenia: zdania, elementy list, wiersze tabel"""
+    units = []
+    for paragraph in re.split(r'\n\s*\n', FENCE_RE.sub('', text)):
+        paragraph = paragraph.strip()
+        if not paragraph:
+            continue
+        lines = paragraph.split('\n')
+        if any(LIST_LINE_RE.match(line) for line in lines):
+            units.extend(line.strip() for line in lines if line.strip())
+        else:
+            units.extend(s for s in SENTENCE_RE.split(' '.join(line.strip() for line in lines)) if s)
+    return units
+
+
+def terms(text: str) -> List[str]:
+    return [t for t in TERM_RE.findall(text.lower()) if t not in STOPWORDS]
+
+
+class DocumentSummarizer:
+    """
+    Streszczenia sekcji jednego dokumentu.
+    IDF liczone leniwie, raz, przy pierwszym streszczeniu.
+    """
+
+    def __init__(self, texts: Sequence[str]):
+        self._texts = texts
+        self._idf: Optional[Dict[str, float]] = None
+
+    def idf(self) -> Dict[str, float]:
+        if self._idf is None:
+            df = Counter()
+            for text in self._texts:
+                df.update(set(terms(text or '')))
+            n = len(self._texts)
+            self._idf = {term: math.log((n + 1) / (count + 1)) + 1.0 for term, count in df.items()}
+        return self._idf
+
+    def summarize(self, text: str, max_tokens: int, count_tokens: Callable[[str], int]) -> str:
+        """
+        Zwraca streszczenie `text` w limicie `max_tokens`.
+
+        Args:
+            text: Treść sekcji
+            max_tokens: Limit tokenów streszczenia
+            count_tokens: Funkcja licząca tokeny (np. TokenCounter.count)
+        """
+        units = split_units(text)
+        if not units:
+            return ''
+
+        idf = self.idf()
+        default_idf = math.log(len(self._texts) + 1) + 1.0
+        unit_terms = [terms(unit) for unit in units]
+        tf = Counter(t for ts in unit_terms for t in ts)
+
+        scored = []
+        for i, ts in enumerate(unit_terms):
+            if not ts:
+                continue
+            weight = sum(tf[t] * idf.get(t, default_idf) for t in set(ts))
+            score = weight / math.sqrt(len(ts))
+            if i == 0:
+                score *= 1.2  # Pierwsze zdanie zwykle streszcza sekcję
+            scored.append((score, i))
+        scored.sort(reverse=True)
+
+        chosen = []
+        used = 0
+        for _, i in scored:
+            cost = count_tokens(units[i]) + 1
+            if used + cost <= max_tokens:
+                chosen.append(i)
+                used += cost
+            if max_tokens - used < 8:
+                break
+
+        chosen.sort()
+        parts = []
+        for i in chosen:
+            separator = '\n' if LIST_LINE_RE.match(units[i]) or (parts and LIST_LINE_RE.match(parts[-1][1])) else ' '
+            parts.append((separator, units[i]))
+        return ''.join(sep + unit for sep, unit in parts).strip()
@@ -0,0 +1,184 @@
+"""
+Template Engine - Prekompilowane szablony plików wyjściowych
+
+Szablon to tekst z polami `{{ nazwa }}`. Przy pierwszym użyciu jest
+kompilowany do planu konkatenacji (na przemian literały i nazwy pól),
+więc renderowanie to jedno podstawienie wartości i jeden join - bez
+ponownego parsowania. Wyniki renderowania są zapamiętywane po wartościach
+pól (np. autor, rok), a wyniki złożone z wielu szablonów - po kluczu
+podanym przez wywołującego (np. zbiór wykrytych języków).
+
+Szablony wbudowane leżą w resources/templates/<destinacja>/; plik o tej
+samej ścieżce w config/destinations/<destinacja>/ ma pierwszeństwo.
+Silniki są współdzielone przez cały proces, więc każde pobranie szablonu
+sprawdza stat() jego pliku: zmiana (czas modyfikacji, rozmiar), dodanie
+albo usunięcie nadpisania wczytuje szablon ponownie i unieważnia
+zapamiętane wyniki.
+"""
+
+import hashlib
+import re
+import threading
+from collections import OrderedDict
+from pathlib import Path
+from stat import S_ISREG
+from typing import Any, Callable, Dict, Hashable, Optional, Tuple
+
+
+PLACEHOLDER_RE = re.compile(r'\{\{\s*(\w+)\s*\}\}')
+TEMPLATE_SUFFIX = '.tmpl'
+BUILTIN_DIR = Path(__file__).parent / 'resources' / 'templates'
+OVERRIDE_DIR = Path(__file__).resolve().parents[2] / 'config' / 'destinations'
+
+
+class Template:
+    """Szablon skompilowany do planu konkatenacji"""
+
+    __slots__ = ('name', 'source', 'plan', 'fields')
+
+    def __init__(self, name: str, source: str):
+        self.name = name
+        self.source = source
+        # split() z grupą daje [literał, pole, literał, pole, ..., literał]
+        self.plan = PLACEHOLDER_RE.split(source)
+        self.fields: Tuple[str, ...] = tuple(self.plan[1::2])
+
+    @property
+    def is_static(self) -> bool:
+        return not self.fields
+
+    def render(self, values: Dict[str, Any]) -> str:
+        """Podstawia wartości pól (brakujące pole - ValueError)"""
+        if not self.fields:
+            return self.source
+        parts = self.plan[:]
+        try:
+            parts[1::2] = [str(values[field]) for field in self.fields]
+        except KeyError as e:
+            raise ValueError(f"Brak wartości pola {e} dla szablonu '{self.name}'") from None
+        return ''.join(parts)
+
+
+class TemplateEngine:
+    """
+    Szablony jednej destinacji.
+
+    - get(): szablon skompilowany raz (nadpisanie z config/destinations/ lub wbudowany)
+    - render(): wynik zapamiętany po nazwie szablonu i wartościach pól
+    - memoize(): dowolny wynik (np. plik złożony z fragmentów) zapamiętany po kluczu
+    """
+
+    def __init__(self, destination: str, override_dir: Optional[Path] = None, cache_size: int = 1024):
+        self.destination = destination
+        self.builtin_dir = BUILTIN_DIR / destination
+        self.override_dir = Path(override_dir) if override_dir else OVERRIDE_DIR / destination
+        self.cache_size = cache_size
+        self._templates: Dict[str, Tuple[Template, Tuple[str, int, int]]] = {}  # {nazwa: (szablon, plik)}
+        self._outputs: OrderedDict = OrderedDict()
+        self._lock = threading.RLock()
+
+    def get(self, name: str) -> Template:
+        """Zwraca skompilowany szablon `name` (np. 'LICENSE', 'readme/header')"""
+        stamp = self._stamp(name)
+        cached = self._templates.get(name)
+        if cached is None or cached[1] != stamp:
+            with self._lock:
+                cached = self._templates.get(name)
+                if cached is None or cached[1] != stamp:
+                    if cached is not None:
+                        # Wyniki mogły powstać ze starej wersji szablonu
+                        self._outputs.clear()
+                    cached = (Template(name, Path(stamp[0]).read_text(encoding='utf-8')), stamp)
+                    self._templates[name] = cached
+        return cached[0]
+
+    def render(self, name: str, **values) -> str:
+        """Renderuje szablon; wynik zapamiętany po (nazwa, wartości pól)"""
+        template = self.get(name)
+        if template.is_static:
+            return template.source
+        key = (name, tuple(sorted(values.items())))
+        return self.memoize(key, lambda: template.render(values))
+
+    def memoize(self, key: Hashable, build: Callable[[], str]) -> str:
+        """Zwraca zapamiętany wynik dla `key` albo buduje go przez `build()` (LRU)"""
+        with self._lock:
+            cached = self._outputs.get(key)
+            if cached is not None:
+                self._outputs.move_to_end(key)
+                return cached
+
+        output = build()
+
+        with self._lock:
+            self._outputs[key] = output
+            if len(self._outputs) > self.cache_size:
+                self._outputs.popitem(last=False)
+        return output
+
+    def fingerprint(self, *names: str) -> str:
+        """
+        Hash treści szablonów `names` w postaci faktycznie użytej (nadpisanie
+        albo wbudowany) - część hasha źródeł pliku wyjściowego.
+        """
+        digest = hashlib.blake2b(digest_size=16)
+        for name in names:
+            digest.update(name.encode('utf-8'))
+            digest.update(b'\0')
+            digest.update(self.get(name).source.encode('utf-8', 'surrogatepass'))
+            digest.update(b'\0')
+        return digest.hexdigest()
+
+    def clear(self):
+        """Czyści szablony i wyniki"""
+        with self._lock:
+            self._templates.clear()
+            self._outputs.clear()
+
+    def _stamp(self, name: str) -> Tuple[str, int, int]:
+        """Plik szablonu (nadpisanie albo wbudowany): (ścieżka, rozmiar, czas modyfikacji)"""
+        for directory in (self.override_dir, self.builtin_dir):
+            path = directory / (name + TEMPLATE_SUFFIX)
+            try:
+                stat = path.stat()
+            except OSError:
+                continue
+            if S_ISREG(stat.st_mode):
+                return str(path), stat.st_size, stat.st_mtime_ns
+        raise ValueError(f"Nie znaleziono szablonu '{name}' dla destinacji {self.destination}")
+
+
+_engines: Dict[Tuple[str, Optional[str]], TemplateEngine] = {}
+_engines_lock = threading.Lock()
+
+
+def get_template_engine(destination: str, override_dir: Optional[str] = None) -> TemplateEngine:
+    """Współdzielony silnik szablonów destinacji (cache wspólny dla wszystkich instancji transformera)"""
+    key = (destination, str(override_dir) if override_dir else None)
+    engine = _engines.get(key)
+    if engine is None:
+        with _engines_lock:
+            engine = _engines.get(key)
+            if engine is None:
+                engine = TemplateEngine(destination, override_dir)
+                _engines[key] = engine
+    return engine
+
+
+def template_dir_fingerprint(destination: str, override_dir: Optional[str] = None) -> str:
+    """
+    Odcisk plików szablonów destinacji (nadpisania i wbudowane): ścieżka,
+    rozmiar i czas modyfikacji - bez czytania treści. Zmienia się przy każdej
+    zmianie, dodaniu lub usunięciu szablonu.
+    """
+    digest = hashlib.blake2b(digest_size=16)
+    for directory in (Path(override_dir) if override_dir else OVERRIDE_DIR / destination,
+                      BUILTIN_DIR / destination):
+        digest.update(str(directory).encode('utf-8', 'surrogatepass') + b'\0')
+        if not directory.is_dir():
+            continue
+        for path in sorted(directory.rglob('*' + TEMPLATE_SUFFIX)):
+            stat = path.stat()
+            digest.update(f"{path.relative_to(directory)}\0{stat.st_size}\0{stat.st_mtime_ns}\0"
+                          .encode('utf-8', 'surrogatepass'))
+    return digest.hexdigest()
@@ -0,0 +1,239 @@
+"""
+Token Counter - Lokalny licznik tokenów (BPE na bajtach)
+
+Liczy tokeny tak jak tokenizery modeli GPT: tekst jest dzielony
+pre-tokenizerem w stylu cl100k, a każdy fragment kodowany przez
+scalanie par bajtów według rang ze słownika dostarczonego w repo
+(resources/token_vocab.bpe). Nie wymaga sieci ani dodatkowych pakietów.
+
+Długie pre-tokeny (ciągi spacji, linie z myślników, słowa bez przerw) są
+kodowane w kawałkach po MAX_PIECE_BYTES bajtów - koszt scalania rośnie
+z kwadratem długości fragmentu, a tokeny słownika są znacznie krótsze.
+
+Wyniki są zapamiętywane po hashu treści; dla bardzo dużych tekstów
+dostępny jest szybki tryb przybliżony (dokładne liczenie na oknach
+rozłożonych po tekście i skalowanie do całej długości).
+"""
+
+import base64
+import hashlib
+import re
+import threading
+from collections import OrderedDict
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional
+
+
+VOCAB_PATH = Path(__file__).parent / 'resources' / 'token_vocab.bpe'
+
+# Dłuższe pre-tokeny kodowane są w kawałkach tej długości (bajty)
+MAX_PIECE_BYTES = 256
+
+# Pre-tokenizer cl100k; \p{L} -> [^\W\d_], \p{N} -> \d (moduł re nie zna klas Unicode)
+PRETOKEN_RE = re.compile(
+    r"(?i:'s|'t|'re|'ve|'m|'ll|'d)"
+    r"|(?:[^\r\n\w]|_)?[^\W\d_]+"
+    r"|\d{1,3}"
+    r"| ?(?:[^\s\w]|_)+[\r\n]*"
+    r"|\s*[\r\n]+"
+    r"|\s+(?!\S)"
+    r"|\s+"
+)
+
+
+def load_vocab(path: Path = VOCAB_PATH) -> Dict[bytes, int]:
+    """Wczytuje słownik w formacie tiktoken: '<token base64> <ranga>' w każdej linii"""
+    ranks = {}
+    with open(path, 'rb') as f:
+        for line in f:
+            if line.strip():
+                token, rank = line.split()
+                ranks[base64.b64decode(token)] = int(rank)
+    return ranks
+
+
+class TokenCounter:
+    """
+    Licznik tokenów BPE ze słownikiem lokalnym.
+
+    - count(): liczba tokenów (cache po hashu treści)
+    - count_sections(): liczby tokenów dla listy sekcji
+    - truncate(): przycina tekst do limitu tokenów na granicy pre-tokenu
+    """
+
+    def __init__(self, config: Dict = None):
+        default_config = {
+            'vocab_path': VOCAB_PATH,
+            'cache_size': 4096,                 # Liczba zapamiętanych tekstów
+            'piece_cache_size': 200000,         # Liczba zapamiętanych pre-tokenów
+            'approx_threshold': 2 * 1024 * 1024,  # Od tej długości tryb przybliżony (auto)
+            'approx_sample_size': 256 * 1024,   # Łączny rozmiar próbek w trybie przybliżonym
+            'approx_windows': 32                # Liczba okien próbkowania
+        }
+        if config:
+            default_config.update(config)
+        self.config = default_config
+
+        self._ranks = load_vocab(Path(self.config['vocab_path']))
+        self._pieces: Dict[str, int] = {}
+        self._counts: OrderedDict = OrderedDict()
+        self._lock = threading.Lock()
+
+    # --- API -----------------------------------------------------------------
+
+    def count(self, text: str, approximate: Optional[bool] = None) -> int:
+        """
+        Zwraca liczbę tokenów w tekście.
+
+        Args:
+            text: Tekst do policzenia
+            approximate: True - tryb przybliżony, False - dokładny,
+                         None - przybliżony dopiero powyżej `approx_threshold`
+        """
+        if not text:
+            return 0
+
+        if approximate is None:
+            approximate = len(text) >= self.config['approx_threshold']
+
+        key = (hashlib.blake2b(text.encode('utf-8', 'surrogatepass'), digest_size=16).digest(), approximate)
+        with self._lock:
+            cached = self._counts.get(key)
+            if cached is not None:
+                self._counts.move_to_end(key)
+                return cached
+
+        result = self._approximate(text) if approximate else self._count_exact(text)
+
+        with self._lock:
+            self._counts[key] = result
+            if len(self._counts) > self.config['cache_size']:
+                self._counts.popitem(last=False)
+        return result
+
+    def count_sections(self, sections: Iterable[Dict], approximate: Optional[bool] = None) -> List[int]:
+        """Liczy tokeny dla każdej sekcji (tytuł + treść)"""
+        counts = []
+        for section in sections:
+            title = section.get('title') or ''
+            counts.append(self.count(title, approximate) + self.count(section.get('content') or '', approximate))
+        return counts
+
+    def encode(self, text: str) -> List[int]:
+        """Koduje tekst do listy rang tokenów (dokładnie, bez cache)"""
+        tokens = []
+        for piece in PRETOKEN_RE.findall(text):
+            tokens.extend(self._bpe(piece.encode('utf-8', 'surrogatepass')))
+        return tokens
+
+    def truncate(self, text: str, max_tokens: int) -> str:
+        """Zwraca najdłuższy prefiks tekstu mieszczący się w `max_tokens` (granica pre-tokenu)"""
+        if max_tokens <= 0:
+            return ''
+
+        used = 0
+        for match in PRETOKEN_RE.finditer(text):
+            used += self._piece_count(match.group())
+            if used > max_tokens:
+                return text[:match.start()]
+        return text
+
+    # --- Implementacja -------------------------------------------------------
+
+    def _count_exact(self, text: str) -> int:
+        pieces = self._pieces
+        piece_count = self._piece_count
+        total = 0
+        for piece in PRETOKEN_RE.findall(text):
+            n = pieces.get(piece)
+            total += n if n is not None else piece_count(piece)
+        return total
+
+    def _approximate(self, text: str) -> int:
+        """
+        Tryb przybliżony: dokładne liczenie na oknach rozłożonych równomiernie
+        po tekście i skalowanie gęstości tokenów na znak do całej długości.
+        Koszt zależy od rozmiaru próbki, nie od rozmiaru tekstu.
+        """
+        sample_size = self.config['approx_sample_size']
+        windows = self.config['approx_windows']
+        if len(text) <= sample_size * 2:
+            return self._count_exact(text)
+
+        width = sample_size // windows
+        step = len(text) // windows
+        sample_chars = 0
+        sample_tokens = 0
+        for i in range(windows):
+            start = i * step
+            # Okno zaczyna się i kończy na białym znaku - bez uciętych pre-tokenów
+            if start:
+                space = text.find(' ', start, start + 200)
+                start = space if space != -1 else start
+            end = text.rfind(' ', start + width // 2, start + width)
+            window = text[start:end if end != -1 else start + width]
+            sample_chars += len(window)
+            sample_tokens += self._count_exact(window)
+
+        return round(len(text) * sample_tokens / sample_chars)
+
+    def _piece_count(self, piece: str) -> int:
+        n = self._pieces.get(piece)
+        if n is None:
+            n = len(self._bpe(piece.encode('utf-8', 'surrogatepass')))
+            if len(self._pieces) >= self.config['piece_cache_size']:
+                self._pieces.clear()
+            self._pieces[piece] = n
+        return n
+
+    def _bpe(self, data: bytes) -> List[int]:
+        """Scalanie par bajtów według rang (jak w tiktoken); długie dane w kawałkach"""
+        if len(data) <= MAX_PIECE_BYTES:
+            return self._merge(data)
+        tokens = []
+        merged: Dict[bytes, List[int]] = {}     # Powtarzające się kawałki (ciągi tego samego znaku) kodowane raz
+        for start in range(0, len(data), MAX_PIECE_BYTES):
+            chunk = data[start:start + MAX_PIECE_BYTES]
+            chunk_tokens = merged.get(chunk)
+            if chunk_tokens is None:
+                chunk_tokens = merged[chunk] = self._merge(chunk)
+            tokens.extend(chunk_tokens)
+        return tokens
+
+    def _merge(self, data: bytes) -> List[int]:
+        ranks = self._ranks
+        whole = ranks.get(data)
+        if whole is not None:
+            return [whole]
+
+        # Rangi sąsiednich par; po scaleniu przeliczane są tylko pary wokół miejsca scalenia
+        missing = len(ranks) + 1
+        parts = [data[i:i + 1] for i in range(len(data))]
+        pair_ranks = [ranks.get(parts[i] + parts[i + 1], missing) for i in range(len(parts) - 1)]
+        while pair_ranks:
+            best = min(pair_ranks)
+            if best == missing:
+                break
+            i = pair_ranks.index(best)
+            parts[i:i + 2] = [parts[i] + parts[i + 1]]
+            del pair_ranks[i]
+            if i < len(pair_ranks):
+                pair_ranks[i] = ranks.get(parts[i] + parts[i + 1], missing)
+            if i > 0:
+                pair_ranks[i - 1] = ranks.get(parts[i - 1] + parts[i], missing)
+
+        return [ranks[p] for p in parts]
+
+
+_counter: Optional[TokenCounter] = None
+_counter_lock = threading.Lock()
+
+
+def get_token_counter() -> TokenCounter:
+    """Współdzielony licznik (słownik wczytywany raz, przy pierwszym użyciu)"""
+    global _counter
+    if _counter is None:
+        with _counter_lock:
+            if _counter is None:
+                _counter = TokenCounter()
+    return _counter
@@ -0,0 +1,8 @@
+"""
+Dr.Doc - wersja narzędzia
+
+Zapisywana w manifeście projektu: zmiana wersji unieważnia zapamiętane
+przebiegi (nowy kod może generować inne pliki z tych samych danych).
+"""
+
+__version__ = '1.0.0'
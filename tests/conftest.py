@@ -0,0 +1,5 @@
+import sys
+from pathlib import Path
+
+# Testy importują pakiet src z katalogu repozytorium (jak drdoc.py)
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
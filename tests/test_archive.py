@@ -0,0 +1,72 @@
+import io
+import subprocess
+import sys
+import tarfile
+import zipfile
+from pathlib import Path
+
+import pytest
+
+import drdoc
+from src.generators.archive import archive_format_for
+from src.generators.file_generator import FileGenerator
+from src.transformers.base_transformer import TransformedData
+
+ROOT = Path(__file__).resolve().parent.parent
+EXAMPLE = ROOT / 'examples' / 'example_markdown.md'
+ARGS = ['-i', str(EXAMPLE), '-d', 'github,chatgpt', '--project-name', 'demo']
+
+
+def _run(monkeypatch, *args):
+    monkeypatch.setattr(sys, 'argv', ['drdoc.py', *ARGS, *args])
+    return drdoc.main()
+
+
+def _directory_files(root: Path):
+    return {
+        path.relative_to(root).as_posix(): path.read_bytes()
+        for path in root.rglob('*') if path.is_file() and path.name != '.drdoc_manifest.json'
+    }
+
+
+def _zip_files(data: bytes):
+    with zipfile.ZipFile(io.BytesIO(data)) as archive:
+        return {name: archive.read(name) for name in archive.namelist()}
+
+
+def _tar_files(data: bytes):
+    with tarfile.open(fileobj=io.BytesIO(data)) as archive:
+        return {member.name: archive.extractfile(member).read() for member in archive.getmembers() if member.isfile()}
+
+
+def test_archives_match_directory_output(tmp_path, monkeypatch, capsys):
+    assert _run(monkeypatch, '-o', str(tmp_path / 'out')) == 0
+    expected = _directory_files(tmp_path / 'out')
+    assert {'demo_github/README.md', 'demo_chatgpt/context.md'} <= set(expected)
+
+    assert _run(monkeypatch, '--archive', str(tmp_path / 'wynik.zip')) == 0
+    assert _zip_files((tmp_path / 'wynik.zip').read_bytes()) == expected
+
+    assert _run(monkeypatch, '--archive', str(tmp_path / 'wynik.tgz')) == 0
+    assert _tar_files((tmp_path / 'wynik.tgz').read_bytes()) == expected
+
+    # tar na stdout (potok) - komunikaty trafiają na stderr
+    proc = subprocess.run([sys.executable, str(ROOT / 'drdoc.py'), *ARGS, '--archive', '-'],
+                          capture_output=True, cwd=tmp_path, check=True)
+    assert _tar_files(proc.stdout) == expected
+    assert 'Zapisano archiwum tar na stdout' in proc.stderr.decode('utf-8')
+    assert not list(tmp_path.glob('*.tmp'))
+
+
+def test_unknown_extension_is_a_clean_error(tmp_path, monkeypatch, capsys):
+    assert _run(monkeypatch, '--archive', str(tmp_path / 'wynik.rar')) == 1
+    out = capsys.readouterr().out
+
+    assert 'Nieznany format archiwum' in out and 'Traceback' not in out
+    assert not list(tmp_path.iterdir())
+
+    with pytest.raises(ValueError):
+        archive_format_for('wynik.7z')
+    with pytest.raises(ValueError):
+        FileGenerator(tmp_path).save_archive({'demo': TransformedData()}, tmp_path / 'wynik.rar')
+    assert not list(tmp_path.iterdir())
@@ -0,0 +1,68 @@
+import sys
+
+import drdoc
+from src.transformers import templates
+
+SECTIONS = ['Instalacja', 'Konfiguracja', 'Uruchomienie', 'Testy', 'Wdrożenie', 'Licencja']
+
+
+def _document(titles):
+    body = '\n\n'.join(f"## {title}\n\nOpis etapu {title.lower()} w kilku zdaniach." for title in titles)
+    return f"# Projekt\n\nKrótki opis.\n\n{body}\n"
+
+
+def _run(monkeypatch, capsys, *args):
+    monkeypatch.setattr(sys, 'argv', ['drdoc.py', *args])
+    code = drdoc.main()
+    return code, capsys.readouterr().out
+
+
+def test_manifest_short_circuits_unchanged_run(tmp_path, monkeypatch, capsys):
+    source = tmp_path / 'doc.md'
+    source.write_text(_document(SECTIONS), encoding='utf-8')
+    args = ('-i', str(source), '-d', 'github', '-o', str(tmp_path / 'out'), '--project-name', 'demo')
+
+    code, out = _run(monkeypatch, capsys, *args)
+    assert code == 0 and 'Zapisano' in out
+
+    code, out = _run(monkeypatch, capsys, *args)
+    assert code == 0 and 'Bez zmian' in out and 'Zapisano' not in out
+
+    # --force, zmiana wersji i zmiana szablonów unieważniają manifest
+    code, out = _run(monkeypatch, capsys, *args, '--force')
+    assert 'Zapisano' in out
+
+    monkeypatch.setattr(drdoc, '__version__', '0.0.0-test')
+    code, out = _run(monkeypatch, capsys, *args)
+    assert 'Zapisano' in out and 'Bez zmian' not in out
+    code, out = _run(monkeypatch, capsys, *args)
+    assert 'Bez zmian' in out
+
+    overrides = tmp_path / 'destinations'
+    (overrides / 'github').mkdir(parents=True)
+    (overrides / 'github' / 'CONTRIBUTING.md.tmpl').write_text('Zapraszamy.\n', encoding='utf-8')
+    monkeypatch.setattr(templates, 'OVERRIDE_DIR', overrides)
+    code, out = _run(monkeypatch, capsys, *args)
+    assert 'Zapisano' in out and 'Bez zmian' not in out
+
+
+def test_stale_files_are_removed(tmp_path, monkeypatch, capsys):
+    source = tmp_path / 'doc.md'
+    project = tmp_path / 'out' / 'demo'
+    args = ('-i', str(source), '-d', 'github', '-o', str(tmp_path / 'out'), '--project-name', 'demo')
+
+    source.write_text(_document(SECTIONS), encoding='utf-8')
+    _run(monkeypatch, capsys, *args)
+    before = {p.name for p in (project / 'docs').iterdir()}
+    (project / 'notatki.txt').write_text('moje', encoding='utf-8')
+
+    source.write_text(_document(SECTIONS[:4]), encoding='utf-8')
+    code, out = _run(monkeypatch, capsys, *args)
+    after = {p.name for p in (project / 'docs').iterdir()}
+
+    assert code == 0
+    assert after < before
+    for name in before - after:
+        assert f"docs/{name} (nieaktualny, usunięty)" in out
+    # Pliki spoza manifestu nie są ruszane
+    assert (project / 'notatki.txt').read_text(encoding='utf-8') == 'moje'
@@ -0,0 +1,26 @@
+from src.parsers import detect_format, parse_content
+from src.parsers.clipboard_parser import ClipboardParser
+
+
+MIXED = 'Notes about the API.\n\n{"name": "demo", "tags": [1, 2]}\n\ndef handler(x):\n    return x\n'
+
+
+def test_source_code_is_not_mixed_content():
+    source = (
+        '"""Module docstring."""\n\nimport os\n\n'
+        '# - comment that looks like a list item\n'
+        'def main():\n    return os.getcwd()\n\n'
+        'Plain line of prose.\n'
+    )
+    assert ClipboardParser().can_parse(source) == 0.0
+
+
+def test_prose_and_json_are_mixed_content():
+    assert detect_format(MIXED)[0] == 'clipboard'
+
+
+def test_sections_without_headers_get_titles():
+    parsed = parse_content(MIXED, 'clipboard')
+    titles = [section['title'] for section in parsed.sections]
+    assert all(titles)
+    assert 'code: def handler(x):' in titles
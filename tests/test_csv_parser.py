@@ -0,0 +1,48 @@
+from src.parsers import detect_format
+from src.parsers.csv_parser import CsvParser
+
+
+def test_two_lines_are_not_a_table():
+    assert CsvParser().can_parse('Some text, with a comma.\nAnother, line.\n') == 0.0
+
+
+def test_score_grows_with_lines_and_columns():
+    parser = CsvParser()
+    small = parser.can_parse('a,b\n1,2\n3,4\n')
+    wide = parser.can_parse('a,b,c,d\n1,2,3,4\n5,6,7,8\n')
+    long = parser.can_parse('a,b\n' + ''.join(f'{i},{i}\n' for i in range(20)))
+
+    assert 0.0 < small < wide
+    assert small < long <= 0.8
+
+
+def test_detects_real_csv():
+    content = 'id,name,age\n' + ''.join(f'{i},name{i},{20 + i}\n' for i in range(10))
+    assert detect_format(content)[0] == 'csv'
+
+
+def test_demoted_column_keeps_original_text():
+    rows = ''.join(f'{i:03d},1.50\n' for i in range(5))
+    content = 'code,price\n' + rows + 'A12,n/a\n'
+    parsed = CsvParser({'sample_rows': 3, 'chunk_size': 2}).parse(content)
+    table = parsed.tables[0]
+    columns = table['columns']
+
+    assert table['column_types'] == {'code': 'str', 'price': 'str'}
+    assert columns['code'] == ['000', '001', '002', '003', '004', 'A12']
+    assert columns['price'] == ['1.50'] * 5 + ['n/a']
+
+
+def test_demoted_stats_are_lexicographic_without_columns():
+    content = 'n\n10\n05\n3\nx\n'
+    for keep_columns in (True, False):
+        parsed = CsvParser({'sample_rows': 3, 'chunk_size': 2, 'keep_columns': keep_columns}).parse(content)
+        stats = parsed.tables[0]['column_stats']['n']
+
+        assert stats['type'] == 'str' and stats['demoted']
+        assert (stats['min'], stats['max']) == ('05', 'x')
+
+
+def test_typed_column_values_are_converted():
+    parsed = CsvParser().parse('a,b\n1,x\n,y\n3,z\n')
+    assert parsed.tables[0]['columns']['a'] == [1, None, 3]
@@ -0,0 +1,60 @@
+from src.parsers import parse_content
+from src.transformers import transformer_registry
+from src.transformers.dedup import Deduplicator, deduplicate_parsed
+
+SETUP = (
+    "Zainstaluj Pythona 3.11, utwórz wirtualne środowisko i doinstaluj zależności "
+    "poleceniem pip install -r requirements.txt, a następnie uruchom serwer deweloperski "
+    "i otwórz przeglądarkę pod adresem localhost na porcie osiem tysięcy."
+)
+
+
+def _document(*sections):
+    return "# Projekt\n\nOpis projektu.\n\n" + "\n\n".join(f"## {title}\n\n{body}" for title, body in sections)
+
+
+def test_short_sections_are_never_compared():
+    parsed = parse_content(_document(("Installation", "TBD"), ("Usage", "TBD")), 'md')
+
+    deduped, report = deduplicate_parsed(parsed)
+
+    assert [s['title'] for s in deduped.sections] == [s['title'] for s in parsed.sections]
+    assert report['collapsed'] == []
+    assert Deduplicator().find_duplicates(['TBD', 'TBD', 'TBD']) == []
+
+
+def test_section_with_other_title_becomes_reference():
+    parsed = parse_content(_document(("Windows setup", SETUP), ("Linux setup", SETUP)), 'md')
+
+    deduped, report = deduplicate_parsed(parsed)
+
+    titles = [s['title'] for s in deduped.sections]
+    assert 'Linux setup' in titles and 'Windows setup' in titles
+    linux = next(s for s in deduped.sections if s['title'] == 'Linux setup')
+    assert 'Windows setup' in linux['content'] and SETUP not in linux['content']
+    assert report['sections_referenced'] == 1 and report['sections_removed'] == 0
+
+
+def test_repeated_section_with_same_title_is_removed():
+    parsed = parse_content(_document(("Setup", SETUP), ("Inne", "Coś zupełnie innego."), ("Setup", SETUP)), 'md')
+
+    deduped, report = deduplicate_parsed(parsed)
+
+    assert [s['title'] for s in deduped.sections].count('Setup') == 1
+    assert report['sections_removed'] == 1
+
+
+def test_dedup_is_opt_in():
+    sections = [(name, SETUP) for name in ("Windows setup", "Linux setup", "macOS setup", "BSD setup")]
+    parsed = parse_content(_document(*sections), 'md')
+
+    for destination in ('chatgpt', 'github', 'rag', 'project_brief'):
+        transformer = transformer_registry.get_transformer(destination)
+        assert transformer.config['deduplicate'] is False
+        assert transformer.deduplicate(parsed) == (parsed, None)
+
+    plain = transformer_registry.get_transformer('github').transform(parsed)
+    deduped = transformer_registry.get_transformer('github', {'deduplicate': True}).transform(parsed)
+    docs = sorted(name for name in plain.files if name.startswith('docs/'))
+    assert docs
+    assert sorted(name for name in deduped.files if name.startswith('docs/')) == docs
@@ -0,0 +1,24 @@
+from pathlib import Path
+
+from src.parsers import _sniff_mixed, _sniff_table
+
+ROOT = Path(__file__).resolve().parent.parent
+
+
+def test_markdown_does_not_wake_table_or_clipboard_parsers():
+    content = (ROOT / 'examples' / 'example_markdown.md').read_text(encoding='utf-8')
+    assert not _sniff_table(',;\t')(content)
+    assert not _sniff_mixed(content)
+
+
+def test_prose_with_commas_is_not_a_table():
+    content = 'Some text, with a comma.\nAnother line, here.\nA line without one.\n'
+    assert not _sniff_table(',;\t')(content)
+    assert not _sniff_mixed(content)
+
+
+def test_tables_and_mixed_content_pass():
+    assert _sniff_table(',;\t')('a,b\n"x, y",2\n"p",3\n')
+    assert _sniff_table('\t')('a\tb\n1\t2\n3\t4\n')
+    assert _sniff_mixed('Notes about the API.\n\n{"name": "demo"}\n')
+    assert _sniff_mixed('Results below:\n\nname,score\nann,3\nbob,4\n')
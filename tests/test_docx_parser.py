@@ -0,0 +1,33 @@
+import io
+import zipfile
+
+from src.parsers.docx_parser import DocxParser
+
+W = 'http://schemas.openxmlformats.org/wordprocessingml/2006/main'
+
+
+def _paragraph(text: str, style: str = None) -> str:
+    props = f'<w:pPr><w:pStyle w:val="{style}"/></w:pPr>' if style else ''
+    return f'<w:p>{props}<w:r><w:t>{text}</w:t></w:r></w:p>'
+
+
+def _docx(*paragraphs: str) -> bytes:
+    document = f'<w:document xmlns:w="{W}"><w:body>{"".join(paragraphs)}</w:body></w:document>'
+    buffer = io.BytesIO()
+    with zipfile.ZipFile(buffer, 'w') as zf:
+        zf.writestr('word/document.xml', document)
+        zf.writestr('word/styles.xml', f'<w:styles xmlns:w="{W}"><w:style w:styleId="Heading1">'
+                                       f'<w:name w:val="heading 1"/></w:style></w:styles>')
+    return buffer.getvalue()
+
+
+def test_section_paragraphs_are_separated_by_blank_lines():
+    parsed = DocxParser().parse(_docx(
+        _paragraph('Wstęp', 'Heading1'),
+        _paragraph('Pierwszy akapit.'),
+        _paragraph('Drugi akapit.'),
+    ))
+
+    section = next(s for s in parsed.sections if s['title'] == 'Wstęp')
+    assert section['content'] == 'Pierwszy akapit.\n\nDrugi akapit.'
+    assert 'Pierwszy akapit.\n\nDrugi akapit.' in parsed.content
@@ -0,0 +1,50 @@
+from src.parsers import parse_content
+from src.transformers.dedup import code_fingerprint
+from src.transformers.github_transformer import GitHubTransformer
+
+LOOP = "for x in items:\n    print(x)\n"
+OTHER = "SELECT id FROM users;\n"
+
+
+def _document(*blocks):
+    body = '\n\n'.join(f"## Krok {i}\n\nOpis kroku {i}.\n\n```{lang}\n{code}```" for i, (lang, code) in enumerate(blocks, 1))
+    return f"# Projekt\n\nKrótki opis.\n\n{body}\n"
+
+
+def _examples(result):
+    return sorted(path for path in result.files if path.startswith('examples/example_'))
+
+
+def test_fingerprint_ignores_layout_only_differences():
+    assert code_fingerprint(LOOP) == code_fingerprint("\n        for x in items:   \r\n        \tprint(x)\r\n\n")
+    assert code_fingerprint(LOOP) != code_fingerprint(LOOP.replace('print', 'log'))
+
+
+def test_identical_blocks_share_one_file():
+    parsed = parse_content(_document(('python', LOOP), ('sql', OTHER), ('python', LOOP.replace('    ', '\t'))), 'md')
+    result = GitHubTransformer().transform(parsed)
+
+    assert _examples(result) == ['examples/example_1.py', 'examples/example_2.sql']
+    assert result.read_file('examples/example_1.py') == LOOP.rstrip('\n')
+    index = result.read_file('examples/README.md')
+    assert 'Bloki kodu z dokumentu: 3, unikalne: 2.' in index
+    assert '| [example_1.py](example_1.py) | python | #1, #3 |' in index
+    assert '| [example_2.sql](example_2.sql) | sql | #2 |' in index
+
+
+def test_dedup_examples_can_be_disabled():
+    parsed = parse_content(_document(('python', LOOP), ('python', LOOP)), 'md')
+    result = GitHubTransformer({'dedup_examples': False}).transform(parsed)
+
+    assert _examples(result) == ['examples/example_1.py', 'examples/example_2.py']
+
+
+def test_near_duplicates_removed_earlier_keep_their_block_numbers():
+    code = ''.join(f"result_{i} = compute(value_{i}, factor={i}, mode='fast')\n" for i in range(30))
+    parsed = parse_content(_document(('python', code), ('sql', OTHER), ('python', code + "print('done')\n")), 'md')
+    result = GitHubTransformer({'deduplicate': True}).transform(parsed)
+
+    assert _examples(result) == ['examples/example_1.py', 'examples/example_2.sql']
+    index = result.read_file('examples/README.md')
+    assert 'Bloki kodu z dokumentu: 3, unikalne: 2.' in index
+    assert '| [example_1.py](example_1.py) | python | #1, #3 |' in index
@@ -0,0 +1,132 @@
+import os
+import threading
+import time
+
+from src.generators import file_generator
+from src.generators.file_generator import FileGenerator
+from src.transformers.base_transformer import StreamedFile, TransformedData
+
+
+def _transformed(files):
+    data = TransformedData()
+    data.destination = 'test'
+    for path, content in files.items():
+        data.add_file(path, content)
+    return data
+
+
+def _broken_stream():
+    yield "Początek pliku\n"
+    raise RuntimeError("błąd renderowania")
+
+
+def _temp_files(directory):
+    return [p for p in directory.rglob('*.tmp')]
+
+
+def test_files_are_replaced_atomically(tmp_path, monkeypatch):
+    replaced = []
+    original = os.replace
+    monkeypatch.setattr(file_generator.os, 'replace', lambda src, dst: replaced.append((src, dst)) or original(src, dst))
+
+    report = FileGenerator(tmp_path, max_workers=1).generate_with_report(
+        _transformed({'README.md': 'treść\n', 'docs/a.md': StreamedFile(lambda: iter(['a', 'b']))}), 'demo')
+
+    project = tmp_path / 'demo'
+    assert sorted(report.written) == ['README.md', 'docs/a.md']
+    targets = {os.fspath(dst): src for src, dst in replaced}
+    for rel_path in ('README.md', 'docs/a.md'):
+        temp = targets[os.fspath(project / rel_path)]
+        # Plik tymczasowy w tym samym katalogu co docelowy (ten sam system plików)
+        assert temp.parent == (project / rel_path).parent and temp.name.endswith('.tmp')
+    assert (project / 'docs' / 'a.md').read_text(encoding='utf-8') == 'ab'
+    assert not _temp_files(project)
+
+
+def test_identical_files_are_not_rewritten(tmp_path, monkeypatch):
+    generator = FileGenerator(tmp_path, max_workers=1)
+    generator.generate_with_report(_transformed({'a.md': 'jeden', 'b.md': 'dwa'}), 'demo')
+    project = tmp_path / 'demo'
+    os.utime(project / 'a.md', ns=(1, 1))
+
+    hashed = []
+    original = file_generator.file_digest
+    monkeypatch.setattr(file_generator, 'file_digest', lambda path: hashed.append(path.name) or original(path))
+
+    # Bez manifestu źródeł - każdy plik jest renderowany i porównywany z dyskiem
+    report = generator.generate_with_report(
+        _transformed({'a.md': 'jeden', 'b.md': 'trzy', 'c.md': StreamedFile(lambda: iter(['nowy']))}), 'demo')
+
+    assert report.identical == ['a.md']
+    assert sorted(report.written) == ['b.md', 'c.md']
+    assert os.stat(project / 'a.md').st_mtime_ns == 1
+    # Hash liczony tylko przy zgodnym rozmiarze ('dwa' -> 'trzy' różni się rozmiarem, c.md nie istniał)
+    assert hashed == ['a.md']
+
+
+def test_failed_write_is_reported_and_leaves_no_temp_files(tmp_path):
+    generator = FileGenerator(tmp_path, max_workers=1)
+    generator.generate_with_report(_transformed({'a.md': 'stara treść', 'b.md': 'b'}), 'demo')
+    project = tmp_path / 'demo'
+
+    report = generator.generate_with_report(
+        _transformed({'a.md': StreamedFile(_broken_stream), 'b.md': 'nowe b'}), 'demo')
+
+    assert list(report.failed) == ['a.md']
+    assert 'RuntimeError' in report.failed['a.md']
+    assert report.written == ['b.md']
+    assert 'a.md' not in report.files
+    # Istniejący plik nienaruszony, bez plików tymczasowych
+    assert (project / 'a.md').read_text(encoding='utf-8') == 'stara treść'
+    assert not _temp_files(project)
+    # Plik bez hasha źródeł w manifeście - kolejny przebieg zapisze go ponownie
+    assert generator.load_manifest(project)['files']['a.md'] == {}
+
+
+def test_unwritable_target_is_reported(tmp_path):
+    (tmp_path / 'demo').mkdir()
+    (tmp_path / 'demo' / 'docs').write_text('plik zamiast katalogu', encoding='utf-8')
+
+    report = FileGenerator(tmp_path, max_workers=1).generate_with_report(
+        _transformed({'docs/a.md': 'a', 'README.md': 'r'}), 'demo')
+
+    assert list(report.failed) == ['docs/a.md']
+    assert report.written == ['README.md']
+    assert not _temp_files(tmp_path)
+
+
+def test_batched_writes_keep_input_order_and_counts(tmp_path, monkeypatch):
+    files = {}
+    for i in range(200):
+        path = f"docs/{i % 7}/plik_{i:03d}.md"
+        files[path] = StreamedFile(_broken_stream) if i % 50 == 49 else f"plik {i}\n"
+    identical = [path for i, path in enumerate(files) if i % 10 == 3]
+
+    order = {path: i for i, path in enumerate(files)}
+    threads = set()
+    original = FileGenerator._write_one
+
+    def write_one(item):
+        threads.add(threading.current_thread().name)
+        # Wcześniejsze paczki kończą się później niż następne
+        time.sleep(0.002 * (len(files) - order.get(item[0], len(files))) / len(files))
+        return original(item)
+
+    monkeypatch.setattr(FileGenerator, '_write_one', staticmethod(write_one))
+
+    reports = []
+    for workers in (1, 4):
+        output = tmp_path / f"workers_{workers}"
+        for path in identical:
+            (output / 'demo' / path).parent.mkdir(parents=True, exist_ok=True)
+            (output / 'demo' / path).write_text(files[path], encoding='utf-8')
+        reports.append(FileGenerator(output, max_workers=workers).generate_with_report(_transformed(files), 'demo'))
+
+    sequential, parallel = reports
+    assert any(name.startswith('drdoc-write') for name in threads)
+    assert parallel.counts() == sequential.counts() == {
+        'written': 176, 'skipped': 20, 'failed': 4, 'removed': 0
+    }
+    assert parallel.written == sequential.written == [p for p in files if p not in identical and p not in parallel.failed]
+    assert parallel.identical == sequential.identical == identical
+    assert list(parallel.failed) == list(sequential.failed) == [p for i, p in enumerate(files) if i % 50 == 49]
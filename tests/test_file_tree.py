@@ -0,0 +1,98 @@
+from src.generators.file_tree import FileTree
+
+PATHS = [
+    'README.md',
+    'docs/index.md',
+    'docs/01-wstep.md',
+    'docs/02-instalacja.md',
+    'docs/03-konfiguracja.md',
+    'examples/README.md',
+    'src/app/core/main.py',
+    'src/app/core/utils.py',
+    'LICENSE'
+]
+
+
+def test_full_tree():
+    assert FileTree(PATHS).render() == (
+        ".\n"
+        "├── LICENSE\n"
+        "├── README.md\n"
+        "├── docs/\n"
+        "│   ├── 01-wstep.md\n"
+        "│   ├── 02-instalacja.md\n"
+        "│   ├── 03-konfiguracja.md\n"
+        "│   └── index.md\n"
+        "├── examples/\n"
+        "│   └── README.md\n"
+        "└── src/\n"
+        "    └── app/\n"
+        "        └── core/\n"
+        "            ├── main.py\n"
+        "            └── utils.py\n"
+    )
+
+
+def test_max_entries_marks_hidden_entries():
+    lines = list(FileTree(PATHS).lines(max_entries=2, max_depth=2))
+
+    assert lines == [
+        "├── LICENSE",
+        "├── README.md",
+        "└── … (+3 więcej)"
+    ]
+    docs = list(FileTree(PATHS).lines('docs', max_entries=3))
+    assert docs[-1] == "└── … (+1 więcej)"
+    assert docs[-2].startswith("├── ")
+
+
+def test_max_depth_collapses_to_file_counts():
+    lines = list(FileTree(PATHS).lines(max_depth=1))
+
+    assert "├── docs/ (4 plików)" in lines
+    assert "└── src/ (2 plików)" in lines
+    assert not any(line.startswith("│") for line in lines)
+
+
+def test_collapse_joins_single_child_chains():
+    lines = list(FileTree(PATHS).lines(collapse=True))
+
+    assert "└── src/app/core/" in lines
+    assert lines[-2:] == ["    ├── main.py", "    └── utils.py"]
+    assert "└── src/app/core/ (2 plików)" in FileTree(PATHS).lines(collapse=True, max_depth=1)
+
+
+def test_pages_cover_all_lines_once():
+    tree = FileTree(PATHS)
+    everything = list(tree.lines())
+
+    pages, offset = [], 0
+    while offset is not None:
+        page = tree.page(offset=offset, limit=4)
+        assert page['offset'] == offset
+        pages.append(page['lines'])
+        offset = page['next_offset']
+
+    assert [len(page) for page in pages] == [4, 4, 4, 2]
+    assert sum(pages, []) == everything
+    # Strona kończąca się dokładnie na ostatniej linii nie ma następnej
+    assert tree.page(offset=8, limit=6)['next_offset'] is None
+    assert tree.page(offset=8, limit=5)['next_offset'] == 13
+
+
+def test_entries_of_one_directory():
+    tree = FileTree(PATHS)
+
+    root = tree.entries(limit=3)
+    assert root['total'] == 5 and root['next_offset'] == 3
+    assert [entry['name'] for entry in root['entries']] == ['LICENSE', 'README.md', 'docs']
+    assert root['entries'][2] == {'name': 'docs', 'path': 'docs', 'type': 'dir', 'files': 4}
+
+    rest = tree.entries(offset=3, limit=3)
+    assert rest['next_offset'] is None
+    assert rest['entries'][1] == {'name': 'src/app/core', 'path': 'src/app/core', 'type': 'dir', 'files': 2}
+
+    core = tree.entries('src/app/core/')
+    assert core['path'] == 'src/app/core'
+    assert [entry['path'] for entry in core['entries']] == ['src/app/core/main.py', 'src/app/core/utils.py']
+    assert tree.entries('README.md') is None and tree.entries('brak') is None
@@ -0,0 +1,40 @@
+from pathlib import Path
+
+from src.parsers import parse_content
+from src.transformers import base_transformer
+from src.transformers.github_transformer import GitHubTransformer
+from src.transformers.templates import TemplateEngine
+
+ROOT = Path(__file__).resolve().parent.parent
+
+
+def _parsed():
+    return parse_content((ROOT / 'examples' / 'example_markdown.md').read_text(encoding='utf-8'), 'md')
+
+
+def test_every_file_has_sources():
+    result = GitHubTransformer().transform(_parsed())
+
+    assert {'.gitignore', 'LICENSE', 'CONTRIBUTING.md', 'README.md'} <= set(result.sources)
+    assert set(result.files) - set(result.sources) <= {p for p in result.files if p.startswith('examples/')}
+
+
+def test_sources_follow_version(monkeypatch):
+    parsed = _parsed()
+    before = GitHubTransformer().transform(parsed).sources
+
+    monkeypatch.setattr(base_transformer, '__version__', '0.0.0-test')
+    after = GitHubTransformer().transform(parsed).sources
+
+    assert set(after) == set(before)
+    assert all(after[path] != hashed for path, hashed in before.items())
+
+
+def test_fingerprint_covers_loaded_templates(tmp_path):
+    (tmp_path / 'CONTRIBUTING.md.tmpl').write_text('Pull requesty mile widziane.\n', encoding='utf-8')
+    builtin = TemplateEngine('github', tmp_path / 'missing')
+    overridden = TemplateEngine('github', tmp_path)
+
+    assert builtin.fingerprint('LICENSE') == overridden.fingerprint('LICENSE')
+    assert builtin.fingerprint('CONTRIBUTING.md') != overridden.fingerprint('CONTRIBUTING.md')
+    assert builtin.fingerprint('LICENSE', 'CONTRIBUTING.md') != builtin.fingerprint('CONTRIBUTING.md', 'LICENSE')
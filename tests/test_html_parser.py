@@ -0,0 +1,71 @@
+from src.parsers import parser_registry
+
+
+PAGE = '''<html><head><title>Strona</title><script>var x = 1;</script></head><body>
+<h1>Intro</h1><p>Hello <strong>world</strong></p>
+<ul><li>a<ul><li>b</li></ul></li><li>c</li></ul>
+<h2>Code</h2><pre><code class="language-python">print(1)</code></pre>
+<h3>Data</h3><table><tr><th>A</th><th>B</th></tr><tr><td>1</td><td>2</td></tr></table>
+</body></html>'''
+
+
+def parse_html(text):
+    return parser_registry.get_parser('html').parse(text)
+
+
+def parse_xml(text):
+    return parser_registry.get_parser('xml').parse(text)
+
+
+def test_headings_become_sections():
+    result = parse_html(PAGE)
+
+    assert result.title == 'Strona'
+    assert [(h['text'], h['level']) for h in result.headers] == [('Intro', 1), ('Code', 2), ('Data', 3)]
+    assert [s['title'] for s in result.sections] == ['Intro', 'Code', 'Data']
+    assert 'var x' not in ''.join(s['content'] for s in result.sections)
+    assert result.errors == []
+
+
+def test_nested_lists_are_indented_under_parent_item():
+    intro = parse_html(PAGE).sections[0]['content']
+
+    assert intro == 'Hello **world**\n\n- a\n  - b\n- c'
+
+
+def test_code_language_comes_from_class():
+    result = parse_html(PAGE)
+
+    assert result.code_blocks[0]['language'] == 'python'
+    assert result.sections[1]['content'] == '```python\nprint(1)\n```'
+
+
+def test_tables_are_rendered_as_markdown():
+    result = parse_html(PAGE)
+
+    assert result.tables[0]['headers'] == ['A', 'B']
+    assert result.tables[0]['rows'] == [['1', '2']]
+    assert result.sections[2]['content'] == '| A | B |\n|---|---|\n| 1 | 2 |'
+
+
+def test_xml_records_become_sections():
+    result = parse_xml('<items><item><name>One</name><v>1</v></item>'
+                       '<item title="Two"><v>2</v></item></items>')
+
+    assert [s['title'] for s in result.sections] == ['One', 'Two']
+    assert result.sections[0]['content'] == '- name: One\n- v: 1'
+    assert result.errors == []
+
+
+def test_malformed_xml_reports_error():
+    result = parse_xml('<items><item></items>')
+
+    assert result.sections == []
+    assert any(e.startswith('XML parsing error') for e in result.errors)
+
+
+def test_entity_doctype_is_flagged():
+    result = parse_xml('<!DOCTYPE r [<!ENTITY e "w">]><r>&e;</r>')
+
+    assert [s['content'] for s in result.sections] == ['w']
+    assert any('ENTITY' in e for e in result.errors)
@@ -0,0 +1,37 @@
+import subprocess
+import sys
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+
+# Budżet skumulowanego czasu importu src.parsers (start `drdoc.py --detect`)
+BUDGET_MS = 60
+RUNS = 5
+
+
+def _import_src_parsers():
+    """Zwraca (czas importu src.parsers w ms, zaimportowane moduły src.*)"""
+    proc = subprocess.run(
+        [sys.executable, '-X', 'importtime', '-c',
+         "import sys, src.parsers; print(' '.join(m for m in sys.modules if m.startswith('src')))"],
+        capture_output=True, text=True, cwd=ROOT, check=True
+    )
+    # Format: "import time: <self us> | <cumulative us> | <wcięcie><moduł>"
+    cumulative = next(
+        int(line.split('|')[1]) for line in proc.stderr.splitlines()
+        if line.startswith('import time:') and line.split('|')[-1].strip() == 'src.parsers'
+    )
+    return cumulative / 1000, set(proc.stdout.split())
+
+
+def test_parsers_are_imported_lazily():
+    _, modules = _import_src_parsers()
+
+    assert modules == {'src', 'src.parsers', 'src.parsers.base_parser'}
+
+
+def test_import_time_budget():
+    # Najlepszy z kilku przebiegów - pojedynczy pomiar bywa zaszumiony
+    best = min(_import_src_parsers()[0] for _ in range(RUNS))
+
+    assert best <= BUDGET_MS, f"import src.parsers: {best:.1f} ms (budżet {BUDGET_MS} ms)"
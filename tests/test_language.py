@@ -0,0 +1,64 @@
+import pytest
+
+from src.transformers import language
+from src.transformers.language import LanguageClassifier, extension_for, get_language_classifier, normalize_language
+
+SAMPLES = {
+    'python': 'import os\n\ndef main(args):\n    for x in args:\n        print(x)\n    return None\n',
+    'javascript': "const x = require('fs');\nfunction run() {\n  console.log(x);\n  return null;\n}\n",
+    'bash': '#!/bin/bash\nset -e\nfor f in *.txt; do\n  echo "$f"\ndone\n',
+    'json': '{\n  "name": "demo",\n  "version": "1.0.0",\n  "private": true\n}\n',
+    'html': '<!DOCTYPE html>\n<html>\n<head><title>x</title></head>\n<body><div class="a"></div></body>\n</html>\n',
+    'sql': 'SELECT id, name FROM users WHERE age > 18 ORDER BY name;\n',
+    'yaml': 'name: demo\nversion: 1\nservices:\n  web:\n    image: nginx\n',
+    'go': 'package main\n\nimport "fmt"\n\nfunc main() {\n\tfmt.Println("hi")\n}\n',
+}
+
+
+def test_labels_and_extensions_are_normalized():
+    assert normalize_language(' Py ') == 'python'
+    assert normalize_language('') == normalize_language(None) == 'text'
+    assert extension_for('yml') == 'yml'
+    assert extension_for('kotlin') == 'kotlin'
+    assert extension_for('objective c') == 'txt'
+
+
+@pytest.mark.parametrize('expected', sorted(SAMPLES))
+def test_unlabeled_blocks_are_classified(expected):
+    assert get_language_classifier().classify(SAMPLES[expected]) == expected
+
+
+def test_too_few_features_give_text():
+    assert get_language_classifier().classify_batch(['', 'hello']) == ['text', 'text']
+
+
+def test_batch_classifies_each_unique_block_once(monkeypatch):
+    classifier = LanguageClassifier()
+    calls = []
+    original = language.extract_features
+    monkeypatch.setattr(language, 'extract_features', lambda code: calls.append(code) or original(code))
+
+    codes = [SAMPLES['python'], SAMPLES['go'], SAMPLES['python'], SAMPLES['go']]
+    assert classifier.classify_batch(codes) == ['python', 'go', 'python', 'go']
+    assert len(calls) == 2
+
+    # Drugie wywołanie korzysta z cache po hashu treści
+    assert classifier.classify(SAMPLES['go']) == 'go'
+    assert len(calls) == 2
+
+
+def test_cache_is_bounded():
+    classifier = LanguageClassifier({'cache_size': 2})
+    classifier.classify_batch([SAMPLES['python'], SAMPLES['go'], SAMPLES['sql']])
+
+    assert len(classifier._results) == 2
+
+
+def test_resolve_keeps_labels_and_classifies_the_rest():
+    blocks = [
+        {'language': 'js', 'code': SAMPLES['python']},
+        {'language': '', 'code': SAMPLES['python']},
+        {'code': SAMPLES['sql']},
+    ]
+
+    assert get_language_classifier().resolve(blocks) == ['javascript', 'python', 'sql']
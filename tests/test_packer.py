@@ -0,0 +1,54 @@
+from pathlib import Path
+
+from src.parsers import parse_content
+from src.transformers.chatgpt_transformer import ChatGPTTransformer
+from src.transformers.packer import ancestors
+from src.transformers.tokenizer import get_token_counter
+
+ROOT = Path(__file__).resolve().parent.parent
+
+
+def test_ancestors_follow_heading_levels():
+    levels = [1, 2, 3, 2, 0, 3]
+    assert ancestors(levels, [2]) == [0, 1]
+    assert ancestors(levels, [5]) == [0, 3]
+    assert ancestors(levels, [1, 2]) == [0]
+    assert ancestors(levels, []) == []
+
+
+def test_context_keeps_parent_headings_within_budget():
+    content = (ROOT / 'examples' / 'example_markdown.md').read_text(encoding='utf-8')
+    parsed = parse_content(content, 'md')
+
+    for max_tokens in (300, 600, 4000):
+        result = ChatGPTTransformer({'max_tokens': max_tokens}).transform(parsed)
+        context = result.files['context.md']
+        if '### Frontend' in context:
+            assert '### Technologie' in context
+        assert get_token_counter().count(context) <= max_tokens
+
+
+def test_section_content_is_tokenized_once(monkeypatch):
+    content = (ROOT / 'examples' / 'example_markdown.md').read_text(encoding='utf-8')
+    parsed = parse_content(content, 'md')
+    counter = get_token_counter()
+    calls = []
+    original = counter.count
+    monkeypatch.setattr(counter, 'count', lambda text, approximate=None: calls.append(text) or original(text, approximate))
+
+    result = ChatGPTTransformer({'max_tokens': 4000, 'summarize_long_sections': False}).transform(parsed)
+
+    for section in parsed.sections:
+        if section.get('content'):
+            assert calls.count(section['content']) == 1
+    assert [entry['tokens'] for entry in result.metadata['section_tokens']] == counter.count_sections(parsed.sections)
+
+
+def test_streamed_context_has_token_estimate():
+    content = (ROOT / 'examples' / 'example_markdown.md').read_text(encoding='utf-8')
+    result = ChatGPTTransformer({'optimize_tokens': False}).transform(parse_content(content, 'md'))
+
+    estimate = result.metadata['token_estimate']
+    exact = get_token_counter().count(''.join(result.files['context.md']))
+    assert isinstance(estimate, int)
+    assert abs(estimate - exact) <= exact // 20
@@ -0,0 +1,110 @@
+from src.parsers import parse_content
+from src.parsers.base_parser import DataType
+from src.parsers.php_parser import PhpParser
+
+CONFIG = """<?php
+/** Konfiguracja aplikacji */
+define('APP_ENV', 'prod');
+const VERSION = '2.1', DEBUG = false;
+
+return [
+    'name' => 'Sklep',
+    'db' => [
+        'hosts' => ['10.0.0.1', '10.0.0.2'],
+        'port' => 5432,
+        'options' => array('timeout' => 1.5, 'retry' => null),
+    ],
+    'secret' => env('SECRET'),
+    -1 => 'ujemny',
+];
+"""
+
+CODE = """<?php
+namespace App\\Models;
+
+use App\\Base;
+
+/**
+ * Użytkownik systemu
+ */
+final class User extends Base {
+    const ROLE = 'admin';
+
+    public function name(): string { return $this->name; }
+
+    public function greeting() {
+        $text = <<<EOT
+Witaj "{$this->name}"\\n
+EOT;
+        $raw = <<<'RAW'
+bez \\n interpolacji
+RAW;
+        return $text;
+    }
+}
+
+function helper(array $items = [1, 2]) {
+    return count($items);
+}
+"""
+
+
+def test_nested_arrays_and_constants():
+    result = PhpParser().parse(CONFIG)
+
+    assert result.data_type == DataType.STRUCTURED
+    assert result.title == 'Sklep'
+    assert result.raw_structure['db'] == {
+        'hosts': ['10.0.0.1', '10.0.0.2'],
+        'port': 5432,
+        'options': {'timeout': 1.5, 'retry': None}
+    }
+    # Wyrażenia nie są wykonywane - zostają jako tekst źródła
+    assert result.raw_structure['secret'] == "env('SECRET')"
+    assert result.raw_structure[-1] == 'ujemny'
+    assert result.metadata['constants'] == {'APP_ENV': 'prod', 'VERSION': '2.1', 'DEBUG': False}
+    assert [s['title'] for s in result.sections] == ['name', 'db', 'secret', '-1']
+    assert result.errors == []
+
+
+def test_classes_functions_and_heredocs():
+    result = parse_content(CODE, 'php')
+
+    assert result.data_type == DataType.CODE
+    assert result.metadata['namespace'] == 'App\\Models'
+    assert result.metadata['uses'] == ['App\\Base']
+    assert result.metadata['classes'] == [{'name': 'User', 'kind': 'class', 'methods': ['name', 'greeting']}]
+    assert result.metadata['functions'] == [
+        {'name': 'helper', 'signature': 'function helper(array $items = [1, 2])'}
+    ]
+    assert result.metadata['constants'] == {'User::ROLE': 'admin'}
+
+    user, helper = result.code_blocks
+    assert user['code'].startswith('final class User') and user['code'].endswith('}')
+    assert 'RAW;' in user['code'] and 'function helper' not in user['code']
+    assert helper['code'] == "function helper(array $items = [1, 2]) {\n    return count($items);\n}"
+    assert result.sections[0]['content'].startswith('/**\n * Użytkownik systemu')
+    assert result.errors == []
+
+
+def test_heredoc_bodies():
+    result = PhpParser().parse("<?php\n$texts = [<<<EOT\n  linia \\t {$x}\n  EOT, <<<'RAW'\nsurowe \\t\nRAW];\n")
+
+    # Wcięcie znacznika zamykającego usuwane z linii; nowdoc bez sekwencji ucieczki
+    assert result.raw_structure == {'texts': ['linia \t {$x}', 'surowe \\t']}
+
+
+def test_errors_are_reported_not_raised():
+    result = PhpParser().parse("<?php\nclass Broken {\n  function f() {\n$x = ['a' => 'niezamknięty;\n")
+
+    assert any('Niezamknięty string' in error for error in result.errors)
+    assert any('Niezamknięta deklaracja class Broken' in error for error in result.errors)
+    assert result.code_blocks[0]['code'].startswith('class Broken')
+
+    unclosed = PhpParser().parse("<?php\n$a = <<<EOT\nbez końca\n")
+    assert any("Niezamknięty heredoc 'EOT'" in error for error in unclosed.errors)
+    assert unclosed.raw_structure is None
+
+    function = PhpParser().parse("<?php\nfunction f() {\n  return 1;\n")
+    assert function.errors == ['Niezamknięta funkcja f']
+    assert function.code_blocks[0]['code'] == "function f() {\n  return 1;\n"
@@ -0,0 +1,89 @@
+from src.parsers import parse_content
+from src.transformers.project_brief_transformer import SLOT_KEYWORDS, BriefIndex, ProjectBriefTransformer
+
+DOCUMENT = """# Sklep
+
+## Cele projektu
+
+- Sprzedaż online
+- Obsługa płatności
+
+### Cel główny
+
+Uruchomienie sklepu przed sezonem.
+
+## Architektura
+
+Backend w Pythonie, frontend w React.
+
+## Harmonogram
+
+- Etap 1: MVP
+- Etap 2: płatności
+
+## Poza zakresem
+
+- Aplikacja mobilna
+
+## Notatki
+
+Luźne uwagi bez sygnałów.
+
+## Ryzyka i założenia
+
+- Opóźnienia dostawcy
+"""
+
+
+def _section(title, content='', level=2):
+    return {'title': title, 'level': level, 'content': content}
+
+
+def test_title_decides_and_subsections_inherit():
+    index = BriefIndex(parse_content(DOCUMENT, 'md').sections)
+    titles = {slot: [s['title'] for s in index.sections_for(slot)] for slot in SLOT_KEYWORDS}
+
+    assert titles['goals'] == ['Cele projektu', 'Cel główny']
+    assert titles['stack'] == ['Architektura']
+    assert titles['timeline'] == ['Harmonogram']
+    assert titles['out_of_scope'] == ['Poza zakresem']
+    assert titles['risks'] == ['Ryzyka i założenia']
+    assert 'Notatki' not in sum(titles.values(), [])
+
+
+def test_content_needs_enough_hits():
+    index = BriefIndex([
+        _section('A', 'Jeden budżet.'),
+        _section('B', 'Budżet i koszty wdrożenia.'),
+        _section('Budżet', 'Zespół, zespół, zespół.')
+    ])
+
+    assert index.assignment == [None, 'budget', 'budget']
+    assert index.unclassified() == 1
+
+
+def test_ties_follow_slot_priority():
+    # "Overview of goals" - summary i goals po jednym trafieniu w tytule; summary jest wcześniej
+    index = BriefIndex([_section('Overview of goals')])
+
+    assert index.assignment == ['summary']
+
+
+def test_inheritance_stops_at_sibling_level():
+    index = BriefIndex([
+        _section('Cele', level=2),
+        _section('Szczegóły', level=3),
+        _section('Dodatki', level=2),
+        _section('Szczegóły', level=3)
+    ])
+
+    assert index.assignment == ['goals', 'goals', None, None]
+
+
+def test_metadata_lists_slot_titles():
+    result = ProjectBriefTransformer().transform(parse_content(DOCUMENT, 'md'))
+
+    assert result.metadata['slots']['goals'] == ['Cele projektu', 'Cel główny']
+    assert result.metadata['unclassified_sections'] == 2  # "Sklep" i "Notatki"
+    brief = ''.join(next(iter(result.files.values())))
+    assert '❌ Aplikacja mobilna' in brief and '1. Sprzedaż online' in brief
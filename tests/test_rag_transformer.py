@@ -0,0 +1,80 @@
+import json
+import random
+import re
+
+import pytest
+
+from src.parsers import parse_content
+from src.transformers.rag_transformer import RAGTransformer
+from src.transformers.tokenizer import get_token_counter
+
+
+def _document(depth: int = 4) -> str:
+    lines = []
+    for level in range(1, depth + 1):
+        lines.append(f"{'#' * level} Rozdział poziomu {level} o dość długim tytule nagłówka")
+        lines.append('')
+    paragraph = ' '.join(f'Zdanie numer {i} opisuje szczegóły konfiguracji modułu.' for i in range(12))
+    lines.extend([paragraph, ''] * 20)
+    return '\n'.join(lines)
+
+
+@pytest.mark.parametrize('chunk_tokens', [64, 128, 512])
+def test_header_path_prefix_fits_in_chunk(chunk_tokens):
+    transformer = RAGTransformer({
+        'chunk_tokens': chunk_tokens,
+        'overlap_tokens': 16,
+        'prepend_header_path': True
+    })
+    chunks = list(transformer.iter_chunks(parse_content(_document(), 'md')))
+
+    assert chunks
+    for chunk in chunks:
+        assert chunk['tokens'] <= chunk_tokens
+        assert chunk['text'].startswith(' > '.join(chunk['header_path'])[:20])
+
+
+def test_transform_writes_prefixed_chunks():
+    transformer = RAGTransformer({'chunk_tokens': 96, 'overlap_tokens': 8, 'prepend_header_path': True})
+    result = transformer.transform(parse_content(_document(2), 'md'))
+    rows = [json.loads(line) for line in result.files['chunks.jsonl']]
+
+    assert rows and all(row['tokens'] <= 96 for row in rows)
+
+
+def _mixed_document(seed: int) -> str:
+    rng = random.Random(seed)
+    words = ['konfiguracja', 'moduł', 'x', '42', 'API', 'żółć', '->', 'foo_bar()', 'ąę', '...', 'https://a.b/c?d=e']
+    lines = []
+    for section in range(6):
+        lines.append(f"{'#' * rng.randint(1, 3)} Sekcja {section} {' '.join(rng.choices(words, k=rng.randint(1, 12)))}")
+        lines.append('')
+        for _ in range(rng.randint(1, 4)):
+            # Długie akapity wymuszają podział na zdania, długie "słowa" - przycinanie
+            sentences = [' '.join(rng.choices(words, k=rng.randint(1, 40))) + rng.choice('.!?') for _ in range(rng.randint(1, 15))]
+            lines.append(' '.join(sentences) + ('x' * rng.randint(0, 300)))
+            lines.append('')
+    return '\n'.join(lines)
+
+
+@pytest.mark.parametrize('prepend', [False, True])
+@pytest.mark.parametrize('chunk_tokens,overlap_tokens', [(32, 0), (32, 31), (64, 16), (100, 50)])
+def test_chunks_never_exceed_budget(chunk_tokens, overlap_tokens, prepend):
+    transformer = RAGTransformer({
+        'chunk_tokens': chunk_tokens,
+        'overlap_tokens': overlap_tokens,
+        'prepend_header_path': prepend
+    })
+    counter = get_token_counter()
+
+    for seed in range(5):
+        parsed = parse_content(_mixed_document(seed), 'md')
+        chunks = list(transformer.iter_chunks(parsed))
+
+        assert chunks
+        for chunk in chunks:
+            assert chunk['tokens'] == counter.count(chunk['text']) <= chunk_tokens
+        # Żadne słowo sekcji nie ginie przy przycinaniu
+        words = set(re.findall(r'\w+', ' '.join(chunk['text'] for chunk in chunks)))
+        for section in parsed.sections:
+            assert {w for w in re.findall(r'\w+', section.get('content') or '') if len(w) < 20} <= words
@@ -0,0 +1,30 @@
+from src.parsers import parser_registry
+from src.parsers.base_parser import filter_config
+from src.transformers import transformer_registry
+
+
+def test_server_side_keys_are_dropped():
+    github = transformer_registry.get_transformer('github').request_options
+    clipboard = parser_registry.get_parser('clipboard').request_options
+    rag = transformer_registry.get_transformer('rag').request_options
+
+    assert filter_config({'template_dir': '/tmp', 'add_emojis': False}, github) == {'add_emojis': False}
+    assert filter_config({'executor': 'process', 'max_workers': 64}, clipboard) == {}
+    assert filter_config({'output_file': '../chunks.jsonl'}, rag) == {}
+
+
+def test_numbers_are_clamped():
+    clipboard = parser_registry.get_parser('clipboard').request_options
+    github = transformer_registry.get_transformer('github').request_options
+
+    assert filter_config({'parallel_min_size': 0}, clipboard) == {'parallel_min_size': 64 * 1024}
+    assert filter_config({'docs_split_level': 3.7, 'dedup_threshold': 2}, github) == {
+        'docs_split_level': 3, 'dedup_threshold': 1.0
+    }
+
+
+def test_wrong_types_and_values_are_dropped():
+    csv = parser_registry.get_parser('csv').request_options
+
+    assert filter_config({'has_header': 'no', 'sample_rows': True, 'delimiter': '|'}, csv) == {}
+    assert filter_config({'sample_rows': float('nan'), 'delimiter': ';'}, csv) == {'delimiter': ';'}
@@ -0,0 +1,72 @@
+from src.parsers import parse_content
+from src.transformers.github_transformer import GitHubTransformer
+from src.transformers.sharding import github_anchor, render_index, render_shard, shard_sections, slugify, split_level
+
+
+def _section(title, level, content='Treść.'):
+    return {'title': title, 'level': level, 'content': content}
+
+
+SECTIONS = [
+    _section('Projekt', 1),
+    _section('Instalacja', 2),
+    _section('Wymagania', 3),
+    _section('Użycie', 2),
+    _section('Przykład', 3),
+    _section('Przykład', 3),
+]
+
+
+def test_slug_and_anchor():
+    assert slugify('Żółć i łódź: wersja 2.0') == 'zolc-i-lodz-wersja-2-0'
+    assert slugify('???') == 'section'
+    assert github_anchor('Krok 1: Instalacja') == 'krok-1-instalacja'
+
+
+def test_single_top_heading_splits_one_level_lower():
+    assert split_level([1, 2, 3, 2]) == 2
+    assert split_level([1, 2, 1]) == 1
+    assert split_level([0, 0]) == 1
+
+
+def test_subsections_stay_with_parent():
+    shards = shard_sections(SECTIONS)
+
+    assert [shard.filename for shard in shards] == ['01-projekt.md', '02-instalacja.md', '03-uzycie.md']
+    assert [shard.sections for shard in shards] == [[0], [1, 2], [3, 4, 5]]
+    assert ''.join(render_shard(shards[1], SECTIONS)).startswith('# Instalacja\n\nTreść.\n\n## Wymagania\n')
+
+
+def test_oversized_group_continues_in_next_part():
+    sections = [_section('Rozdział', 1, 'x' * 400)] + [_section(f'Część {i}', 2, 'y' * 400) for i in range(4)]
+    shards = shard_sections(sections, max_chars=1000, level=1)
+
+    assert [shard.filename for shard in shards] == ['01-rozdzial.md', '01-rozdzial-2.md', '01-rozdzial-3.md']
+    assert [index for shard in shards for index in shard.sections] == list(range(5))
+    assert ''.join(render_shard(shards[1], sections)).startswith('# Rozdział (cz. 2)\n\n## Część 1')
+
+
+def test_index_links_every_heading_with_unique_anchors():
+    shards = shard_sections(SECTIONS)
+    index = ''.join(render_index(shards, SECTIONS, 'Dokumentacja'))
+
+    assert index == (
+        '# Dokumentacja\n\n'
+        '- [Projekt](01-projekt.md)\n'
+        '- [Instalacja](02-instalacja.md)\n'
+        '  - [Wymagania](02-instalacja.md#wymagania)\n'
+        '- [Użycie](03-uzycie.md)\n'
+        '  - [Przykład](03-uzycie.md#przykład)\n'
+        '  - [Przykład](03-uzycie.md#przykład-1)\n'
+    )
+
+
+def test_github_docs_keep_every_section_once():
+    body = ''.join(f"## Sekcja {i}\n\nOpis sekcji {i}.\n\n" for i in range(6))
+    parsed = parse_content(f"# Projekt\n\nWstęp.\n\n{body}", 'md')
+    result = GitHubTransformer({'docs_max_chars': 1000}).transform(parsed)
+
+    docs = [path for path in result.files if path.startswith('docs/') and path != 'docs/index.md']
+    text = ''.join(result.read_file(path) for path in docs)
+    assert all(text.count(f"Opis sekcji {i}.") == 1 for i in range(6))
+    assert 'docs/index.md' in result.sources and all(path in result.sources for path in docs)
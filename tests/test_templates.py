@@ -0,0 +1,72 @@
+import os
+
+import pytest
+
+from src.transformers.templates import Template, TemplateEngine, get_template_engine
+
+
+def _write(path, text, mtime_ns=None):
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(text, encoding='utf-8')
+    if mtime_ns is not None:
+        os.utime(path, ns=(mtime_ns, mtime_ns))
+
+
+def test_fields_are_rendered():
+    template = Template('t', 'Copyright (c) {{ year }} {{author}}, {{ year }}\n')
+
+    assert template.fields == ('year', 'author', 'year')
+    assert template.render({'year': 2026, 'author': 'Jan'}) == 'Copyright (c) 2026 Jan, 2026\n'
+    assert Template('s', 'bez pól { year }').is_static
+
+
+def test_missing_field_is_an_error():
+    with pytest.raises(ValueError, match="author"):
+        Template('LICENSE', '{{ year }} {{ author }}').render({'year': 2026})
+
+    engine = TemplateEngine('github')
+    with pytest.raises(ValueError, match="author"):
+        engine.render('LICENSE', year=2026)
+    with pytest.raises(ValueError, match="Nie znaleziono szablonu"):
+        engine.get('brak/szablonu')
+
+
+def test_override_takes_precedence(tmp_path):
+    builtin = TemplateEngine('github', tmp_path / 'brak')
+    _write(tmp_path / 'readme' / 'install.tmpl', 'Własna instalacja\n')
+    engine = TemplateEngine('github', tmp_path)
+
+    assert engine.render('readme/install') == 'Własna instalacja\n'
+    assert engine.get('CONTRIBUTING.md').source == builtin.get('CONTRIBUTING.md').source
+    assert builtin.render('readme/install') != 'Własna instalacja\n'
+
+
+def test_changed_files_are_reloaded(tmp_path):
+    engine = get_template_engine('github', str(tmp_path))
+    assert get_template_engine('github', str(tmp_path)) is engine
+    builtin = engine.render('LICENSE', year=2026, author='Jan')
+
+    # Nowe nadpisanie
+    _write(tmp_path / 'LICENSE.tmpl', 'Licencja {{ author }}\n', 10**9)
+    assert engine.render('LICENSE', year=2026, author='Jan') == 'Licencja Jan\n'
+
+    # Zmiana treści (inny czas modyfikacji) - także zapamiętanych wyników
+    _write(tmp_path / 'LICENSE.tmpl', 'Licencja: {{ author }}\n', 2 * 10**9)
+    assert engine.render('LICENSE', year=2026, author='Jan') == 'Licencja: Jan\n'
+
+    # Usunięte nadpisanie - powrót do szablonu wbudowanego
+    (tmp_path / 'LICENSE.tmpl').unlink()
+    assert engine.render('LICENSE', year=2026, author='Jan') == builtin
+
+
+def test_github_gitignore_follows_changed_fragment(tmp_path):
+    from src.parsers import parse_content
+    from src.transformers.github_transformer import GitHubTransformer
+
+    parsed = parse_content("# Demo\n\n```python\nprint(1)\n```\n", 'md')
+    transformer = GitHubTransformer({'template_dir': str(tmp_path)})
+    assert '__pycache__' in transformer.transform(parsed).files['.gitignore']
+
+    _write(tmp_path / 'gitignore' / 'python.tmpl', '# Python\n*.pyc\n', 10**9)
+    gitignore = transformer.transform(parsed).files['.gitignore']
+    assert '*.pyc' in gitignore and '__pycache__' not in gitignore
@@ -0,0 +1,40 @@
+import time
+
+import pytest
+
+from src.transformers.tokenizer import MAX_PIECE_BYTES, TokenCounter
+
+
+@pytest.fixture(scope='module')
+def counter():
+    return TokenCounter()
+
+
+@pytest.mark.parametrize('text', [
+    ' ' * 8000,
+    '-' * 8000,
+    'a' * 22000,
+    'x' * 2_000_000,
+    'słowo' * 5000,
+])
+def test_long_pieces_are_counted_quickly(counter, text):
+    start = time.perf_counter()
+    count = counter.count(text, approximate=False)
+    elapsed = time.perf_counter() - start
+
+    assert elapsed < 2.0
+    assert 0 < count <= len(text.encode('utf-8'))
+    assert count == len(counter.encode(text))
+
+
+def test_long_piece_is_split_into_chunks(counter):
+    piece = '=' * (MAX_PIECE_BYTES * 3 + 10)
+    chunk = '=' * MAX_PIECE_BYTES
+    rest = '=' * 10
+
+    assert counter.count(piece) == 3 * counter.count(chunk) + counter.count(rest)
+
+
+def test_short_text_counts_are_unchanged(counter):
+    assert counter.encode('Hello world, to jest test tokenizera: zażółć gęślą jaźń 12345!')[:6] == \
+        [15842, 15812, 44, 331, 562, 771]
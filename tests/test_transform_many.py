@@ -0,0 +1,63 @@
+import copy
+import sys
+from pathlib import Path
+
+import drdoc
+from src.parsers import parse_content
+from src.transformers import transform_many, transformer_registry
+
+ROOT = Path(__file__).resolve().parent.parent
+DESTINATIONS = ['github', 'chatgpt', 'rag', 'project_brief']
+
+
+def _parsed():
+    content = (ROOT / 'examples' / 'example_markdown.md').read_text(encoding='utf-8')
+    return parse_content(content, 'md')
+
+
+def _files(result):
+    return {path: result.read_file(path) for path in result.files}
+
+
+def test_fan_out_matches_sequential_transforms():
+    parsed = _parsed()
+    before = copy.deepcopy(parsed.to_dict())
+
+    results = transform_many(DESTINATIONS + ['github'], parsed, max_workers=4)
+
+    assert list(results) == DESTINATIONS
+    for dest in DESTINATIONS:
+        expected = transformer_registry.transform(dest, parsed)
+        assert results[dest].errors == expected.errors
+        assert _files(results[dest]) == _files(expected)
+    # Transformery współdzielą ParsedData tylko do odczytu
+    assert parsed.to_dict() == before
+
+
+def test_failing_destination_does_not_stop_others(monkeypatch):
+    parsed = _parsed()
+    transformer = transformer_registry.get_transformer('chatgpt')
+
+    def fail(*args, **kwargs):
+        raise RuntimeError('awaria')
+
+    monkeypatch.setattr(transformer, 'transform', fail)
+    results = transform_many(['github', 'chatgpt', 'nieznana'], parsed)
+
+    assert list(results) == ['github', 'chatgpt', 'nieznana']
+    assert results['github'].errors == [] and results['github'].files
+    assert results['chatgpt'].errors == ['Błąd transformacji: awaria']
+    assert results['nieznana'].errors == ['Nieznany typ destinacji: nieznana']
+
+
+def test_cli_writes_one_directory_per_destination(tmp_path, monkeypatch, capsys):
+    source = tmp_path / 'doc.md'
+    source.write_text('# Projekt\n\nOpis.\n\n## Instalacja\n\nKroki instalacji.\n', encoding='utf-8')
+    out = tmp_path / 'out'
+    monkeypatch.setattr(sys, 'argv', ['drdoc.py', '-i', str(source), '-d', 'github,chatgpt,github',
+                                      '-o', str(out), '--project-name', 'demo'])
+
+    assert drdoc.main() == 0
+    capsys.readouterr()
+    assert sorted(p.name for p in out.iterdir()) == ['demo_chatgpt', 'demo_github']
+    assert (out / 'demo_github' / 'README.md').exists()
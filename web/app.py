@@ -6,15 +6,24 @@ Flask API serving the web interface
 
 import sys
 import os
+import json
+import secrets
+import threading
+from collections import OrderedDict
 from pathlib import Path
-from flask import Flask, render_template, request, jsonify, send_from_directory
+from flask import Flask, Response, render_template, request, jsonify, send_from_directory, stream_with_context
+from werkzeug.utils import secure_filename
 
 # Add src to path
 sys.path.insert(0, str(Path(__file__).parent.parent))
 
-from src.parsers import parse_content, detect_format
-from src.transformers import transform_data
+from src.parsers import parse_content, detect_format, parser_registry
+from src.parsers.base_parser import filter_config
+from src.transformers import transform_many, transformer_registry
 from src.generators.file_generator import FileGenerator
+from src.generators.archive import ARCHIVE_FORMATS, MIME_TYPES
+from src.generators.file_tree import FileTree
+from src.version import __version__
 
 app = Flask(__name__, 
             template_folder='templates',
@@ -23,6 +32,19 @@ app = Flask(__name__,
 # Configuration
 app.config['MAX_CONTENT_LENGTH'] = 16 * 1024 * 1024  # 16MB max file size
 OUTPUT_DIR = Path(__file__).parent.parent / 'data' / 'output'
+DESTINATIONS = ['github', 'chatgpt', 'rag', 'project_brief']
+
+# File trees of recent results, expanded lazily through /api/tree (LRU)
+TREE_CACHE_SIZE = 64
+TREE_DEPTH = 3          # Levels shown in the "file_tree" field
+TREE_ENTRIES = 200      # Entries per directory in the "file_tree" field
+TREE_PAGE_MAX = 1000    # Max. "limit" of one /api/tree page
+_trees = OrderedDict()
+_trees_lock = threading.Lock()
+
+
+class RequestError(Exception):
+    """Invalid transform request (returned as a 400 JSON error)"""
 
 
 @app.route('/')
@@ -92,13 +114,16 @@ def api_transform():
     {
         "content": "string - input content",
         "format": "string - input format (auto/txt/md/json)",
-        "destination": "string - destination type (github/chatgpt/project_brief)",
+        "destination": "string - destination type (github/chatgpt/rag/project_brief)",
+        "destinations": ["github", "chatgpt"] - optional, several destinations from one parse,
         "options": {
             "project_name": "string",
             "author": "string",
             "description": "string",
             "license": "string",
-            "preview": true/false
+            "preview": true/false,
+            "parser_config": {"allow_comments": true, ...},
+            "transformer_config": {"max_tokens": 8000, ...}
         }
     }
     
@@ -109,109 +134,331 @@ def api_transform():
             "files_count": int,
             "destination": "string",
             "file_tree": "string - ASCII tree",
+            "tree_id": "string",
             "files": {"path": "content", ...}
         },
         "error": "error message if any"
     }
+    
+    "file_tree" shows at most TREE_DEPTH levels and TREE_ENTRIES entries per
+    directory; deeper levels are expanded with /api/tree/<tree_id>.
+    
+    With "destinations" the result is {"destinations": {"<name>": {...}, ...}},
+    one object per destination in the shape above. Transformers run
+    concurrently on the same parsed data; output directories are named
+    "<project_name>_<destination>".
+    
+    In preview mode the response body is streamed: file contents are
+    written to the JSON document chunk by chunk as transformers produce them.
     """
     try:
         data = request.get_json()
         
-        # Validation
-        if not data:
-            return jsonify({
-                'success': False,
-                'error': 'No data provided'
-            }), 400
+        results, metadata, multiple = _transform_request(data)
+        destinations = list(results)
+        preview = data.get('options', {}).get('preview', True)
         
-        content = data.get('content', '')
-        if not content or not content.strip():
-            return jsonify({
-                'success': False,
-                'error': 'Empty content'
-            }), 400
+        generator = FileGenerator(str(OUTPUT_DIR))
         
-        format_hint = data.get('format', 'auto')
-        if format_hint == 'auto':
-            format_hint = None
+        # Prepare response (file tree per destination)
+        responses = {}
+        for dest, transformed in results.items():
+            tree = generator.file_tree(transformed)
+            responses[dest] = {
+                'files_count': len(transformed.files),
+                'destination': dest,
+                'file_tree': tree.render(max_depth=TREE_DEPTH, max_entries=TREE_ENTRIES, collapse=True),
+                'tree_id': _remember_tree(tree)
+            }
         
-        destination = data.get('destination')
-        if not destination:
-            return jsonify({
-                'success': False,
-                'error': 'Missing destination'
-            }), 400
+        # Preview: stream file contents straight from the transformers
+        if preview:
+            parts = [(dest, responses[dest], results[dest].files) for dest in results]
+            return Response(stream_with_context(_stream_preview(parts, multiple)),
+                            mimetype='application/json')
         
-        if destination not in ['github', 'chatgpt', 'project_brief']:
-            return jsonify({
-                'success': False,
-                'error': f'Unknown destination: {destination}'
-            }), 400
+        # Not preview mode - actually generate files
+        for dest, transformed in results.items():
+            project_name = f"{metadata['project_name']}_{dest}" if multiple else metadata['project_name']
+            report = generator.generate_with_report(transformed, project_name)
+            result = responses[dest]
+            result['files'] = None
+            result['output_path'] = str(OUTPUT_DIR / project_name)
+            result['generated_files'] = list(report.files.keys())
+            if report.failed:
+                result['failed_files'] = report.failed
         
-        options = data.get('options', {})
-        preview = options.get('preview', True)
+        return jsonify({
+            'success': True,
+            'result': {'destinations': responses} if multiple else responses[destinations[0]]
+        })
         
-        # Parse content
-        parsed_data = parse_content(content, format_hint)
+    except RequestError as e:
+        return jsonify({
+            'success': False,
+            'error': str(e)
+        }), 400
+    except Exception as e:
+        app.logger.error(f"Error in transform: {e}", exc_info=True)
+        return jsonify({
+            'success': False,
+            'error': str(e)
+        }), 500
+
+
+@app.route('/api/transform/archive', methods=['POST'])
+def api_transform_archive():
+    """
+    API endpoint to download the transform result as an archive
+    
+    Request JSON: same as /api/transform, plus
+        "options": {"archive_format": "zip" | "tar.gz" | "tar"}  (default: zip)
+    
+    Response: the archive, streamed file by file as it is compressed
+    (nothing is written to the output directory). Files are placed under
+    "<project_name>/" ("<project_name>_<destination>/" with "destinations").
+    On error: JSON {"success": false, "error": "..."}.
+    """
+    try:
+        data = request.get_json()
+        archive_format = ((data or {}).get('options') or {}).get('archive_format', 'zip')
+        if archive_format not in ARCHIVE_FORMATS:
+            raise RequestError(f'Unknown archive format: {archive_format}')
         
-        if parsed_data.errors:
-            app.logger.warning(f"Parse warnings: {parsed_data.errors}")
+        results, metadata, multiple = _transform_request(data)
         
-        # Transform data
-        metadata = {
-            'project_name': options.get('project_name', 'my-project'),
-            'author': options.get('author', 'Unknown'),
-            'description': options.get('description', 'Project description'),
-            'license': options.get('license', 'MIT')
+        project_name = secure_filename(metadata['project_name']) or 'project'
+        projects = {
+            (f"{project_name}_{dest}" if multiple else project_name): transformed
+            for dest, transformed in results.items()
         }
         
-        transformed_data = transform_data(destination, parsed_data, metadata=metadata)
-        
-        if transformed_data.errors:
-            return jsonify({
-                'success': False,
-                'error': '; '.join(transformed_data.errors)
-            }), 400
-        
-        # Generate file tree
         generator = FileGenerator(str(OUTPUT_DIR))
-        file_tree = generator.get_file_tree(transformed_data)
-        
-        # Prepare response
-        result = {
-            'files_count': len(transformed_data.files),
-            'destination': destination,
-            'file_tree': file_tree,
-            'files': transformed_data.files if preview else None
-        }
-        
-        # If not preview mode, actually generate files
-        if not preview:
-            project_name = metadata['project_name']
-            generated_files = generator.generate(transformed_data, project_name)
-            result['output_path'] = str(OUTPUT_DIR / project_name)
-            result['generated_files'] = list(generated_files.keys())
+        return Response(
+            stream_with_context(generator.iter_archive(projects, archive_format)),
+            mimetype=MIME_TYPES[archive_format],
+            headers={'Content-Disposition': f'attachment; filename="{project_name}.{archive_format}"'}
+        )
         
+    except RequestError as e:
         return jsonify({
-            'success': True,
-            'result': result
-        })
-        
+            'success': False,
+            'error': str(e)
+        }), 400
     except Exception as e:
-        app.logger.error(f"Error in transform: {e}", exc_info=True)
+        app.logger.error(f"Error in transform archive: {e}", exc_info=True)
         return jsonify({
             'success': False,
             'error': str(e)
         }), 500
 
 
+@app.route('/api/tree/<tree_id>', methods=['GET'])
+def api_tree(tree_id):
+    """
+    API endpoint to expand the file tree of a /api/transform result
+    
+    Query parameters:
+        path: directory to expand (default: root)
+        offset, limit: page of entries / lines (limit max TREE_PAGE_MAX)
+        view: "entries" (default) - direct children of the directory,
+              "lines" - ASCII tree lines of the subtree
+        depth: levels rendered in the "lines" view (default: TREE_DEPTH)
+    
+    Response JSON ("entries"):
+    {
+        "success": true,
+        "path": "docs",
+        "total": int,
+        "entries": [{"name", "path", "type": "dir"|"file", "files": int (dirs)}],
+        "next_offset": int or null
+    }
+    
+    Response JSON ("lines"): {"success": true, "lines": [...], "offset": int, "next_offset": int or null}
+    
+    Trees are kept for the last TREE_CACHE_SIZE results; an expired tree_id returns 404.
+    """
+    tree = _cached_tree(tree_id)
+    if tree is None:
+        return jsonify({
+            'success': False,
+            'error': 'File tree not found or expired'
+        }), 404
+    
+    path = request.args.get('path', '')
+    offset = max(request.args.get('offset', 0, type=int), 0)
+    limit = min(max(request.args.get('limit', TREE_ENTRIES, type=int), 1), TREE_PAGE_MAX)
+    view = request.args.get('view', 'entries')
+    
+    if tree.node(path) is None:
+        return jsonify({
+            'success': False,
+            'error': f'Directory not found: {path}'
+        }), 404
+    
+    if view == 'lines':
+        depth = max(request.args.get('depth', TREE_DEPTH, type=int), 1)
+        page = tree.page(path, offset, limit, max_depth=depth, max_entries=TREE_ENTRIES, collapse=True)
+    elif view == 'entries':
+        page = tree.entries(path, offset, limit)
+    else:
+        return jsonify({
+            'success': False,
+            'error': f'Unknown view: {view}'
+        }), 400
+    
+    return jsonify({'success': True, **page})
+
+
+def _remember_tree(tree: FileTree) -> str:
+    """Store a file tree for /api/tree; returns its id (oldest trees are dropped)"""
+    tree_id = secrets.token_urlsafe(12)
+    with _trees_lock:
+        _trees[tree_id] = tree
+        while len(_trees) > TREE_CACHE_SIZE:
+            _trees.popitem(last=False)
+    return tree_id
+
+
+def _cached_tree(tree_id: str):
+    """File tree stored by _remember_tree (None if unknown or expired)"""
+    with _trees_lock:
+        tree = _trees.get(tree_id)
+        if tree is not None:
+            _trees.move_to_end(tree_id)
+        return tree
+
+
+def _transform_request(data):
+    """
+    Validate a transform request and run the transformers.
+    
+    Returns:
+        (results, metadata, multiple): {destination: TransformedData},
+        project metadata and whether "destinations" was used
+    
+    Raises:
+        RequestError: Invalid request or transformation errors
+    """
+    # Validation
+    if not data:
+        raise RequestError('No data provided')
+    
+    content = data.get('content', '')
+    if not content or not content.strip():
+        raise RequestError('Empty content')
+    
+    format_hint = data.get('format', 'auto')
+    if format_hint == 'auto':
+        format_hint = None
+    
+    # One destination ("destination") or several ("destinations")
+    multiple = 'destinations' in data
+    destinations = data.get('destinations') if multiple else [data.get('destination')]
+    if not isinstance(destinations, list) or not destinations or not all(destinations):
+        raise RequestError('Missing destination')
+    
+    for destination in destinations:
+        if destination not in DESTINATIONS:
+            raise RequestError(f'Unknown destination: {destination}')
+    
+    options = data.get('options', {})
+    
+    # Nadpisania konfiguracji dla tego żądania (instancje współdzielone przez cache rejestru)
+    parser_config = options.get('parser_config') or None
+    transformer_config = options.get('transformer_config') or None
+    for name, value in (('parser_config', parser_config), ('transformer_config', transformer_config)):
+        if value is not None and not isinstance(value, dict):
+            raise RequestError(f'{name} must be an object')
+    
+    # Tylko klucze z request_options parsera/transformera (bez template_dir, executor itp.),
+    # liczby przycięte do dozwolonych zakresów
+    confidence = None
+    if parser_config:
+        parser = parser_registry.get_parser(format_hint) if format_hint else None
+        if parser is None:
+            format_hint, confidence = detect_format(content)
+            parser = parser_registry.get_parser(format_hint)
+        parser_config = filter_config(parser_config, parser.request_options) or None
+    
+    transformer_configs = None
+    if transformer_config:
+        transformer_configs = {
+            dest: filter_config(transformer_config, transformer_registry.get_transformer(dest).request_options)
+            for dest in destinations
+        }
+    
+    # Parse content
+    parsed_data = parse_content(content, format_hint, config=parser_config)
+    if confidence is not None:
+        parsed_data.confidence = confidence
+    
+    if parsed_data.errors:
+        app.logger.warning(f"Parse warnings: {parsed_data.errors}")
+    
+    # Transform data
+    metadata = {
+        'project_name': options.get('project_name', 'my-project'),
+        'author': options.get('author', 'Unknown'),
+        'description': options.get('description', 'Project description'),
+        'license': options.get('license', 'MIT')
+    }
+    
+    # One parse feeds all transformers (run concurrently)
+    results = transform_many(destinations, parsed_data, transformer_configs, metadata=metadata)
+    
+    errors = [
+        (f'{dest}: ' if multiple else '') + '; '.join(transformed.errors)
+        for dest, transformed in results.items() if transformed.errors
+    ]
+    if errors:
+        raise RequestError('; '.join(errors))
+    
+    return results, metadata, multiple
+
+
+def _stream_preview(parts: list, multiple: bool):
+    """
+    Yield the transform response JSON piece by piece.
+    
+    Args:
+        parts: [(destination, result dict, files), ...]
+        multiple: Wrap results in {"destinations": {...}}
+    """
+    yield '{"success": true, "result": '
+    if multiple:
+        yield '{"destinations": {'
+    for i, (destination, result, files) in enumerate(parts):
+        if multiple:
+            yield (', ' if i else '') + json.dumps(destination) + ': '
+        yield from _stream_result(result, files)
+    if multiple:
+        yield '}}'
+    yield '}'
+
+
+def _stream_result(result: dict, files: dict):
+    """
+    Yield one result object with its files.
+    Each content chunk is JSON-escaped on its own, so streamed files are
+    never joined into one string.
+    """
+    yield json.dumps(result)[:-1] + ', "files": {'
+    for i, (path, content) in enumerate(files.items()):
+        yield (', ' if i else '') + json.dumps(path) + ': "'
+        for chunk in ([content] if isinstance(content, str) else content):
+            yield json.dumps(chunk)[1:-1]
+        yield '"'
+    yield '}}'
+
+
 @app.route('/api/health', methods=['GET'])
 def health():
     """Health check endpoint"""
     return jsonify({
         'status': 'healthy',
         'service': 'Dr.Doc API',
-        'version': '1.0.0'
+        'version': __version__
     })
 
 